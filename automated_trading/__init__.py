@@ -14,9 +14,12 @@ Directory Structure:
     ├── order_manager.py      # Order state management with idempotency
     ├── signal_queue.py       # Signal queue for intraday redeployment
     ├── position_monitor.py   # Position monitoring and exits
+    ├── price_snapshot.py     # Per-cycle bulk price snapshot
+    ├── trade_stream.py       # Alpaca trade-updates websocket listener
     ├── reconciliation.py     # Broker state reconciliation
     ├── alerts.py             # Email alert system
     ├── execute_trades.py     # Daily execution engine
+    ├── state_store.py        # SQLite (WAL) state backend with JSON export
     ├── utils.py              # Utility functions
     └── data/
         ├── live_positions.json    # Current positions
@@ -55,6 +55,14 @@ except ImportError:
     ALPACA_AVAILABLE = False
     APIError = Exception  # Fallback
 
+# Alpaca market data (multi-symbol latest trades)
+try:
+    from alpaca.data.historical import StockHistoricalDataClient
+    from alpaca.data.requests import StockLatestTradeRequest
+    ALPACA_DATA_AVAILABLE = True
+except ImportError:
+    ALPACA_DATA_AVAILABLE = False
+
 from . import config
 from .utils import log_audit_event
 
@@ -92,6 +100,8 @@ class AlpacaTradingClient:
 
         self.paper = paper
         self.client = None
+        self.data_client = None
+        self.trade_stream = None  # Optional TradeUpdateStream used by await_fill
         self._last_account_fetch = None
         self._cached_account = None
         self._connect()
@@ -437,6 +447,7 @@ class AlpacaTradingClient:
             order_id: Alpaca order ID to poll.
             timeout_seconds: Max seconds to wait before giving up.
             poll_interval: Seconds between polls (starts at this, doubles up to 2s).
+                Not used while a connected trade stream delivers the update.
 
         Returns:
             Final order dict with status, filled_avg_price, etc.
@@ -448,8 +459,22 @@ class AlpacaTradingClient:
                            'canceled', 'done_for_day', 'replaced'}
         elapsed = 0.0
         current_interval = poll_interval
+        order_data = None
+
+        # Wait on the trade-updates stream when it's up; poll whatever is left
+        stream = self.trade_stream
+        if stream is not None and stream.is_connected():
+            started = time.monotonic()
+            order_data = stream.wait_for_terminal(order_id, timeout_seconds)
+            elapsed = time.monotonic() - started
+            if order_data is not None:
+                logger.info(
+                    f"Order {order_id} reached terminal state: {order_data.get('status')} "
+                    f"(streamed, elapsed {elapsed:.1f}s)"
+                )
+                return order_data
 
-        while elapsed < timeout_seconds:
+        while elapsed < timeout_seconds or order_data is None:
             order_data = self.get_order(order_id)
             if order_data is None:
                 raise AlpacaClientError(f"Order {order_id} not found during await_fill")
@@ -781,6 +806,30 @@ class AlpacaTradingClient:
                 return None
             raise
 
+    def get_orders_since(self, after: datetime, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Get all orders (open and closed) submitted after a timestamp in one call.
+
+        Args:
+            after: Only orders submitted after this time
+            limit: Maximum orders returned (Alpaca caps this at 500)
+
+        Returns:
+            List of order dictionaries
+        """
+        request = GetOrdersRequest(
+            status=QueryOrderStatus.ALL,
+            limit=limit,
+            after=after
+        )
+
+        orders = self._retry_operation(
+            lambda: self.client.get_orders(request),
+            "Get orders since"
+        )
+
+        return [self._format_order_response(o) for o in orders]
+
     def cancel_order(self, order_id: str) -> bool:
         """
         Cancel an order.
@@ -915,6 +964,41 @@ class AlpacaTradingClient:
                 return False, "Asset not found"
             return False, f"Error checking asset: {e}"
 
+    def get_latest_trade_prices(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the latest trade price for many symbols in one market-data request.
+
+        Args:
+            symbols: Ticker symbols
+
+        Returns:
+            Dictionary mapping symbol -> {'price', 'timestamp'} (symbols
+            without a trade are omitted)
+        """
+        if not symbols or not ALPACA_DATA_AVAILABLE:
+            return {}
+
+        if self.data_client is None:
+            creds = config.get_api_credentials()
+            self.data_client = StockHistoricalDataClient(
+                api_key=creds['api_key'],
+                secret_key=creds['secret_key']
+            )
+
+        trades = self._retry_operation(
+            lambda: self.data_client.get_stock_latest_trade(
+                StockLatestTradeRequest(symbol_or_symbols=list(symbols))
+            ),
+            "Get latest trades"
+        )
+
+        result = {}
+        for symbol, trade in (trades or {}).items():
+            price = float(trade.price) if trade is not None and trade.price else 0.0
+            if price > 0:
+                result[symbol] = {'price': price, 'timestamp': trade.timestamp}
+        return result
+
     def get_latest_quote(self, symbol: str) -> Optional[Dict[str, float]]:
         """
         Get the latest quote for a symbol.
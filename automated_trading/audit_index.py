@@ -0,0 +1,340 @@
+# automated_trading/audit_index.py
+"""
+Sidecar Byte-Offset Index for the Audit Log
+
+audit_log.jsonl is append-only and never rotated, so anything that scans it
+from the start gets slower every day. The sidecar index (audit_log.jsonl.idx)
+holds one fixed-width record per log line:
+
+    offset (u8) | length (u4) | day YYYYMMDD (i4) | crc32(event_type) (u4)
+
+log_audit_event appends a record under the same file lock as the log line.
+Readers filter the 20-byte records with numpy (date ranges by binary search,
+event types by hash), then mmap the log and parse only the matching lines,
+so "last N events of type X" and "events since date D" cost O(result) JSON
+parsing instead of O(file).
+
+The index is self-healing: if it is missing, corrupt or behind the log
+(lines appended by an older writer, a fresh checkout, a merge), the next
+read rebuilds it or indexes just the unindexed tail. The first read in a
+process checks every record against the log's line boundaries, so an index
+that no longer matches a log rewritten in the middle is rebuilt too. The
+index is a local cache and isn't committed; CI rebuilds it from the JSONL.
+
+This module only depends on the standard library and numpy so the
+analyzers under scripts/analyzers/ can use it without loading the trading
+configuration.
+"""
+
+import os
+import json
+import mmap
+import zlib
+import fcntl
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = '.idx'
+RECORD_DTYPE = np.dtype([
+    ('offset', '<u8'),
+    ('length', '<u4'),
+    ('day', '<i4'),
+    ('type', '<u4'),
+])
+
+DayLike = Union[str, date, datetime]
+
+
+def _type_hash(event_type: Any) -> int:
+    """Stable 32-bit hash of an event type."""
+    return zlib.crc32(str(event_type).encode('utf-8'))
+
+
+def _day_key(value: Optional[DayLike]) -> int:
+    """YYYYMMDD integer for a date, datetime or ISO timestamp string (0 if unparseable)."""
+    if isinstance(value, (date, datetime)):
+        return value.year * 10000 + value.month * 100 + value.day
+    try:
+        return int(str(value)[:10].replace('-', ''))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _make_record(offset: int, length: int, event: Dict[str, Any]) -> np.ndarray:
+    record = np.zeros(1, dtype=RECORD_DTYPE)
+    record['offset'] = offset
+    record['length'] = length
+    record['day'] = _day_key(event.get('timestamp'))
+    record['type'] = _type_hash(event.get('event_type'))
+    return record
+
+
+class AuditLogIndex:
+    """
+    Offset index over one JSONL audit log.
+
+    Attributes:
+        log_path: Path to the JSONL log
+        index_path: Path to the sidecar index (log_path + '.idx')
+    """
+
+    def __init__(self, log_path: str, index_path: Optional[str] = None):
+        self.log_path = str(log_path)
+        self.index_path = str(index_path) if index_path else self.log_path + INDEX_SUFFIX
+        self.lock_path = f"{self.log_path}.lock"
+        self._records: Optional[np.ndarray] = None
+        self._sorted_by_day = False
+        self._sizes = None  # (log size, index size) when _records was loaded
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, offset: int, length: int, event: Dict[str, Any]) -> None:
+        """
+        Index a line just appended at offset (caller holds the log lock).
+
+        Only appends when the index already covers everything before offset;
+        otherwise the next read catches up from the first unindexed byte.
+        """
+        if self._last_indexed_end() != offset:
+            return
+        with open(self.index_path, 'ab') as f:
+            f.write(_make_record(offset, length, event).tobytes())
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _read_index(self) -> np.ndarray:
+        """All index records on disk (empty if missing or not whole records)."""
+        try:
+            size = os.path.getsize(self.index_path)
+        except OSError:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        if size % RECORD_DTYPE.itemsize:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.fromfile(self.index_path, dtype=RECORD_DTYPE)
+
+    def _last_indexed_end(self) -> int:
+        """End offset of the last indexed line, reading only the final record (-1 if unusable)."""
+        try:
+            size = os.path.getsize(self.index_path)
+        except OSError:
+            return 0
+        if size % RECORD_DTYPE.itemsize:
+            return -1
+        if size == 0:
+            return 0
+        with open(self.index_path, 'rb') as f:
+            f.seek(size - RECORD_DTYPE.itemsize)
+            last = np.frombuffer(f.read(RECORD_DTYPE.itemsize), dtype=RECORD_DTYPE)
+        return self._indexed_end(last)
+
+    @staticmethod
+    def _indexed_end(records: np.ndarray) -> int:
+        if len(records) == 0:
+            return 0
+        last = records[-1]
+        return int(last['offset']) + int(last['length'])
+
+    def _is_consistent(self, records: np.ndarray, log_size: int, full: bool = True) -> bool:
+        """
+        Check that the records still point at whole log lines.
+
+        The full check verifies every record: records don't overlap, each
+        starts at a line start with '{' and ends on a newline, and there are
+        no more records than lines. full=False only checks the last record,
+        for re-reads of an index this process already validated.
+        """
+        if len(records) == 0:
+            return True
+        end = self._indexed_end(records)
+        if end > log_size:
+            return False
+        if full:
+            return self._records_match_lines(records, end)
+        offset = int(records[-1]['offset'])
+        with open(self.log_path, 'rb') as f:
+            f.seek(offset)
+            first = f.read(1)
+            f.seek(end - 1)
+            last = f.read(1)
+        return first == b'{' and last == b'\n'
+
+    def _records_match_lines(self, records: np.ndarray, end: int) -> bool:
+        """Vectorized line-boundary check of every record against log bytes [0, end)."""
+        offsets = records['offset'].astype(np.int64)
+        ends = offsets + records['length'].astype(np.int64)
+        if np.any(offsets[1:] < ends[:-1]) or np.any(ends <= offsets):
+            return False
+
+        newline = ord('\n')
+        log = np.memmap(self.log_path, dtype=np.uint8, mode='r', shape=(end,))
+        try:
+            return bool(
+                np.all(log[offsets] == ord('{'))
+                and np.all(log[ends - 1] == newline)
+                and np.all(log[offsets[offsets > 0] - 1] == newline)
+                and len(records) <= np.count_nonzero(log == newline)
+            )
+        finally:
+            del log
+
+    def _index_tail(self, start: int) -> np.ndarray:
+        """Records for complete lines from byte offset start to the end of the log."""
+        records = []
+        offset = start
+        with open(self.log_path, 'rb') as f:
+            f.seek(start)
+            for line in f:
+                length = len(line)
+                if line.endswith(b'\n'):
+                    try:
+                        event = json.loads(line)
+                        if isinstance(event, dict):
+                            records.append(_make_record(offset, length, event))
+                    except ValueError:
+                        pass  # Unparseable lines are skipped, as readers always did
+                offset += length
+        if not records:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.concatenate(records)
+
+    def refresh(self) -> np.ndarray:
+        """
+        Bring the index up to date with the log and return its records.
+
+        Returns cached records when neither file has changed size.
+        """
+        try:
+            log_size = os.path.getsize(self.log_path)
+        except OSError:
+            self._records = np.zeros(0, dtype=RECORD_DTYPE)
+            self._sizes = None
+            return self._records
+
+        index_size = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else -1
+        if self._records is not None and self._sizes == (log_size, index_size):
+            return self._records
+
+        records = self._read_index()
+        sizes = (log_size, index_size)
+        full = self._records is None  # First read in this process checks every record
+        if self._indexed_end(records) < log_size or not self._is_consistent(records, log_size, full=full):
+            records = self._catch_up()
+            sizes = None  # Re-validate (without the lock) on the next read
+
+        self._records = records
+        self._sorted_by_day = bool(np.all(records['day'][1:] >= records['day'][:-1]))
+        self._sizes = sizes
+        return records
+
+    def _catch_up(self) -> np.ndarray:
+        """Rebuild or extend the index under the log lock."""
+        with open(self.lock_path, 'w') as lf:
+            fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+            try:
+                log_size = os.path.getsize(self.log_path)
+                index_bytes = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+                records = self._read_index()
+                if index_bytes % RECORD_DTYPE.itemsize or not self._is_consistent(records, log_size):
+                    logger.info(f"Rebuilding audit log index for {self.log_path}")
+                    records = np.zeros(0, dtype=RECORD_DTYPE)
+                    mode = 'wb'
+                else:
+                    mode = 'ab'
+
+                start = self._indexed_end(records)
+                tail = self._index_tail(start) if start < log_size else np.zeros(0, dtype=RECORD_DTYPE)
+                if mode == 'wb' or len(tail):
+                    with open(self.index_path, mode) as f:
+                        f.write(tail.tobytes())
+                return np.concatenate([records, tail])
+            finally:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _parse(self, records: np.ndarray, event_type: Optional[str], reverse: bool,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Slice and parse the log lines for records (verifying event_type)."""
+        events: List[Dict[str, Any]] = []
+        if len(records) == 0:
+            return events
+
+        with open(self.log_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                order = range(len(records) - 1, -1, -1) if reverse else range(len(records))
+                offsets = records['offset']
+                lengths = records['length']
+                for i in order:
+                    if limit is not None and len(events) >= limit:
+                        break
+                    start = int(offsets[i])
+                    try:
+                        event = json.loads(mm[start:start + int(lengths[i])])
+                    except ValueError:
+                        continue
+                    if event_type is None or event.get('event_type') == event_type:
+                        events.append(event)
+        return events
+
+    def recent(self, event_type: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Most recent events, newest first.
+
+        Args:
+            event_type: Optional filter by event type
+            limit: Maximum events to return
+        """
+        records = self.refresh()
+        if event_type is not None:
+            records = records[records['type'] == _type_hash(event_type)]
+        return self._parse(records, event_type, reverse=True, limit=limit)
+
+    def since(self, since: DayLike, event_type: Optional[str] = None,
+              until: Optional[DayLike] = None) -> List[Dict[str, Any]]:
+        """
+        Events dated on or after since (and on or before until), oldest first.
+
+        Dates are compared on the timestamp's calendar day (YYYY-MM-DD), like
+        the analyzers' timestamp[:10] comparisons.
+        """
+        records = self.refresh()
+        lo = _day_key(since)
+        hi = _day_key(until) if until is not None else None
+
+        if self._sorted_by_day:
+            days = records['day']
+            start = int(np.searchsorted(days, lo, side='left'))
+            end = int(np.searchsorted(days, hi, side='right')) if hi is not None else len(records)
+            records = records[start:end]
+        else:
+            mask = records['day'] >= lo
+            if hi is not None:
+                mask &= records['day'] <= hi
+            records = records[mask]
+
+        if event_type is not None:
+            records = records[records['type'] == _type_hash(event_type)]
+        return self._parse(records, event_type, reverse=False)
+
+
+# Per-path instances (records are cached between reads in one process)
+_indexes: Dict[str, AuditLogIndex] = {}
+
+
+def get_audit_index(log_path: str) -> AuditLogIndex:
+    """Get or create the index for an audit log path"""
+    key = os.path.abspath(str(log_path))
+    if key not in _indexes:
+        _indexes[key] = AuditLogIndex(key)
+    return _indexes[key]
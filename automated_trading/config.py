@@ -34,6 +34,15 @@ ALPACA_PAPER_SECRET_KEY = os.getenv('ALPACA_PAPER_SECRET_KEY')
 ALPACA_LIVE_API_KEY = os.getenv('ALPACA_LIVE_API_KEY')
 ALPACA_LIVE_SECRET_KEY = os.getenv('ALPACA_LIVE_SECRET_KEY')
 
+# Trade-updates websocket (fills/cancels pushed as they happen). Optional:
+# when disabled or disconnected, pending orders are polled over REST.
+TRADE_STREAM_ENABLED = os.getenv('TRADE_STREAM_ENABLED', 'false').lower() == 'true'
+TRADE_STREAM_URL = os.getenv(
+    'ALPACA_TRADE_STREAM_URL',
+    'wss://api.alpaca.markets/stream' if TRADING_MODE == 'live' else 'wss://paper-api.alpaca.markets/stream'
+)
+TRADE_STREAM_CONNECT_TIMEOUT_SECONDS = 5   # Wait this long for auth + listen before falling back
+
 # =============================================================================
 # PORTFOLIO PARAMETERS (Scalable Design)
 # =============================================================================
@@ -155,6 +164,18 @@ ENABLE_MA_STATUS_CHECK = True  # Check FMP M&A database before entering trades
 MA_CACHE_FILE = "data/ma_status_cache.json"
 MA_CACHE_TTL_DAYS = 7  # Re-check M&A status weekly
 
+# Downtrend Filter (reject entries >3% below the 5-day SMA of closes)
+# Off: with the MultiIndex frames recent yfinance versions return, the
+# original check raised on every signal and was skipped, so trades have
+# never been filtered on it. Enabling it changes which trades execute.
+ENABLE_DOWNTREND_FILTER = False
+
+# Sector Profile Lookup (fill a missing signal sector from the FMP profile)
+# Off: the sector concentration check has only ever seen the signal's own
+# sector. Enabling it subjects sector-less signals to that check (changing
+# which trades execute) and adds a profile request per such signal.
+ENABLE_SECTOR_PROFILE_LOOKUP = False
+
 # Stale / Delisted Ticker Filter
 ENABLE_STALE_TICKER_FILTER = True  # Reject tickers with no recent price data
 STALE_PRICE_MAX_DAYS = 5  # Reject if price data is older than 5 trading days
@@ -311,6 +332,13 @@ SIGNAL_HISTORY_FILE = os.path.join(DATA_DIR, 'signal_history.json')
 EXECUTION_METRICS_FILE = os.path.join(DATA_DIR, 'execution_metrics.json')
 HIGH_WATER_MARK_FILE = os.path.join(DATA_DIR, 'high_water_mark.json')
 ROTATION_STATE_FILE = os.path.join(DATA_DIR, 'rotation_state.json')
+MORNING_PREP_FILE = os.path.join(DATA_DIR, 'morning_prep.json')  # Pre-market warm-up (see prepare_morning_trades)
+
+# State backend for orders, signals, positions and circuit breaker state:
+# 'sqlite' upserts changed records into STATE_DB_FILE (WAL) and exports the
+# JSON files above once per run; 'json' rewrites the JSON files on every save.
+STATE_BACKEND = os.getenv('STATE_BACKEND', 'sqlite').lower()
+STATE_DB_FILE = os.path.join(DATA_DIR, 'state.sqlite')
 
 # Path to approved signals from main pipeline (for tier lookup during broker sync)
 # Note: This is in the main data/ directory, not automated_trading/data/
@@ -343,6 +371,8 @@ ACCOUNT_CACHE_TIMEOUT_SECONDS = 60   # Account data cache lifetime (non-forced f
 ORDER_EXPIRATION_HOURS = 24          # Remove stale pending orders after this many hours
 SIGNAL_STALENESS_HOURS = 24          # Queued signals expire for redeployment after this
 PARTIAL_FILL_TIMEOUT_MINUTES = 15    # Cancel unfilled order remainder after this many minutes
+ORDER_RECONCILE_LOOKBACK_MARGIN_MINUTES = 5  # List broker orders from this long before the oldest pending submit
+PRICE_SNAPSHOT_MAX_AGE_SECONDS = 60  # Reuse one bulk price snapshot for this long (one monitor cycle)
 
 # =============================================================================
 # HELPER FUNCTIONS
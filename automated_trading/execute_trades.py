@@ -10,16 +10,17 @@ This module handles:
 - Daily summary generation
 
 Designed to be run as:
-1. Morning job (execute_morning_trades) - Run at 9:35 AM ET
-2. Monitor job (run_monitoring_cycle) - Run every 5 minutes during market hours
-3. End of day job (run_end_of_day) - Run at 4:30 PM ET
+1. Pre-market job (prepare_morning_trades) - Run at 9:20 AM ET
+2. Morning job (execute_morning_trades) - Run at 9:35 AM ET
+3. Monitor job (run_monitoring_cycle) - Run every 5 minutes during market hours
+4. End of day job (run_end_of_day) - Run at 4:30 PM ET
 """
 
 import os
 import sys
 import json
 import logging
-import yfinance as yf
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 
@@ -34,17 +35,24 @@ from .position_monitor import PositionMonitor, create_position_monitor, CircuitB
 from .reconciliation import Reconciler
 from .alerts import AlertSender, create_alert_sender
 from .execution_metrics import ExecutionMetrics, create_execution_metrics
+from .trade_stream import TradeUpdateStream
+from .state_store import export_state_snapshots
 
 # Import rotation scorer — uses automated_trading/config.py settings
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'jobs'))
 from rotation_scorer import build_live_rotation_scorer
+from volatility import get_atr_pcts
+from price_store import get_histories, period_start
 from .utils import (
     load_json_file,
     save_json_file,
     log_audit_event,
     read_recent_audit_events,
+    read_audit_events_since,
     is_market_hours,
     is_trading_window,
+    is_trading_day,
+    get_eastern_now,
     generate_client_order_id,
     format_currency,
     format_percentage,
@@ -76,6 +84,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _signal_prep_key(signal: Dict[str, Any]) -> str:
+    """Identifies the version of a signal that prepared checks were computed for."""
+    entry_price = signal.get('entry_price') or signal.get('currentPrice')
+    return f"{signal.get('date_generated', '')}|{entry_price}"
+
+
 class TradingEngine:
     """
     Main trading engine orchestrator.
@@ -116,11 +130,13 @@ class TradingEngine:
         self.position_monitor: Optional[PositionMonitor] = None
         self.alert_sender: Optional[AlertSender] = None
         self.execution_metrics: Optional[ExecutionMetrics] = None
+        self.trade_stream: Optional[TradeUpdateStream] = None
 
         # Session-level caches to avoid redundant I/O per job run
         self._atr_cache: Dict[str, Optional[float]] = {}
         self._win_rate_cache: Optional[Tuple[float, int]] = None
         self._cooldown_cache: Optional[Dict[str, datetime]] = None  # {ticker: last_close_datetime}
+        self._signal_prep: Dict[str, Dict[str, Any]] = {}  # {ticker: prepared validation checks}
 
         # Signal rotation scorer (recycles dead positions for stronger signals)
         self._rotation_scorer = build_live_rotation_scorer()
@@ -185,6 +201,12 @@ class TradingEngine:
             self.alert_sender = create_alert_sender()
             self.execution_metrics = create_execution_metrics()
 
+            # Optional trade-updates stream (fills pushed instead of polled)
+            if config.TRADE_STREAM_ENABLED:
+                self.trade_stream = TradeUpdateStream()
+                self.trade_stream.start()
+                self.alpaca_client.trade_stream = self.trade_stream
+
             # Ensure data directory and audit log exist for analyzers
             os.makedirs(config.DATA_DIR, exist_ok=True)
             if not os.path.exists(config.AUDIT_LOG_FILE):
@@ -242,46 +264,20 @@ class TradingEngine:
         logger.warning("No signal file found")
         return []
 
-    def validate_signal(self, signal: Dict[str, Any]) -> Tuple[bool, str]:
+    def _check_signal_filters(self, signal: Dict[str, Any]) -> Optional[str]:
         """
-        Validate a signal before execution.
-
-        Args:
-            signal: Signal dictionary
+        Shell company, stale ticker, M&A and single-insider filters.
 
         Returns:
-            Tuple of (is_valid, reason)
+            Rejection reason, or None if the signal passes
         """
         ticker = signal.get('ticker')
         entry_price = signal.get('entry_price') or signal.get('currentPrice')
         signal_score = signal.get('signal_score') or signal.get('rank_score', 0)
-
-        # Basic validation
-        if not ticker:
-            return False, "Missing ticker"
-
-        if not entry_price or entry_price <= 0:
-            return False, "Invalid entry price"
-
-        if signal_score < config.MIN_SIGNAL_SCORE_THRESHOLD:
-            return False, f"Score {signal_score} below threshold {config.MIN_SIGNAL_SCORE_THRESHOLD}"
-
-        # NEW FILTERS: Cooldown, Single-Insider, Downtrend
-        # Extract signal fields
         insider_count = signal.get('insider_count', 0)
         market_cap = signal.get('market_cap')
         buy_value = signal.get('buy_value', 0)
 
-        # Filter 1: Repeat Trade Cooldown (7 calendar days)
-        # Uses pre-built cache instead of scanning the full audit log per signal
-        cooldown_cache = self._get_cooldown_cache()
-        last_close = cooldown_cache.get(ticker)
-        if last_close is not None:
-            cutoff_date = datetime.now() - timedelta(days=7)
-            if last_close >= cutoff_date:
-                close_date = last_close.strftime('%Y-%m-%d')
-                return False, f"Cooldown: {ticker} closed on {close_date}, 7-day cooldown required"
-
         # Filter 2: Shell Company / SPAC Rejection
         if getattr(config, 'ENABLE_SHELL_COMPANY_FILTER', False) and check_shell_company is not None:
             is_shell, shell_reason = check_shell_company(
@@ -293,7 +289,7 @@ class TradingEngine:
                 name_patterns=getattr(config, 'SHELL_COMPANY_NAME_PATTERNS', []),
             )
             if is_shell:
-                return False, f"Shell company/SPAC — {shell_reason}"
+                return f"Shell company/SPAC — {shell_reason}"
 
         # Filter 3: Stale / Delisted Ticker Check
         if getattr(config, 'ENABLE_STALE_TICKER_FILTER', False) and check_stale_ticker is not None:
@@ -304,7 +300,7 @@ class TradingEngine:
                 max_stale_days=getattr(config, 'STALE_PRICE_MAX_DAYS', 5),
             )
             if is_stale:
-                return False, stale_reason
+                return stale_reason
 
         # Filter 4: M&A / Acquisition Status Check
         if getattr(config, 'ENABLE_MA_STATUS_CHECK', False) and check_ma_target is not None:
@@ -319,24 +315,24 @@ class TradingEngine:
                 market_cap=market_cap,
             )
             if is_target:
-                return False, f"M&A target — {ma_details}"
+                return f"M&A target — {ma_details}"
 
         # Filter 5: Single Insider Micro-Cap & Go-Private Detection
         if insider_count == 1:
             # Check 1: Micro-cap with low score
             if market_cap is not None and market_cap < 100_000_000:
                 if signal_score < 9.0:
-                    return False, f"Single insider micro-cap: score {signal_score:.2f} < 9.0 required (mkt cap ${market_cap/1e6:.1f}M)"
+                    return f"Single insider micro-cap: score {signal_score:.2f} < 9.0 required (mkt cap ${market_cap/1e6:.1f}M)"
 
             # Check 2: Weak conviction (low buy value)
             if buy_value < 500_000:
-                return False, f"Single insider weak conviction: buy_value ${buy_value:,.0f} < $500K minimum"
+                return f"Single insider weak conviction: buy_value ${buy_value:,.0f} < $500K minimum"
 
             # Check 3: Likely go-private transaction (basic check from main prompt)
             if market_cap and market_cap > 0 and buy_value > 10_000_000:
                 pct_of_cap = buy_value / market_cap
                 if pct_of_cap > 0.3:
-                    return False, f"Likely go-private: single insider buying {pct_of_cap*100:.0f}% of market cap — skipping"
+                    return f"Likely go-private: single insider buying {pct_of_cap*100:.0f}% of market cap — skipping"
 
             # === LEVEL 1: Enhanced Go-Private Hard Rejections (Numerical Thresholds Only) ===
             if market_cap and market_cap > 0:
@@ -344,11 +340,11 @@ class TradingEngine:
 
                 # Hard Rejection 1: Single insider buying >50% of company
                 if pct_of_cap > 0.5:
-                    return False, f"Go-private: single insider buying {pct_of_cap*100:.0f}% of company (likely acquisition)"
+                    return f"Go-private: single insider buying {pct_of_cap*100:.0f}% of company (likely acquisition)"
 
                 # Hard Rejection 2: >$50M buying >20% of company
                 if buy_value > 50_000_000 and pct_of_cap > 0.2:
-                    return False, f"Go-private: ${buy_value/1e6:.0f}M purchase = {pct_of_cap*100:.0f}% of ${market_cap/1e6:.0f}M company (likely M&A)"
+                    return f"Go-private: ${buy_value/1e6:.0f}M purchase = {pct_of_cap*100:.0f}% of ${market_cap/1e6:.0f}M company (likely M&A)"
 
                 # === LEVEL 2: Manual Review Alerts (Numerical Thresholds Only) ===
                 # These DO NOT reject - just log warnings
@@ -371,41 +367,141 @@ class TradingEngine:
                     logger.warning(f"   Risk: Exceptional transaction size warrants investigation")
                     logger.warning(f"   Action: Signal ALLOWED but flagged for investigation")
 
-        # Filter 3: Downtrend Detection
+        return None
+
+    def _downtrend_sma(self, ticker: str) -> Optional[float]:
+        """5-day SMA of closing prices for the downtrend check (None if unavailable)."""
         try:
-            # Get 7 days of history
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=7)
-            hist = yf.download(ticker, start=start_date, end=end_date, progress=False)
+            # Last 5 completed sessions from the shared price store
+            end_date = datetime.now().date() - timedelta(days=1)
+            hist = get_histories([ticker], start=period_start('5d', end=end_date), end=end_date).get(ticker)
 
-            if not hist.empty and len(hist) >= 5:
+            if hist is not None and len(hist) >= 5:
                 # Compute 5-day SMA of closing prices
-                last_5_closes = hist['Close'].tail(5)
-                sma_5 = last_5_closes.mean()
-
-                if sma_5 and entry_price < sma_5 * 0.97:
-                    # Price is >3% below 5-day SMA - downtrend
-                    pct_below = ((entry_price - sma_5) / sma_5) * 100
-                    return False, f"Downtrend: {ticker} price ${entry_price:.2f} is {abs(pct_below):.1f}% below 5-day SMA ${sma_5:.2f}"
-            # If yfinance call fails or insufficient data, log warning but DO NOT block
-            elif hist.empty:
+                return float(hist['Close'].tail(5).mean())
+            # If no or insufficient history, log warning but DO NOT block
+            elif hist is None or hist.empty:
                 logger.warning(f"{ticker}: No price history available for downtrend check, allowing trade")
 
         except Exception as e:
-            # yfinance call failed - log warning but DO NOT block the trade
+            # Price lookup failed - log warning but DO NOT block the trade
             logger.warning(f"{ticker}: Downtrend check failed ({str(e)}), allowing trade")
+        return None
+
+    def _signal_sector(self, signal: Dict[str, Any]) -> str:
+        """
+        Sector for the concentration check: the signal's own, or the FMP
+        profile's when it has none and ENABLE_SECTOR_PROFILE_LOOKUP is on.
+        """
+        sector = signal.get('sector') or 'Unknown'
+        if sector != 'Unknown' or not config.ENABLE_SECTOR_PROFILE_LOOKUP or get_company_profile is None:
+            return sector
+        try:
+            profile = get_company_profile(signal.get('ticker')) or {}
+            return profile.get('sector') or 'Unknown'
+        except Exception as e:
+            logger.warning(f"{signal.get('ticker')}: Sector lookup failed ({str(e)})")
+            return 'Unknown'
+
+    def _prepare_signal(self, signal: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resolve the network-bound parts of validate_signal for one signal.
+
+        Runs the signal filters, the sector lookup for the concentration
+        check and the 5-day SMA for the downtrend check (each when enabled)
+        and the Alpaca tradeability lookup. None of these depend on portfolio state
+        or the live price, so the result can be computed pre-market and
+        reused at the open.
+        """
+        ticker = signal.get('ticker')
+        prep = {
+            'key': _signal_prep_key(signal),
+            'rejected': self._check_signal_filters(signal),
+            'sector': None,
+            'sma_5': None,
+            'tradeable': None,
+            'tradeable_message': '',
+        }
+        if prep['rejected']:
+            return prep
+
+        prep['sector'] = self._signal_sector(signal)
+        if config.ENABLE_DOWNTREND_FILTER:
+            prep['sma_5'] = self._downtrend_sma(ticker)
+        prep['tradeable'], prep['tradeable_message'] = self.alpaca_client.is_asset_tradeable(ticker)
+        return prep
+
+    def _get_signal_prep(self, signal: Dict[str, Any]) -> Dict[str, Any]:
+        """Prepared checks for a signal, computed on first use and then reused."""
+        ticker = signal.get('ticker')
+        prep = self._signal_prep.get(ticker)
+        if prep is None or prep.get('key') != _signal_prep_key(signal):
+            prep = self._prepare_signal(signal)
+            self._signal_prep[ticker] = prep
+        return prep
+
+    def validate_signal(self, signal: Dict[str, Any]) -> Tuple[bool, str]:
+        """
+        Validate a signal before execution.
+
+        Args:
+            signal: Signal dictionary
+
+        Returns:
+            Tuple of (is_valid, reason)
+        """
+        ticker = signal.get('ticker')
+        entry_price = signal.get('entry_price') or signal.get('currentPrice')
+        signal_score = signal.get('signal_score') or signal.get('rank_score', 0)
+
+        # Basic validation
+        if not ticker:
+            return False, "Missing ticker"
+
+        if not entry_price or entry_price <= 0:
+            return False, "Invalid entry price"
+
+        if signal_score < config.MIN_SIGNAL_SCORE_THRESHOLD:
+            return False, f"Score {signal_score} below threshold {config.MIN_SIGNAL_SCORE_THRESHOLD}"
+
+        # Filter 1: Repeat Trade Cooldown (7 calendar days)
+        # Uses pre-built cache instead of scanning the full audit log per signal
+        cooldown_cache = self._get_cooldown_cache()
+        last_close = cooldown_cache.get(ticker)
+        if last_close is not None:
+            cutoff_date = datetime.now() - timedelta(days=7)
+            if last_close >= cutoff_date:
+                close_date = last_close.strftime('%Y-%m-%d')
+                return False, f"Cooldown: {ticker} closed on {close_date}, 7-day cooldown required"
+
+        # Filters 2-5 and the lookups below are network-bound; they are
+        # resolved once per signal (pre-market when the warm-up ran)
+        prep = self._get_signal_prep(signal)
+        if prep['rejected']:
+            return False, prep['rejected']
+
+        # Filter 3: Downtrend Detection (off unless ENABLE_DOWNTREND_FILTER)
+        sma_5 = prep.get('sma_5')
+        if config.ENABLE_DOWNTREND_FILTER and sma_5 and entry_price < sma_5 * 0.97:
+            # Price is >3% below 5-day SMA - downtrend
+            pct_below = ((entry_price - sma_5) / sma_5) * 100
+            return False, f"Downtrend: {ticker} price ${entry_price:.2f} is {abs(pct_below):.1f}% below 5-day SMA ${sma_5:.2f}"
+
+        # Sector resolved with the other prepared checks (stored on the
+        # signal so the opened position records it too)
+        if prep.get('sector') not in (None, 'Unknown') and (signal.get('sector') or 'Unknown') == 'Unknown':
+            signal['sector'] = prep['sector']
 
         # Check if already have position
         if ticker in self.position_monitor.positions:
             return False, "Already have position"
 
         # Check if tradeable at Alpaca
-        is_tradeable, message = self.alpaca_client.is_asset_tradeable(ticker)
-        if not is_tradeable:
-            return False, f"Not tradeable: {message}"
+        if not prep['tradeable']:
+            return False, f"Not tradeable: {prep['tradeable_message']}"
         # Log warning if tradeable but with restrictions
-        if message:
-            logger.warning(f"{ticker}: {message}")
+        if prep['tradeable_message']:
+            logger.warning(f"{ticker}: {prep['tradeable_message']}")
 
         # Check portfolio constraints
         portfolio_value = self.alpaca_client.get_portfolio_value()
@@ -499,55 +595,40 @@ class TradingEngine:
         """
         Build a {ticker: last_close_datetime} map from the audit log.
 
-        Reads the file once, extracts the most recent POSITION_CLOSED timestamp
-        per ticker, and stores it for O(1) lookups during signal validation.
-        Only retains entries within the cooldown window (7 days) to keep the
-        map small.
+        Reads only the POSITION_CLOSED events of the cooldown window (7 days)
+        through the audit log index, extracts the most recent close per
+        ticker, and stores it for O(1) lookups during signal validation.
         """
         cache: Dict[str, datetime] = {}
-        audit_log_path = os.path.join(os.path.dirname(__file__), 'data', 'audit_log.jsonl')
-
-        if not os.path.exists(audit_log_path):
-            return cache
-
         cutoff = datetime.now() - timedelta(days=7)
 
         try:
-            with open(audit_log_path, 'r') as f:
-                for line in f:
-                    try:
-                        event = json.loads(line.strip())
-                        if event.get('event_type') != 'POSITION_CLOSED':
-                            continue
-
-                        event_data = event.get('data', {})
-                        ticker = event_data.get('ticker') or event_data.get('symbol', '')
-                        if not ticker:
-                            continue
-
-                        timestamp_str = event.get('timestamp', '')
-                        try:
-                            event_date = datetime.fromisoformat(
-                                timestamp_str.replace('Z', '+00:00')
-                            )
-                            # Normalize to naive-local: the rest of the system
-                            # (datetime.now(), _record_cooldown, validate_signal)
-                            # uses naive datetimes.  Mixing tz-aware and naive
-                            # raises TypeError on comparison.
-                            if event_date.tzinfo is not None:
-                                event_date = event_date.replace(tzinfo=None)
-                        except (ValueError, TypeError):
-                            continue
-
-                        if event_date < cutoff:
-                            continue
-
-                        # Keep the most recent close per ticker
-                        if ticker not in cache or event_date > cache[ticker]:
-                            cache[ticker] = event_date
-
-                    except json.JSONDecodeError:
-                        continue
+            for event in read_audit_events_since(cutoff.date(), event_type='POSITION_CLOSED'):
+                event_data = event.get('data', {})
+                ticker = event_data.get('ticker') or event_data.get('symbol', '')
+                if not ticker:
+                    continue
+
+                timestamp_str = event.get('timestamp', '')
+                try:
+                    event_date = datetime.fromisoformat(
+                        timestamp_str.replace('Z', '+00:00')
+                    )
+                    # Normalize to naive-local: the rest of the system
+                    # (datetime.now(), _record_cooldown, validate_signal)
+                    # uses naive datetimes.  Mixing tz-aware and naive
+                    # raises TypeError on comparison.
+                    if event_date.tzinfo is not None:
+                        event_date = event_date.replace(tzinfo=None)
+                except (ValueError, TypeError):
+                    continue
+
+                if event_date < cutoff:
+                    continue
+
+                # Keep the most recent close per ticker
+                if ticker not in cache or event_date > cache[ticker]:
+                    cache[ticker] = event_date
         except Exception as e:
             logger.debug(f"Cooldown cache build failed: {e}")
 
@@ -580,11 +661,32 @@ class TradingEngine:
         for t in stale:
             del cache[t]
 
+    def _prefetch_atr(self, tickers: List[str]) -> None:
+        """
+        Load ATR% for all candidate tickers in one batched call.
+
+        Values come from the shared volatility service (persisted per day),
+        so sizing each order afterwards is a dictionary lookup.
+        """
+        if not config.ENABLE_VOLATILITY_ADJUSTED_SIZING:
+            return
+        pending = [t for t in dict.fromkeys(tickers) if t and t not in self._atr_cache]
+        if not pending:
+            return
+        try:
+            values = get_atr_pcts(pending, config.VOLATILITY_ATR_LOOKBACK_DAYS)
+        except Exception as e:
+            logger.warning(f"ATR prefetch failed for {len(pending)} tickers: {e}")
+            return
+        for t in pending:
+            self._atr_cache[t] = values.get(t.upper().strip())
+
     def _calculate_atr_pct(self, ticker: str) -> Optional[float]:
         """
         Calculate the 20-day Average True Range as a percentage of price.
 
-        Results are cached per session to avoid redundant yfinance downloads.
+        Results are cached per session; execute_morning_trades prefetches
+        all signals' values up front (see _prefetch_atr).
 
         Returns:
             ATR as % of closing price, or None if data is unavailable.
@@ -592,40 +694,13 @@ class TradingEngine:
         if ticker in self._atr_cache:
             return self._atr_cache[ticker]
         try:
-            lookback = config.VOLATILITY_ATR_LOOKBACK_DAYS + 5  # extra days for weekends
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=int(lookback * 1.8))
-            hist = yf.download(ticker, start=start_date, end=end_date, progress=False)
-
-            if hist.empty or len(hist) < config.VOLATILITY_ATR_LOOKBACK_DAYS:
-                return None
-
-            # True Range = max(high-low, |high-prev_close|, |low-prev_close|)
-            high = hist['High']
-            low = hist['Low']
-            close = hist['Close']
-            prev_close = close.shift(1)
-
-            tr = high - low
-            tr = tr.combine(abs(high - prev_close), max)
-            tr = tr.combine(abs(low - prev_close), max)
-
-            atr = tr.tail(config.VOLATILITY_ATR_LOOKBACK_DAYS).mean()
-            last_close = close.iloc[-1]
-
-            if last_close > 0:
-                # Handle pandas Series by extracting scalar
-                atr_val = float(atr.iloc[0]) if hasattr(atr, 'iloc') else float(atr)
-                close_val = float(last_close.iloc[0]) if hasattr(last_close, 'iloc') else float(last_close)
-                result = (atr_val / close_val) * 100
-                self._atr_cache[ticker] = result
-                return result
-            self._atr_cache[ticker] = None
-            return None
+            values = get_atr_pcts([ticker], config.VOLATILITY_ATR_LOOKBACK_DAYS)
+            result = values.get(ticker.upper().strip())
         except Exception as e:
             logger.debug(f"ATR calculation failed for {ticker}: {e}")
-            self._atr_cache[ticker] = None
-            return None
+            result = None
+        self._atr_cache[ticker] = result
+        return result
 
     def _calculate_position_value(
         self,
@@ -1146,11 +1221,178 @@ class TradingEngine:
     # Main Execution Functions
     # =========================================================================
 
+    def _sorted_signals(self) -> List[Dict[str, Any]]:
+        """Approved signals, highest score first."""
+        signals = self.load_approved_signals()
+        signals.sort(
+            key=lambda x: x.get('signal_score') or x.get('rank_score', 0),
+            reverse=True
+        )
+        return signals
+
+    def prepare_morning_trades(self) -> Dict[str, Any]:
+        """
+        Pre-market warm-up for execute_morning_trades.
+
+        This should be called once per day before the open (around 9:20 AM ET).
+        Resolves everything validate_signal needs that does not depend on the
+        live price or portfolio state (signal filters, sector, tradeability and
+        the 5-day SMA when the downtrend filter is enabled), plus ATR for
+        sizing and the cooldown cache, for every approved signal, and saves it
+        to MORNING_PREP_FILE. The morning run then only checks portfolio
+        constraints and submits orders.
+
+        Returns:
+            Preparation summary dictionary
+        """
+        logger.info(f"\n{'='*60}")
+        logger.info("PRE-MARKET WARM-UP")
+        logger.info(f"Time: {datetime.now()}")
+        logger.info(f"{'='*60}")
+
+        started = time.monotonic()
+        today = get_eastern_now().date()
+        results = {
+            'timestamp': datetime.now().isoformat(),
+            'signals_loaded': 0,
+            'prepared': 0,
+            'rejected': 0,
+            'errors': []
+        }
+
+        if not config.TRADING_ENABLED:
+            results['errors'].append("Trading is disabled")
+            logger.warning("Trading is disabled - skipping warm-up")
+            return results
+
+        if not is_trading_day(today):
+            results['errors'].append("Not a trading day")
+            logger.info("Not a trading day - skipping warm-up")
+            return results
+
+        signals = self._sorted_signals()
+        results['signals_loaded'] = len(signals)
+        if not signals:
+            logger.info("No signals to prepare")
+            return results
+
+        tickers = [s.get('ticker') for s in signals if s.get('ticker')]
+        self._prefetch_atr(tickers)
+        cooldown_cache = self._get_cooldown_cache()
+        if config.ENABLE_DOWNTREND_FILTER:
+            # Download the SMA bars for every ticker in one batch; the
+            # per-signal reads below then come from the price store
+            end_date = datetime.now().date() - timedelta(days=1)
+            try:
+                get_histories(tickers, start=period_start('5d', end=end_date), end=end_date)
+            except Exception as e:
+                logger.warning(f"Batched SMA download failed: {e}")
+
+        # Sequential: off the critical path, and each lookup is cached
+        for signal in signals:
+            ticker = signal.get('ticker')
+            if not ticker:
+                continue
+            try:
+                prep = self._get_signal_prep(signal)
+            except Exception as e:
+                logger.warning(f"Warm-up failed for {ticker}: {e}")
+                results['errors'].append(f"{ticker}: {e}")
+                continue
+            results['prepared'] += 1
+            if prep['rejected']:
+                results['rejected'] += 1
+                logger.info(f"  {ticker}: {prep['rejected']}")
+
+        save_json_file(config.MORNING_PREP_FILE, {
+            'date': today.isoformat(),
+            'created_at': datetime.now().isoformat(),
+            'signals': self._signal_prep,
+            'atr_pct': {t: self._atr_cache.get(t) for t in tickers if t in self._atr_cache},
+            'cooldown': {t: closed.isoformat() for t, closed in cooldown_cache.items()},
+        })
+        results['elapsed_seconds'] = round(time.monotonic() - started, 2)
+
+        log_audit_event('MORNING_PREP_COMPLETE', {
+            'signals_loaded': results['signals_loaded'],
+            'prepared': results['prepared'],
+            'rejected': results['rejected'],
+            'elapsed_seconds': results['elapsed_seconds'],
+        })
+        logger.info(
+            f"Warm-up complete: {results['prepared']} prepared "
+            f"({results['rejected']} rejected) in {results['elapsed_seconds']:.1f}s"
+        )
+        return results
+
+    def _load_morning_prep(self) -> int:
+        """
+        Seed the per-signal checks, ATR and cooldown caches from today's warm-up file.
+
+        ATR values the warm-up could not compute (None) are left out so the
+        morning run retries them.
+
+        Returns:
+            Number of prepared signals loaded (0 if the warm-up did not run today)
+        """
+        data = load_json_file(config.MORNING_PREP_FILE, default={})
+        if not isinstance(data, dict) or data.get('date') != get_eastern_now().date().isoformat():
+            logger.info("No pre-market warm-up for today - validating signals inline")
+            return 0
+
+        prepared = data.get('signals') or {}
+        for ticker, prep in prepared.items():
+            self._signal_prep.setdefault(ticker, prep)
+        for ticker, atr_pct in (data.get('atr_pct') or {}).items():
+            if atr_pct is not None:
+                self._atr_cache.setdefault(ticker, atr_pct)
+        if self._cooldown_cache is None and isinstance(data.get('cooldown'), dict):
+            self._cooldown_cache = {
+                ticker: datetime.fromisoformat(closed) for ticker, closed in data['cooldown'].items()
+            }
+        logger.info(f"Loaded pre-market warm-up for {len(prepared)} signals ({data.get('created_at')})")
+        return len(prepared)
+
+    def _morning_timing(self, run_started: datetime, order_times: List[datetime],
+                        prepared: int) -> Dict[str, Any]:
+        """Latency from the market open (and from the run start) to the first and last order."""
+        market_open = run_started.replace(
+            hour=config.MARKET_OPEN_TIME.hour, minute=config.MARKET_OPEN_TIME.minute,
+            second=0, microsecond=0
+        )
+
+        def seconds(since: datetime, at: Optional[datetime]) -> Optional[float]:
+            return round((at - since).total_seconds(), 2) if at is not None else None
+
+        first = order_times[0] if order_times else None
+        last = order_times[-1] if order_times else None
+        timing = {
+            'prepared_signals': prepared,
+            'run_started_after_open_seconds': seconds(market_open, run_started),
+            'open_to_first_order_seconds': seconds(market_open, first),
+            'open_to_last_order_seconds': seconds(market_open, last),
+            'run_to_first_order_seconds': seconds(run_started, first),
+            'run_to_last_order_seconds': seconds(run_started, last),
+        }
+
+        log_audit_event('MORNING_EXECUTION_TIMING', timing)
+        if first is not None:
+            logger.info(
+                f"⏱️  Open → first order {timing['open_to_first_order_seconds']:.1f}s, "
+                f"→ last order {timing['open_to_last_order_seconds']:.1f}s "
+                f"(run start → first order {timing['run_to_first_order_seconds']:.1f}s, "
+                f"{prepared} signals pre-warmed)"
+            )
+        return timing
+
     def execute_morning_trades(self) -> Dict[str, Any]:
         """
         Execute morning trades at market open.
 
-        This should be called once per day around 9:35 AM ET.
+        This should be called once per day around 9:35 AM ET. Checks resolved
+        by prepare_morning_trades earlier in the day are reused, so only
+        portfolio constraints are evaluated here. Latency from the open to
+        the first and last order is reported in results['timing'].
 
         Returns:
             Execution summary dictionary
@@ -1160,6 +1402,7 @@ class TradingEngine:
         logger.info(f"Time: {datetime.now()}")
         logger.info(f"{'='*60}")
 
+        run_started = get_eastern_now()
         results = {
             'timestamp': datetime.now().isoformat(),
             'signals_loaded': 0,
@@ -1297,22 +1540,23 @@ class TradingEngine:
                 [d.to_dict() for d in discrepancies]
             )
 
-        # Load signals
-        signals = self.load_approved_signals()
+        # Load signals (sorted by score, highest first)
+        signals = self._sorted_signals()
         results['signals_loaded'] = len(signals)
 
         if not signals:
             logger.info("No signals to execute")
             return results
 
-        # Sort by score (highest first)
-        signals.sort(
-            key=lambda x: x.get('signal_score') or x.get('rank_score', 0),
-            reverse=True
-        )
+        # Checks resolved pre-market; only portfolio constraints remain on the critical path
+        prepared = self._load_morning_prep()
+
+        # Volatility for every candidate in one batch, before the first order
+        self._prefetch_atr([s.get('ticker') for s in signals])
 
         # Execute signals (collect trades for batch email)
         executed_trades = []
+        order_times: List[datetime] = []
 
         for signal in signals:
             ticker = signal.get('ticker')
@@ -1332,6 +1576,7 @@ class TradingEngine:
 
                 if success:
                     results['orders_submitted'] += 1
+                    order_times.append(get_eastern_now())
 
                     # Track trade for batch email (match execute_buy_signal calculation)
                     entry_price = signal.get('entry_price') or signal.get('currentPrice')
@@ -1374,6 +1619,8 @@ class TradingEngine:
                     results['queued_for_later'] += 1
                     logger.info(f"  Queued {ticker} for intraday redeployment")
 
+        results['timing'] = self._morning_timing(run_started, order_times, prepared)
+
         # Send ONE consolidated batch email for all morning trades
         if executed_trades:
             logger.info(f"Sending batch email for {len(executed_trades)} morning trades")
@@ -1420,7 +1667,8 @@ class TradingEngine:
             order_results = self.order_manager.update_orders_from_broker(
                 self.alpaca_client,
                 on_fill_callback=self._on_order_filled,
-                execution_metrics=self.execution_metrics
+                execution_metrics=self.execution_metrics,
+                trade_stream=self.trade_stream
             )
             results['orders_filled'] = [o['ticker'] for o in order_results['filled']]
 
@@ -1935,6 +2183,10 @@ class TradingEngine:
         # Generate AI insights (graceful failure - never blocks EOD email)
         ai_insights = None
         try:
+            # The analyzers read execution_metrics.json and live_positions.json
+            # directly; export this run's state first so they see it
+            export_state_snapshots()
+
             logger.info("Generating AI insights...")
             from scripts.ai_orchestrator import generate_ai_insights
 
@@ -2006,17 +2258,22 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description='Alpaca Automated Trading Engine')
-    parser.add_argument('command', choices=['morning', 'monitor', 'eod', 'status'],
+    parser.add_argument('command', choices=['premarket', 'morning', 'monitor', 'eod', 'status'],
                        help='Command to run')
     parser.add_argument('--dry-run', action='store_true',
                        help='Run without executing trades')
 
     args = parser.parse_args()
+    engine = None
 
     try:
         engine = TradingEngine(command=args.command)
 
-        if args.command == 'morning':
+        if args.command == 'premarket':
+            results = engine.prepare_morning_trades()
+            print(json.dumps(results, indent=2, default=str))
+
+        elif args.command == 'morning':
             results = engine.execute_morning_trades()
             print(json.dumps(results, indent=2, default=str))
 
@@ -2038,6 +2295,11 @@ def main():
         logger.error(f"Engine error: {e}")
         logger.error(traceback.format_exc())
         sys.exit(1)
+    finally:
+        if engine is not None and engine.trade_stream is not None:
+            engine.trade_stream.stop()
+        # Write the run's state changes back to the JSON files the workflows commit
+        export_state_snapshots()
 
 
 if __name__ == '__main__':
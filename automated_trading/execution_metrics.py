@@ -12,7 +12,6 @@ This data helps optimize limit order cushion settings and EXECUTION_START_TIME.
 """
 
 import os
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
@@ -20,10 +19,9 @@ from statistics import mean, median, stdev
 
 from . import config
 from .utils import (
-    load_json_file,
-    save_json_file,
     log_audit_event
 )
+from .state_store import load_state, save_state
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +46,7 @@ class ExecutionMetrics:
     def _load_state(self):
         """Load execution history from disk."""
         file_exists = os.path.exists(config.EXECUTION_METRICS_FILE)
-        data = load_json_file(config.EXECUTION_METRICS_FILE, default={})
+        data = load_state(config.EXECUTION_METRICS_FILE, records_key='executions', default={})
         if not isinstance(data, dict):
             data = {}
         self.executions = data.get('executions', [])
@@ -74,7 +72,7 @@ class ExecutionMetrics:
             'daily_stats': self.daily_stats,
             'last_updated': datetime.now().isoformat()
         }
-        save_json_file(config.EXECUTION_METRICS_FILE, data)
+        save_state(config.EXECUTION_METRICS_FILE, data, records_key='executions')
 
     # =========================================================================
     # Recording Executions
@@ -10,19 +10,19 @@ Handles order lifecycle management with:
 """
 
 import os
-import json
+import time
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
+from contextlib import contextmanager
 
 from . import config
 from .utils import (
-    load_json_file,
-    save_json_file,
     generate_client_order_id,
     log_audit_event
 )
+from .state_store import load_state, save_state
 
 logger = logging.getLogger(__name__)
 
@@ -100,11 +100,14 @@ class OrderManager:
     def __init__(self):
         """Initialize order manager."""
         self.pending_orders: Dict[str, Dict] = {}  # client_order_id -> order_info
+        self.last_reconcile_stats: Dict[str, Any] = {}
+        self._save_depth = 0        # >0 while saves are batched
+        self._save_pending = False  # A save was requested inside the batch
         self._load_state()
 
     def _load_state(self):
         """Load pending orders from disk."""
-        data = load_json_file(config.PENDING_ORDERS_FILE, default={})
+        data = load_state(config.PENDING_ORDERS_FILE, records_key='orders', default={})
         if not isinstance(data, dict):
             data = {}
         self.pending_orders = data.get('orders', {})
@@ -113,12 +116,27 @@ class OrderManager:
         logger.info(f"Loaded {len(self.pending_orders)} pending orders")
 
     def _save_state(self):
-        """Save pending orders to disk."""
+        """Save pending orders to disk (deferred while inside _batched_saves)."""
+        if self._save_depth:
+            self._save_pending = True
+            return
         data = {
             'orders': self.pending_orders,
             'last_updated': datetime.now().isoformat()
         }
-        save_json_file(config.PENDING_ORDERS_FILE, data)
+        save_state(config.PENDING_ORDERS_FILE, data, records_key='orders')
+
+    @contextmanager
+    def _batched_saves(self):
+        """Collapse every _save_state call in the block into one save at the end."""
+        self._save_depth += 1
+        try:
+            yield
+        finally:
+            self._save_depth -= 1
+            if self._save_depth == 0 and self._save_pending:
+                self._save_pending = False
+                self._save_state()
 
     # =========================================================================
     # Order Creation and Submission
@@ -565,19 +583,131 @@ class OrderManager:
 
         return removed
 
+    def apply_trade_updates(
+        self,
+        updates: List[Tuple[str, Dict[str, Any]]],
+        on_fill_callback=None,
+        execution_metrics=None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Apply streamed trade updates (see trade_stream.py) to pending orders.
+
+        Uses the same transitions as broker polling: fills go through
+        mark_order_filled (and the fill callback), cancels/expiries/rejects
+        through mark_order_rejected, partial fills update filled_shares.
+
+        Args:
+            updates: (event, order) pairs from TradeUpdateStream.drain()
+            on_fill_callback: Callback function(order) when order fills
+            execution_metrics: Optional ExecutionMetrics instance for tracking
+
+        Returns:
+            Dictionary with 'filled' and 'rejected' lists
+        """
+        results = {'filled': [], 'rejected': []}
+        partial_updated = False
+
+        for event, broker_order in updates:
+            client_order_id = broker_order.get('client_order_id')
+            order = self.pending_orders.get(client_order_id)
+            if order is None:
+                continue  # Not tracked (or already resolved)
+
+            # The order payload carries the resulting status ('fill' -> 'filled')
+            status = normalize_order_status(broker_order.get('status') or event)
+
+            if status == 'filled':
+                filled_order = self.mark_order_filled(
+                    client_order_id,
+                    broker_order['filled_qty'],
+                    broker_order['filled_avg_price'],
+                    execution_metrics=execution_metrics
+                )
+                if filled_order:
+                    results['filled'].append(filled_order)
+                    if on_fill_callback:
+                        on_fill_callback(filled_order)
+
+            elif status in ['rejected', 'cancelled', 'expired']:
+                rejected_order = self.mark_order_rejected(
+                    client_order_id,
+                    f"Broker status: {status}"
+                )
+                if rejected_order:
+                    results['rejected'].append(rejected_order)
+
+            elif status == 'partially_filled':
+                order['filled_shares'] = broker_order['filled_qty']
+                order['state'] = OrderState.PARTIALLY_FILLED.value
+                partial_updated = True
+
+        if partial_updated:
+            self._save_state()
+
+        return results
+
+    def _list_broker_orders(
+        self,
+        alpaca_client,
+        orders: List[Dict[str, Any]]
+    ) -> Optional[Tuple[Dict[str, Dict], Dict[str, Dict]]]:
+        """
+        Fetch every broker order submitted since the oldest of orders in one call.
+
+        Args:
+            alpaca_client: AlpacaTradingClient instance
+            orders: Pending orders to reconcile
+
+        Returns:
+            (by order_id, by client_order_id) maps, or None if the bulk
+            listing is unavailable and orders must be fetched one by one
+        """
+        if not orders or not hasattr(alpaca_client, 'get_orders_since'):
+            return None
+
+        submitted = []
+        for order in orders:
+            try:
+                submitted.append(datetime.fromisoformat(order.get('submitted_at') or order['created_at']))
+            except (KeyError, TypeError, ValueError):
+                return None
+        after = min(submitted) - timedelta(minutes=config.ORDER_RECONCILE_LOOKBACK_MARGIN_MINUTES)
+
+        try:
+            broker_orders = alpaca_client.get_orders_since(after)
+        except Exception as e:
+            logger.warning(f"Bulk order listing failed, fetching orders individually: {e}")
+            return None
+
+        by_id = {o['order_id']: o for o in broker_orders if o.get('order_id')}
+        by_client_id = {o['client_order_id']: o for o in broker_orders if o.get('client_order_id')}
+        return by_id, by_client_id
+
     def update_orders_from_broker(
         self,
         alpaca_client,
         on_fill_callback=None,
-        execution_metrics=None
+        execution_metrics=None,
+        trade_stream=None
     ) -> Dict[str, List[Dict]]:
         """
         Update pending orders from broker status.
 
+        Reconciles all pending orders against a single list-orders call
+        (joined on order_id, then client_order_id). Orders missing from the
+        listing fall back to get_order. State is saved once, after all
+        transitions; timing and REST call counts are logged and kept in
+        last_reconcile_stats.
+
+        With a connected trade_stream, queued trade updates are applied first
+        and orders the stream has covered since submission are not polled
+        (partially filled orders still are, for the partial-fill timeout).
+
         Args:
             alpaca_client: AlpacaTradingClient instance
             on_fill_callback: Callback function(order) when order fills
             execution_metrics: Optional ExecutionMetrics instance for tracking
+            trade_stream: Optional TradeUpdateStream
 
         Returns:
             Dictionary with 'filled', 'rejected', 'unchanged' lists
@@ -587,107 +717,157 @@ class OrderManager:
             'rejected': [],
             'unchanged': []
         }
-
-        for client_order_id in list(self.pending_orders.keys()):
-            order = self.pending_orders[client_order_id]
-
-            # Skip if no Alpaca order ID yet
-            if not order.get('order_id'):
-                results['unchanged'].append(order)
-                continue
-
-            try:
-                # Get current status from Alpaca
-                broker_order = alpaca_client.get_order(order['order_id'])
-
-                if not broker_order:
-                    logger.warning(f"Order {order['order_id']} not found at broker")
+        started = time.monotonic()
+        rest_calls = 0
+
+        with self._batched_saves():
+            if trade_stream is not None:
+                streamed = self.apply_trade_updates(
+                    trade_stream.drain(),
+                    on_fill_callback=on_fill_callback,
+                    execution_metrics=execution_metrics
+                )
+                results['filled'].extend(streamed['filled'])
+                results['rejected'].extend(streamed['rejected'])
+
+            to_reconcile = []
+            for order in list(self.pending_orders.values()):
+                # Skip if no Alpaca order ID yet
+                if not order.get('order_id'):
                     results['unchanged'].append(order)
                     continue
 
-                status = normalize_order_status(broker_order['status'])
-
-                # Handle fill
-                if status == 'filled':
-                    filled_order = self.mark_order_filled(
-                        client_order_id,
-                        broker_order['filled_qty'],
-                        broker_order['filled_avg_price'],
-                        execution_metrics=execution_metrics
-                    )
-                    results['filled'].append(filled_order)
-
-                    if on_fill_callback:
-                        on_fill_callback(filled_order)
+                # The stream already delivered every update for this order
+                if (trade_stream is not None
+                        and order.get('state') != OrderState.PARTIALLY_FILLED.value
+                        and trade_stream.covers(order)):
+                    results['unchanged'].append(order)
+                    continue
 
-                # Handle terminal broker states that should stop local tracking.
-                # NOTE: `done_for_day` and `suspended` are intentionally excluded
-                # because brokers can later transition those orders back to active
-                # or filled states.
-                elif status in ['rejected', 'cancelled', 'expired']:
-                    rejected_order = self.mark_order_rejected(
-                        client_order_id,
-                        f"Broker status: {status}"
-                    )
-                    results['rejected'].append(rejected_order)
+                to_reconcile.append(order)
+
+            listing = self._list_broker_orders(alpaca_client, to_reconcile)
+            if listing is not None:
+                rest_calls += 1
+                by_id, by_client_id = listing
+
+            for order in to_reconcile:
+                client_order_id = order['client_order_id']
+                try:
+                    # Join against the bulk listing; fetch individually if absent
+                    broker_order = None
+                    if listing is not None:
+                        broker_order = by_id.get(order['order_id']) or by_client_id.get(client_order_id)
+                    if broker_order is None:
+                        broker_order = alpaca_client.get_order(order['order_id'])
+                        rest_calls += 1
+
+                    if not broker_order:
+                        logger.warning(f"Order {order['order_id']} not found at broker")
+                        results['unchanged'].append(order)
+                        continue
 
-                # Handle partial fill
-                elif status == 'partially_filled':
-                    order['filled_shares'] = broker_order['filled_qty']
-                    order['state'] = OrderState.PARTIALLY_FILLED.value
-
-                    # Check if partial fill has exceeded timeout
-                    submitted_at_str = order.get('submitted_at') or order['created_at']
-                    submitted_at = datetime.fromisoformat(submitted_at_str)
-                    age_minutes = (datetime.now() - submitted_at).total_seconds() / 60
-
-                    if age_minutes > config.PARTIAL_FILL_TIMEOUT_MINUTES:
-                        # Cancel unfilled remainder at broker
-                        cancelled = alpaca_client.cancel_order(order['order_id'])
-
-                        if not cancelled:
-                            # Cancel failed — order may have fully filled in the
-                            # meantime. Re-fetch to get the true final state so we
-                            # don't record a stale partial qty as the fill.
-                            logger.warning(
-                                f"Failed to cancel partial fill remainder for "
-                                f"{order['ticker']} (order {order['order_id']}), "
-                                f"re-fetching order status"
-                            )
-                            refreshed = alpaca_client.get_order(order['order_id'])
-                            if refreshed:
-                                refreshed_status = normalize_order_status(refreshed['status'])
-                                if refreshed_status == 'filled':
-                                    broker_order = refreshed
-                                elif refreshed_status == 'partially_filled':
-                                    broker_order = refreshed
-                        else:
-                            logger.info(
-                                f"Cancelled partial fill remainder for {order['ticker']} "
-                                f"after {age_minutes:.0f}min "
-                                f"({broker_order['filled_qty']}/{order['shares']} shares filled)"
-                            )
+                    status = normalize_order_status(broker_order['status'])
 
-                        # Accept the filled portion as a completed order
+                    # Handle fill
+                    if status == 'filled':
                         filled_order = self.mark_order_filled(
                             client_order_id,
                             broker_order['filled_qty'],
                             broker_order['filled_avg_price'],
                             execution_metrics=execution_metrics
                         )
-                        if filled_order:
-                            results['filled'].append(filled_order)
-                            if on_fill_callback:
-                                on_fill_callback(filled_order)
+                        results['filled'].append(filled_order)
+
+                        if on_fill_callback:
+                            on_fill_callback(filled_order)
+
+                    # Handle terminal broker states that should stop local tracking.
+                    # NOTE: `done_for_day` and `suspended` are intentionally excluded
+                    # because brokers can later transition those orders back to active
+                    # or filled states.
+                    elif status in ['rejected', 'cancelled', 'expired']:
+                        rejected_order = self.mark_order_rejected(
+                            client_order_id,
+                            f"Broker status: {status}"
+                        )
+                        results['rejected'].append(rejected_order)
+
+                    # Handle partial fill
+                    elif status == 'partially_filled':
+                        order['filled_shares'] = broker_order['filled_qty']
+                        order['state'] = OrderState.PARTIALLY_FILLED.value
+                        self._save_state()
+
+                        # Check if partial fill has exceeded timeout
+                        submitted_at_str = order.get('submitted_at') or order['created_at']
+                        submitted_at = datetime.fromisoformat(submitted_at_str)
+                        age_minutes = (datetime.now() - submitted_at).total_seconds() / 60
+
+                        if age_minutes > config.PARTIAL_FILL_TIMEOUT_MINUTES:
+                            # Cancel unfilled remainder at broker
+                            cancelled = alpaca_client.cancel_order(order['order_id'])
+                            rest_calls += 1
+
+                            if not cancelled:
+                                # Cancel failed — order may have fully filled in the
+                                # meantime. Re-fetch to get the true final state so we
+                                # don't record a stale partial qty as the fill.
+                                logger.warning(
+                                    f"Failed to cancel partial fill remainder for "
+                                    f"{order['ticker']} (order {order['order_id']}), "
+                                    f"re-fetching order status"
+                                )
+                                refreshed = alpaca_client.get_order(order['order_id'])
+                                rest_calls += 1
+                                if refreshed:
+                                    refreshed_status = normalize_order_status(refreshed['status'])
+                                    if refreshed_status == 'filled':
+                                        broker_order = refreshed
+                                    elif refreshed_status == 'partially_filled':
+                                        broker_order = refreshed
+                            else:
+                                logger.info(
+                                    f"Cancelled partial fill remainder for {order['ticker']} "
+                                    f"after {age_minutes:.0f}min "
+                                    f"({broker_order['filled_qty']}/{order['shares']} shares filled)"
+                                )
+
+                            # Accept the filled portion as a completed order
+                            filled_order = self.mark_order_filled(
+                                client_order_id,
+                                broker_order['filled_qty'],
+                                broker_order['filled_avg_price'],
+                                execution_metrics=execution_metrics
+                            )
+                            if filled_order:
+                                results['filled'].append(filled_order)
+                                if on_fill_callback:
+                                    on_fill_callback(filled_order)
+                        else:
+                            results['unchanged'].append(order)
+
                     else:
                         results['unchanged'].append(order)
 
-                else:
+                except Exception as e:
+                    logger.error(f"Error updating order {client_order_id}: {e}")
                     results['unchanged'].append(order)
 
-            except Exception as e:
-                logger.error(f"Error updating order {client_order_id}: {e}")
-                results['unchanged'].append(order)
+        elapsed = time.monotonic() - started
+        reconciled = len(to_reconcile)
+        self.last_reconcile_stats = {
+            'orders_reconciled': reconciled,
+            'rest_calls': rest_calls,
+            'elapsed_seconds': round(elapsed, 4),
+            'orders_per_second': round(reconciled / elapsed, 1) if elapsed > 0 else None,
+            'bulk_listing': listing is not None
+        }
+        if reconciled:
+            logger.info(
+                f"⏱️ Reconciled {reconciled} orders in {elapsed:.2f}s "
+                f"({reconciled / max(elapsed, 1e-6):.1f} orders/s, {rest_calls} REST calls)"
+            )
 
         return results
 
@@ -27,7 +27,6 @@ import yfinance as yf
 from . import config
 from .utils import (
     load_json_file,
-    save_json_file,
     log_audit_event,
     is_market_hours,
     is_trading_window,
@@ -35,6 +34,8 @@ from .utils import (
     format_percentage,
     calculate_pnl_pct
 )
+from .state_store import load_state, save_state
+from .price_snapshot import PriceSnapshot
 from .reconciliation import Reconciler, CashReconciler
 
 logger = logging.getLogger(__name__)
@@ -78,7 +79,7 @@ class CircuitBreakerState:
 
     def _load_state(self):
         """Load daily state from disk."""
-        data = load_json_file(config.DAILY_STATE_FILE, default={})
+        data = load_state(config.DAILY_STATE_FILE, records_key='trades_today', default={})
         if not isinstance(data, dict):
             data = {}
 
@@ -121,11 +122,11 @@ class CircuitBreakerState:
             'total_trades_today': self.total_trades_today,
             'last_updated': datetime.now().isoformat()
         }
-        save_json_file(config.DAILY_STATE_FILE, data)
+        save_state(config.DAILY_STATE_FILE, data, records_key='trades_today')
 
     def _load_high_water_mark(self):
         """Load peak portfolio value (high-water mark) from disk."""
-        data = load_json_file(config.HIGH_WATER_MARK_FILE, default={})
+        data = load_state(config.HIGH_WATER_MARK_FILE, default={})
         if not isinstance(data, dict):
             data = {}
         self.peak_portfolio_value = data.get('peak_portfolio_value', 0.0)
@@ -136,7 +137,7 @@ class CircuitBreakerState:
             'peak_portfolio_value': self.peak_portfolio_value,
             'last_updated': datetime.now().isoformat()
         }
-        save_json_file(config.HIGH_WATER_MARK_FILE, data)
+        save_state(config.HIGH_WATER_MARK_FILE, data)
 
     def _clear_high_water_mark(self, context: str) -> None:
         """Clear persisted high-water mark so drawdown checks can re-baseline."""
@@ -403,6 +404,7 @@ class PositionMonitor:
         self.signal_history: Dict[str, Dict] = {}
         self.circuit_breaker = CircuitBreakerState()
         self.reconciler = Reconciler()
+        self.price_snapshot = PriceSnapshot(alpaca_client)
         self._load_positions()
         self._load_signal_history()
 
@@ -416,7 +418,7 @@ class PositionMonitor:
 
     def _load_positions(self):
         """Load positions from disk."""
-        data = load_json_file(config.LIVE_POSITIONS_FILE, default={})
+        data = load_state(config.LIVE_POSITIONS_FILE, records_key='positions', default={})
         if not isinstance(data, dict):
             logger.warning(f"live_positions.json has unexpected type {type(data).__name__}, resetting")
             data = {}
@@ -438,7 +440,7 @@ class PositionMonitor:
 
     def _load_signal_history(self):
         """Load signal history from disk."""
-        data = load_json_file(config.SIGNAL_HISTORY_FILE, default={})
+        data = load_state(config.SIGNAL_HISTORY_FILE, records_key='signals', default={})
         if not isinstance(data, dict):
             logger.warning(f"signal_history.json has unexpected type {type(data).__name__}, resetting")
             data = {}
@@ -454,7 +456,7 @@ class PositionMonitor:
             'signals': self.signal_history,
             'last_updated': datetime.now().isoformat()
         }
-        save_json_file(config.SIGNAL_HISTORY_FILE, data)
+        save_state(config.SIGNAL_HISTORY_FILE, data, records_key='signals')
 
     def _save_to_signal_history(self, ticker: str, signal_data: Dict) -> None:
         """
@@ -623,7 +625,7 @@ class PositionMonitor:
             'positions': save_data,
             'last_updated': datetime.now().isoformat()
         }
-        save_json_file(config.LIVE_POSITIONS_FILE, data)
+        save_state(config.LIVE_POSITIONS_FILE, data, records_key='positions')
 
     # =========================================================================
     # Position Management
@@ -703,12 +705,19 @@ class PositionMonitor:
         """
         Get current price for a ticker.
 
+        Uses the cycle's price snapshot when it has the ticker, otherwise
+        looks the ticker up individually.
+
         Args:
             ticker: Stock ticker
 
         Returns:
             Current price or None
         """
+        price = self.price_snapshot.get(ticker)
+        if price:
+            return price
+
         # Try Alpaca first if we have a position
         if self.alpaca_client:
             broker_pos = self.alpaca_client.get_position(ticker)
@@ -732,6 +741,14 @@ class PositionMonitor:
 
         return None
 
+    def refresh_price_snapshot(self) -> None:
+        """Price all open positions in bulk (reused until the snapshot expires)."""
+        self.price_snapshot.ensure(list(self.positions.keys()))
+
+    def get_price_age(self, ticker: str) -> Optional[float]:
+        """Seconds since the snapshot price for ticker was observed (None if not in snapshot)."""
+        return self.price_snapshot.age_seconds(ticker)
+
     def calculate_position_pnl(self, ticker: str) -> Dict[str, float]:
         """
         Calculate P&L for a position.
@@ -771,6 +788,7 @@ class PositionMonitor:
         total_cost = 0
         total_value = 0
 
+        self.refresh_price_snapshot()
         for ticker in self.positions:
             pnl = self.calculate_position_pnl(ticker)
             total_pnl_dollars += pnl['pnl_dollars']
@@ -800,6 +818,7 @@ class PositionMonitor:
         exits_needed = []
         positions_updated = False
 
+        self.refresh_price_snapshot()
         for ticker, pos in self.positions.items():
             current_price = self.get_current_price(ticker)
             price_is_stale = False
@@ -902,6 +921,7 @@ class PositionMonitor:
                 }
 
             if exit_info:
+                exit_info['price_age_seconds'] = None if price_is_stale else self.get_price_age(ticker)
                 exits_needed.append(exit_info)
                 logger.info(
                     f"Exit triggered for {ticker}: {exit_info['reason']} "
@@ -922,6 +942,7 @@ class PositionMonitor:
         """
         updated = []
 
+        self.refresh_price_snapshot()
         for ticker, pos in self.positions.items():
             current_price = self.get_current_price(ticker)
             if current_price:
@@ -1099,6 +1120,8 @@ class PositionMonitor:
         try:
             broker_positions = self.alpaca_client.get_all_positions()
             broker_tickers = {pos['symbol']: pos for pos in broker_positions}
+            # The same call prices every held ticker for this cycle's snapshot
+            self.price_snapshot.seed_from_positions(broker_positions)
             local_tickers = set(self.positions.keys())
 
             corrections = {
@@ -1370,6 +1393,7 @@ class PositionMonitor:
         total_value = 0.0
         total_pnl = 0.0
 
+        self.refresh_price_snapshot()
         for ticker, pos in self.positions.items():
             current_price = self.get_current_price(ticker)
             if not current_price:
@@ -0,0 +1,188 @@
+# automated_trading/price_snapshot.py
+"""
+Per-Cycle Price Snapshot
+
+PositionMonitor.check_exits and update_trailing_stops used to price every
+position with its own Alpaca get_position call (plus a yfinance .info lookup
+on a miss), so one monitoring cycle priced each ticker two or more times.
+
+A PriceSnapshot prices a whole set of tickers at once:
+1. one get_all_positions call (broker mark for every held ticker)
+2. one multi-symbol latest-trade request for tickers the broker didn't price
+3. one batched yfinance download for anything still missing
+
+and then serves those prices for the rest of the cycle. Every entry records
+its source and when the price was observed, so callers can see how old it is.
+Tickers the snapshot could not price return None and callers keep their
+existing fallbacks (single-ticker lookup, then last known price).
+"""
+
+import time
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import yfinance as yf
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+
+def _epoch(timestamp: Any) -> float:
+    """Epoch seconds for a datetime or pandas Timestamp (now if missing)."""
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    try:
+        return float(timestamp.timestamp())
+    except (AttributeError, TypeError, ValueError):
+        return time.time()
+
+
+class PriceSnapshot:
+    """
+    Bulk-fetched prices shared by everything in one monitoring cycle.
+
+    Entries are {'price', 'source', 'as_of'} where source is 'position',
+    'trade' or 'yfinance' and as_of is the epoch time the price was observed.
+    """
+
+    def __init__(self, alpaca_client=None, max_age_seconds: float = None):
+        self.alpaca_client = alpaca_client
+        self.max_age_seconds = (
+            config.PRICE_SNAPSHOT_MAX_AGE_SECONDS if max_age_seconds is None else max_age_seconds
+        )
+        self.prices: Dict[str, Dict[str, Any]] = {}
+        self._attempted: set = set()  # Tickers already tried this snapshot (priced or not)
+        self._positions_fetched = False
+        self._taken_at: Optional[float] = None
+
+    # =========================================================================
+    # Snapshot lifecycle
+    # =========================================================================
+
+    def is_fresh(self) -> bool:
+        """True while the snapshot is younger than max_age_seconds."""
+        return self._taken_at is not None and (time.time() - self._taken_at) < self.max_age_seconds
+
+    def invalidate(self) -> None:
+        """Drop all prices so the next ensure() fetches a new snapshot."""
+        self.prices = {}
+        self._attempted = set()
+        self._positions_fetched = False
+        self._taken_at = None
+
+    def _start_if_expired(self) -> None:
+        if not self.is_fresh():
+            self.invalidate()
+            self._taken_at = time.time()
+
+    def seed_from_positions(self, broker_positions: List[Dict[str, Any]]) -> None:
+        """
+        Record prices from a get_all_positions result the caller already has.
+
+        Lets the broker sync at the start of a cycle double as the snapshot's
+        position fetch.
+        """
+        self._start_if_expired()
+        self._positions_fetched = True
+        now = time.time()
+        for pos in broker_positions:
+            symbol = pos.get('symbol')
+            price = pos.get('current_price')
+            if symbol and price and price > 0:
+                self.prices[symbol] = {'price': float(price), 'source': 'position', 'as_of': now}
+                self._attempted.add(symbol)
+
+    def ensure(self, tickers: Iterable[str]) -> None:
+        """
+        Make sure every ticker has been priced in the current snapshot.
+
+        Starts a new snapshot if the current one expired; otherwise only
+        tickers not yet attempted are fetched.
+        """
+        self._start_if_expired()
+        missing = [t for t in dict.fromkeys(tickers) if t not in self._attempted]
+        if not missing:
+            return
+
+        if self.alpaca_client:
+            if not self._positions_fetched:
+                self._fetch_positions()
+                missing = [t for t in missing if t not in self.prices]
+            if missing:
+                self._fetch_latest_trades(missing)
+                missing = [t for t in missing if t not in self.prices]
+
+        if missing:
+            self._fetch_yfinance(missing)
+
+        self._attempted.update(t for t in dict.fromkeys(tickers))
+
+    # =========================================================================
+    # Bulk sources
+    # =========================================================================
+
+    def _fetch_positions(self) -> None:
+        try:
+            self.seed_from_positions(self.alpaca_client.get_all_positions())
+        except Exception as e:
+            logger.warning(f"Bulk position price fetch failed: {e}")
+
+    def _fetch_latest_trades(self, tickers: List[str]) -> None:
+        try:
+            trades = self.alpaca_client.get_latest_trade_prices(tickers)
+        except Exception as e:
+            logger.warning(f"Bulk latest-trade fetch failed for {len(tickers)} tickers: {e}")
+            return
+        for symbol, trade in trades.items():
+            self.prices[symbol] = {
+                'price': float(trade['price']),
+                'source': 'trade',
+                'as_of': _epoch(trade.get('timestamp')),
+            }
+
+    def _fetch_yfinance(self, tickers: List[str]) -> None:
+        try:
+            data = yf.download(
+                tickers, period='1d', interval='1m', progress=False,
+                auto_adjust=False, group_by='column', threads=False
+            )
+        except Exception as e:
+            logger.warning(f"Batch yfinance price fetch failed for {len(tickers)} tickers: {e}")
+            return
+        if data is None or data.empty or 'Close' not in data:
+            return
+
+        closes = data['Close']
+        if not hasattr(closes, 'columns'):
+            closes = closes.to_frame(name=tickers[0])
+        for symbol in tickers:
+            if symbol not in closes.columns:
+                continue
+            series = closes[symbol].dropna()
+            if series.empty or not series.iloc[-1] > 0:
+                continue
+            self.prices[symbol] = {
+                'price': float(series.iloc[-1]),
+                'source': 'yfinance',
+                'as_of': _epoch(series.index[-1]),
+            }
+
+    # =========================================================================
+    # Lookups
+    # =========================================================================
+
+    def get(self, ticker: str) -> Optional[float]:
+        """Snapshot price for ticker, or None if expired or not priced."""
+        if not self.is_fresh():
+            return None
+        entry = self.prices.get(ticker)
+        return entry['price'] if entry else None
+
+    def age_seconds(self, ticker: str) -> Optional[float]:
+        """Seconds since the snapshot price for ticker was observed."""
+        entry = self.prices.get(ticker)
+        if not entry:
+            return None
+        return max(0.0, time.time() - entry['as_of'])
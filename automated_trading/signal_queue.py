@@ -13,19 +13,17 @@ Features:
 """
 
 import os
-import json
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 
 from . import config
 from .utils import (
-    load_json_file,
-    save_json_file,
     log_audit_event,
     is_trading_window,
     minutes_until_market_close
 )
+from .state_store import load_state, save_state
 
 logger = logging.getLogger(__name__)
 
@@ -50,7 +48,7 @@ class SignalQueue:
 
     def _load_state(self):
         """Load queued signals from disk with automatic schema migration."""
-        data = load_json_file(config.QUEUED_SIGNALS_FILE, default={})
+        data = load_state(config.QUEUED_SIGNALS_FILE, records_key='signals', default={})
         if not isinstance(data, dict):
             data = {}
         self.queued_signals = data.get('signals', {})
@@ -95,7 +93,7 @@ class SignalQueue:
             'last_reset_date': self.last_reset_date or datetime.now().strftime('%Y-%m-%d'),
             'last_updated': datetime.now().isoformat()
         }
-        save_json_file(config.QUEUED_SIGNALS_FILE, data)
+        save_state(config.QUEUED_SIGNALS_FILE, data, records_key='signals')
 
     # =========================================================================
     # Signal Queue Management
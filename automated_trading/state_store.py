@@ -0,0 +1,394 @@
+# automated_trading/state_store.py
+"""
+State Store for Automated Trading
+
+Record-level persistence for the trading state that used to be rewritten as
+whole JSON files on every change (pending orders, queued signals, positions,
+signal history, circuit breaker state, execution metrics).
+
+Backend (config.STATE_BACKEND):
+- 'sqlite' (default): one SQLite database in WAL mode with one table per
+  store. Each row holds one record (or one top-level field) as a JSON
+  column, and saves upsert/delete only the rows that changed, so a cycle's
+  disk I/O is O(changed records) instead of O(total state). WAL readers never
+  block the writer.
+- 'json': the original load_json_file/save_json_file behaviour.
+
+The JSON files stay the interchange format: the GitHub workflows commit them
+between runs and the analyzers read them. A store is (re)imported from its
+JSON file whenever that file changed behind the database's back (first run on
+a fresh checkout, a git pull), and modified stores are exported back to JSON
+once at the end of the process instead of on every save.
+
+Usage:
+    data = load_state(config.PENDING_ORDERS_FILE, records_key='orders', default={})
+    save_state(config.PENDING_ORDERS_FILE, data, records_key='orders')
+
+    python -m automated_trading.state_store export    # write modified stores to JSON
+    python -m automated_trading.state_store migrate   # import all JSON state files
+"""
+
+import os
+import re
+import sys
+import json
+import atexit
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import config
+from .utils import load_json_file, save_json_file
+
+logger = logging.getLogger(__name__)
+
+# Row kinds within a store table
+RECORD = 'record'   # One entry of the records_key dict
+ITEM = 'item'       # One element of the records_key list (key = zero-padded position)
+META = 'meta'       # Any other top-level field
+
+# JSON state files and the field holding their per-record collection
+STATE_FILES = {
+    config.LIVE_POSITIONS_FILE: 'positions',
+    config.PENDING_ORDERS_FILE: 'orders',
+    config.QUEUED_SIGNALS_FILE: 'signals',
+    config.SIGNAL_HISTORY_FILE: 'signals',
+    config.DAILY_STATE_FILE: 'trades_today',
+    config.HIGH_WATER_MARK_FILE: None,
+    config.EXECUTION_METRICS_FILE: 'executions',
+}
+
+RowKey = Tuple[str, str]
+
+
+def _store_name(filepath: str) -> str:
+    """Table name for a JSON state file (basename without extension)."""
+    name = os.path.splitext(os.path.basename(filepath))[0].lower()
+    return re.sub(r'[^a-z0-9_]', '_', name)
+
+
+def _to_rows(data: Dict[str, Any], records_key: Optional[str]) -> Dict[RowKey, str]:
+    """Split a JSON state object into serialized rows."""
+    rows = {}
+    for field, value in data.items():
+        if field == records_key and isinstance(value, dict):
+            rows[(META, field)] = '{}'
+            for key, record in value.items():
+                rows[(RECORD, str(key))] = json.dumps(record, default=str)
+        elif field == records_key and isinstance(value, list):
+            rows[(META, field)] = '[]'
+            for i, record in enumerate(value):
+                rows[(ITEM, f'{i:010d}')] = json.dumps(record, default=str)
+        else:
+            rows[(META, field)] = json.dumps(value, default=str)
+    return rows
+
+
+def _from_rows(rows: List[Tuple[str, str, str]], records_key: Optional[str]) -> Dict[str, Any]:
+    """Rebuild the JSON state object from (kind, key, value) rows."""
+    data: Dict[str, Any] = {}
+    records = []
+    for kind, key, value in rows:
+        if kind == META:
+            data[key] = json.loads(value)
+        else:
+            records.append((kind, key, value))
+
+    if records_key is not None:
+        container = data.get(records_key)
+        for kind, key, value in sorted(records, key=lambda r: r[1]):
+            if kind == RECORD and isinstance(container, dict):
+                container[key] = json.loads(value)
+            elif kind == ITEM and isinstance(container, list):
+                container.append(json.loads(value))
+    return data
+
+
+def _file_signature(filepath: str) -> Tuple[Optional[int], Optional[int]]:
+    """(mtime_ns, size) of a file, or (None, None) if it doesn't exist."""
+    try:
+        st = os.stat(filepath)
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None, None
+
+
+class StateStore:
+    """
+    SQLite (WAL) store with one table per state file.
+
+    Each table has (kind, key, value) rows; value is a JSON document. The
+    _stores table tracks a write version per store, the version last exported
+    to JSON, and the JSON file signature seen at the last import/export.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict[RowKey, str]] = {}  # store -> rows as last read/written
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS _stores (
+                    name TEXT PRIMARY KEY,
+                    json_path TEXT NOT NULL,
+                    records_key TEXT,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    exported_version INTEGER NOT NULL DEFAULT 0,
+                    json_mtime_ns INTEGER,
+                    json_size INTEGER
+                )
+            """)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._cache.clear()
+
+    def _ensure_store(self, conn: sqlite3.Connection, name: str, json_path: str,
+                      records_key: Optional[str]) -> None:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS "{name}" (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (kind, key)
+            ) WITHOUT ROWID
+        """)
+        conn.execute(
+            "INSERT INTO _stores (name, json_path, records_key) VALUES (?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET json_path = excluded.json_path, "
+            "records_key = excluded.records_key",
+            (name, os.path.abspath(json_path), records_key)
+        )
+
+    def _read_rows(self, conn: sqlite3.Connection, name: str) -> List[Tuple[str, str, str]]:
+        return conn.execute(f'SELECT kind, key, value FROM "{name}"').fetchall()
+
+    def _import_json(self, conn: sqlite3.Connection, name: str, json_path: str,
+                     records_key: Optional[str], signature: Tuple) -> None:
+        """Replace a store's rows with the contents of its JSON file."""
+        data = load_json_file(json_path, default=None)
+        rows = _to_rows(data, records_key) if isinstance(data, dict) else {}
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute(f'DELETE FROM "{name}"')
+            conn.executemany(
+                f'INSERT INTO "{name}" (kind, key, value) VALUES (?, ?, ?)',
+                [(kind, key, value) for (kind, key), value in rows.items()]
+            )
+            conn.execute(
+                "UPDATE _stores SET exported_version = version, json_mtime_ns = ?, json_size = ? "
+                "WHERE name = ?",
+                (signature[0], signature[1], name)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        logger.info(f"Imported {len(rows)} rows into state store '{name}' from {json_path}")
+
+    def load(self, json_path: str, records_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Load a store, importing its JSON file first if that file changed.
+
+        Returns:
+            The JSON-shaped state object, or None if the store is empty
+        """
+        name = _store_name(json_path)
+        with self._lock:
+            conn = self._connect()
+            self._ensure_store(conn, name, json_path, records_key)
+
+            version, exported, mtime_ns, size = conn.execute(
+                "SELECT version, exported_version, json_mtime_ns, json_size FROM _stores WHERE name = ?",
+                (name,)
+            ).fetchone()
+            signature = _file_signature(json_path)
+            if signature[0] is not None and signature != (mtime_ns, size):
+                if version > exported:
+                    logger.warning(
+                        f"{json_path} changed but state store '{name}' has unexported "
+                        f"changes - keeping the database copy"
+                    )
+                else:
+                    self._import_json(conn, name, json_path, records_key, signature)
+
+            rows = self._read_rows(conn, name)
+            self._cache[name] = {(kind, key): value for kind, key, value in rows}
+
+        if not rows:
+            return None
+        return _from_rows(rows, records_key)
+
+    def save(self, json_path: str, data: Dict[str, Any], records_key: Optional[str] = None) -> bool:
+        """
+        Persist a state object, writing only the rows that changed.
+
+        Returns:
+            True if successful
+        """
+        name = _store_name(json_path)
+        rows = _to_rows(data, records_key)
+
+        with self._lock:
+            conn = self._connect()
+            if name not in self._cache:
+                self._ensure_store(conn, name, json_path, records_key)
+                self._cache[name] = {(kind, key): value
+                                     for kind, key, value in self._read_rows(conn, name)}
+            cache = self._cache[name]
+
+            changed = [(kind, key, value) for (kind, key), value in rows.items()
+                       if cache.get((kind, key)) != value]
+            removed = [row_key for row_key in cache if row_key not in rows]
+            if not changed and not removed:
+                return True
+
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(
+                    f'INSERT OR REPLACE INTO "{name}" (kind, key, value) VALUES (?, ?, ?)', changed
+                )
+                conn.executemany(f'DELETE FROM "{name}" WHERE kind = ? AND key = ?', removed)
+                conn.execute("UPDATE _stores SET version = version + 1 WHERE name = ?", (name,))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                self._cache.pop(name, None)
+                raise
+
+            for kind, key, value in changed:
+                cache[(kind, key)] = value
+            for row_key in removed:
+                del cache[row_key]
+        return True
+
+    def export(self, name: Optional[str] = None) -> int:
+        """
+        Write stores with unexported changes back to their JSON files.
+
+        Args:
+            name: Optional single store to export (default: all stores)
+
+        Returns:
+            Number of JSON files written
+        """
+        written = 0
+        with self._lock:
+            conn = self._connect()
+            query = "SELECT name, json_path, records_key, version FROM _stores WHERE version > exported_version"
+            params: Tuple = ()
+            if name is not None:
+                query += " AND name = ?"
+                params = (name,)
+
+            for store, json_path, records_key, version in conn.execute(query, params).fetchall():
+                data = _from_rows(self._read_rows(conn, store), records_key)
+                if not save_json_file(json_path, data):
+                    continue
+                signature = _file_signature(json_path)
+                conn.execute(
+                    "UPDATE _stores SET exported_version = ?, json_mtime_ns = ?, json_size = ? "
+                    "WHERE name = ?",
+                    (version, signature[0], signature[1], store)
+                )
+                written += 1
+        return written
+
+    def migrate(self, state_files: Dict[str, Optional[str]] = STATE_FILES) -> int:
+        """Import every existing JSON state file (unless the database is ahead)."""
+        imported = 0
+        for json_path, records_key in state_files.items():
+            if os.path.exists(json_path) and self.load(json_path, records_key) is not None:
+                imported += 1
+        return imported
+
+
+# Global store instance
+_store: Optional[StateStore] = None
+
+
+def get_state_store() -> StateStore:
+    """Get or create the global state store (exports to JSON at exit)."""
+    global _store
+    if _store is None:
+        _store = StateStore(config.STATE_DB_FILE)
+        atexit.register(export_state_snapshots)
+    return _store
+
+
+def _use_sqlite() -> bool:
+    return config.STATE_BACKEND == 'sqlite'
+
+
+def load_state(filepath: str, records_key: Optional[str] = None, default: Any = None) -> Any:
+    """
+    Load a state object through the configured backend.
+
+    Args:
+        filepath: JSON state file (also identifies the store)
+        records_key: Top-level field holding the per-record dict or list
+        default: Returned if there is no stored state
+    """
+    if not _use_sqlite():
+        return load_json_file(filepath, default=default)
+    try:
+        data = get_state_store().load(filepath, records_key)
+    except Exception as e:
+        logger.error(f"State store read failed for {filepath}, reading JSON: {e}")
+        return load_json_file(filepath, default=default)
+    return default if data is None else data
+
+
+def save_state(filepath: str, data: Any, records_key: Optional[str] = None) -> bool:
+    """
+    Save a state object through the configured backend.
+
+    Returns:
+        True if successful
+    """
+    if not _use_sqlite() or not isinstance(data, dict):
+        return save_json_file(filepath, data)
+    try:
+        return get_state_store().save(filepath, data, records_key)
+    except Exception as e:
+        logger.error(f"State store write failed for {filepath}, writing JSON: {e}")
+        return save_json_file(filepath, data)
+
+
+def export_state_snapshots() -> int:
+    """Export modified stores to their JSON files (no-op for the JSON backend)."""
+    if not _use_sqlite():
+        return 0
+    try:
+        written = get_state_store().export()
+        if written:
+            logger.info(f"Exported {written} state store(s) to JSON")
+        return written
+    except Exception as e:
+        logger.error(f"Failed to export state store snapshots: {e}")
+        return 0
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'export'
+    if command == 'export':
+        print(f"Exported {export_state_snapshots()} state file(s)")
+    elif command == 'migrate':
+        print(f"Imported {get_state_store().migrate()} state file(s) into {config.STATE_DB_FILE}")
+    else:
+        print("Usage: python -m automated_trading.state_store [export|migrate]")
+        sys.exit(2)
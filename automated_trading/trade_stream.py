@@ -0,0 +1,317 @@
+# automated_trading/trade_stream.py
+"""
+Alpaca Trade-Updates Stream
+
+Listens on Alpaca's trade_updates websocket so order fills, partial fills,
+cancels and rejects arrive as they happen instead of at the next REST poll.
+
+The listener runs an asyncio loop on a daemon thread and only records
+events; order state is changed on the caller's thread:
+- OrderManager.update_orders_from_broker(trade_stream=...) applies queued
+  events through the usual mark_order_filled / mark_order_rejected
+  transitions (and fill callbacks), then skips REST polling for orders the
+  stream has been connected for since their submission
+- AlpacaTradingClient.await_fill blocks on the stream's condition variable
+  instead of sleep-polling get_order
+
+If the stream is disabled, can't authenticate or drops, everything falls
+back to REST polling. The listener reconnects with backoff.
+
+serve_replay() runs a local stand-in server that speaks the same protocol and
+replays recorded trade_updates messages, for tests and dry runs.
+"""
+
+import json
+import queue
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import config
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_ORDER_STATUSES = {'filled', 'cancelled', 'canceled', 'expired', 'rejected',
+                           'done_for_day', 'replaced'}
+RECONNECT_MAX_BACKOFF_SECONDS = 30
+
+
+class TradeStreamError(Exception):
+    """Raised when the stream cannot authenticate or subscribe."""
+    pass
+
+
+def _decode(raw: Any) -> Dict[str, Any]:
+    """Decode a text or binary (paper endpoint) websocket frame."""
+    if isinstance(raw, (bytes, bytearray)):
+        raw = raw.decode('utf-8')
+    msg = json.loads(raw)
+    return msg if isinstance(msg, dict) else {}
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def format_stream_order(order: Dict[str, Any]) -> Dict[str, Any]:
+    """Order payload from a trade update, in AlpacaTradingClient.get_order format."""
+    return {
+        'order_id': str(order.get('id')),
+        'client_order_id': order.get('client_order_id'),
+        'symbol': order.get('symbol'),
+        'qty': _to_int(order.get('qty')),
+        'filled_qty': _to_int(order.get('filled_qty')),
+        'side': order.get('side'),
+        'type': order.get('type') or order.get('order_type'),
+        'status': order.get('status'),
+        'limit_price': _to_float(order.get('limit_price')),
+        'stop_price': _to_float(order.get('stop_price')),
+        'filled_avg_price': _to_float(order.get('filled_avg_price')),
+        'submitted_at': order.get('submitted_at'),
+        'filled_at': order.get('filled_at'),
+        'time_in_force': order.get('time_in_force')
+    }
+
+
+class TradeUpdateStream:
+    """
+    Background trade_updates listener.
+
+    Attributes:
+        url: Websocket endpoint
+        events_received: Count of trade updates received
+    """
+
+    def __init__(self, url: Optional[str] = None, api_key: Optional[str] = None,
+                 secret_key: Optional[str] = None):
+        creds = config.get_api_credentials()
+        self.url = url or config.TRADE_STREAM_URL
+        self.api_key = api_key if api_key is not None else creds['api_key']
+        self.secret_key = secret_key if secret_key is not None else creds['secret_key']
+        self.events_received = 0
+
+        self._events: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue()
+        self._orders: Dict[str, Dict[str, Any]] = {}  # order_id -> latest order state
+        self._cond = threading.Condition()
+        self._connected_since: Optional[datetime] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._ws = None
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    def start(self, wait_seconds: float = None) -> bool:
+        """
+        Start the listener thread and wait briefly for it to subscribe.
+
+        Returns:
+            True if connected (False means callers will poll)
+        """
+        if not WEBSOCKETS_AVAILABLE:
+            logger.warning("websockets not installed - trade stream disabled, polling orders")
+            return False
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._thread_main, name='trade-stream', daemon=True)
+            self._thread.start()
+
+        wait_seconds = config.TRADE_STREAM_CONNECT_TIMEOUT_SECONDS if wait_seconds is None else wait_seconds
+        with self._cond:
+            self._cond.wait_for(self.is_connected, timeout=wait_seconds)
+        if self.is_connected():
+            logger.info(f"📡 Trade stream connected ({self.url})")
+        else:
+            logger.warning("Trade stream not connected - polling orders until it is")
+        return self.is_connected()
+
+    def stop(self, timeout: float = 5) -> None:
+        """Stop the listener and close the socket."""
+        loop = self._loop
+        if loop is not None and self._stop is not None:
+            loop.call_soon_threadsafe(self._stop.set)
+            if self._ws is not None:
+                asyncio.run_coroutine_threadsafe(self._ws.close(), loop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_connected(self) -> bool:
+        return self._connected_since is not None
+
+    def _thread_main(self) -> None:
+        try:
+            asyncio.run(self.run())
+        except Exception as e:
+            logger.error(f"Trade stream thread stopped: {e}")
+
+    def _set_connected(self, connected: bool) -> None:
+        with self._cond:
+            self._connected_since = datetime.now() if connected else None
+            self._cond.notify_all()
+
+    # =========================================================================
+    # Websocket protocol
+    # =========================================================================
+
+    async def run(self) -> None:
+        """Connect, subscribe and consume until stop(), reconnecting with backoff."""
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        backoff = 1
+
+        while not self._stop.is_set():
+            try:
+                async with websockets.connect(
+                    self.url, open_timeout=config.TRADE_STREAM_CONNECT_TIMEOUT_SECONDS
+                ) as ws:
+                    self._ws = ws
+                    await self._subscribe(ws)
+                    self._set_connected(True)
+                    backoff = 1
+                    async for raw in ws:
+                        self._on_message(_decode(raw))
+            except Exception as e:
+                if not self._stop.is_set():
+                    logger.warning(f"Trade stream error: {e}")
+            finally:
+                self._ws = None
+                self._set_connected(False)
+
+            if self._stop.is_set():
+                break
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, RECONNECT_MAX_BACKOFF_SECONDS)
+
+    async def _subscribe(self, ws) -> None:
+        """Authenticate and listen to trade_updates."""
+        timeout = config.TRADE_STREAM_CONNECT_TIMEOUT_SECONDS
+
+        await ws.send(json.dumps({'action': 'auth', 'key': self.api_key, 'secret': self.secret_key}))
+        msg = _decode(await asyncio.wait_for(ws.recv(), timeout))
+        if msg.get('stream') != 'authorization' or msg.get('data', {}).get('status') != 'authorized':
+            raise TradeStreamError(f"Trade stream authorization failed: {msg}")
+
+        await ws.send(json.dumps({'action': 'listen', 'data': {'streams': ['trade_updates']}}))
+        msg = _decode(await asyncio.wait_for(ws.recv(), timeout))
+        if msg.get('stream') != 'listening' or 'trade_updates' not in msg.get('data', {}).get('streams', []):
+            raise TradeStreamError(f"Trade stream subscription failed: {msg}")
+
+    def _on_message(self, msg: Dict[str, Any]) -> None:
+        if msg.get('stream') != 'trade_updates':
+            return
+        data = msg.get('data') or {}
+        event = data.get('event')
+        order = format_stream_order(data.get('order') or {})
+        with self._cond:
+            self._orders[order['order_id']] = order
+            self.events_received += 1
+            self._cond.notify_all()
+        self._events.put((event, order))
+        logger.debug(f"Trade update: {event} {order['symbol']} ({order['client_order_id']})")
+
+    # =========================================================================
+    # Caller-thread API
+    # =========================================================================
+
+    def drain(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Take all (event, order) updates received since the last drain."""
+        updates = []
+        while True:
+            try:
+                updates.append(self._events.get_nowait())
+            except queue.Empty:
+                return updates
+
+    def covers(self, order: Dict[str, Any]) -> bool:
+        """
+        True if the stream has been connected continuously since the order
+        was submitted, so any update for it has already been received.
+        """
+        since = self._connected_since
+        submitted_at = order.get('submitted_at')
+        if since is None or not submitted_at:
+            return False
+        try:
+            return since <= datetime.fromisoformat(str(submitted_at))
+        except ValueError:
+            return False
+
+    def wait_for_terminal(self, order_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Block until an update puts order_id in a terminal state.
+
+        Returns:
+            The order (get_order format), or None on timeout or disconnect
+        """
+        def terminal_or_down():
+            order = self._orders.get(str(order_id))
+            if order and str(order.get('status', '')).lower() in TERMINAL_ORDER_STATUSES:
+                return True
+            return not self.is_connected()
+
+        with self._cond:
+            self._cond.wait_for(terminal_or_down, timeout=timeout)
+            order = self._orders.get(str(order_id))
+        if order and str(order.get('status', '')).lower() in TERMINAL_ORDER_STATUSES:
+            return order
+        return None
+
+
+# =============================================================================
+# Local stand-in server
+# =============================================================================
+
+async def serve_replay(messages: List[Dict[str, Any]], host: str = '127.0.0.1', port: int = 0,
+                       delay: float = 0.0, key: Optional[str] = None):
+    """
+    Start a local server that speaks the trade_updates protocol and replays
+    recorded messages to each subscriber.
+
+    Args:
+        messages: Recorded {'stream': 'trade_updates', 'data': {...}} messages
+        delay: Seconds between replayed messages
+        key: If set, only this API key is authorized
+
+    Returns:
+        The websockets server (server.sockets[0].getsockname() gives the port)
+    """
+    async def handler(ws):
+        auth = _decode(await ws.recv())
+        if key is not None and auth.get('key') != key:
+            await ws.send(json.dumps({'stream': 'authorization',
+                                      'data': {'status': 'unauthorized', 'action': 'authenticate'}}))
+            return
+        await ws.send(json.dumps({'stream': 'authorization',
+                                  'data': {'status': 'authorized', 'action': 'authenticate'}}))
+        await ws.recv()  # listen request
+        await ws.send(json.dumps({'stream': 'listening', 'data': {'streams': ['trade_updates']}}))
+        for msg in messages:
+            if delay:
+                await asyncio.sleep(delay)
+            await ws.send(json.dumps(msg).encode('utf-8'))
+        await ws.wait_closed()
+
+    return await websockets.serve(handler, host, port)
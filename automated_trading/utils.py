@@ -21,6 +21,7 @@ import hashlib
 import pytz
 
 from . import config
+from .audit_index import get_audit_index
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +54,8 @@ def log_audit_event(
     Uses JSONL format (one JSON object per line) for append-only efficiency.
     Audit logs should NEVER be deleted or rotated for compliance.
     Uses file locking to prevent corruption from concurrent writes.
+    Each line's byte offset is recorded in the sidecar index (see
+    audit_index.py) under the same lock.
 
     Args:
         event_type: Type of event (ORDER_SUBMITTED, POSITION_CLOSED, etc.)
@@ -77,8 +80,16 @@ def log_audit_event(
             # Acquire exclusive lock for appending
             fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
             try:
-                with open(config.AUDIT_LOG_FILE, 'a') as f:
-                    f.write(json.dumps(event) + '\n')
+                line = (json.dumps(event) + '\n').encode('utf-8')
+                with open(config.AUDIT_LOG_FILE, 'ab') as f:
+                    f.seek(0, os.SEEK_END)
+                    offset = f.tell()
+                    f.write(line)
+                try:
+                    get_audit_index(config.AUDIT_LOG_FILE).append(offset, len(line), event)
+                except Exception as e:
+                    # Readers catch the index up from the log, so this is not fatal
+                    logger.debug(f"Failed to update audit log index: {e}")
             finally:
                 fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
     except Exception as e:
@@ -93,6 +104,8 @@ def read_recent_audit_events(
     """
     Read recent audit events from the log.
 
+    Uses the sidecar offset index, so only the returned lines are parsed.
+
     Args:
         event_type: Optional filter by event type
         limit: Maximum events to return
@@ -103,6 +116,11 @@ def read_recent_audit_events(
     if not os.path.exists(config.AUDIT_LOG_FILE):
         return []
 
+    try:
+        return get_audit_index(config.AUDIT_LOG_FILE).recent(event_type=event_type, limit=limit)
+    except Exception as e:
+        logger.warning(f"Audit log index unavailable, scanning full log: {e}")
+
     events = []
     try:
         with open(config.AUDIT_LOG_FILE, 'r') as f:
@@ -126,6 +144,30 @@ def read_recent_audit_events(
     return events
 
 
+def read_audit_events_since(
+    since: Any,
+    event_type: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Read audit events dated on or after a calendar day.
+
+    Args:
+        since: date, datetime or 'YYYY-MM-DD' (compared on the timestamp's day)
+        event_type: Optional filter by event type
+
+    Returns:
+        List of event dictionaries (oldest first)
+    """
+    if not os.path.exists(config.AUDIT_LOG_FILE):
+        return []
+
+    try:
+        return get_audit_index(config.AUDIT_LOG_FILE).since(since, event_type=event_type)
+    except Exception as e:
+        logger.error(f"Failed to read audit log: {e}")
+        return []
+
+
 # =============================================================================
 # CLIENT ORDER ID GENERATION
 # =============================================================================
@@ -19,10 +19,10 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 from datetime import datetime
-import time
 
 try:
     import requests
+    from http_client import get_http_client
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
@@ -111,7 +111,8 @@ class AutomatedPoliticianStatusChecker:
 
         try:
             logger.debug(f"Making request to: {url}")
-            response = requests.get(url, params=query_params, timeout=30)
+            # Shared client paces requests under the Congress.gov hourly limit
+            response = get_http_client().get(url, params=query_params, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
@@ -182,9 +183,6 @@ class AutomatedPoliticianStatusChecker:
             if offset >= total_count:
                 break
 
-            # Rate limiting: brief pause between requests
-            time.sleep(0.5)
-
         logger.info(f"Total active Congress members found: {len(current_members)}")
         return current_members
 
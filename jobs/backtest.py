@@ -1,16 +1,44 @@
 # jobs/backtest.py
 """
 Backtest historical insider trading signals.
-Calculates returns at 1-week and 1-month horizons and compares to SPY benchmark.
+Calculates forward returns at configurable horizons (1-week and 1-month by
+default) and compares them to the SPY benchmark.
+
+Prices are loaded once per run: every ticker's series covering all of its
+signal dates plus the longest horizon is read from the shared price store
+(missing ranges downloaded in batches), and SPY is read once for the whole
+span. Forward returns for all signals and horizons are then computed with
+searchsorted over each ticker's date index, so sweeping horizons or slippage
+assumptions costs no extra downloads.
+
+Horizons count trading sessions. The sweep searches ceil(days * 7/5) +
+WINDOW_BUFFER_DAYS calendar days for the exit close, so '3m=63' really
+reaches 63 sessions. run_backtest keeps the original days + 4 calendar-day
+window (about 17 sessions for 21, 46 for 63) so backtest_results.csv stays
+comparable with earlier weeks and with the original per-signal fetch
+(kept in scripts/test_backtest.py for parity checks).
+
+Usage:
+    python jobs/backtest.py
+    python jobs/backtest.py --horizons 1w=5,1m=21 --slippage-bps 10
+    python jobs/backtest.py --sweep-horizons 5,10,21,63 --sweep-slippage 0,10,25
+
+Used by:
+- .github/workflows/weekly_backtest.yml
 """
 
+import argparse
+import math
 import pandas as pd
-import yfinance as yf
+import numpy as np
 from datetime import datetime, timedelta
 import os
 import warnings
 import logging
 import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from price_store import get_price_store
 
 # Suppress all warnings
 warnings.filterwarnings('ignore')
@@ -25,7 +53,7 @@ class SuppressStderr:
         self._original_stderr = sys.stderr
         sys.stderr = open(os.devnull, 'w')
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         sys.stderr.close()
         sys.stderr = self._original_stderr
@@ -33,138 +61,273 @@ class SuppressStderr:
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 HISTORY_CSV = os.path.join(DATA_DIR, 'signals_history.csv')
 OUT_CSV = os.path.join(DATA_DIR, 'backtest_results.csv')
+SWEEP_CSV = os.path.join(DATA_DIR, 'backtest_sweep.csv')
 
-def fetch_forward_returns(ticker, start_date, days_forward):
+BENCHMARK_TICKER = 'SPY'
+DEFAULT_HORIZONS = [(5, '1w'), (21, '1m')]  # (trading days forward, label)
+WINDOW_BUFFER_DAYS = 5                      # Calendar days past the horizon for holidays
+RESULT_COLUMNS = ['ticker', 'signal_date', 'horizon', 'ticker_return', 'spy_return',
+                  'alpha', 'signal_score', 'action']
+
+
+def parse_horizons(spec: str) -> List[Tuple[int, str]]:
+    """
+    Parse a horizon list like '1w=5,1m=21' or '5,10,21'.
+
+    Unlabelled horizons are labelled '<days>d'.
     """
-    Fetch daily close prices from start_date to start_date + days_forward.
-    
+    horizons = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        label, _, days = part.rpartition('=')
+        days = int(days)
+        if days < 1:
+            raise ValueError(f"Horizon must be at least 1 trading day: {part}")
+        horizons.append((days, label.strip() or f"{days}d"))
+    return horizons
+
+
+def window_calendar_days(days_forward: int, legacy: bool = False) -> int:
+    """
+    Calendar days after the signal date searched for the exit close.
+
+    days_forward sessions span ceil(days_forward * 7/5) calendar days, plus
+    WINDOW_BUFFER_DAYS for holidays. legacy gives the original per-signal
+    window of days_forward + WINDOW_BUFFER_DAYS - 1 calendar days, which
+    falls short of the horizon beyond about a week.
+    """
+    if legacy:
+        return days_forward + WINDOW_BUFFER_DAYS - 1
+    return math.ceil(days_forward * 7 / 5) + WINDOW_BUFFER_DAYS
+
+
+def forward_returns(dates: np.ndarray, closes: np.ndarray, signal_dates: np.ndarray,
+                    days_forward: int, legacy_window: bool = False) -> np.ndarray:
+    """
+    Forward returns for many signals on one price series.
+
+    The entry is the first close on or after the signal date and the exit
+    is days_forward trading days later, capped at the last close within
+    window_calendar_days(days_forward) of the signal date (the last
+    available close when the horizon hasn't elapsed yet).
+
     Args:
-        ticker: Stock ticker symbol
-        start_date: Starting date for price fetch
-        days_forward: Number of trading days forward
-    
+        dates: Sorted datetime64[D] bar dates
+        closes: Close for each bar
+        signal_dates: datetime64[D] signal dates
+        days_forward: Horizon in trading days
+        legacy_window: Use the original per-signal window (see window_calendar_days)
+
     Returns:
-        Tuple of (start_price, horizon_price, return_fraction) or None if error
+        Array of returns (NaN where there is no bar in the window)
+    """
+    start = np.searchsorted(dates, signal_dates, side='left')
+    window_end = signal_dates + np.timedelta64(window_calendar_days(days_forward, legacy_window), 'D')
+    last = np.searchsorted(dates, window_end, side='right') - 1
+
+    valid = start <= last
+    entry_idx = np.where(valid, start, 0)
+    exit_idx = np.where(valid, np.minimum(start + days_forward, last), 0)
+    if len(closes) == 0:
+        return np.full(len(signal_dates), np.nan)
+
+    entry = closes[entry_idx]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = closes[exit_idx] / entry - 1.0
+    return np.where(valid & (entry > 0), returns, np.nan)
+
+
+def apply_slippage(returns: np.ndarray, slippage_bps: float) -> np.ndarray:
+    """Net returns after paying slippage_bps on both the entry and the exit."""
+    if not slippage_bps:
+        return returns
+    s = slippage_bps / 10_000
+    return (1.0 + returns) * (1.0 - s) / (1.0 + s) - 1.0
+
+
+def load_signals(history_csv: str = HISTORY_CSV) -> pd.DataFrame:
+    """Signals history with parseable dates, in file order."""
+    df = pd.read_csv(history_csv)
+    if df.empty:
+        return df
+    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df = df[df['date'].notna() & df['ticker'].notna()].reset_index(drop=True)
+    df['ticker'] = df['ticker'].astype(str)
+    return df
+
+
+class BacktestEngine:
     """
-    start = start_date
-    end = start_date + timedelta(days=days_forward+5)  # Buffer for weekends/holidays
-    
-    try:
-        # Download data with suppressed output
-        with SuppressStderr():
-            df = yf.download(
-                ticker, 
-                start=start.strftime('%Y-%m-%d'), 
-                end=end.strftime('%Y-%m-%d'), 
-                progress=False,
-                auto_adjust=True
+    Forward returns for a table of signals over any set of horizons.
+
+    Each ticker's price series (and SPY's) is loaded once, covering its
+    signal dates plus the longest horizon requested so far; later runs with
+    shorter or equal horizons reuse it. legacy_window selects the original
+    per-signal exit window (see window_calendar_days).
+    """
+
+    def __init__(self, signals: pd.DataFrame, store=None, legacy_window: bool = False):
+        self.signals = signals
+        self.store = store or get_price_store()
+        self.legacy_window = legacy_window
+        self.prices: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._loaded_days = 0
+        self.failed_tickers = set()
+
+        self._signal_dates = signals['date'].to_numpy().astype('datetime64[D]')
+        self._ticker_codes, self._tickers = pd.factorize(signals['ticker'].str.upper().str.strip())
+
+    def _load_prices(self, max_days: int) -> None:
+        """Read every ticker's series once for signal dates through max_days forward."""
+        if max_days <= self._loaded_days:
+            return
+        span = timedelta(days=window_calendar_days(max_days, self.legacy_window))
+        spans = self.signals.assign(ticker=self._tickers[self._ticker_codes]).groupby('ticker')['date'].agg(['min', 'max'])
+        ranges = {t: (row['min'].date(), (row['max'] + span).date()) for t, row in spans.iterrows()}
+        ranges[BENCHMARK_TICKER] = (spans['min'].min().date(), (spans['max'].max() + span).date())
+
+        try:
+            with SuppressStderr():
+                histories = self.store.get_histories_for_ranges(ranges, adjusted=True)
+        except Exception as e:
+            print(f"   ⚠️  Price download failed: {e}")
+            histories = {}
+
+        self.prices = {}
+        for t, hist in histories.items():
+            if hist.empty or 'Close' not in hist.columns:
+                continue
+            self.prices[t] = (
+                hist.index.to_numpy().astype('datetime64[D]'),
+                hist['Close'].to_numpy(dtype=np.float64),
             )
-        
-        # Check if we got valid data
-        if df.empty or 'Close' not in df.columns:
-            return None
-        
-        # Reset index to access by position
-        df = df.reset_index()
-        
-        # Ensure we have enough data
-        if len(df) == 0:
-            return None
-        
-        # Get start price (first available close)
-        start_price = float(df['Close'].iloc[0])
-        
-        # Get horizon price (at days_forward or last available)
-        idx_horizon = min(days_forward, len(df) - 1)
-        horizon_price = float(df['Close'].iloc[idx_horizon])
-        
-        # Calculate return as scalar float
-        ret = float((horizon_price - start_price) / start_price)
-        
-        return start_price, horizon_price, ret
-        
-    except Exception:
-        # Silently skip errors (delisted stocks, etc.)
-        return None
+        self._loaded_days = max_days
+
+    def _returns_for(self, ticker_idx: np.ndarray, ticker: str, days_forward: int) -> np.ndarray:
+        series = self.prices.get(ticker)
+        if series is None:
+            return np.full(len(ticker_idx), np.nan)
+        return forward_returns(series[0], series[1], self._signal_dates[ticker_idx], days_forward,
+                               self.legacy_window)
+
+    def run(self, horizons: Sequence[Tuple[int, str]] = DEFAULT_HORIZONS,
+            slippage_bps: float = 0.0) -> pd.DataFrame:
+        """
+        Forward returns, SPY returns and alpha for every signal and horizon.
+
+        Args:
+            horizons: (trading days, label) pairs
+            slippage_bps: Cost paid on both the entry and the exit of each
+                signal trade (the SPY benchmark is not charged)
+
+        Returns:
+            DataFrame with RESULT_COLUMNS, one row per signal and horizon
+            (signals in file order, horizons in the given order); signals
+            without prices in the window are left out
+        """
+        if self.signals.empty or not horizons:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        self._load_prices(max(days for days, _ in horizons))
 
-def run_backtest():
+        order = np.argsort(self._ticker_codes, kind='stable')
+        bounds = np.flatnonzero(np.diff(self._ticker_codes[order])) + 1
+        groups = np.split(order, bounds)
+
+        if 'signal_score' in self.signals:
+            scores = pd.to_numeric(self.signals['signal_score'], errors='coerce').fillna(0.0).to_numpy(dtype=np.float64)
+        else:
+            scores = np.zeros(len(self.signals))
+        actions = self.signals['action'].astype(str) if 'action' in self.signals else ''
+
+        frames = []
+        self.failed_tickers = set()
+        for h, (days, label) in enumerate(horizons):
+            ticker_ret = np.full(len(self.signals), np.nan)
+            for idx in groups:
+                ticker_ret[idx] = self._returns_for(idx, self._tickers[self._ticker_codes[idx[0]]], days)
+            spy_ret = self._returns_for(np.arange(len(self.signals)), BENCHMARK_TICKER, days)
+            ticker_ret = apply_slippage(ticker_ret, slippage_bps)
+
+            valid = np.isfinite(ticker_ret) & np.isfinite(spy_ret)
+            self.failed_tickers.update(self.signals['ticker'][~valid])
+            frames.append(pd.DataFrame({
+                'ticker': self.signals['ticker'],
+                'signal_date': self.signals['date'],
+                'horizon': label,
+                'ticker_return': ticker_ret,
+                'spy_return': spy_ret,
+                'alpha': ticker_ret - spy_ret,
+                'signal_score': scores,
+                'action': actions,
+                '_signal': np.arange(len(self.signals)),
+                '_horizon': h,
+            })[valid])
+
+        results = pd.concat(frames, ignore_index=True)
+        results = results.sort_values(['_signal', '_horizon'], kind='stable')
+        return results[RESULT_COLUMNS].reset_index(drop=True)
+
+
+def summarize(results_df: pd.DataFrame, horizons: Sequence[Tuple[int, str]] = ()) -> pd.DataFrame:
+    """Per-horizon hit rate, return and alpha statistics (in the order of horizons)."""
+    grouped = results_df.groupby('horizon', sort=False)
+    summary = pd.DataFrame({
+        'signals': grouped.size(),
+        'hit_rate': grouped['ticker_return'].apply(lambda r: (r > 0).mean()),
+        'avg_return': grouped['ticker_return'].mean(),
+        'median_return': grouped['ticker_return'].median(),
+        'avg_alpha': grouped['alpha'].mean(),
+        'best_return': grouped['ticker_return'].max(),
+        'worst_return': grouped['ticker_return'].min(),
+    })
+    order = [label for _, label in horizons if label in summary.index]
+    if order:
+        summary = summary.loc[order]
+    return summary.rename_axis('horizon').reset_index()
+
+
+def run_backtest(horizons: Sequence[Tuple[int, str]] = DEFAULT_HORIZONS,
+                 slippage_bps: float = 0.0, out_csv: str = OUT_CSV):
     """
     Main backtest function.
     Reads signals_history.csv and calculates forward returns for each signal.
+
+    Args:
+        horizons: (trading days, label) pairs
+        slippage_bps: Per-side slippage charged on each signal trade
+        out_csv: Where to write the per-signal results
     """
     print("=" * 60)
     print("BACKTEST RESULTS")
     print("=" * 60)
-    
+
     # Check if history file exists
     if not os.path.exists(HISTORY_CSV):
         print(f"❌ No history file at {HISTORY_CSV}")
         print("   Run main.py to generate signals history first.")
         return
-    
+
     # Load signals history
-    df = pd.read_csv(HISTORY_CSV, parse_dates=['date'])
-    
+    df = load_signals(HISTORY_CSV)
+
     if df.empty:
         print("❌ Signals history file is empty")
         return
-    
+
     print(f"📊 Analyzing {len(df)} historical signals...")
-    
-    # Prepare results storage
-    results = []
-    spy_ticker = 'SPY'
-    failed_tickers = set()
-    
-    # Process each signal
-    for idx, row in df.iterrows():
-        ticker = row['ticker']
-        
-        # Parse signal date
-        try:
-            sig_date = pd.to_datetime(row['date']).to_pydatetime()
-        except Exception:
-            continue
-        
-        # Test both 1-week (~5 trading days) and 1-month (~21 trading days)
-        for horizon_days, label in [(5, '1w'), (21, '1m')]:
-            # Get ticker returns
-            res_ticker = fetch_forward_returns(ticker, sig_date, horizon_days)
-            
-            # Get SPY returns for comparison
-            res_spy = fetch_forward_returns(spy_ticker, sig_date, horizon_days)
-            
-            # Skip if either failed
-            if not res_ticker or not res_spy:
-                failed_tickers.add(ticker)
-                continue
-            
-            # Extract returns
-            _, _, ret_ticker = res_ticker
-            _, _, ret_spy = res_spy
-            
-            # Calculate alpha (excess return vs SPY)
-            alpha = ret_ticker - ret_spy
-            
-            # Store result
-            results.append({
-                'ticker': ticker,
-                'signal_date': sig_date,
-                'horizon': label,
-                'ticker_return': float(ret_ticker),
-                'spy_return': float(ret_spy),
-                'alpha': float(alpha),
-                'signal_score': float(row.get('signal_score', 0)) if pd.notna(row.get('signal_score')) else 0.0,
-                'action': str(row.get('action', ''))
-            })
-    
+    if slippage_bps:
+        print(f"   Slippage: {slippage_bps:g} bps per side")
+
+    # Original exit window, so results stay comparable with earlier weeks
+    engine = BacktestEngine(df, legacy_window=True)
+    results_df = engine.run(horizons, slippage_bps)
+
     # Show summary of failed tickers
-    if failed_tickers:
-        print(f"   ⚠️  Skipped {len(failed_tickers)} ticker(s) (delisted/invalid): {', '.join(sorted(failed_tickers))}")
-    
-    # Convert to DataFrame
-    results_df = pd.DataFrame(results)
-    
+    if engine.failed_tickers:
+        print(f"   ⚠️  Skipped {len(engine.failed_tickers)} ticker(s) (delisted/invalid): {', '.join(sorted(engine.failed_tickers))}")
+
     if results_df.empty:
         print("\n⚠️  No backtest results generated")
         print("   Possible reasons:")
@@ -172,56 +335,82 @@ def run_backtest():
         print("   - Signals are too recent (not enough price history)")
         print("   - Yahoo Finance data unavailable")
         return results_df
-    
-    # Ensure all numeric columns are proper floats
-    for col in ['ticker_return', 'spy_return', 'alpha', 'signal_score']:
-        results_df[col] = pd.to_numeric(results_df[col], errors='coerce')
-    
-    # Drop any rows with NaN values
-    results_df = results_df.dropna(subset=['ticker_return', 'spy_return', 'alpha'])
-    
-    if results_df.empty:
-        print("\n⚠️  No valid backtest results after cleaning")
-        return results_df
-    
+
     # Print summary statistics
     print("\n" + "=" * 60)
     print("PERFORMANCE SUMMARY")
     print("=" * 60)
-    
-    for label in ['1w', '1m']:
-        subset = results_df[results_df['horizon'] == label].copy()
-        
-        if subset.empty:
-            continue
-        
-        # Calculate metrics
-        total_signals = len(subset)
-        hit_rate = (subset['ticker_return'] > 0).mean()
-        avg_return = subset['ticker_return'].mean()
-        avg_alpha = subset['alpha'].mean()
-        median_return = subset['ticker_return'].median()
-        best_return = subset['ticker_return'].max()
-        worst_return = subset['ticker_return'].min()
-        
-        print(f"\n📊 {label.upper()} HORIZON:")
+
+    for _, row in summarize(results_df, horizons).iterrows():
+        total_signals = int(row['signals'])
+        hit_rate = row['hit_rate']
+
+        print(f"\n📊 {row['horizon'].upper()} HORIZON:")
         print(f"   Signals Tested: {total_signals}")
         print(f"   Hit Rate: {hit_rate*100:.1f}% ({int(hit_rate*total_signals)} profitable)")
-        print(f"   Avg Return: {avg_return*100:+.2f}%")
-        print(f"   Median Return: {median_return*100:+.2f}%")
-        print(f"   Avg Alpha vs SPY: {avg_alpha*100:+.2f}%")
-        print(f"   Best Trade: {best_return*100:+.2f}%")
-        print(f"   Worst Trade: {worst_return*100:+.2f}%")
-    
+        print(f"   Avg Return: {row['avg_return']*100:+.2f}%")
+        print(f"   Median Return: {row['median_return']*100:+.2f}%")
+        print(f"   Avg Alpha vs SPY: {row['avg_alpha']*100:+.2f}%")
+        print(f"   Best Trade: {row['best_return']*100:+.2f}%")
+        print(f"   Worst Trade: {row['worst_return']*100:+.2f}%")
+
     # Save results to CSV
-    results_df.to_csv(OUT_CSV, index=False)
-    print(f"\n💾 Backtest results saved to: {OUT_CSV}")
-    
+    results_df.to_csv(out_csv, index=False)
+    print(f"\n💾 Backtest results saved to: {out_csv}")
+
     print("\n" + "=" * 60)
     print("BACKTEST COMPLETE")
     print("=" * 60)
-    
+
     return results_df
 
+def run_sweep(horizons: Sequence[Tuple[int, str]], slippage_grid: Sequence[float],
+              out_csv: str = SWEEP_CSV) -> Optional[pd.DataFrame]:
+    """
+    Summary statistics for every horizon × slippage combination.
+
+    Prices are loaded once for the longest horizon; each combination is
+    then a vectorized pass over the loaded series.
+    """
+    if not os.path.exists(HISTORY_CSV):
+        print(f"❌ No history file at {HISTORY_CSV}")
+        return None
+
+    df = load_signals(HISTORY_CSV)
+    if df.empty:
+        print("❌ Signals history file is empty")
+        return None
+
+    engine = BacktestEngine(df)
+    summaries = []
+    for slippage_bps in slippage_grid:
+        summary = summarize(engine.run(horizons, slippage_bps), horizons)
+        summary.insert(1, 'slippage_bps', slippage_bps)
+        summaries.append(summary)
+
+    sweep = pd.concat(summaries, ignore_index=True)
+    days_by_label = {label: days for days, label in horizons}
+    sweep.insert(1, 'horizon_days', sweep['horizon'].map(days_by_label))
+    sweep.to_csv(out_csv, index=False)
+
+    print(f"\n📊 Sweep: {len(horizons)} horizons × {len(slippage_grid)} slippage levels "
+          f"over {len(df)} signals")
+    print(sweep.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+    print(f"\n💾 Sweep results saved to: {out_csv}")
+    return sweep
+
 if __name__ == "__main__":
-    run_backtest()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Backtest historical insider trading signals')
+    parser.add_argument('--horizons', type=parse_horizons, default=DEFAULT_HORIZONS,
+                        help="Horizons as label=trading_days, e.g. '1w=5,1m=21'")
+    parser.add_argument('--slippage-bps', type=float, default=0.0,
+                        help='Slippage per side in basis points')
+    parser.add_argument('--sweep-horizons', type=parse_horizons,
+                        help="Also write a summary for these horizons to backtest_sweep.csv, e.g. '5,10,21,63'")
+    parser.add_argument('--sweep-slippage', type=lambda s: [float(x) for x in s.split(',') if x.strip()],
+                        help="Slippage levels (bps per side) for the sweep, e.g. '0,10,25'")
+    args = parser.parse_args()
+
+    run_backtest(args.horizons, args.slippage_bps)
+    if args.sweep_horizons or args.sweep_slippage:
+        run_sweep(args.sweep_horizons or args.horizons, args.sweep_slippage or [args.slippage_bps])
@@ -7,12 +7,13 @@ Replaces broken Selenium scraper with reliable API integration
 import requests
 import pandas as pd
 from datetime import datetime, timedelta
-import time
 import logging
 from typing import List, Dict, Optional
 import json
 import os
 
+from http_client import get_http_client
+
 # Setup logging first
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -239,36 +240,28 @@ class CapitolTradesScraper:
             # Make API request
             url = f"{self.API_BASE_URL}/get_latest_trades"
 
-            for attempt in range(self.max_retries):
-                try:
-                    response = requests.get(
-                        url,
-                        headers=self.headers,
-                        timeout=30
-                    )
-
-                    response.raise_for_status()
-                    trades_data = response.json()
-
-                    logger.info(f"✓ API returned {len(trades_data)} total trades")
+            # Shared client retries timeouts, 429s and 5xx with backoff
+            try:
+                response = get_http_client().get(
+                    url,
+                    headers=self.headers,
+                    timeout=30,
+                    retries=self.max_retries - 1
+                )
 
-                    # Increment rate limit counter
-                    self._increment_rate_limit()
+                response.raise_for_status()
+                trades_data = response.json()
 
-                    return trades_data
+                logger.info(f"✓ API returned {len(trades_data)} total trades")
 
-                except requests.exceptions.RequestException as e:
-                    logger.warning(f"API request failed (attempt {attempt + 1}/{self.max_retries}): {e}")
+                # Increment rate limit counter
+                self._increment_rate_limit()
 
-                    if attempt < self.max_retries - 1:
-                        wait_time = (attempt + 1) * 2
-                        logger.info(f"Waiting {wait_time}s before retry...")
-                        time.sleep(wait_time)
-                    else:
-                        logger.error(f"All API retry attempts failed")
-                        raise
+                return trades_data
 
-            return []
+            except requests.exceptions.RequestException as e:
+                logger.error(f"All API retry attempts failed: {e}")
+                raise
 
         except Exception as e:
             logger.error(f"Error fetching from API: {e}")
@@ -0,0 +1,181 @@
+# jobs/cluster_engine.py
+"""
+Vectorized sliding-window cluster engine.
+
+Finds, for every ticker, the ±window_days window of insider buys with the most
+unique insiders (ties broken by total value, first window wins) — the same
+selection the original per-row loop in process_signals.cluster_and_score made.
+
+Instead of slicing a DataFrame per row (O(n²) per ticker), the engine:
+- sorts once by (ticker, trade_date)
+- finds every row's window bounds with two searchsorted calls over a
+  composite (ticker, date-rank) key, so windows never cross tickers
+- computes window value sums from prefix sums (mean conviction is only
+  needed for each ticker's winning window)
+- counts unique insiders with a single two-pointer scan
+
+Used by:
+- process_signals.py (cluster_and_score)
+- scripts/bench_cluster_engine.py (benchmark vs the original loop in scripts/test_cluster_engine.py)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _window_bounds(ticker_codes: np.ndarray, dates: np.ndarray, window_days: int):
+    """
+    Compute [lo, hi) row bounds of each row's ±window_days window.
+
+    Rows must already be sorted by (ticker, date). Dates are mapped to their
+    rank among the unique dates so the composite key fits comfortably in int64.
+    """
+    uniq_dates = np.unique(dates)
+    delta = np.timedelta64(int(window_days), 'D')
+
+    date_rank = np.searchsorted(uniq_dates, dates, side='left')
+    rank_lo = np.searchsorted(uniq_dates, dates - delta, side='left')
+    rank_hi = np.searchsorted(uniq_dates, dates + delta, side='right')
+
+    stride = np.int64(len(uniq_dates) + 1)
+    base = ticker_codes.astype(np.int64) * stride
+    key = base + date_rank
+
+    lo = np.searchsorted(key, base + rank_lo, side='left')
+    hi = np.searchsorted(key, base + rank_hi, side='left')
+    return lo, hi
+
+
+def _unique_counts(insider_codes: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    Count distinct insiders in each [lo, hi) window with one two-pointer pass.
+
+    Both bounds are non-decreasing across rows, so each row enters and leaves
+    the running window exactly once. Code -1 (missing name) is not counted,
+    matching pandas nunique().
+    """
+    n = len(insider_codes)
+    codes = insider_codes.tolist()
+    lo_list = lo.tolist()
+    hi_list = hi.tolist()
+
+    seen = [0] * (int(insider_codes.max()) + 1 if n else 0)
+    counts = np.zeros(n, dtype=np.int64)
+    left = right = distinct = 0
+
+    for i in range(n):
+        target_hi = hi_list[i]
+        while right < target_hi:
+            c = codes[right]
+            if c >= 0:
+                if seen[c] == 0:
+                    distinct += 1
+                seen[c] += 1
+            right += 1
+        target_lo = lo_list[i]
+        while left < target_lo:
+            c = codes[left]
+            if c >= 0:
+                seen[c] -= 1
+                if seen[c] == 0:
+                    distinct -= 1
+            left += 1
+        counts[i] = distinct
+
+    return counts
+
+
+def _prefix(values: np.ndarray) -> np.ndarray:
+    """Prefix sums with a leading zero so window sums are p[hi] - p[lo]."""
+    out = np.zeros(len(values) + 1, dtype=np.float64)
+    np.cumsum(values, out=out[1:])
+    return out
+
+
+def find_best_windows(buys: pd.DataFrame, window_days: int = 5):
+    """
+    Find the best cluster window for every ticker.
+
+    Args:
+        buys: DataFrame with ticker, insider, trade_date, value_calc, conviction.
+        window_days: Half-width of the sliding window in days.
+
+    Returns:
+        (sorted_buys, best) where sorted_buys is buys stably sorted by
+        (ticker, trade_date) with a fresh RangeIndex, and best is a DataFrame
+        indexed by ticker with columns last_trade_date, cluster_count,
+        total_value, avg_conviction, window_start, window_end. The best window
+        rows are sorted_buys.iloc[window_start:window_end].
+    """
+    best_cols = ['last_trade_date', 'cluster_count', 'total_value',
+                 'avg_conviction', 'window_start', 'window_end']
+
+    buys = buys[buys['trade_date'].notna()]
+    if buys.empty:
+        return buys.reset_index(drop=True), pd.DataFrame(columns=best_cols)
+
+    sorted_buys = buys.sort_values(['ticker', 'trade_date'], kind='mergesort').reset_index(drop=True)
+
+    ticker_codes, ticker_names = pd.factorize(sorted_buys['ticker'], sort=False)
+    insider_codes, _ = pd.factorize(sorted_buys['insider'], sort=False)
+    dates = sorted_buys['trade_date'].to_numpy(dtype='datetime64[ns]')
+
+    lo, hi = _window_bounds(ticker_codes, dates, window_days)
+
+    values = pd.to_numeric(sorted_buys['value_calc'], errors='coerce').to_numpy(dtype=np.float64)
+    conviction = pd.to_numeric(sorted_buys['conviction'], errors='coerce').to_numpy(dtype=np.float64)
+
+    value_prefix = _prefix(np.nan_to_num(values, nan=0.0))
+    conv_valid = ~np.isnan(conviction)
+    conv_count_prefix = _prefix(conv_valid.astype(np.float64))
+
+    counts = _unique_counts(insider_codes, lo, hi)
+    totals = value_prefix[hi] - value_prefix[lo]
+
+    # Per-ticker lexicographic argmax over (count, total), first row wins ties.
+    # Rows are contiguous per ticker, so reduceat over group starts suffices.
+    group_starts = np.flatnonzero(np.r_[True, ticker_codes[1:] != ticker_codes[:-1]])
+    group_ids = np.repeat(np.arange(len(group_starts)), np.diff(np.r_[group_starts, len(ticker_codes)]))
+
+    max_count = np.maximum.reduceat(counts, group_starts)
+    is_max_count = counts == max_count[group_ids]
+    masked_totals = np.where(is_max_count, totals, -np.inf)
+    max_total = np.maximum.reduceat(masked_totals, group_starts)
+    is_best = is_max_count & (totals == max_total[group_ids])
+    best_rows = np.flatnonzero(is_best)
+    _, first = np.unique(group_ids[best_rows], return_index=True)
+    best_rows = best_rows[first]
+
+    best_lo = lo[best_rows]
+    best_hi = hi[best_rows]
+    best_counts = counts[best_rows]
+
+    # Recompute the winning windows' aggregates directly from their rows so the
+    # reported figures don't carry prefix-sum rounding.
+    best_totals = np.empty(len(best_rows), dtype=np.float64)
+    best_conv = np.empty(len(best_rows), dtype=np.float64)
+    for k, (a, b) in enumerate(zip(best_lo.tolist(), best_hi.tolist())):
+        best_totals[k] = np.nansum(values[a:b])
+        best_conv[k] = np.mean(conviction[a:b][conv_valid[a:b]]) if conv_count_prefix[b] > conv_count_prefix[a] else np.nan
+
+    # A window with no named insiders and no value never beats the initial
+    # (0, 0) state of the original loop — report it as an empty cluster.
+    empty = (best_counts == 0) & ~(best_totals > 0)
+    best_counts = np.where(empty, 0, best_counts)
+    best_totals = np.where(empty, 0.0, best_totals)
+    best_conv = np.where(empty, 0.0, best_conv)
+    best_lo = np.where(empty, 0, best_lo)
+    best_hi = np.where(empty, 0, best_hi)
+
+    last_trade = sorted_buys.groupby(ticker_codes, sort=True)['trade_date'].max().to_numpy()
+
+    best = pd.DataFrame({
+        'last_trade_date': last_trade,
+        'cluster_count': best_counts.astype(int),
+        'total_value': best_totals,
+        'avg_conviction': best_conv,
+        'window_start': best_lo.astype(int),
+        'window_end': best_hi.astype(int),
+    }, index=pd.Index(ticker_names, name='ticker'))
+
+    return sorted_buys, best
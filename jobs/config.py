@@ -153,8 +153,18 @@ MIN_POLITICIANS_FOR_CLUSTER = 2  # Min politicians needed for cluster signal
 TIER_1_MIN_SIGNALS = 3  # Tier 1: 3+ signals (highest conviction)
 TIER_2_MIN_SIGNALS = 2  # Tier 2: 2 signals (high conviction)
 
+# OpenInsider Fetch
+OPENINSIDER_WINDOW_DAYS = 7  # Filing-date window returned each run
+OPENINSIDER_INCREMENTAL = True  # Only fetch/parse filings newer than the last run; reuse the rest
+OPENINSIDER_RECENT_CACHE_FILE = "data/openinsider_recent.csv"  # Parsed rows from the current window
+OPENINSIDER_OVERLAP_HOURS = 24  # Re-parse this far behind the newest cached filing (late-published filings)
+
 # SEC EDGAR Settings
 SEC_USER_AGENT = "InsiderClusterWatch samie.mirghani@gmail.com"  # Required by SEC
+SEC_EDGAR_MAX_FILINGS = 200  # Form 4 filings listed per run (feed is paged 100 at a time)
+SEC_FORM4_MAX_WORKERS = 8  # Form 4 downloads in flight (the HTTP client holds SEC to 10 req/s)
+FORM4_ACCESSION_CACHE_FILE = "data/form4_accession_cache.json"  # Parsed Form 4s keyed by accession number
+FORM4_ACCESSION_CACHE_DAYS = 30  # Forget parsed filings after this many days
 
 # Multi-Signal Position Sizing (overrides standard sizing for multi-signal trades)
 MULTI_SIGNAL_POSITION_SIZES = {
@@ -187,8 +197,8 @@ MULTI_SIGNAL_TAKE_PROFIT = {
 ENABLE_INSIDER_SCORING = True  # Enable tracking of individual insider performance
 INSIDER_LOOKBACK_YEARS = 3  # Years of history to analyze for insider performance
 MIN_TRADES_FOR_INSIDER_SCORE = 3  # Minimum trades needed to calculate reliable score
-INSIDER_OUTCOME_UPDATE_BATCH_SIZE = 50  # Max trades to update per run (rate limit protection)
-INSIDER_API_RATE_LIMIT_DELAY = 0.3  # Delay between API calls in seconds
+INSIDER_OUTCOME_UPDATE_BATCH_SIZE = 2000  # Max trades to update per run (histories are read once per ticker)
+INSIDER_API_RATE_LIMIT_DELAY = 0.3  # Delay between API calls in seconds (per-trade outcome path only)
 INSIDER_SCORE_WEIGHT = 0.15  # Weight of insider score in overall ranking (0-1)
 
 # Insider Score Multiplier Range
@@ -219,6 +229,13 @@ SHORT_INTEREST_CONVICTION_BOOST = 1.0  # Conviction points to add for high short
 SQUEEZE_SETUP_CONVICTION_BOOST = 0.5  # Additional boost for very high SI + high days to cover
 SQUEEZE_SCORE_THRESHOLD = 70.0  # Score above this = high squeeze potential
 
+# Concurrent Signal Enrichment (news, short interest, 13F fetched concurrently per signal)
+ENRICHMENT_MAX_WORKERS = 8  # Shared thread pool size for all enrichment stages
+NEWS_MAX_CONCURRENCY = 4  # News fetches in flight at once
+SHORT_INTEREST_RATE_LIMIT_PER_SECOND = 4.0  # yfinance .info requests per second
+SHORT_INTEREST_MAX_CONCURRENCY = 4  # Short interest fetches in flight at once
+SEC_13F_MAX_CONCURRENCY = 2  # Tickers checked at once (the shared HTTP client enforces the SEC rate limit)
+
 # Realistic Paper Trading Settings
 REALISTIC_TRADING_MODE = True  # Enable realistic trading constraints
 MARKET_OPEN_HOUR = 9  # 9:30 AM ET
@@ -275,7 +292,7 @@ CONGRESS_GOV_API_KEY = os.getenv('CONGRESS_GOV_API_KEY', None)
 
 # FMP API Settings (Financial Modeling Prep)
 FMP_API_KEY = os.getenv('FMP_API_KEY', None)  # FMP API key for company profile data
-INDUSTRY_CACHE_FILE = "data/company_profiles_cache.json"  # Cache file for company profiles
+INDUSTRY_CACHE_FILE = "data/company_profiles_cache.sqlite"  # Cache store for company profiles
 INDUSTRY_CACHE_TTL_DAYS = 30  # Industry cache TTL (30 days - industry rarely changes)
 MAX_PARALLEL_WORKERS = 5  # Max parallel workers for batch API fetching
 
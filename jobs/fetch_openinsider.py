@@ -5,12 +5,19 @@ Returns a pandas.DataFrame with columns:
   filing_date, trade_date, ticker, insider, title, trade_type, qty, price, owned, value
 """
 
+import os
+import math
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import time
 import logging
+from datetime import datetime, timedelta
 from ticker_validator import validate_and_normalize_ticker
+from http_client import get_http_client
+from openinsider_parser import OPENINSIDER_COLUMNS, parse_openinsider_table
+from config import (OPENINSIDER_WINDOW_DAYS, OPENINSIDER_INCREMENTAL, OPENINSIDER_RECENT_CACHE_FILE,
+                    OPENINSIDER_OVERLAP_HOURS)
 
 logger = logging.getLogger(__name__)
 
@@ -20,21 +27,70 @@ OPENINS_URLS = [
     "http://openinsider.com/screener"    # Fallback for restricted networks
 ]
 
-def fetch_openinsider_recent(max_retries=3):
+# Columns that identify one trade when merging re-parsed rows into the cache
+OPENINSIDER_TRADE_KEY = ['filing_date', 'trade_date', 'ticker', 'insider', 'trade_type', 'qty', 'price']
+
+def load_recent_rows(path=None):
+    """Rows parsed on earlier runs that are still inside the window (or None)."""
+    path = path or OPENINSIDER_RECENT_CACHE_FILE
+    try:
+        if not os.path.exists(path):
+            return None
+        # Text columns stay text (a ticker like "NA" must not become NaN)
+        cached = pd.read_csv(path, keep_default_na=False,
+                             na_values={'filing_date': [''], 'trade_date': ['']},
+                             parse_dates=['filing_date', 'trade_date'])
+        cutoff = datetime.now() - timedelta(days=OPENINSIDER_WINDOW_DAYS)
+        cached = cached[cached['filing_date'] >= cutoff]
+        return cached[OPENINSIDER_COLUMNS] if not cached.empty else None
+    except Exception as e:
+        logger.warning(f"Could not load cached OpenInsider rows: {e}")
+        return None
+
+
+def save_recent_rows(df, path=None):
+    path = path or OPENINSIDER_RECENT_CACHE_FILE
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        df.to_csv(path, index=False)
+    except Exception as e:
+        logger.warning(f"Could not save OpenInsider rows: {e}")
+
+
+def fetch_openinsider_recent(max_retries=3, incremental=OPENINSIDER_INCREMENTAL):
     """
     Fetch recent insider transactions with retry logic.
 
     Args:
         max_retries: Number of retry attempts if request fails
+        incremental: Only request and parse filings from the last
+            OPENINSIDER_OVERLAP_HOURS before the newest one seen on an earlier
+            run onwards, merging them with the cached rows
 
     Returns:
         DataFrame with insider transaction data
     """
+    # Incremental: ask only for the days since the newest cached filing and
+    # skip rows filed well before it; the rest of the window comes from the
+    # cache. OpenInsider sometimes publishes a filing late with an earlier
+    # filing time, so an overlap window behind the newest filing is re-parsed
+    # and merged on the trade key.
+    cached = load_recent_rows() if incremental else None
+    newer_than = None
+    fetch_days = OPENINSIDER_WINDOW_DAYS
+    if cached is not None:
+        newest = cached['filing_date'].max()
+        newer_than = (newest - timedelta(hours=OPENINSIDER_OVERLAP_HOURS)).strftime('%Y-%m-%d %H:%M:%S')
+        days_since = (datetime.now() - newest).total_seconds() / 86400
+        fetch_days = min(OPENINSIDER_WINDOW_DAYS, max(1, math.ceil(days_since) + 1))
+        print(f"   ♻️  {len(cached)} cached rows through {newest}; re-parsing from {newer_than}, "
+              f"fetching last {fetch_days} day(s)")
+
     # Request last 7 days to only get RECENT filings
     # This prevents re-detecting old clusters from stale data
     # Historical data for 90d outcomes is already saved in insider_trades_history.csv
     params = {
-        'fd': '7',         # Last 7 days (reduced from 180 to prevent duplicate signals)
+        'fd': str(fetch_days),  # Last 7 days, fewer when incremental (reduced from 180 to prevent duplicate signals)
         'xp': '1',         # Exclude options (we want open market)
         'sortcol': '0',    # Sort by filing date
         'cnt': '5000',     # Max results (increased from 1000)
@@ -53,9 +109,9 @@ def fetch_openinsider_recent(max_retries=3):
         'Cache-Control': 'max-age=0'
     }
 
-    # Use a session for better connection handling
-    session = requests.Session()
-    session.headers.update(headers)
+    # Shared client pools the connection and rate-limits openinsider.com;
+    # retries stay here so the HTTPS -> HTTP fallback keeps working
+    client = get_http_client()
 
     # Track connection errors to trigger HTTP fallback
     https_failed = False
@@ -77,7 +133,7 @@ def fetch_openinsider_recent(max_retries=3):
             if attempt > 0:
                 time.sleep(2)
 
-            r = session.get(url, params=params, timeout=30)
+            r = client.get(url, params=params, headers=headers, timeout=30, retries=0)
 
             # Check for common blocking scenarios
             if r.status_code == 403:
@@ -87,92 +143,38 @@ def fetch_openinsider_recent(max_retries=3):
                 if attempt < max_retries - 1:
                     continue
                 else:
-                    return pd.DataFrame(columns=['filing_date','trade_date','ticker','insider','title','trade_type','qty','price','owned','value'])
+                    return pd.DataFrame(columns=OPENINSIDER_COLUMNS)
 
             r.raise_for_status()
 
-            soup = BeautifulSoup(r.text, 'html.parser')
-            table = soup.find('table', {'class': 'tinytable'})
+            # Stream the tinytable straight into typed columns
+            df = parse_openinsider_table(r.content, newer_than=newer_than, newest_first=True)
 
-            if not table:
+            if df is None:
                 print("⚠️  Warning: Could not find data table on OpenInsider")
                 print(f"   Page length: {len(r.text)} bytes")
                 print(f"   Status code: {r.status_code}")
                 # Try to find any table to help diagnose
-                all_tables = soup.find_all('table')
+                all_tables = BeautifulSoup(r.text, 'html.parser').find_all('table')
                 if all_tables:
                     print(f"   Found {len(all_tables)} table(s) with classes: {[t.get('class') for t in all_tables]}")
-                return pd.DataFrame(columns=['filing_date','trade_date','ticker','insider','title','trade_type','qty','price','owned','value'])
+                return pd.DataFrame(columns=OPENINSIDER_COLUMNS)
 
-            rows = []
-            table_rows = table.find_all('tr')[1:]  # Skip header row
-            
-            print(f"   Parsing {len(table_rows)} rows from OpenInsider...")
-            
-            for tr in table_rows:
-                cols = [td.get_text(strip=True) for td in tr.find_all('td')]
-                
-                # OpenInsider table has these columns:
-                # 0: X (indicator)
-                # 1: Filing Date
-                # 2: Trade Date
-                # 3: Ticker
-                # 4: Company Name (we'll skip this)
-                # 5: Insider Name
-                # 6: Title
-                # 7: Trans Type (P/S/etc)
-                # 8: Last Price
-                # 9: Qty
-                # 10: Owned
-                # 11: ΔOwn
-                # 12: Value
-                
-                if len(cols) < 13:  # Need at least 13 columns
-                    continue
-                    
-                try:
-                    # Correct column mapping
-                    trade_type = cols[7]  # Transaction type (P/S/M/etc)
-                    
-                    # Skip if not a clear buy or sale
-                    if not trade_type or trade_type == '-':
-                        continue
-                    
-                    row_data = {
-                        'filing_date': cols[1],      # Filing date
-                        'trade_date': cols[2],       # Trade date  
-                        'ticker': cols[3],           # Ticker symbol
-                        'insider': cols[5],          # Insider name (skip company name at cols[4])
-                        'title': cols[6],            # Title/position
-                        'trade_type': trade_type,    # Transaction type
-                        'qty': cols[9].replace(',','').replace('+',''),           # Quantity
-                        'price': cols[8].replace('$','').replace(',',''),         # Price
-                        'owned': cols[10].replace(',','').replace('+',''),        # Owned after
-                        'value': cols[12].replace('$','').replace(',','').replace('+','')  # Value
-                    }
-                    
-                    rows.append(row_data)
-                    
-                except Exception as e:
-                    # Skip rows that don't parse correctly
-                    continue
+            print(f"   Parsed {len(df)} rows from OpenInsider...")
+
+            if incremental:
+                if cached is not None:
+                    df = cached if df.empty else (
+                        pd.concat([cached, df], ignore_index=True)
+                        .drop_duplicates(subset=OPENINSIDER_TRADE_KEY, keep='last', ignore_index=True))
+                save_recent_rows(df)
 
-            if not rows:
+            if df.empty:
                 print("⚠️  No rows successfully parsed")
-                return pd.DataFrame(columns=['filing_date','trade_date','ticker','insider','title','trade_type','qty','price','owned','value'])
-            
-            df = pd.DataFrame(rows)
-            
-            # Convert data types
-            for c in ['qty','price','owned','value']:
-                df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0)
-            
-            df['trade_date'] = pd.to_datetime(df['trade_date'], errors='coerce')
-            df['filing_date'] = pd.to_datetime(df['filing_date'], errors='coerce')
+                return pd.DataFrame(columns=OPENINSIDER_COLUMNS)
             
             # Filter to keep only recent trades (last 14 days)
             # Historical data is already saved for outcome tracking
-            from datetime import datetime, timedelta
             cutoff_date = datetime.now() - timedelta(days=14)
             df = df[df['trade_date'] >= cutoff_date]
             
@@ -254,7 +256,7 @@ def fetch_openinsider_recent(max_retries=3):
                 time.sleep(wait_time)
             else:
                 print("❌ All retry attempts failed - OpenInsider is not responding")
-                return pd.DataFrame(columns=['filing_date','trade_date','ticker','insider','title','trade_type','qty','price','owned','value'])
+                return pd.DataFrame(columns=OPENINSIDER_COLUMNS)
 
         except requests.exceptions.HTTPError as e:
             print(f"❌ HTTP Error {e.response.status_code}: {e}")
@@ -266,7 +268,7 @@ def fetch_openinsider_recent(max_retries=3):
                 time.sleep(wait_time)
             else:
                 print("❌ All attempts failed - unable to access OpenInsider")
-                return pd.DataFrame(columns=['filing_date','trade_date','ticker','insider','title','trade_type','qty','price','owned','value'])
+                return pd.DataFrame(columns=OPENINSIDER_COLUMNS)
 
         except requests.exceptions.ConnectionError as e:
             error_str = str(e)
@@ -290,7 +292,7 @@ def fetch_openinsider_recent(max_retries=3):
                 time.sleep(wait_time)
             else:
                 print("❌ All connection attempts failed - OpenInsider is unreachable")
-                return pd.DataFrame(columns=['filing_date','trade_date','ticker','insider','title','trade_type','qty','price','owned','value'])
+                return pd.DataFrame(columns=OPENINSIDER_COLUMNS)
 
         except Exception as e:
             print(f"❌ Unexpected error: {type(e).__name__}: {e}")
@@ -301,9 +303,9 @@ def fetch_openinsider_recent(max_retries=3):
                 time.sleep(wait_time)
             else:
                 print("❌ All attempts failed")
-                return pd.DataFrame(columns=['filing_date','trade_date','ticker','insider','title','trade_type','qty','price','owned','value'])
+                return pd.DataFrame(columns=OPENINSIDER_COLUMNS)
     
-    return pd.DataFrame(columns=['filing_date','trade_date','ticker','insider','title','trade_type','qty','price','owned','value'])
+    return pd.DataFrame(columns=OPENINSIDER_COLUMNS)
 
 if __name__ == "__main__":
     print("="*60)
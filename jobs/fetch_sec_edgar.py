@@ -2,17 +2,34 @@
 """
 Fetch Form 4 filings directly from SEC EDGAR as a backup to OpenInsider.
 Parses the EDGAR RSS feed and individual Form 4 XML files.
+
+Ingestion runs in three parts:
+- Form4AccessionCache: parsed transactions persisted by accession number, so
+  filings seen on an earlier run (the days_back windows overlap) are never
+  downloaded or parsed again
+- A bounded thread pool downloads the remaining filings; the shared HTTP
+  client holds all SEC traffic to 10 requests/second
+- iter_form4_transactions streams each filing's XML with iterparse and emits
+  rows straight into the OpenInsider-compatible schema
 """
 
+import io
+import os
+import re
+import json
+import logging
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 from datetime import datetime, timedelta
-import time
-import re
-import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional
 from xml.etree import ElementTree as ET
 from ticker_validator import validate_and_normalize_ticker, get_failed_ticker_cache
+from http_client import get_http_client
+from config import (
+    SEC_EDGAR_MAX_FILINGS, SEC_FORM4_MAX_WORKERS,
+    FORM4_ACCESSION_CACHE_FILE, FORM4_ACCESSION_CACHE_DAYS
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +43,11 @@ SEC_HEADERS = {
     'Accept-Encoding': 'gzip, deflate',
     'Host': 'www.sec.gov'
 }
+SEC_FEED_PAGE_SIZE = 100  # SEC limits to 100 entries per request
+OPENINSIDER_COLUMNS = ['filing_date','trade_date','ticker','insider','title','trade_type','qty','price','owned','value']
+ACCESSION_PATTERN = re.compile(r'(\d{10}-\d{2}-\d{6})')
 
-def fetch_recent_form4_filings(days_back=3, max_filings=100):
+def fetch_recent_form4_filings(days_back=3, max_filings=SEC_EDGAR_MAX_FILINGS):
     """
     Fetch recent Form 4 filings from SEC EDGAR.
     
@@ -52,12 +72,10 @@ def fetch_recent_form4_filings(days_back=3, max_filings=100):
         'datea': start_date.strftime('%Y%m%d'),
         'owner': 'include',  # Include insider filings
         'start': 0,
-        'count': min(max_filings, 100),  # SEC limits to 100 per request
+        'count': min(max_filings, SEC_FEED_PAGE_SIZE),
         'output': 'atom'  # Get results in XML format
     }
     
-    filing_urls = []
-
     # Try HTTPS first, fall back to HTTP if needed
     for url_index, sec_url in enumerate(SEC_RSS_URLS):
         try:
@@ -65,30 +83,41 @@ def fetch_recent_form4_filings(days_back=3, max_filings=100):
             if url_index > 0:
                 print(f"   🔄 Trying {protocol} fallback...")
 
-            response = requests.get(
-                sec_url,
-                params=params,
-                headers=SEC_HEADERS,
-                timeout=30
-            )
-            response.raise_for_status()
+            filing_urls = []
+            namespace = {'atom': 'http://www.w3.org/2005/Atom'}
 
-            # Parse the ATOM/XML feed
-            root = ET.fromstring(response.content)
+            # Page through the feed until max_filings or the feed runs out
+            for start in range(0, max_filings, SEC_FEED_PAGE_SIZE):
+                params['start'] = start
+                params['count'] = min(SEC_FEED_PAGE_SIZE, max_filings - start)
 
-            # Extract filing URLs from the feed
-            namespace = {'atom': 'http://www.w3.org/2005/Atom'}
-            entries = root.findall('.//atom:entry', namespace)
+                response = get_http_client().get(
+                    sec_url,
+                    params=params,
+                    headers=SEC_HEADERS,
+                    timeout=30
+                )
+                response.raise_for_status()
+
+                # Parse the ATOM/XML feed
+                root = ET.fromstring(response.content)
 
-            for entry in entries[:max_filings]:
-                link = entry.find('.//atom:link[@rel="alternate"]', namespace)
-                if link is not None:
-                    filing_url = link.get('href')
-                    if filing_url:
-                        # Convert to documents page
-                        filing_url = filing_url.replace('-index.htm', '.txt')
-                        filing_urls.append(filing_url)
+                # Extract filing URLs from the feed
+                entries = root.findall('.//atom:entry', namespace)
 
+                for entry in entries:
+                    link = entry.find('.//atom:link[@rel="alternate"]', namespace)
+                    if link is not None:
+                        filing_url = link.get('href')
+                        if filing_url:
+                            # Convert to documents page
+                            filing_url = filing_url.replace('-index.htm', '.txt')
+                            filing_urls.append(filing_url)
+
+                if len(entries) < params['count']:
+                    break
+
+            filing_urls = list(dict.fromkeys(filing_urls))
             print(f"✅ Found {len(filing_urls)} Form 4 filings")
             return filing_urls
 
@@ -117,148 +146,226 @@ def fetch_recent_form4_filings(days_back=3, max_filings=100):
 
     return []
 
-def parse_form4_xml(filing_url, max_retries=2):
+def accession_number(filing_url: str) -> str:
+    """Accession number (e.g. 0000950170-25-012345) from a filing URL."""
+    match = ACCESSION_PATTERN.search(filing_url)
+    return match.group(1) if match else filing_url
+
+
+class Form4AccessionCache:
     """
-    Parse a Form 4 XML file and extract transaction data.
-    
-    Returns:
-        List of transaction dictionaries
+    Parsed Form 4 transactions persisted by accession number.
+
+    Filings are immutable once filed, so a cached entry (including an empty
+    one: no purchases/sales, invalid ticker) is final. Entries older than
+    max_age_days are dropped on save to keep the file small.
     """
-    transactions = []
-    
-    for attempt in range(max_retries):
+
+    def __init__(self, path: str = FORM4_ACCESSION_CACHE_FILE,
+                 max_age_days: int = FORM4_ACCESSION_CACHE_DAYS):
+        self.path = path
+        self.max_age_days = max_age_days
+        self.entries: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self) -> None:
         try:
-            # Fetch the filing
-            response = requests.get(filing_url, headers=SEC_HEADERS, timeout=20)
-            response.raise_for_status()
-            
-            # Parse XML
-            content = response.text
-            
-            # Extract XML portion (Form 4s have XML embedded in text)
-            xml_match = re.search(r'<XML>(.*?)</XML>', content, re.DOTALL)
-            if not xml_match:
-                return []
-            
-            xml_content = xml_match.group(1)
-            root = ET.fromstring(xml_content)
-            
-            # Extract issuer (company) information
-            issuer = root.find('.//issuer')
-            if issuer is None:
-                return []
-            
-            ticker_elem = issuer.find('.//issuerTradingSymbol')
-            raw_ticker = ticker_elem.text if ticker_elem is not None else None
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    self.entries = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load Form 4 cache: {e}")
+            self.entries = {}
+
+    def get(self, accession: str) -> Optional[List[Dict]]:
+        entry = self.entries.get(accession)
+        return entry['transactions'] if entry else None
+
+    def put(self, accession: str, transactions: List[Dict]) -> None:
+        self.entries[accession] = {
+            'parsed_at': datetime.now().isoformat(),
+            'transactions': [
+                {k: (v.isoformat() if hasattr(v, 'isoformat') else v) for k, v in tx.items()}
+                for tx in transactions
+            ]
+        }
+
+    def save(self) -> None:
+        cutoff = (datetime.now() - timedelta(days=self.max_age_days)).isoformat()
+        self.entries = {k: v for k, v in self.entries.items() if v.get('parsed_at', '') >= cutoff}
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save Form 4 cache: {e}")
+
+
+def _text(elem, path: str) -> Optional[str]:
+    found = elem.find(path)
+    return found.text.strip() if found is not None and found.text else None
+
+
+def _number(elem, path: str) -> float:
+    text = _text(elem, path)
+    return float(text) if text else 0
 
+
+def iter_form4_transactions(xml_bytes: bytes, filing_date: datetime = None) -> Iterator[Dict]:
+    """
+    Stream a Form 4 ownership document and yield purchase/sale rows.
+
+    Issuer and reporting owner precede the transaction tables in the Form 4
+    schema, so each transaction element can be emitted (and freed) as soon as
+    it closes.
+
+    Args:
+        xml_bytes: The <ownershipDocument> XML
+        filing_date: Value for the filing_date column (default: now)
+
+    Yields:
+        Transaction dicts in the OpenInsider column schema
+    """
+    filing_date = filing_date or datetime.now()
+    ticker = None
+    owner_name = None
+    is_director = is_officer = False
+    officer_title = None
+
+    for _, elem in ET.iterparse(io.BytesIO(xml_bytes), events=('end',)):
+        tag = elem.tag
+
+        if tag == 'issuerTradingSymbol':
+            raw_ticker = (elem.text or '').strip()
             if not raw_ticker:
-                return []
+                return
 
             # TICKER VALIDATION: Normalize and validate ticker
             # Removes .Q, .G, .M suffixes and checks against blacklist
             ticker, validation_error, _ = validate_and_normalize_ticker(raw_ticker)
-
             if not ticker:
                 # Invalid ticker - log and skip
                 if validation_error and 'Blacklisted' not in validation_error:
                     logger.debug(f"Skipping invalid ticker '{raw_ticker}': {validation_error}")
-                return []
-            
-            # Extract reporting owner (insider) information
-            owner = root.find('.//reportingOwner')
-            if owner is None:
-                return []
-            
-            owner_name_elem = owner.find('.//rptOwnerName')
-            owner_name = owner_name_elem.text if owner_name_elem is not None else 'Unknown'
-            
-            # Extract relationship/title
-            relationship = owner.find('.//reportingOwnerRelationship')
-            title_parts = []
-            if relationship is not None:
-                if relationship.find('.//isDirector') is not None and relationship.find('.//isDirector').text == '1':
+                return
+
+        elif tag == 'rptOwnerName' and owner_name is None:
+            owner_name = (elem.text or 'Unknown').strip()
+
+        elif tag == 'isDirector':
+            is_director = is_director or (elem.text or '').strip() in ('1', 'true')
+
+        elif tag == 'isOfficer':
+            is_officer = is_officer or (elem.text or '').strip() in ('1', 'true')
+
+        elif tag == 'officerTitle' and officer_title is None:
+            officer_title = elem.text
+
+        elif tag in ('nonDerivativeTransaction', 'derivativeTransaction'):
+            if ticker is None or owner_name is None:
+                return
+
+            try:
+                tx_date = _text(elem, './/transactionDate/value')
+                tx_code = _text(elem, './/transactionCode')
+                if tx_date is None or tx_code is None:
+                    continue
+
+                # Map transaction codes to types
+                if tx_code in ['P', 'M']:  # P=Purchase, M=Option Exercise
+                    trade_type = 'P - Purchase'
+                elif tx_code in ['S']:  # S=Sale
+                    trade_type = 'S - Sale'
+                else:
+                    continue  # Skip other transaction types
+
+                qty = _number(elem, './/transactionShares/value')
+                price = _number(elem, './/transactionPricePerShare/value')
+                owned = _number(elem, './/sharesOwnedFollowingTransaction/value')
+
+                title_parts = []
+                if is_director:
                     title_parts.append('Director')
-                if relationship.find('.//isOfficer') is not None and relationship.find('.//isOfficer').text == '1':
-                    officer_title = relationship.find('.//officerTitle')
-                    if officer_title is not None:
-                        title_parts.append(officer_title.text)
-            
-            title = ', '.join(title_parts) if title_parts else 'Insider'
-            
-            # Extract transactions (both non-derivative and derivative)
-            for tx_type in ['.//nonDerivativeTransaction', './/derivativeTransaction']:
-                for transaction in root.findall(tx_type):
-                    try:
-                        # Transaction date
-                        tx_date_elem = transaction.find('.//transactionDate/value')
-                        if tx_date_elem is None:
-                            continue
-                        tx_date = pd.to_datetime(tx_date_elem.text)
-                        
-                        # Transaction code (P=Purchase, S=Sale, etc.)
-                        tx_code_elem = transaction.find('.//transactionCode')
-                        if tx_code_elem is None:
-                            continue
-                        tx_code = tx_code_elem.text
-                        
-                        # Map transaction codes to types
-                        if tx_code in ['P', 'M']:  # P=Purchase, M=Option Exercise
-                            trade_type = 'P - Purchase'
-                        elif tx_code in ['S']:  # S=Sale
-                            trade_type = 'S - Sale'
-                        else:
-                            continue  # Skip other transaction types
-                        
-                        # Shares/Quantity
-                        qty_elem = transaction.find('.//transactionShares/value')
-                        qty = float(qty_elem.text) if qty_elem is not None else 0
-                        
-                        # Price per share
-                        price_elem = transaction.find('.//transactionPricePerShare/value')
-                        price = float(price_elem.text) if price_elem is not None else 0
-                        
-                        # Shares owned after transaction
-                        owned_elem = transaction.find('.//sharesOwnedFollowingTransaction/value')
-                        owned = float(owned_elem.text) if owned_elem is not None else 0
-                        
-                        # Calculate value
-                        value = qty * price if price > 0 else 0
-                        
-                        # Add transaction
-                        transactions.append({
-                            'filing_date': datetime.now(),  # Today
-                            'trade_date': tx_date,
-                            'ticker': ticker.strip().upper(),
-                            'insider': owner_name.strip(),
-                            'title': title,
-                            'trade_type': trade_type,
-                            'qty': qty,
-                            'price': price,
-                            'owned': owned,
-                            'value': value
-                        })
-                        
-                    except Exception as e:
-                        print(f"   Warning: Error parsing transaction: {e}")
-                        continue
-            
-            # Rate limiting - be respectful to SEC servers
-            time.sleep(0.2)
-            return transactions
-            
-        except Exception as e:
-            if attempt < max_retries - 1:
-                print(f"   Retry {attempt + 1}/{max_retries} for {filing_url}")
-                time.sleep(2)
-            else:
-                print(f"   Error parsing {filing_url}: {e}")
-                return []
+                if is_officer and officer_title:
+                    title_parts.append(officer_title)
+
+                yield {
+                    'filing_date': filing_date,
+                    'trade_date': pd.to_datetime(tx_date),
+                    'ticker': ticker.strip().upper(),
+                    'insider': owner_name,
+                    'title': ', '.join(title_parts) if title_parts else 'Insider',
+                    'trade_type': trade_type,
+                    'qty': qty,
+                    'price': price,
+                    'owned': owned,
+                    'value': qty * price if price > 0 else 0
+                }
+
+            except Exception as e:
+                print(f"   Warning: Error parsing transaction: {e}")
+
+            finally:
+                elem.clear()
+
+
+def extract_form4_xml(content: bytes) -> Optional[bytes]:
+    """The <XML> block embedded in a Form 4 full-text submission."""
+    start = content.find(b'<XML>')
+    if start == -1:
+        return None
+    end = content.find(b'</XML>', start)
+    if end == -1:
+        return None
+    return content[start + len(b'<XML>'):end].strip()
+
+
+def _download_form4(filing_url: str, max_retries: int = 2) -> Optional[List[Dict]]:
+    """
+    Download and parse one filing.
+
+    Returns:
+        List of transactions ([] for filings with nothing to extract), or
+        None if the download failed (so the result isn't cached)
+    """
+    try:
+        response = get_http_client().get(filing_url, headers=SEC_HEADERS, timeout=20,
+                                         retries=max_retries - 1)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"   Error fetching {filing_url}: {e}")
+        return None
+
+    xml_bytes = extract_form4_xml(response.content)
+    if not xml_bytes:
+        return []
+
+    try:
+        return list(iter_form4_transactions(xml_bytes))
+    except ET.ParseError as e:
+        print(f"   Error parsing {filing_url}: {e}")
+        return []
+
+
+def parse_form4_xml(filing_url, max_retries=2):
+    """
+    Parse a Form 4 XML file and extract transaction data.
     
-    return []
+    Returns:
+        List of transaction dictionaries
+    """
+    return _download_form4(filing_url, max_retries) or []
 
-def fetch_sec_edgar_data(days_back=3, max_filings=50):
+def fetch_sec_edgar_data(days_back=3, max_filings=SEC_EDGAR_MAX_FILINGS, cache=None):
     """
     Main function to fetch and parse SEC EDGAR Form 4 data.
+
+    Args:
+        days_back: Number of days to look back
+        max_filings: Maximum number of filings to list and parse
+        cache: Optional Form4AccessionCache (default: the on-disk cache)
     
     Returns:
         DataFrame with same structure as OpenInsider data
@@ -268,28 +375,36 @@ def fetch_sec_edgar_data(days_back=3, max_filings=50):
     
     if not filing_urls:
         print("No Form 4 filings found on SEC EDGAR")
-        return pd.DataFrame(columns=['filing_date','trade_date','ticker','insider','title','trade_type','qty','price','owned','value'])
-    
-    # Parse each filing
+        return pd.DataFrame(columns=OPENINSIDER_COLUMNS)
+
+    cache = cache if cache is not None else Form4AccessionCache()
+    accessions = [accession_number(url) for url in filing_urls]
+    to_fetch = [(url, acc) for url, acc in zip(filing_urls, accessions) if cache.get(acc) is None]
+
+    # Download and parse only filings not seen on an earlier run
+    print(f"📄 Parsing {len(to_fetch)} filings ({len(filing_urls) - len(to_fetch)} already cached)...")
+
+    if to_fetch:
+        with ThreadPoolExecutor(max_workers=SEC_FORM4_MAX_WORKERS) as executor:
+            futures = {executor.submit(_download_form4, url): acc for url, acc in to_fetch}
+            for i, future in enumerate(as_completed(futures), 1):
+                if i % 25 == 0:
+                    print(f"   Progress: {i}/{len(to_fetch)} filings parsed")
+                transactions = future.result()
+                if transactions is not None:
+                    cache.put(futures[future], transactions)
+        cache.save()
+
     all_transactions = []
-    print(f"📄 Parsing {len(filing_urls)} filings...")
-    
-    for i, url in enumerate(filing_urls, 1):
-        if i % 10 == 0:
-            print(f"   Progress: {i}/{len(filing_urls)} filings parsed")
-        
-        transactions = parse_form4_xml(url)
-        all_transactions.extend(transactions)
-        
-        # Rate limiting
-        time.sleep(0.15)
+    for acc in dict.fromkeys(accessions):
+        all_transactions.extend(cache.get(acc) or [])
     
     if not all_transactions:
         print("No transactions extracted from filings")
-        return pd.DataFrame(columns=['filing_date','trade_date','ticker','insider','title','trade_type','qty','price','owned','value'])
+        return pd.DataFrame(columns=OPENINSIDER_COLUMNS)
     
     # Convert to DataFrame
-    df = pd.DataFrame(all_transactions)
+    df = pd.DataFrame(all_transactions, columns=OPENINSIDER_COLUMNS)
 
     # Ensure proper data types
     df['trade_date'] = pd.to_datetime(df['trade_date'])
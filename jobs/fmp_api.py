@@ -6,6 +6,8 @@ NEW FEATURES:
 - Smart analytics: API usage tracking, cost analysis, cache efficiency
 - Cache warming: Pre-populate S&P 500 tickers for 100% hit rate
 - Eliminates yfinance dependency for most fields
+- Keyed SQLite profile cache: per-ticker upserts, precomputed expiry per
+  field group, batch reads; nothing is parsed at startup
 
 Performance targets:
 - >95% success rate
@@ -16,18 +18,22 @@ Performance targets:
 
 import os
 import json
-import logging
 import time
+import atexit
+import sqlite3
+import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+
+from http_client import get_http_client, HttpQuotaExceeded
 
 # Configuration
 FMP_API_KEY = os.getenv('FMP_API_KEY')
-COMPANY_PROFILES_CACHE_FILE = "data/company_profiles_cache.json"
+COMPANY_PROFILES_DB_FILE = "data/company_profiles_cache.sqlite"
+COMPANY_PROFILES_CACHE_FILE = "data/company_profiles_cache.json"  # Legacy cache, imported once
 ANALYTICS_FILE = "data/fmp_analytics.json"
 PROFILE_CACHE_TTL_DAYS = 30  # Industry/sector rarely change
 PRICE_CACHE_TTL_HOURS = 24  # Price data expires daily
@@ -180,6 +186,148 @@ class FMPAnalytics:
         }
 
 
+class ProfileCache:
+    """
+    Keyed on-disk cache of FMP company profiles
+
+    One SQLite row per ticker holds the profile JSON and an expiry epoch per
+    field group (profile: PROFILE_CACHE_TTL_DAYS, price: PRICE_CACHE_TTL_HOURS),
+    computed from the profile's 'updated' timestamp when it is written. A
+    validity check is a single comparison, lookups read only the requested
+    tickers, and writes upsert only the tickers that changed.
+
+    An empty store imports the legacy JSON cache on first open.
+    """
+
+    EXPIRY_COLUMNS = {'profile': 'profile_expires', 'price': 'price_expires'}
+
+    def __init__(self, db_path: str = COMPANY_PROFILES_DB_FILE,
+                 legacy_json_file: Optional[str] = COMPANY_PROFILES_CACHE_FILE):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                ticker TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                profile_expires REAL NOT NULL,
+                price_expires REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+        if legacy_json_file and os.path.exists(legacy_json_file) and len(self) == 0:
+            self._import_json(legacy_json_file)
+
+    def _import_json(self, path: str) -> None:
+        """One-time import of the old company_profiles_cache.json"""
+        try:
+            with open(path, 'r') as f:
+                profiles = json.load(f)
+            self.put_many(profiles)
+            logger.info(f"Imported {len(profiles)} cached profiles from {path}")
+        except Exception as e:
+            logger.error(f"Error importing profile cache {path}: {e}")
+
+    @staticmethod
+    def _expiry(profile: Dict) -> Tuple[float, float]:
+        """(profile_expires, price_expires) epochs; 0 if 'updated' is missing or invalid"""
+        try:
+            updated = datetime.fromisoformat(profile['updated']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return 0.0, 0.0
+        return (updated + PROFILE_CACHE_TTL_DAYS * 86400,
+                updated + PRICE_CACHE_TTL_HOURS * 3600)
+
+    def _where_fresh(self, field: Optional[str]) -> Tuple[str, tuple]:
+        if field is None:
+            return '', ()
+        return f" AND {self.EXPIRY_COLUMNS[field]} > ?", (time.time(),)
+
+    def get(self, ticker: str, field: Optional[str] = None) -> Optional[Dict]:
+        """
+        Cached profile for a ticker
+
+        Args:
+            ticker: Normalized ticker
+            field: 'profile' or 'price' to return only data still fresh for
+                that field group; None returns the entry regardless of age
+
+        Returns:
+            Profile dict (may be the '_fmp_no_data' sentinel), or None
+        """
+        if field is not None and field not in self.EXPIRY_COLUMNS:
+            return None
+        clause, args = self._where_fresh(field)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT data FROM profiles WHERE ticker = ?{clause}", (ticker, *args)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, tickers: List[str], field: Optional[str] = None) -> Dict[str, Dict]:
+        """Batch version of get(): {ticker: profile} for the tickers found"""
+        if field is not None and field not in self.EXPIRY_COLUMNS:
+            return {}
+        clause, args = self._where_fresh(field)
+        unique = list(dict.fromkeys(tickers))
+        result = {}
+        with self._lock:
+            for i in range(0, len(unique), 500):
+                chunk = unique[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT ticker, data FROM profiles WHERE ticker IN ({placeholders}){clause}",
+                    (*chunk, *args)
+                ).fetchall()
+                for ticker, data in rows:
+                    result[ticker] = json.loads(data)
+        return result
+
+    def is_valid(self, ticker: str, field: str = 'profile') -> bool:
+        """True if the ticker's cached data is fresh for the field group"""
+        if field not in self.EXPIRY_COLUMNS:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT 1 FROM profiles WHERE ticker = ? AND {self.EXPIRY_COLUMNS[field]} > ?",
+                (ticker, time.time())
+            ).fetchone()
+        return row is not None
+
+    def put(self, ticker: str, profile: Dict) -> None:
+        """Upsert one ticker's profile"""
+        self.put_many({ticker: profile})
+
+    def put_many(self, profiles: Dict[str, Dict]) -> None:
+        """Upsert several profiles in one transaction"""
+        if not profiles:
+            return
+        rows = [(ticker, json.dumps(profile), *self._expiry(profile))
+                for ticker, profile in profiles.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO profiles (ticker, data, profile_expires, price_expires) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+        logger.debug(f"Saved {len(rows)} profiles to cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection (checkpoints the WAL into the main file)"""
+        with self._lock:
+            self._conn.close()
+
+
 class EnhancedFMPAPIClient:
     """
     Enhanced FMP API client with multi-field caching and analytics
@@ -189,64 +337,21 @@ class EnhancedFMPAPIClient:
     """
 
     def __init__(self, api_key: Optional[str] = None,
-                 cache_file: str = COMPANY_PROFILES_CACHE_FILE):
+                 cache_file: str = COMPANY_PROFILES_DB_FILE,
+                 legacy_cache_file: Optional[str] = COMPANY_PROFILES_CACHE_FILE):
         """Initialize enhanced FMP API client"""
         self.api_key = api_key or FMP_API_KEY
         self.cache_file = cache_file
-        self.cache = {}
         self.analytics = FMPAnalytics()
 
         if not self.api_key:
             logger.warning("FMP_API_KEY not set. API calls will fail.")
 
-        # Load cache
-        self._load_cache()
-
-        # Create session with retry logic
-        self.session = self._create_session()
+        # Keyed profile cache (rows are read on lookup, not at startup)
+        self.cache = ProfileCache(cache_file, legacy_json_file=legacy_cache_file)
 
-    def _create_session(self) -> requests.Session:
-        """Create requests session with retry logic"""
-        session = requests.Session()
-
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET"]
-        )
-
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
-
-        return session
-
-    def _load_cache(self) -> None:
-        """Load cache from disk"""
-        try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r') as f:
-                    self.cache = json.load(f)
-                logger.info(f"Loaded {len(self.cache)} cached profiles")
-            else:
-                logger.info("No cache file found. Starting with empty cache.")
-                self.cache = {}
-        except Exception as e:
-            logger.error(f"Error loading cache: {e}")
-            self.cache = {}
-
-    def _save_cache(self) -> None:
-        """Save cache to disk"""
-        try:
-            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
-
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
-
-            logger.debug(f"Saved {len(self.cache)} profiles to cache")
-        except Exception as e:
-            logger.error(f"Error saving cache: {e}")
+        # Shared client: pooling, retries and the per-host rate limit
+        self.http = get_http_client()
 
     def _is_cache_valid(self, ticker: str, field: str = 'profile') -> bool:
         """
@@ -259,28 +364,7 @@ class EnhancedFMPAPIClient:
         Returns:
             True if valid, False otherwise
         """
-        if ticker not in self.cache:
-            return False
-
-        cached_data = self.cache[ticker]
-        if 'updated' not in cached_data:
-            return False
-
-        try:
-            updated_date = datetime.fromisoformat(cached_data['updated'])
-            age = datetime.now() - updated_date
-
-            if field == 'profile':
-                # Profile data (industry/sector): 30 days TTL
-                return age.days < PROFILE_CACHE_TTL_DAYS
-            elif field == 'price':
-                # Price data: 24 hours TTL
-                return age.total_seconds() < (PRICE_CACHE_TTL_HOURS * 3600)
-            else:
-                return False
-
-        except Exception:
-            return False
+        return self.cache.is_valid(ticker, field)
 
     def _fetch_profile(self, ticker: str) -> Optional[Dict]:
         """
@@ -318,7 +402,7 @@ class EnhancedFMPAPIClient:
                 'apikey': self.api_key
             }
 
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             response.raise_for_status()
 
             data = response.json()
@@ -328,11 +412,11 @@ class EnhancedFMPAPIClient:
 
             if not data or not isinstance(data, list) or len(data) == 0:
                 logger.warning(f"Empty response for {ticker} — caching no-data sentinel to skip future fetches")
-                self.cache[ticker.upper().strip()] = {
+                self.cache.put(ticker.upper().strip(), {
                     "_fmp_no_data": True,
                     "updated": datetime.now().isoformat(),
                     "source": "fmp_api",
-                }
+                })
                 return None
 
             profile = data[0]
@@ -384,6 +468,11 @@ class EnhancedFMPAPIClient:
 
             return result
 
+        except HttpQuotaExceeded as e:
+            # Throttled locally; nothing was sent to FMP
+            logger.warning(f"FMP quota reached for {ticker}: {e}")
+            cached = self.cache.get(ticker.upper().strip())
+            return cached if cached and not cached.get('_fmp_no_data') else None
         except requests.exceptions.HTTPError as e:
             self.analytics.record_api_call(success=False)
             if e.response.status_code == 404:
@@ -410,26 +499,21 @@ class EnhancedFMPAPIClient:
         ticker = ticker.upper().strip()
 
         # Check cache
-        if not force_refresh and self._is_cache_valid(ticker, 'profile'):
-            cached = self.cache[ticker]
+        cached = None if force_refresh else self.cache.get(ticker, 'profile')
+        if cached is not None:
             if cached.get('_fmp_no_data'):
                 # Sentinel: FMP previously returned no data — don't leak to caller
                 return None
             self.analytics.record_cache_hit()
             return cached
 
-        # Fetch from API
+        # Fetch from API (a no-data sentinel is persisted by _fetch_profile)
         self.analytics.record_cache_miss()
         profile = self._fetch_profile(ticker)
 
         if profile:
-            self.cache[ticker] = profile
-            self._save_cache()
+            self.cache.put(ticker, profile)
             return profile
-
-        # Persist sentinel written by _fetch_profile() so it survives restarts
-        if ticker in self.cache and self.cache[ticker].get('_fmp_no_data'):
-            self._save_cache()
         return None
 
     def get_field(self, ticker: str, field: str) -> Optional[any]:
@@ -461,11 +545,12 @@ class EnhancedFMPAPIClient:
         tickers = [t.upper().strip() for t in tickers if t]
         results = {}
 
-        # Check cache
+        # Check cache (one batched read)
+        fresh = {} if force_refresh else self.cache.get_many(tickers, 'profile')
         missing_tickers = []
         for ticker in tickers:
-            if not force_refresh and self._is_cache_valid(ticker, 'profile'):
-                cached = self.cache[ticker]
+            cached = fresh.get(ticker)
+            if cached is not None:
                 if cached.get('_fmp_no_data'):
                     # Sentinel: FMP had no data last time — skip API call, don't populate results
                     logger.debug(f"Skipping {ticker} — FMP returned no data previously (sentinel cached)")
@@ -480,6 +565,7 @@ class EnhancedFMPAPIClient:
 
             # Parallel fetch
             start_time = time.time()
+            fetched = {}
 
             with ThreadPoolExecutor(max_workers=MAX_PARALLEL_WORKERS) as executor:
                 future_to_ticker = {
@@ -494,13 +580,13 @@ class EnhancedFMPAPIClient:
                     try:
                         profile = future.result()
                         if profile:
-                            self.cache[ticker] = profile
+                            fetched[ticker] = profile
                             results[ticker] = profile
                     except Exception as e:
                         logger.error(f"Error processing {ticker}: {e}")
 
-            # Save cache and analytics
-            self._save_cache()
+            # Upsert only the fetched tickers
+            self.cache.put_many(fetched)
 
             elapsed = time.time() - start_time
             logger.info(f"Fetched {len(missing_tickers)} profiles in {elapsed:.2f}s")
@@ -541,6 +627,10 @@ class EnhancedFMPAPIClient:
         self.analytics.snapshot_efficiency(len(self.cache))
         self.analytics.save()
 
+    def close(self) -> None:
+        """Close the profile cache"""
+        self.cache.close()
+
 
 # Global singleton
 _enhanced_client = None
@@ -551,6 +641,8 @@ def get_enhanced_client() -> EnhancedFMPAPIClient:
     global _enhanced_client
     if _enhanced_client is None:
         _enhanced_client = EnhancedFMPAPIClient()
+        # Closing checkpoints the WAL, so the committed cache file is complete
+        atexit.register(_enhanced_client.close)
     return _enhanced_client
 
 
@@ -633,8 +725,7 @@ def search_mergers_acquisitions(company_name: str) -> Optional[list]:
             'apikey': api_key
         }
 
-        session = requests.Session()
-        response = session.get(url, params=params, timeout=10)
+        response = get_http_client().get(url, params=params, timeout=10)
         response.raise_for_status()
 
         data = response.json()
@@ -16,6 +16,8 @@ import yfinance as yf
 import logging
 from collections import defaultdict
 
+from price_store import get_history
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -141,9 +143,8 @@ def get_sp500_return(start_date, end_date=None):
         if isinstance(end_date, str):
             end_date = pd.to_datetime(end_date)
 
-        # Fetch SPY data
-        spy = yf.Ticker("SPY")
-        hist = spy.history(start=start_date, end=end_date)
+        # SPY bars from the shared price store (end exclusive, as before)
+        hist = get_history("SPY", start_date, pd.Timestamp(end_date) - timedelta(days=1), adjusted=True)
 
         if hist.empty or len(hist) < 2:
             logger.warning("    ⚠ Insufficient S&P 500 data")
@@ -0,0 +1,394 @@
+# jobs/http_client.py
+"""
+Shared Rate-Limited HTTP Client
+
+Every data source used to build its own requests.Session, retry loop and
+time.sleep throttling (OpenInsider, SEC EDGAR, 13F, FMP, Capitol Trades,
+Congress.gov, Google News). HttpClient is the one HTTP layer they share:
+
+- Connection pooling per host (one pooled session per host per thread;
+  requests.Session is not thread-safe)
+- Token-bucket rate limits per host, with optional daily quotas
+  (SEC's 10 requests/second, FMP's free-tier daily limit)
+- Retries with exponential backoff on timeouts, connection errors, 429 and
+  5xx (Retry-After is honoured)
+- Opt-in on-disk response cache with a TTL; once an entry expires it is
+  revalidated with If-None-Match / If-Modified-Since, so unchanged resources
+  come back as 304s instead of full downloads
+- Per-host latency, error, cache-hit and throttle metrics
+
+get() returns a regular requests.Response (cache hits included) and raises
+the usual requests exceptions, so callers keep their existing error handling.
+aget() is the asyncio front-end for the same client.
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import logging
+import threading
+from urllib.parse import urlencode, urlsplit
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'http_cache')
+DEFAULT_TIMEOUT = 30
+POOL_MAXSIZE = 10                       # Pooled connections per host per thread
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER_SECONDS = 60
+SECRET_PARAMS = {'apikey', 'api_key', 'key', 'token'}   # Never written to the cache
+
+
+class HttpQuotaExceeded(requests.exceptions.RequestException):
+    """Raised when a host's daily quota is used up (or a wait would be too long)."""
+    pass
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    rate tokens are added per second up to capacity; acquire() blocks until
+    a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, max_wait: Optional[float] = None) -> float:
+        """
+        Take one token, sleeping until one is available.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            HttpQuotaExceeded: If the wait would exceed max_wait
+        """
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                raise HttpQuotaExceeded(f"Rate limit wait of {wait:.0f}s exceeds {max_wait:.0f}s")
+            # Reserve the token now so concurrent callers queue behind us
+            self.tokens -= 1
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class HostPolicy:
+    """
+    Limits and retry settings for one host (or group of hosts sharing a limit).
+
+    Args:
+        rate_per_second: Sustained request rate (None = unlimited)
+        burst: Requests allowed back to back before the rate applies
+        daily_quota: Optional requests per day (in this process)
+        retries: Retry attempts for retryable failures
+        backoff_seconds: First retry delay (doubles each attempt)
+    """
+
+    def __init__(self, rate_per_second: Optional[float] = None, burst: float = 1,
+                 daily_quota: Optional[int] = None, retries: int = 3, backoff_seconds: float = 1.0):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.bucket = TokenBucket(rate_per_second, burst) if rate_per_second else None
+        self.quota_bucket = TokenBucket(daily_quota / 86400.0, daily_quota) if daily_quota else None
+
+    def acquire(self) -> float:
+        """Wait for this host's rate limit (and quota). Returns seconds waited."""
+        if self.quota_bucket is not None:
+            self.quota_bucket.acquire(max_wait=0)
+        return self.bucket.acquire() if self.bucket is not None else 0.0
+
+
+# SEC asks for at most 10 requests/second across all of its hosts
+_SEC = HostPolicy(rate_per_second=10, burst=1, retries=3, backoff_seconds=2.0)
+FMP_DAILY_QUOTA = 250   # Free tier (matches fmp_api.FMP_FREE_TIER_LIMIT)
+
+HOST_POLICIES: Dict[str, HostPolicy] = {
+    'www.sec.gov': _SEC,
+    'data.sec.gov': _SEC,
+    'efts.sec.gov': _SEC,
+    'financialmodelingprep.com': HostPolicy(rate_per_second=5, burst=5, daily_quota=FMP_DAILY_QUOTA),
+    'openinsider.com': HostPolicy(rate_per_second=1, burst=1, retries=0),
+    'news.google.com': HostPolicy(rate_per_second=2, burst=2),
+    'api.congress.gov': HostPolicy(rate_per_second=1.25, burst=5),   # 5,000/hour
+    'politician-trade-tracker1.p.rapidapi.com': HostPolicy(rate_per_second=1, burst=1),
+}
+DEFAULT_POLICY_ARGS = {'rate_per_second': None, 'retries': 3}
+
+
+def _redact(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {k: ('***' if k.lower() in SECRET_PARAMS else v) for k, v in (params or {}).items()}
+
+
+class HttpClient:
+    """
+    Shared HTTP client (see module docstring).
+
+    Attributes:
+        cache_dir: Directory for cached responses
+        policies: Host -> HostPolicy
+    """
+
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR, policies: Optional[Dict[str, HostPolicy]] = None):
+        self.cache_dir = cache_dir
+        self.policies = dict(HOST_POLICIES if policies is None else policies)
+        self._default_policies: Dict[str, HostPolicy] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    # =========================================================================
+    # Hosts, sessions, metrics
+    # =========================================================================
+
+    def policy_for(self, host: str) -> HostPolicy:
+        policy = self.policies.get(host)
+        if policy is None:
+            with self._lock:
+                policy = self._default_policies.setdefault(host, HostPolicy(**DEFAULT_POLICY_ARGS))
+        return policy
+
+    def _session(self, host: str) -> requests.Session:
+        """Pooled session for host on the current thread."""
+        sessions = getattr(self._local, 'sessions', None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+        session = sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            sessions[host] = session
+        return session
+
+    def _record(self, host: str, **counts: float) -> None:
+        with self._lock:
+            m = self._metrics.setdefault(host, {
+                'requests': 0, 'errors': 0, 'retries': 0, 'cache_hits': 0, 'not_modified': 0,
+                'latency_total': 0.0, 'latency_max': 0.0, 'throttled_seconds': 0.0,
+            })
+            for key, value in counts.items():
+                if key == 'latency':
+                    m['latency_total'] += value
+                    m['latency_max'] = max(m['latency_max'], value)
+                else:
+                    m[key] += value
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-host counters plus average latency (seconds)."""
+        with self._lock:
+            metrics = {host: dict(m) for host, m in self._metrics.items()}
+        for m in metrics.values():
+            m['latency_avg'] = m['latency_total'] / m['requests'] if m['requests'] else 0.0
+        return metrics
+
+    def log_metrics(self) -> None:
+        """Log one summary line per host."""
+        for host, m in sorted(self.get_metrics().items()):
+            logger.info(
+                f"🌐 {host}: {int(m['requests'])} requests, {int(m['cache_hits'])} cache hits, "
+                f"{int(m['not_modified'])} not modified, {int(m['errors'])} errors, "
+                f"avg {m['latency_avg'] * 1000:.0f}ms (max {m['latency_max'] * 1000:.0f}ms), "
+                f"throttled {m['throttled_seconds']:.1f}s"
+            )
+
+    # =========================================================================
+    # Disk cache
+    # =========================================================================
+
+    def _cache_paths(self, url: str, params: Optional[Dict[str, Any]]):
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        digest = hashlib.sha256(f"GET {url}?{query}".encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, digest[:2], digest)
+        return base + '.json', base + '.body'
+
+    def _read_cache(self, url: str, params: Optional[Dict[str, Any]]):
+        meta_path, body_path = self._cache_paths(url, params)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            return meta, body
+        except (OSError, ValueError):
+            return None, None
+
+    def _write_cache(self, url: str, params: Optional[Dict[str, Any]], response: requests.Response) -> None:
+        meta_path, body_path = self._cache_paths(url, params)
+        meta = {
+            'url': url,
+            'params': _redact(params),
+            'status_code': response.status_code,
+            'headers': {k: v for k, v in response.headers.items()
+                        if k.lower() in ('content-type', 'etag', 'last-modified')},
+            'encoding': response.encoding,
+            'fetched_at': time.time(),
+        }
+        try:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            for path, data, mode in ((body_path, response.content, 'wb'),
+                                     (meta_path, json.dumps(meta), 'w')):
+                tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, mode) as f:
+                    f.write(data)
+                os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"HTTP cache write failed for {url}: {e}")
+
+    def _touch_cache(self, url: str, params: Optional[Dict[str, Any]], meta: Dict[str, Any]) -> None:
+        meta_path, _ = self._cache_paths(url, params)
+        meta['fetched_at'] = time.time()
+        try:
+            tmp = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'w') as f:
+                json.dump(meta, f)
+            os.replace(tmp, meta_path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _cached_response(url: str, meta: Dict[str, Any], body: bytes, source: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = meta.get('status_code', 200)
+        response._content = body
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response.encoding = meta.get('encoding')
+        response.url = url
+        response.from_cache = source
+        return response
+
+    # =========================================================================
+    # Requests
+    # =========================================================================
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Dict[str, str]] = None, timeout: float = DEFAULT_TIMEOUT,
+            cache_ttl: Optional[float] = None, retries: Optional[int] = None) -> requests.Response:
+        """
+        Rate-limited GET with retries and optional caching.
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            headers: Request headers
+            timeout: Per-attempt timeout in seconds
+            cache_ttl: Cache successful responses for this many seconds
+                (None = don't cache; 0 = always revalidate)
+            retries: Override the host policy's retry count
+
+        Returns:
+            requests.Response; cached responses have from_cache set to
+            'hit' or 'revalidated'
+
+        Raises:
+            requests exceptions as requests.get would (after retries)
+        """
+        host = urlsplit(url).hostname or ''
+        policy = self.policy_for(host)
+        request_headers = dict(headers or {})
+
+        meta = body = None
+        if cache_ttl is not None:
+            meta, body = self._read_cache(url, params)
+            if meta is not None:
+                if time.time() - meta.get('fetched_at', 0) < cache_ttl:
+                    self._record(host, cache_hits=1)
+                    return self._cached_response(url, meta, body, 'hit')
+                cached_headers = CaseInsensitiveDict(meta.get('headers', {}))
+                if cached_headers.get('etag'):
+                    request_headers['If-None-Match'] = cached_headers['etag']
+                if cached_headers.get('last-modified'):
+                    request_headers['If-Modified-Since'] = cached_headers['last-modified']
+
+        attempts = 1 + (policy.retries if retries is None else retries)
+        session = self._session(host)
+        for attempt in range(attempts):
+            self._record(host, throttled_seconds=policy.acquire())
+            started = time.monotonic()
+            try:
+                response = session.get(url, params=params, headers=request_headers, timeout=timeout)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                self._record(host, requests=1, errors=1, latency=time.monotonic() - started)
+                if attempt == attempts - 1:
+                    raise
+                self._record(host, retries=1)
+                delay = policy.backoff_seconds * (2 ** attempt)
+                logger.debug(f"{host}: {type(e).__name__}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            self._record(host, requests=1, latency=time.monotonic() - started)
+
+            if response.status_code == 304 and meta is not None:
+                self._record(host, not_modified=1)
+                self._touch_cache(url, params, meta)
+                return self._cached_response(url, meta, body, 'revalidated')
+
+            if response.status_code >= 400:
+                self._record(host, errors=1)
+                if response.status_code in RETRY_STATUSES and attempt < attempts - 1:
+                    self._record(host, retries=1)
+                    time.sleep(self._retry_delay(response, policy, attempt))
+                    continue
+                return response
+
+            if cache_ttl is not None:
+                self._write_cache(url, params, response)
+            response.from_cache = None
+            return response
+
+        return response
+
+    @staticmethod
+    def _retry_delay(response: requests.Response, policy: HostPolicy, attempt: int) -> float:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_RETRY_AFTER_SECONDS)
+            except ValueError:
+                pass
+        return policy.backoff_seconds * (2 ** attempt) + random.uniform(0, 0.1)
+
+    async def aget(self, url: str, **kwargs) -> requests.Response:
+        """asyncio front-end for get() (runs on the default executor)."""
+        return await asyncio.to_thread(self.get, url, **kwargs)
+
+
+# Global client instance
+_http_client: Optional[HttpClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Get or create the global HTTP client"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = HttpClient()
+    return _http_client
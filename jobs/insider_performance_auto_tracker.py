@@ -45,7 +45,9 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'jobs'))
 
 import json
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -61,6 +63,19 @@ logger = logging.getLogger(__name__)
 
 from insider_performance_tracker import InsiderPerformanceTracker
 from ticker_validator import get_failed_ticker_cache, validate_and_normalize_ticker
+from price_store import get_price_store
+from sec_13f_parser import RateLimiter
+
+OUTCOME_HORIZONS = [('30d', 30), ('60d', 60), ('90d', 90), ('180d', 180)]
+
+# Hard cap: if a track has failed too many times across all runs,
+# promote it to FAILED to stop the infinite retry cycle.
+# 30 failures = ~30 days of daily retries (or 10 blacklist cycles).
+MAX_TRACK_FAILURE_COUNT = 30
+
+# Per-ticker fallback fetches for tickers the batched store read returned empty
+MATURITY_FETCH_WORKERS = 4            # Concurrent tickers
+MATURITY_FETCH_CALLS_PER_SECOND = 2   # Global yfinance rate limit shared by all workers
 
 
 class AutoInsiderTracker:
@@ -262,29 +277,22 @@ class AutoInsiderTracker:
 
         if not active_tracks:
             print("✅ No active tracks to update")
-            return {'updated': 0, 'matured': 0, 'failed': 0, 'permanently_failed': 0}
+            return {'updated': 0, 'matured': 0, 'failed': 0, 'permanently_failed': 0,
+                    'due_tracks': 0, 'ticker_fetches': 0, 'fetches_saved': 0, 'tracks_per_sec': 0.0}
 
         today = datetime.now()
+        start_time = time.time()
         updated_count = 0
         matured_count = 0
         failed_count = 0
         permanently_failed_count = 0
         failure_details = []  # Collect failure info for summary logging
-        consecutive_failures = 0  # Track consecutive failures for adaptive sleep
-
-        # Per-ticker yfinance result cache for this run.
-        # Avoids calling yfinance N times for the same ticker when multiple
-        # insiders bought the same stock. Stores the raw result dict from
-        # _fetch_outcomes_with_retry keyed by (ticker, trade_date, entry_price,
-        # horizons_tuple) since outcomes depend on these parameters.
-        # For blacklisted/failed tickers, we cache by ticker alone since
-        # the failure is ticker-level, not trade-level.
-        _ticker_failure_cache = {}  # ticker -> failure result dict
-
-        # Hard cap: if a track has failed too many times across all runs,
-        # promote it to FAILED to stop the infinite retry cycle.
-        # 30 failures = ~30 days of daily retries (or 10 blacklist cycles).
-        MAX_TRACK_FAILURE_COUNT = 30
+        tracker_dirty = False
+
+        # Plan: bucket every due track by ticker so each ticker's price and
+        # dividend series is fetched once and all of its tracks and horizons
+        # are resolved in memory.
+        plan = {}  # ticker -> [(track, trade_date, horizons_to_check)]
 
         for track in active_tracks:
             trade_date = pd.to_datetime(track['trade_date'])
@@ -314,146 +322,147 @@ class AutoInsiderTracker:
                 continue
 
             # Check which time horizons need updating
-            horizons_to_check = []
-            if days_elapsed >= 30 and track['outcomes']['30d'] is None:
-                horizons_to_check.append(('30d', 30))
-            if days_elapsed >= 60 and track['outcomes']['60d'] is None:
-                horizons_to_check.append(('60d', 60))
-            if days_elapsed >= 90 and track['outcomes']['90d'] is None:
-                horizons_to_check.append(('90d', 90))
-            if days_elapsed >= 180 and track['outcomes']['180d'] is None:
-                horizons_to_check.append(('180d', 180))
+            horizons_to_check = [
+                (horizon, days) for horizon, days in OUTCOME_HORIZONS
+                if days_elapsed >= days and track['outcomes'][horizon] is None
+            ]
 
             if not horizons_to_check:
                 continue  # No updates needed for this trade yet
 
-            ticker = track['ticker']
-            entry_price = track['entry_price']
+            plan.setdefault(track['ticker'], []).append((track, trade_date, horizons_to_check))
 
-            if self.verbose:
-                print(f"\n📊 {ticker} - {days_elapsed} days elapsed")
-                print(f"   Checking horizons: {[h[0] for h in horizons_to_check]}")
-
-            # Check per-run failure cache: if this ticker already failed
-            # (blacklisted, delisted, etc.) earlier in this run, reuse the
-            # failure result without calling yfinance again.
-            made_api_call = False
-            if ticker in _ticker_failure_cache:
-                result = _ticker_failure_cache[ticker]
-            else:
-                made_api_call = True
-                # Fetch price data with retry
-                result = self._fetch_outcomes_with_retry(
-                    ticker, trade_date, entry_price, horizons_to_check, max_retries
-                )
-                # Cache failures at the ticker level so other tracks for the
-                # same ticker skip the yfinance call. Don't cache successes
-                # because outcome calculations are trade-date-specific.
-                if not (result and result.get('outcomes')):
-                    _ticker_failure_cache[ticker] = result
-
-            if result and result.get('outcomes'):
-                outcomes = result['outcomes']
-                # Update tracking record
-                for horizon, _ in horizons_to_check:
-                    if outcomes.get(horizon):
-                        track['outcomes'][horizon] = outcomes[horizon]
-                        if self.verbose:
-                            print(f"   ✅ {horizon}: ${outcomes[horizon]['price']:.2f} ({outcomes[horizon]['return']:+.1f}%)")
+        due_count = sum(len(entries) for entries in plan.values())
+        if plan:
+            print(f"Due tracks: {due_count} across {len(plan)} tickers")
 
-                track['last_updated'] = datetime.now().isoformat()
-                # Clear any previous failure info on success
-                track.pop('failure_type', None)
-                track.pop('failure_reason', None)
-                track.pop('failure_count', None)
-                updated_count += 1
-                consecutive_failures = 0  # Reset on success
-
-                # Update main tracker's database
-                self._update_tracker_outcomes(track)
-
-                # Check if all outcomes complete (matured)
-                if all(track['outcomes'][h] is not None for h in ['30d', '60d', '90d', '180d']):
-                    track['status'] = 'MATURED'
-                    matured_count += 1
-                    if self.verbose:
-                        print(f"   🎯 Trade MATURED - all outcomes complete")
+        series_by_ticker = self._fetch_ticker_series(plan, max_retries)
+        failed_ticker_cache = get_failed_ticker_cache()
 
-            else:
-                # Handle failure - categorize and track
-                failure_type = result.get('failure_type', 'UNKNOWN') if result else 'UNKNOWN'
-                failure_reason = result.get('failure_reason', 'Unknown error') if result else 'Unknown error'
-
-                # Track failure count
-                failure_count = track.get('failure_count', 0) + 1
-                track['failure_count'] = failure_count
-
-                # Categorize permanent vs temporary failures
-                if failure_type in ['DELISTED', 'INVALID_TICKER']:
-                    # Genuinely dead tickers - mark as permanently FAILED
-                    track['status'] = 'FAILED'
-                    track['failure_type'] = failure_type
-                    track['failure_reason'] = failure_reason
-                    track['last_updated'] = datetime.now().isoformat()
-                    permanently_failed_count += 1
-
-                    failure_details.append({
-                        'ticker': ticker,
-                        'type': failure_type,
-                        'reason': failure_reason,
-                        'permanent': True
-                    })
-                elif failure_type in ['NO_HORIZON_DATA', 'BLACKLISTED']:
-                    # Horizon data not yet available or ticker temporarily
-                    # blacklisted - will retry when cache expires
-                    track['failure_type'] = failure_type
-                    track['failure_reason'] = failure_reason
-                    track['last_updated'] = datetime.now().isoformat()
+        for ticker, entries in plan.items():
+            fetched = series_by_ticker.get(ticker) or {
+                'failure_type': 'UNKNOWN', 'failure_reason': 'Unknown error'
+            }
+            any_resolved = False
 
-                    failure_details.append({
-                        'ticker': ticker,
-                        'type': failure_type,
-                        'reason': failure_reason,
-                        'permanent': False
-                    })
-                elif failure_type == 'RATE_LIMIT':
-                    # Temporary - will retry tomorrow
-                    track['failure_type'] = failure_type
-                    track['failure_reason'] = failure_reason
-                    track['last_updated'] = datetime.now().isoformat()
+            for track, trade_date, horizons_to_check in entries:
+                if self.verbose:
+                    print(f"\n📊 {ticker} - {(today - trade_date).days} days elapsed")
+                    print(f"   Checking horizons: {[h[0] for h in horizons_to_check]}")
 
-                    failure_details.append({
-                        'ticker': ticker,
-                        'type': failure_type,
-                        'reason': failure_reason,
-                        'permanent': False
-                    })
+                if 'series' in fetched:
+                    outcomes = self._resolve_outcomes(
+                        fetched['series'], trade_date, track['entry_price'], horizons_to_check
+                    )
+                    if outcomes:
+                        result = {'outcomes': outcomes}
+                        any_resolved = True
+                    else:
+                        # Stock has price history but the horizon target dates
+                        # aren't available yet (weekends, holidays, data gaps)
+                        result = {
+                            'failure_type': 'NO_HORIZON_DATA',
+                            'failure_reason': 'No trading data for required time horizon (will retry)'
+                        }
                 else:
-                    # Network or unknown error - will retry tomorrow
-                    track['failure_type'] = 'NETWORK_ERROR'
-                    track['failure_reason'] = failure_reason
-                    track['last_updated'] = datetime.now().isoformat()
+                    result = fetched
 
-                    failure_details.append({
-                        'ticker': ticker,
-                        'type': 'NETWORK_ERROR',
-                        'reason': failure_reason,
-                        'permanent': False
-                    })
+                if result.get('outcomes'):
+                    outcomes = result['outcomes']
+                    # Update tracking record
+                    for horizon, _ in horizons_to_check:
+                        if outcomes.get(horizon):
+                            track['outcomes'][horizon] = outcomes[horizon]
+                            if self.verbose:
+                                print(f"   ✅ {horizon}: ${outcomes[horizon]['price']:.2f} ({outcomes[horizon]['return']:+.1f}%)")
+
+                    track['last_updated'] = datetime.now().isoformat()
+                    # Clear any previous failure info on success
+                    track.pop('failure_type', None)
+                    track.pop('failure_reason', None)
+                    track.pop('failure_count', None)
+                    updated_count += 1
+
+                    # Update main tracker's database (saved once below)
+                    tracker_dirty |= self._update_tracker_outcomes(track, save=False)
+
+                    # Check if all outcomes complete (matured)
+                    if all(track['outcomes'][h] is not None for h in ['30d', '60d', '90d', '180d']):
+                        track['status'] = 'MATURED'
+                        matured_count += 1
+                        if self.verbose:
+                            print(f"   🎯 Trade MATURED - all outcomes complete")
 
-                failed_count += 1
-                consecutive_failures += 1
-
-            # Adaptive rate limiting: back off when seeing consecutive failures
-            # (likely yfinance rate limiting or outage). Only sleep when a real
-            # yfinance API call was made; cached failures need no throttle.
-            if made_api_call:
-                if consecutive_failures >= 10:
-                    time.sleep(5.0)  # Heavy backoff after 10+ consecutive failures
-                elif consecutive_failures >= 5:
-                    time.sleep(2.0)  # Moderate backoff
                 else:
-                    time.sleep(0.5)  # Normal rate limiting
+                    # Handle failure - categorize and track
+                    failure_type = result.get('failure_type', 'UNKNOWN')
+                    failure_reason = result.get('failure_reason', 'Unknown error')
+
+                    # Track failure count
+                    failure_count = track.get('failure_count', 0) + 1
+                    track['failure_count'] = failure_count
+
+                    # Categorize permanent vs temporary failures
+                    if failure_type in ['DELISTED', 'INVALID_TICKER']:
+                        # Genuinely dead tickers - mark as permanently FAILED
+                        track['status'] = 'FAILED'
+                        track['failure_type'] = failure_type
+                        track['failure_reason'] = failure_reason
+                        track['last_updated'] = datetime.now().isoformat()
+                        permanently_failed_count += 1
+
+                        failure_details.append({
+                            'ticker': ticker,
+                            'type': failure_type,
+                            'reason': failure_reason,
+                            'permanent': True
+                        })
+                    elif failure_type in ['NO_HORIZON_DATA', 'BLACKLISTED', 'RATE_LIMIT']:
+                        # Horizon data not yet available, ticker temporarily
+                        # blacklisted or rate limited - will retry later
+                        track['failure_type'] = failure_type
+                        track['failure_reason'] = failure_reason
+                        track['last_updated'] = datetime.now().isoformat()
+
+                        failure_details.append({
+                            'ticker': ticker,
+                            'type': failure_type,
+                            'reason': failure_reason,
+                            'permanent': False
+                        })
+                    else:
+                        # Network or unknown error - will retry tomorrow
+                        track['failure_type'] = 'NETWORK_ERROR'
+                        track['failure_reason'] = failure_reason
+                        track['last_updated'] = datetime.now().isoformat()
+
+                        failure_details.append({
+                            'ticker': ticker,
+                            'type': 'NETWORK_ERROR',
+                            'reason': failure_reason,
+                            'permanent': False
+                        })
+
+                    failed_count += 1
+
+            # Ticker-level bookkeeping in the failed ticker cache (main thread
+            # only: the cache rewrites one file and isn't thread-safe)
+            if 'series' in fetched:
+                if any_resolved:
+                    failed_ticker_cache.record_success(ticker)
+                else:
+                    failed_ticker_cache.record_failure(
+                        ticker,
+                        'No trading data for required time horizon',
+                        failure_type='TEMPORARY'
+                    )
+
+        if tracker_dirty:
+            self.tracker._save_trades_history()
+
+        elapsed = time.time() - start_time
+        tracks_per_sec = due_count / elapsed if elapsed > 0 else 0.0
+        fetches_saved = due_count - len(plan)
 
         # Save updated queue
         self._save_tracking_queue()
@@ -464,6 +473,8 @@ class AutoInsiderTracker:
         print(f"{'='*70}")
         print(f"  Updated: {updated_count}")
         print(f"  Matured: {matured_count}")
+        print(f"  Throughput: {tracks_per_sec:.1f} tracks/sec "
+              f"({due_count} due tracks across {len(plan)} tickers, {fetches_saved} fetches saved)")
 
         if failed_count > 0:
             print(f"  Failed: {failed_count}")
@@ -496,14 +507,163 @@ class AutoInsiderTracker:
             'updated': updated_count,
             'matured': matured_count,
             'failed': failed_count,
-            'permanently_failed': permanently_failed_count
+            'permanently_failed': permanently_failed_count,
+            'due_tracks': due_count,
+            'ticker_fetches': len(plan),
+            'fetches_saved': fetches_saved,
+            'tracks_per_sec': round(tracks_per_sec, 2)
+        }
+
+    def _fetch_ticker_series(self, plan: Dict[str, List[tuple]], max_retries: int = 3) -> Dict[str, Dict]:
+        """
+        Fetch each planned ticker's price and dividend series once.
+
+        All tickers are read from the shared price store in one batched call
+        covering each ticker's widest needed window (earliest due trade - 5
+        days through today). Tickers that come back empty go through the
+        retry/classification path on a bounded worker pool, with every
+        network call gated by a global rate limiter.
+
+        Returns:
+            Dict mapping ticker → {'series': ...} on success, or a failure dict
+            with 'failure_type'/'failure_reason'.
+        """
+        results = {}
+        if not plan:
+            return results
+
+        failed_ticker_cache = get_failed_ticker_cache()
+        starts = {}
+        for ticker, entries in plan.items():
+            blacklisted = self._blacklist_failure(ticker, failed_ticker_cache)
+            if blacklisted:
+                results[ticker] = blacklisted
+            else:
+                starts[ticker] = min(trade_date for _, trade_date, _ in entries) - timedelta(days=5)
+
+        today = datetime.now()
+        try:
+            histories = get_price_store().get_histories_for_ranges(
+                {t: (start, today) for t, start in starts.items()}, adjusted=False
+            )
+        except Exception as e:
+            logger.warning(f"Batched history read failed, falling back to per-ticker fetches: {e}")
+            histories = {}
+
+        pending = []
+        for ticker in starts:
+            hist = histories.get(ticker)
+            if hist is not None and not hist.empty:
+                results[ticker] = {'series': self._prepare_series(hist)}
+            else:
+                pending.append(ticker)
+
+        if pending:
+            if self.verbose:
+                print(f"   Retrying {len(pending)} tickers without stored history")
+            rate_limiter = RateLimiter(MATURITY_FETCH_CALLS_PER_SECOND)
+            with ThreadPoolExecutor(max_workers=MATURITY_FETCH_WORKERS) as executor:
+                future_to_ticker = {
+                    executor.submit(self._fetch_history_with_retry, t, starts[t], max_retries, rate_limiter): t
+                    for t in pending
+                }
+                for future in as_completed(future_to_ticker):
+                    t = future_to_ticker[future]
+                    try:
+                        fetched = future.result()
+                    except Exception as e:
+                        fetched = {'failure_type': 'NETWORK_ERROR', 'failure_reason': f'Network error: {e}'}
+                    self._record_cache_failure(t, fetched, failed_ticker_cache)
+                    if 'hist' in fetched:
+                        results[t] = {'series': self._prepare_series(fetched['hist'])}
+                    else:
+                        results[t] = fetched
+
+        return results
+
+    def _blacklist_failure(self, ticker: str, failed_ticker_cache) -> Optional[Dict]:
+        """Failure dict for a blacklisted ticker, or None if it may be fetched."""
+        is_blacklisted, blacklist_reason = failed_ticker_cache.is_blacklisted(ticker)
+        if not is_blacklisted:
+            return None
+        logger.debug(f"Skipping blacklisted ticker {ticker}: {blacklist_reason}")
+        # Determine the appropriate failure type from the blacklist reason
+        # so the caller can categorize it correctly
+        if blacklist_reason and 'delisted' in blacklist_reason.lower():
+            bl_failure_type = 'DELISTED'
+        elif blacklist_reason and 'invalid' in blacklist_reason.lower():
+            bl_failure_type = 'INVALID_TICKER'
+        elif blacklist_reason and 'no trading data' in blacklist_reason.lower():
+            bl_failure_type = 'NO_HORIZON_DATA'
+        else:
+            bl_failure_type = 'BLACKLISTED'
+        return {
+            'failure_type': bl_failure_type,
+            'failure_reason': f'Blacklisted: {blacklist_reason}'
+        }
+
+    @staticmethod
+    def _record_cache_failure(ticker: str, fetched: Dict, failed_ticker_cache) -> None:
+        """Apply a permanent failure reported by _fetch_history_with_retry to the cache."""
+        cache_reason = fetched.get('cache_failure')
+        if cache_reason:
+            failed_ticker_cache.record_failure(ticker, cache_reason, failure_type='PERMANENT')
+
+    @staticmethod
+    def _prepare_series(hist: pd.DataFrame) -> Dict:
+        """Arrays used to resolve outcomes: bar dates, closes and a dividend prefix sum."""
+        dates = hist.index.to_numpy(dtype='datetime64[ns]')
+        div_prefix = np.zeros(len(dates) + 1)
+        np.cumsum(np.nan_to_num(hist['Dividends'].to_numpy(dtype=np.float64)), out=div_prefix[1:])
+        return {
+            'dates': dates,
+            'closes': hist['Close'].to_numpy(dtype=np.float64),
+            'div_prefix': div_prefix,  # div_prefix[k] = dividends on bars [0, k)
         }
 
+    @staticmethod
+    def _resolve_outcomes(series: Dict, trade_date: datetime, entry_price: float,
+                          horizons: List[tuple]) -> Dict:
+        """
+        Resolve a trade's horizon outcomes from a prepared price series.
+
+        Each horizon uses the first close on or after trade_date + days, plus
+        dividends with ex-date in (trade_date, outcome_date].
+        """
+        dates = series['dates']
+        trade_ts = pd.Timestamp(trade_date)
+        if trade_ts.tz is not None:
+            trade_ts = trade_ts.tz_localize(None)
+        trade_dt = np.datetime64(trade_ts.to_datetime64(), 'ns')
+        div_from = int(np.searchsorted(dates, trade_dt, side='right'))
+
+        outcomes = {}
+        for horizon_name, days in horizons:
+            pos = int(np.searchsorted(dates, trade_dt + np.timedelta64(days, 'D'), side='left'))
+            if pos >= len(dates):
+                continue
+            outcome_price = series['closes'][pos]
+            dividends_received = series['div_prefix'][pos + 1] - series['div_prefix'][min(div_from, pos + 1)]
+
+            # Total return = (price appreciation + dividends) / entry price
+            total_return_pct = ((outcome_price - entry_price + dividends_received) / entry_price) * 100
+
+            outcomes[horizon_name] = {
+                'price': float(outcome_price),
+                'return': float(total_return_pct),
+                'dividends': float(dividends_received),
+                'date': str(dates[pos])[:10]
+            }
+        return outcomes
+
     def _fetch_outcomes_with_retry(self, ticker: str, trade_date: datetime,
                                    entry_price: float, horizons: List[tuple],
                                    max_retries: int = 3) -> Optional[Dict]:
         """
-        Fetch price outcomes with retry logic and failure categorization.
+        Fetch price outcomes for a single trade with retry logic and failure categorization.
+
+        update_maturing_trades resolves trades per ticker instead; this is kept
+        for one-off lookups.
 
         Args:
             ticker: Stock ticker
@@ -515,167 +675,108 @@ class AutoInsiderTracker:
         Returns:
             Dict with 'outcomes' key on success, or 'failure_type'/'failure_reason' on failure
         """
-        delay = 1.0
-        last_error = None
         failed_ticker_cache = get_failed_ticker_cache()
 
         # Check if ticker is blacklisted before attempting fetch
-        is_blacklisted, blacklist_reason = failed_ticker_cache.is_blacklisted(ticker)
-        if is_blacklisted:
-            logger.debug(f"Skipping blacklisted ticker {ticker}: {blacklist_reason}")
-            # Determine the appropriate failure type from the blacklist reason
-            # so the caller can categorize it correctly
-            if blacklist_reason and 'delisted' in blacklist_reason.lower():
-                bl_failure_type = 'DELISTED'
-            elif blacklist_reason and 'invalid' in blacklist_reason.lower():
-                bl_failure_type = 'INVALID_TICKER'
-            elif blacklist_reason and 'no trading data' in blacklist_reason.lower():
-                bl_failure_type = 'NO_HORIZON_DATA'
-            else:
-                bl_failure_type = 'BLACKLISTED'
-            return {
-                'failure_type': bl_failure_type,
-                'failure_reason': f'Blacklisted: {blacklist_reason}'
-            }
+        blacklisted = self._blacklist_failure(ticker, failed_ticker_cache)
+        if blacklisted:
+            return blacklisted
+
+        fetched = self._fetch_history_with_retry(ticker, trade_date - timedelta(days=5), max_retries)
+        self._record_cache_failure(ticker, fetched, failed_ticker_cache)
+        if 'hist' not in fetched:
+            return fetched
+
+        outcomes = self._resolve_outcomes(self._prepare_series(fetched['hist']), trade_date, entry_price, horizons)
+        if outcomes:
+            # Record success - remove from blacklist if present
+            failed_ticker_cache.record_success(ticker)
+            return {'outcomes': outcomes}
+
+        # No data for the required horizons yet - stock has price history but
+        # the specific horizon target dates aren't available (weekends,
+        # holidays, data gaps). This is a temporary data-availability issue,
+        # NOT evidence of delisting. Use TEMPORARY so the ticker gets retried
+        # (up to MAX_RETRY_ATTEMPTS before auto-promoting to permanent, with
+        # 30-day cache expiry allowing retries).
+        failed_ticker_cache.record_failure(
+            ticker,
+            'No trading data for required time horizon',
+            failure_type='TEMPORARY'
+        )
+        return {
+            'failure_type': 'NO_HORIZON_DATA',
+            'failure_reason': 'No trading data for required time horizon (will retry)'
+        }
 
-        for attempt in range(max_retries):
-            try:
-                # Fetch historical data
-                start_date = trade_date - timedelta(days=5)
-                end_date = datetime.now()
+    def _fetch_history_with_retry(self, ticker: str, start_date: datetime, max_retries: int = 3,
+                                  rate_limiter: Optional[RateLimiter] = None) -> Dict:
+        """
+        Fetch a ticker's unadjusted daily history with retries and failure categorization.
 
-                stock = yf.Ticker(ticker)
-                hist = stock.history(start=start_date, end=end_date)
+        Safe to run on worker threads: it never writes the failed ticker cache.
+        Permanent failures carry a 'cache_failure' reason for the caller to record.
 
-                if hist.empty:
-                    # Try to get more context from ticker info
-                    try:
-                        info = stock.info
-                        # Check for invalid ticker patterns
-                        if not info or len(info) < 5:
-                            # Likely invalid ticker
-                            if self._is_invalid_ticker_format(ticker):
-                                failed_ticker_cache.record_failure(
-                                    ticker,
-                                    f'Invalid ticker format: {ticker}',
-                                    failure_type='PERMANENT'
-                                )
-                                return {
-                                    'failure_type': 'INVALID_TICKER',
-                                    'failure_reason': f'Invalid ticker format: {ticker}'
-                                }
-                            # Empty history could mean delisted
-                            failed_ticker_cache.record_failure(
-                                ticker,
-                                'No trading history available (possibly delisted)',
-                                failure_type='PERMANENT'
-                            )
-                            return {
-                                'failure_type': 'DELISTED',
-                                'failure_reason': 'No trading history available (possibly delisted)'
-                            }
-                        # Check quote type - mutual funds/ETFs may have different data availability
-                        quote_type = info.get('quoteType', '').upper()
-                        if quote_type in ['MUTUALFUND', 'INDEX']:
-                            failed_ticker_cache.record_failure(
-                                ticker,
-                                f'Ticker is {quote_type}, not a stock',
-                                failure_type='PERMANENT'
-                            )
-                            return {
-                                'failure_type': 'INVALID_TICKER',
-                                'failure_reason': f'Ticker is {quote_type}, not a stock'
-                            }
-                    except:
-                        pass  # Continue to retry logic below
+        Returns:
+            {'hist': DataFrame} on success, or a failure dict with
+            'failure_type'/'failure_reason' (and optionally 'cache_failure').
+        """
+        delay = 1.0
+        last_error = None
 
-                    if attempt < max_retries - 1:
-                        time.sleep(delay)
-                        delay *= 2
-                        continue
+        for attempt in range(max_retries):
+            try:
+                if rate_limiter:
+                    rate_limiter.wait()
 
-                    # After all retries, classify as delisted
-                    return {
-                        'failure_type': 'DELISTED',
-                        'failure_reason': 'No trading history after multiple retries (possibly delisted)'
-                    }
+                # Unadjusted closes from the shared price store; dividends are
+                # added explicitly when resolving, so adjusted prices would double-count
+                hist = get_price_store().get_history(ticker, start_date, datetime.now(), adjusted=False)
 
-                # Remove timezone
-                hist = hist.reset_index()
-                hist['Date'] = pd.to_datetime(hist['Date']).dt.tz_localize(None)
+                if not hist.empty:
+                    return {'hist': hist}
 
-                # Fetch dividend data for the period
-                dividends = None
+                # Try to get more context from ticker info
                 try:
-                    div_data = stock.dividends
-                    if div_data is not None and not div_data.empty:
-                        # Convert to DataFrame and remove timezone
-                        dividends = div_data.reset_index()
-                        dividends.columns = ['Date', 'Dividend']
-                        dividends['Date'] = pd.to_datetime(dividends['Date']).dt.tz_localize(None)
-                except Exception as e:
-                    # Dividends fetch failed, continue without dividend adjustment
-                    logger.debug(f"Could not fetch dividends for {ticker}: {e}")
-                    dividends = None
-
-                outcomes = {}
-
-                # Calculate outcomes for each horizon
-                for horizon_name, days in horizons:
-                    target_date = trade_date + timedelta(days=days)
-                    future_data = hist[hist['Date'] >= target_date]
-
-                    if not future_data.empty:
-                        outcome_price = future_data.iloc[0]['Close']
-                        outcome_date = future_data.iloc[0]['Date']
-
-                        # Calculate dividends received during holding period
-                        dividends_received = 0.0
-                        if dividends is not None and not dividends.empty:
-                            # Sum dividends paid between trade_date and outcome_date
-                            trade_date_normalized = pd.to_datetime(trade_date)
-                            if trade_date_normalized.tz is not None:
-                                trade_date_normalized = trade_date_normalized.tz_localize(None)
-
-                            period_dividends = dividends[
-                                (dividends['Date'] > trade_date_normalized) &
-                                (dividends['Date'] <= outcome_date)
-                            ]
-                            if not period_dividends.empty:
-                                dividends_received = period_dividends['Dividend'].sum()
-
-                        # Calculate total return including dividends
-                        # Total return = (price appreciation + dividends) / entry price
-                        total_return_pct = ((outcome_price - entry_price + dividends_received) / entry_price) * 100
-
-                        outcomes[horizon_name] = {
-                            'price': float(outcome_price),
-                            'return': float(total_return_pct),
-                            'dividends': float(dividends_received),
-                            'date': str(outcome_date)[:10]
+                    if rate_limiter:
+                        rate_limiter.wait()
+                    info = yf.Ticker(ticker).info
+                    # Check for invalid ticker patterns
+                    if not info or len(info) < 5:
+                        # Likely invalid ticker
+                        if self._is_invalid_ticker_format(ticker):
+                            return {
+                                'failure_type': 'INVALID_TICKER',
+                                'failure_reason': f'Invalid ticker format: {ticker}',
+                                'cache_failure': f'Invalid ticker format: {ticker}'
+                            }
+                        # Empty history could mean delisted
+                        return {
+                            'failure_type': 'DELISTED',
+                            'failure_reason': 'No trading history available (possibly delisted)',
+                            'cache_failure': 'No trading history available (possibly delisted)'
+                        }
+                    # Check quote type - mutual funds/ETFs may have different data availability
+                    quote_type = info.get('quoteType', '').upper()
+                    if quote_type in ['MUTUALFUND', 'INDEX']:
+                        return {
+                            'failure_type': 'INVALID_TICKER',
+                            'failure_reason': f'Ticker is {quote_type}, not a stock',
+                            'cache_failure': f'Ticker is {quote_type}, not a stock'
                         }
+                except:
+                    pass  # Continue to retry logic below
 
-                if outcomes:
-                    # Record success - remove from blacklist if present
-                    failed_ticker_cache.record_success(ticker)
-                    return {'outcomes': outcomes}
-                else:
-                    # No data for the required horizons yet - stock has price
-                    # history (hist was non-empty) but the specific horizon
-                    # target dates aren't available (weekends, holidays, data
-                    # gaps). This is a temporary data-availability issue, NOT
-                    # evidence of delisting. Use TEMPORARY so the ticker gets
-                    # retried (up to MAX_RETRY_ATTEMPTS before auto-promoting
-                    # to permanent, with 30-day cache expiry allowing retries).
-                    failed_ticker_cache.record_failure(
-                        ticker,
-                        'No trading data for required time horizon',
-                        failure_type='TEMPORARY'
-                    )
-                    return {
-                        'failure_type': 'NO_HORIZON_DATA',
-                        'failure_reason': 'No trading data for required time horizon (will retry)'
-                    }
+                if attempt < max_retries - 1:
+                    time.sleep(delay)
+                    delay *= 2
+                    continue
+
+                # After all retries, classify as delisted
+                return {
+                    'failure_type': 'DELISTED',
+                    'failure_reason': 'No trading history after multiple retries (possibly delisted)'
+                }
 
             except Exception as e:
                 last_error = str(e)
@@ -750,8 +851,17 @@ class AutoInsiderTracker:
             return True
         return False
 
-    def _update_tracker_outcomes(self, track: Dict):
-        """Update the main tracker's database with new outcomes"""
+    def _update_tracker_outcomes(self, track: Dict, save: bool = True) -> bool:
+        """
+        Update the main tracker's database with new outcomes.
+
+        Args:
+            track: Tracking record with outcomes
+            save: Write trades history to disk now (False = caller saves once later)
+
+        Returns:
+            True if a matching trade was updated
+        """
         try:
             # Find the trade in the tracker's database
             mask = (
@@ -773,10 +883,13 @@ class AutoInsiderTracker:
                 self.tracker.trades_history.loc[idx, 'last_updated'] = datetime.now().isoformat()
 
                 # Save to disk
-                self.tracker._save_trades_history()
+                if save:
+                    self.tracker._save_trades_history()
+                return True
 
         except Exception as e:
             print(f"⚠️  Error updating tracker outcomes: {e}")
+        return False
 
     def update_insider_profiles(self):
         """
@@ -791,8 +904,8 @@ class AutoInsiderTracker:
 
         before_count = len(self.tracker.profiles)
 
-        # Recalculate all profiles
-        self.tracker.calculate_insider_profiles()
+        # Recalculate profiles for insiders whose trades changed
+        self.tracker.calculate_insider_profiles(incremental=True)
 
         after_count = len(self.tracker.profiles)
         new_profiles = after_count - before_count
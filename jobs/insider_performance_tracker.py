@@ -18,13 +18,20 @@ import json
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
-import yfinance as yf
 import time
 from pathlib import Path
 import re
 from difflib import SequenceMatcher
 import logging
 
+from price_store import get_price_store
+
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
 # Suppress yfinance error spam for delisted stocks
 # yfinance logs ERROR for every delisted ticker, which clutters logs
 # These are expected failures and don't break the pipeline
@@ -35,10 +42,27 @@ logger = logging.getLogger(__name__)
 DATA_DIR = Path(__file__).parent.parent / 'data'
 INSIDER_PROFILES_PATH = DATA_DIR / 'insider_profiles.json'
 INSIDER_TRADES_HISTORY_PATH = DATA_DIR / 'insider_trades_history.csv'
+INSIDER_PROFILES_STATE_PATH = DATA_DIR / 'insider_profiles_state.json'
+
+PROFILE_HORIZONS = ['30d', '60d', '90d', '180d']
 
 # Minimum entry price for profile inclusion (filters penny stocks)
 MIN_ENTRY_PRICE_FOR_PROFILE = 1.00
 
+# Days of history after a trade needed for its outcomes (buffer beyond 180d)
+OUTCOME_WINDOW_DAYS = 200
+
+# Names more similar than this (SequenceMatcher ratio) are the same insider
+NAME_MATCH_THRESHOLD = 0.85
+
+# Titles and suffixes stripped before matching
+NAME_TITLE_SUFFIX_PATTERNS = [
+    re.compile(pattern, flags=re.IGNORECASE) for pattern in [
+        r'\bMr\.?\b', r'\bMrs\.?\b', r'\bMs\.?\b', r'\bDr\.?\b',
+        r'\bJr\.?\b', r'\bSr\.?\b', r'\bIII\b', r'\bII\b', r'\bIV\b'
+    ]
+]
+
 
 class InsiderPerformanceTracker:
     """
@@ -73,10 +97,11 @@ class InsiderPerformanceTracker:
         return {}
 
     def _save_profiles(self):
-        """Save insider profiles to JSON file."""
+        """Save insider profiles to JSON file (and the incremental-run state alongside)."""
         INSIDER_PROFILES_PATH.parent.mkdir(parents=True, exist_ok=True)
         with open(INSIDER_PROFILES_PATH, 'w') as f:
             json.dump(self.profiles, f, indent=2, default=str)
+        self._save_profiles_state()
 
     def _load_name_mapping(self) -> Dict:
         """Load insider name mapping from JSON file."""
@@ -97,31 +122,14 @@ class InsiderPerformanceTracker:
         with open(name_mapping_path, 'w') as f:
             json.dump(self.name_mapping, f, indent=2)
 
-    def _normalize_insider_name(self, name: str, company: str = None) -> str:
+    @staticmethod
+    def _clean_insider_name(name: str) -> str:
         """
-        Normalize insider name to canonical format with fuzzy matching.
+        Lowercase, punctuation-free "first middle last" form of a raw Form 4 name.
 
-        Handles common variations:
-        - "Last, First Middle" → "First Middle Last"
-        - Removes punctuation and titles
-        - Fuzzy matches against existing names (>85% similarity)
-        - Uses company ticker to disambiguate common names
-
-        Args:
-            name: Raw insider name from Form 4
-            company: Company ticker (helps disambiguate common names)
-
-        Returns:
-            Canonical name format
-
-        Examples:
-            "Cook, Timothy D." → "Timothy D Cook"
-            "Tim Cook" → "Timothy D Cook" (fuzzy matched)
-            "T.D. Cook" → "Timothy D Cook" (fuzzy matched)
+        Example:
+            "Cook, Timothy D. Jr." → "timothy d cook"
         """
-        if not name or not isinstance(name, str):
-            return "UNKNOWN"
-
         # Step 1: Clean the name
         cleaned = name.strip()
 
@@ -133,59 +141,163 @@ class InsiderPerformanceTracker:
                 cleaned = f"{first.strip()} {last.strip()}"
 
         # Step 3: Remove common titles and suffixes
-        titles_suffixes = [
-            r'\bMr\.?\b', r'\bMrs\.?\b', r'\bMs\.?\b', r'\bDr\.?\b',
-            r'\bJr\.?\b', r'\bSr\.?\b', r'\bIII\b', r'\bII\b', r'\bIV\b'
-        ]
-        for pattern in titles_suffixes:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        for pattern in NAME_TITLE_SUFFIX_PATTERNS:
+            cleaned = pattern.sub('', cleaned)
 
         # Step 4: Normalize spaces and punctuation
         cleaned = re.sub(r'[^\w\s]', '', cleaned)  # Remove punctuation
         cleaned = re.sub(r'\s+', ' ', cleaned)      # Normalize spaces
-        cleaned = cleaned.strip().lower()
+        return cleaned.strip().lower()
+
+    def _get_name_index(self) -> Dict:
+        """
+        Blocked index over name_mapping for fuzzy lookups, built on first use.
+
+        Entries are (names, canonical names, insertion order) lists per block:
+        'all' holds every key, 'companies' one block per company suffix and
+        'no_company' the keys stored without one. Rebuilt if name_mapping was
+        replaced or edited behind the index's back.
+        """
+        index = getattr(self, '_name_index', None)
+        if index is None or index['mapping'] is not self.name_mapping or index['size'] != len(self.name_mapping):
+            index = {'mapping': self.name_mapping, 'size': 0, 'all': ([], [], []),
+                     'companies': {}, 'no_company': ([], [], [])}
+            self._name_index = index
+            for key, canonical in self.name_mapping.items():
+                self._index_name(key, canonical)
+        return index
+
+    def _index_name(self, lookup_key: str, canonical: str):
+        """Add one name_mapping entry to the blocks it belongs to."""
+        index = self._name_index
+        if '|' in lookup_key:
+            existing_name, existing_company = lookup_key.split('|', 1)
+            blocks = [index['all'], index['companies'].setdefault(existing_company, ([], [], []))]
+        else:
+            existing_name = lookup_key
+            blocks = [index['all'], index['no_company']]
+        for names, canonicals, order in blocks:
+            names.append(existing_name)
+            canonicals.append(canonical)
+            order.append(index['size'])
+        index['size'] += 1
+
+    def _fuzzy_match_name(self, cleaned: str, company: str = None) -> Optional[str]:
+        """
+        Canonical name of the most similar known insider, if above NAME_MATCH_THRESHOLD.
+
+        Same candidates and ranking as the original SequenceMatcher scan of
+        name_mapping (kept in scripts/test_insider_name_index.py): same-company
+        and company-less keys when a company is given, every key otherwise;
+        ties go to the earliest key.
+        rapidfuzz's ratio is never below SequenceMatcher's, so its score cutoff
+        only discards names that couldn't match, and the few survivors are scored
+        with SequenceMatcher.
+        """
+        index = self._get_name_index()
+        if company:
+            blocks = [index['no_company']]
+            if company in index['companies']:
+                blocks.append(index['companies'][company])
+        else:
+            blocks = [index['all']]
+
+        best = None  # (ratio, -order, canonical)
+        for names, canonicals, order in blocks:
+            if RAPIDFUZZ_AVAILABLE:
+                shortlist = [i for _, _, i in process.extract(
+                    cleaned, names, scorer=fuzz.ratio, score_cutoff=NAME_MATCH_THRESHOLD * 100, limit=None)]
+            else:
+                shortlist = range(len(names))
+            for i in shortlist:
+                ratio = SequenceMatcher(None, cleaned, names[i]).ratio()
+                if ratio > NAME_MATCH_THRESHOLD and (best is None or (ratio, -order[i]) > best[:2]):
+                    best = (ratio, -order[i], canonicals[i])
+
+        return best[2] if best else None
+
+    def _resolve_insider_name(self, name: str, company: str = None) -> Tuple[str, bool]:
+        """
+        Canonical name for a raw name, adding it to name_mapping if it's new.
+
+        Returns:
+            (canonical name, whether name_mapping changed)
+        """
+        if not name or not isinstance(name, str):
+            return "UNKNOWN", False
+
+        cleaned = self._clean_insider_name(name)
 
         # Step 5: Create lookup key (with company if provided)
         lookup_key = f"{cleaned}|{company}" if company else cleaned
 
         # Step 6: Check if we've seen this exact name before
         if lookup_key in self.name_mapping:
-            return self.name_mapping[lookup_key]
+            return self.name_mapping[lookup_key], False
 
-        # Step 7: Fuzzy match against existing names
-        best_match = None
-        best_ratio = 0
+        # Step 7: Fuzzy match against existing names (>85% similarity = same person),
+        # otherwise this is a new unique person - create canonical name
+        canonical = self._fuzzy_match_name(cleaned, company) or self._format_canonical_name(cleaned)
+        self.name_mapping[lookup_key] = canonical
+        self._index_name(lookup_key, canonical)
+        return canonical, True
 
-        for existing_key, canonical_name in self.name_mapping.items():
-            # Only compare same-company insiders if company specified
-            if company and '|' in existing_key:
-                existing_name, existing_company = existing_key.split('|', 1)
-                if existing_company != company:
-                    continue
-            else:
-                existing_name = existing_key.split('|')[0] if '|' in existing_key else existing_key
+    def _normalize_insider_name(self, name: str, company: str = None) -> str:
+        """
+        Normalize insider name to canonical format with fuzzy matching.
 
-            # Calculate similarity ratio
-            ratio = SequenceMatcher(None, cleaned.split('|')[0], existing_name).ratio()
+        Handles common variations:
+        - "Last, First Middle" → "First Middle Last"
+        - Removes punctuation and titles
+        - Fuzzy matches against existing names (>85% similarity)
+        - Uses company ticker to disambiguate common names
 
-            # If very similar (>85% match), consider it the same person
-            if ratio > 0.85 and ratio > best_ratio:
-                best_ratio = ratio
-                best_match = canonical_name
+        Args:
+            name: Raw insider name from Form 4
+            company: Company ticker (helps disambiguate common names)
 
-        # If found good match, use it
-        if best_match and best_ratio > 0.85:
-            self.name_mapping[lookup_key] = best_match
-            self._save_name_mapping()
-            # print(f"   Matched '{name}' → '{best_match}' (similarity: {best_ratio:.1%})")
-            return best_match
+        Returns:
+            Canonical name format
 
-        # Otherwise, this is a new unique person - create canonical name
-        canonical = self._format_canonical_name(cleaned.split('|')[0])
-        self.name_mapping[lookup_key] = canonical
-        self._save_name_mapping()
+        Examples:
+            "Cook, Timothy D." → "Timothy D Cook"
+            "Tim Cook" → "Timothy D Cook" (fuzzy matched)
+            "T.D. Cook" → "Timothy D Cook" (fuzzy matched)
+        """
+        canonical, changed = self._resolve_insider_name(name, company)
+        if changed:
+            self._save_name_mapping()
         return canonical
 
+    def _normalize_insider_names(self, names, companies) -> List[str]:
+        """
+        Normalize a column of names in one pass (see _normalize_insider_name).
+
+        Names are resolved in order, so a later row can match a new name from
+        an earlier row, and name_mapping is saved once at the end instead of
+        after every new name.
+
+        Args:
+            names: Raw insider names
+            companies: Company ticker for each name
+
+        Returns:
+            Canonical names, aligned with the input
+        """
+        resolved = {}
+        changed = False
+        canonical_names = []
+        for name, company in zip(names, companies):
+            key = (name, company)
+            if key not in resolved:
+                resolved[key], new_name = self._resolve_insider_name(name, company)
+                changed = changed or new_name
+            canonical_names.append(resolved[key])
+
+        if changed:
+            self._save_name_mapping()
+        return canonical_names
+
     def _format_canonical_name(self, normalized_name: str) -> str:
         """
         Format normalized name to Title Case canonical format.
@@ -269,24 +381,25 @@ class InsiderPerformanceTracker:
         if 'insider' in trades_df.columns and 'insider_name' not in trades_df.columns:
             trades_df['insider_name'] = trades_df['insider']
 
+        has_names = 'insider_name' in trades_df.columns
+        raw_names = trades_df['insider_name'] if has_names else pd.Series('UNKNOWN', index=trades_df.index)
+
+        # Skip trades already in history (deduplication)
+        if not self.trades_history.empty and has_names:
+            known = set(zip(self.trades_history['ticker'], self.trades_history['insider_name'],
+                            self.trades_history['trade_date']))
+            is_new = [(ticker, name, pd.to_datetime(trade_date)) not in known
+                      for ticker, name, trade_date in zip(trades_df['ticker'], raw_names, trades_df['trade_date'])]
+            trades_df = trades_df[is_new]
+            raw_names = raw_names[is_new]
+
+        # Normalize insider names to handle variations (one mapping save for the batch)
+        normalized_names = self._normalize_insider_names(raw_names, trades_df['ticker'])
+
         # Prepare new trades for insertion
         new_trades = []
-        for _, row in trades_df.iterrows():
-            # Skip if already in history (deduplication)
-            if not self.trades_history.empty:
-                existing = self.trades_history[
-                    (self.trades_history['ticker'] == row['ticker']) &
-                    (self.trades_history['insider_name'] == row.get('insider_name', row.get('insider'))) &
-                    (self.trades_history['trade_date'] == pd.to_datetime(row['trade_date']))
-                ]
-                if not existing.empty:
-                    continue
-
-            # Normalize insider name to handle variations
-            raw_name = row.get('insider_name', row.get('insider', 'UNKNOWN'))
+        for (_, row), raw_name, normalized_name in zip(trades_df.iterrows(), raw_names, normalized_names):
             ticker = row['ticker']
-            normalized_name = self._normalize_insider_name(raw_name, ticker)
-
             new_trade = {
                 'trade_date': pd.to_datetime(row['trade_date']),
                 'ticker': ticker,
@@ -352,13 +465,15 @@ class InsiderPerformanceTracker:
             # CRITICAL BUG FIX: Save to disk to persist changes
             self._save_trades_history()
 
-    def update_outcomes(self, batch_size: int = 50, rate_limit_delay: float = 0.3):
+    def update_outcomes(self, batch_size: int = 50, rate_limit_delay: float = 0.3, batched: bool = True):
         """
         Update outcomes for trades that don't have complete outcome data.
 
         Args:
-            batch_size: Maximum number of trades to update per run (to avoid API rate limits)
-            rate_limit_delay: Delay between API calls in seconds
+            batch_size: Maximum number of trades to update per run
+            rate_limit_delay: Delay between API calls in seconds (per-trade path only)
+            batched: Read each ticker's history once for all of its pending trades
+                (False = legacy per-trade lookups)
         """
         if self.trades_history.empty:
             return
@@ -394,6 +509,19 @@ class InsiderPerformanceTracker:
         to_process = missing_outcomes.head(batch_size)
         print(f"Updating outcomes for {len(to_process)} trades (batch size: {batch_size})")
 
+        if batched:
+            updated_count = self._update_outcomes_batched(to_process)
+        else:
+            updated_count = self._update_outcomes_per_trade(to_process, rate_limit_delay)
+
+        print(f"Successfully updated outcomes for {updated_count}/{len(to_process)} trades")
+
+        # Save updated history
+        if updated_count > 0:
+            self._save_trades_history()
+
+    def _update_outcomes_per_trade(self, to_process: pd.DataFrame, rate_limit_delay: float) -> int:
+        """Legacy path: one history lookup per trade. Returns the number of trades updated."""
         updated_count = 0
         for idx, row in to_process.iterrows():
             try:
@@ -423,11 +551,93 @@ class InsiderPerformanceTracker:
                 print(f"Error updating outcomes for {row['ticker']} ({row['insider_name']}): {e}")
                 continue
 
-        print(f"Successfully updated outcomes for {updated_count}/{len(to_process)} trades")
+        return updated_count
 
-        # Save updated history
-        if updated_count > 0:
-            self._save_trades_history()
+    def _update_outcomes_batched(self, to_process: pd.DataFrame) -> int:
+        """
+        Batched path: one history read per ticker covering all of its pending trades.
+
+        Outcomes match _calculate_trade_outcomes: first close on or after
+        trade_date + N days, plus dividends with ex-date in (trade_date, outcome_date].
+        Trades without a positive entry price are skipped rather than given
+        infinite returns. Results are written back in a single assignment.
+        Returns the number of trades updated.
+        """
+        trades = to_process[['ticker', 'trade_date', 'entry_price']].copy()
+        trades['ticker'] = trades['ticker'].astype(str).str.upper().str.strip()
+        trades['entry_price'] = pd.to_numeric(trades['entry_price'], errors='coerce')
+        trade_dates = pd.to_datetime(trades['trade_date'])
+        if trade_dates.dt.tz is not None:
+            trade_dates = trade_dates.dt.tz_localize(None)
+        trades['trade_date'] = trade_dates
+        trades = trades[trades['trade_date'].notna() & (trades['entry_price'] > 0)]
+        if trades.empty:
+            return 0
+
+        # Same per-trade window as the legacy path, unioned per ticker
+        spans = trades.groupby('ticker')['trade_date'].agg(['min', 'max'])
+        ranges = {
+            t: (row['min'] - timedelta(days=5), row['max'] + timedelta(days=OUTCOME_WINDOW_DAYS))
+            for t, row in spans.iterrows()
+        }
+        try:
+            histories = get_price_store().get_histories_for_ranges(ranges, adjusted=False)
+        except Exception as e:
+            print(f"Error fetching price history for outcome update: {e}")
+            return 0
+
+        horizons = [(30, '30d'), (60, '60d'), (90, '90d'), (180, '180d')]
+        price_cols = [f'outcome_{key}' for _, key in horizons]
+        return_cols = [f'return_{key}' for _, key in horizons]
+        results = []
+
+        for ticker, group in trades.groupby('ticker', sort=False):
+            hist = histories.get(ticker)
+            if hist is None or hist.empty:
+                continue
+
+            dates = hist.index.to_numpy(dtype='datetime64[ns]')
+            closes = hist['Close'].to_numpy(dtype=np.float64)
+            # div_prefix[k] = dividends on bars [0, k)
+            div_prefix = np.zeros(len(dates) + 1)
+            np.cumsum(np.nan_to_num(hist['Dividends'].to_numpy(dtype=np.float64)), out=div_prefix[1:])
+
+            t_dates = group['trade_date'].to_numpy(dtype='datetime64[ns]')
+            entry = group['entry_price'].to_numpy(dtype=np.float64)
+
+            # Trades with no bar on or after the trade date get no update
+            has_entry_bar = np.searchsorted(dates, t_dates, side='left') < len(dates)
+            if not has_entry_bar.any():
+                continue
+            div_from = np.searchsorted(dates, t_dates, side='right')
+
+            prices = np.full((len(group), len(horizons)), np.nan)
+            returns = np.full((len(group), len(horizons)), np.nan)
+            for j, (days, _) in enumerate(horizons):
+                pos = np.searchsorted(dates, t_dates + np.timedelta64(days, 'D'), side='left')
+                found = pos < len(dates)
+                pos_safe = np.minimum(pos, len(dates) - 1)
+                outcome_price = closes[pos_safe]
+                dividends_received = div_prefix[pos_safe + 1] - div_prefix[np.minimum(div_from, pos_safe + 1)]
+                prices[:, j] = np.where(found, outcome_price, np.nan)
+                returns[:, j] = np.where(
+                    found, (outcome_price - entry + dividends_received) / entry * 100, np.nan
+                )
+
+            results.append(pd.DataFrame(
+                np.hstack([prices, returns])[has_entry_bar],
+                index=group.index[has_entry_bar],
+                columns=price_cols + return_cols,
+            ))
+
+        if not results:
+            return 0
+
+        updates = pd.concat(results)
+        updates['last_updated'] = datetime.now().isoformat()
+        cols = price_cols + return_cols + ['last_updated']
+        self.trades_history.loc[updates.index, cols] = updates[cols]
+        return len(updates)
 
     def _calculate_trade_outcomes(self, ticker: str, trade_date: datetime,
                                   entry_price: float, max_retries: int = 3) -> Optional[Dict]:
@@ -454,17 +664,17 @@ class InsiderPerformanceTracker:
                 # Fetch historical data
                 # Start a few days before trade date to ensure we have data
                 start_date = trade_date - timedelta(days=5)
-                end_date = trade_date + timedelta(days=200)  # Give buffer beyond 180 days
+                end_date = trade_date + timedelta(days=OUTCOME_WINDOW_DAYS)  # Give buffer beyond 180 days
 
-                stock = yf.Ticker(ticker)
-                hist = stock.history(start=start_date, end=end_date)
+                # Unadjusted closes from the shared price store; dividends are
+                # added explicitly below, so adjusted prices would double-count
+                hist = get_price_store().get_history(ticker, start_date, end_date, adjusted=False)
 
                 if hist.empty:
                     return None
 
                 # Find the actual trade date or closest after
                 hist = hist.reset_index()
-                hist['Date'] = pd.to_datetime(hist['Date']).dt.tz_localize(None)  # Remove timezone for comparison
 
                 # Normalize trade_date to timezone-naive for comparison
                 trade_date_normalized = pd.to_datetime(trade_date)
@@ -478,19 +688,10 @@ class InsiderPerformanceTracker:
 
                 trade_position = trade_idx.index[0]
 
-                # Fetch dividend data for the period
-                dividends = None
-                try:
-                    div_data = stock.dividends
-                    if div_data is not None and not div_data.empty:
-                        # Convert to DataFrame and remove timezone
-                        dividends = div_data.reset_index()
-                        dividends.columns = ['Date', 'Dividend']
-                        dividends['Date'] = pd.to_datetime(dividends['Date']).dt.tz_localize(None)
-                except Exception as e:
-                    # Dividends fetch failed, continue without dividend adjustment
-                    logging.debug(f"Could not fetch dividends for {ticker}: {e}")
-                    dividends = None
+                # Dividends for the period come with the stored bars
+                dividends = hist.loc[hist['Dividends'] > 0, ['Date', 'Dividends']].rename(
+                    columns={'Dividends': 'Dividend'}
+                )
 
                 outcomes = {}
 
@@ -562,15 +763,15 @@ class InsiderPerformanceTracker:
             if start_date.tz is not None:
                 start_date = start_date.tz_localize(None)
 
-            # Fetch SPY data with buffer
-            spy = yf.Ticker("SPY")
-            hist = spy.history(start=start_date - timedelta(days=5), end=end_date + timedelta(days=5))
+            # SPY bars from the shared price store (with buffer)
+            hist = get_price_store().get_history(
+                'SPY', start_date - timedelta(days=5), end_date + timedelta(days=5), adjusted=True
+            )
 
             if hist.empty or len(hist) < 2:
                 return None
 
             hist = hist.reset_index()
-            hist['Date'] = pd.to_datetime(hist['Date']).dt.tz_localize(None)
 
             # Get start price (on or after start_date)
             start_data = hist[hist['Date'] >= start_date]
@@ -592,14 +793,22 @@ class InsiderPerformanceTracker:
             logging.debug(f"Could not fetch SPY return: {e}")
             return None
 
-    def calculate_insider_profiles(self):
+    def calculate_insider_profiles(self, incremental: bool = False):
         """
         Calculate performance profiles for all insiders based on their trade history.
 
         Updates self.profiles with comprehensive statistics for each insider.
+        All statistics are computed with one groupby pass over the trades
+        (see _compute_profiles).
 
         Filters applied before profile calculation:
         - Penny stock trades (entry_price < MIN_ENTRY_PRICE_FOR_PROFILE) are excluded
+
+        Args:
+            incremental: Recompute only insiders whose trades changed since the
+                last run (per the last_updated column) and merge them into the
+                existing profiles. Falls back to a full rebuild when no previous
+                run state exists.
         """
         if self.trades_history.empty:
             print("No trade history available to calculate profiles")
@@ -645,90 +854,258 @@ class InsiderPerformanceTracker:
             print("No qualifying trades after filtering")
             return
 
-        # Track which insiders actually get a profile this run
-        profiled_this_run = set()
+        if not pd.api.types.is_datetime64_any_dtype(trades_with_outcomes['trade_date']):
+            trades_with_outcomes['trade_date'] = pd.to_datetime(trades_with_outcomes['trade_date'], format='mixed')
 
-        # Group by insider
-        for insider_name in trades_with_outcomes['insider_name'].unique():
-            insider_trades = trades_with_outcomes[
-                trades_with_outcomes['insider_name'] == insider_name
-            ].copy()
+        # Insiders with enough trades for reliable statistics get a profile
+        trade_counts = trades_with_outcomes.groupby('insider_name').size()
+        qualifying = trade_counts[trade_counts >= self.min_trades_for_score]
+        trades_with_outcomes = trades_with_outcomes[
+            trades_with_outcomes['insider_name'].isin(qualifying.index)
+        ]
 
-            if len(insider_trades) < self.min_trades_for_score:
-                continue  # Not enough trades for reliable statistics
+        changed = None
+        state = self._load_profiles_state() if incremental else None
+        if state is not None:
+            changed = self._changed_insiders(trades_with_outcomes, qualifying, state)
 
-            profiled_this_run.add(insider_name)
+        if changed is not None:
+            to_compute = trades_with_outcomes[trades_with_outcomes['insider_name'].isin(changed)]
+        else:
+            to_compute = trades_with_outcomes
 
-            profile = {
-                'name': insider_name,
-                'total_trades': len(insider_trades),
-                'most_recent_trade': insider_trades['trade_date'].max().isoformat(),
-                'oldest_trade': insider_trades['trade_date'].min().isoformat(),
-                'companies_traded': insider_trades['ticker'].nunique(),
-                'tickers': insider_trades['ticker'].unique().tolist(),
-            }
+        new_profiles = self._compute_profiles(to_compute)
 
-            # Calculate performance metrics for each time horizon
-            for horizon in ['30d', '60d', '90d', '180d']:
-                returns_col = f'return_{horizon}'
-                valid_trades = insider_trades[insider_trades[returns_col].notna()].copy()
+        # Purge stale profiles for insiders who no longer qualify
+        # (e.g., all trades were penny stocks, or dropped below min_trades threshold)
+        stale_names = [
+            name for name in list(self.profiles.keys())
+            if name not in qualifying.index
+        ]
+        if stale_names:
+            for name in stale_names:
+                del self.profiles[name]
+            logger.info(f"Purged {len(stale_names)} stale profiles (no longer qualifying)")
 
-                if len(valid_trades) > 0:
-                    valid_returns = valid_trades[returns_col]
+        self.profiles.update(new_profiles)
 
-                    # Win rate (% of profitable trades)
-                    win_rate = (valid_returns > 0).sum() / len(valid_returns) * 100
+        # Calculate percentiles (share of scores <= each score)
+        if self.profiles:
+            scores = np.sort([p['overall_score'] for p in self.profiles.values() if p['overall_score'] is not None])
+            if len(scores):
+                for profile in self.profiles.values():
+                    if profile['overall_score'] is not None:
+                        at_or_below = np.searchsorted(scores, profile['overall_score'], side='right')
+                        profile['score_percentile'] = round(float(at_or_below / len(scores) * 100), 1)
 
-                    # Average return
-                    avg_return = valid_returns.mean()
+        if changed is not None:
+            print(f"Calculated profiles for {len(self.profiles)} insiders "
+                  f"({len(new_profiles)} recomputed incrementally)")
+        else:
+            print(f"Calculated profiles for {len(self.profiles)} insiders")
 
-                    # Median return (more robust to outliers)
-                    median_return = valid_returns.median()
+        # Save profiles
+        self._save_profiles()
 
-                    # Best and worst returns
-                    best_return = valid_returns.max()
-                    worst_return = valid_returns.min()
+    def _load_profiles_state(self) -> Optional[Dict]:
+        """Load the previous profile run's state (None if missing or unusable)."""
+        if not INSIDER_PROFILES_STATE_PATH.exists() or not self.profiles:
+            return None
+        try:
+            with open(INSIDER_PROFILES_STATE_PATH, 'r') as f:
+                state = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Could not load {INSIDER_PROFILES_STATE_PATH}: {e}")
+            return None
+        # Settings that change every profile force a full rebuild
+        if state.get('min_trades_for_score') != self.min_trades_for_score:
+            return None
+        if not state.get('watermark') or not state.get('last_run'):
+            return None
+        return state
+
+    def _save_profiles_state(self):
+        """Record the last_updated watermark covered by the current profiles."""
+        last_updated = pd.to_datetime(self.trades_history.get('last_updated'), errors='coerce', format='mixed')
+        watermark = last_updated.max() if last_updated is not None else pd.NaT
+        state = {
+            'last_run': datetime.now().isoformat(),
+            'watermark': watermark.isoformat() if pd.notna(watermark) else None,
+            'min_trades_for_score': self.min_trades_for_score,
+        }
+        INSIDER_PROFILES_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = str(INSIDER_PROFILES_STATE_PATH) + '.tmp'
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_file, INSIDER_PROFILES_STATE_PATH)
+        except OSError as e:
+            logger.warning(f"Could not save {INSIDER_PROFILES_STATE_PATH}: {e}")
 
-                    # Standard deviation (for Sharpe calculation)
-                    std_return = valid_returns.std()
+    def _changed_insiders(self, trades: pd.DataFrame, trade_counts: pd.Series, state: Dict) -> set:
+        """
+        Insiders whose profile inputs changed since the last run.
 
-                    # Sharpe ratio (assuming 0% risk-free rate, annualized)
-                    # Sharpe = (Average Return - Risk Free Rate) / Std Dev
-                    if std_return > 0:
-                        sharpe = (avg_return / std_return)
-                    else:
-                        sharpe = 0
-
-                    # Calculate alpha vs S&P 500
-                    # Alpha = Average(Insider Return - SPY Return)
-                    days = int(horizon.replace('d', ''))
-                    alpha_values = []
-
-                    for _, trade in valid_trades.iterrows():
-                        trade_date = pd.to_datetime(trade['trade_date'])
-                        spy_return = self._get_spy_return(trade_date, days)
-
-                        if spy_return is not None:
-                            trade_return = trade[returns_col]
-                            alpha = trade_return - spy_return
-                            alpha_values.append(alpha)
-
-                    # Calculate average alpha if we have data
-                    if alpha_values:
-                        avg_alpha = np.mean(alpha_values)
-                        profile[f'alpha_{horizon}'] = round(avg_alpha, 2)
-                        profile[f'alpha_sample_size_{horizon}'] = len(alpha_values)
+        An insider is recomputed if any of their trades was added or updated
+        after the previous watermark, their qualifying trade count differs from
+        the stored profile (trades dropped out), they have no stored profile, or
+        one of their trades crossed the 12-month recency cutoff since last run.
+        """
+        watermark = pd.Timestamp(state['watermark'])
+        last_run = pd.Timestamp(state['last_run'])
+
+        last_updated = pd.to_datetime(trades['last_updated'], errors='coerce', format='mixed')
+        changed = set(trades.loc[last_updated > watermark, 'insider_name'])
+
+        stored_counts = pd.Series(
+            {name: p.get('total_trades') for name, p in self.profiles.items()}, dtype='float64'
+        )
+        current = trade_counts.astype('float64')
+        changed |= set(current.index[current.ne(stored_counts.reindex(current.index))])
+
+        now = datetime.now()
+        crossed = (
+            (trades['trade_date'] >= last_run - timedelta(days=365)) &
+            (trades['trade_date'] < now - timedelta(days=365))
+        )
+        changed |= set(trades.loc[crossed, 'insider_name'])
+        return changed
+
+    def _spy_returns(self, trade_dates: pd.Series, horizon_days: List[int]) -> pd.DataFrame:
+        """
+        S&P 500 return from each trade date over each horizon (same rules as _get_spy_return).
+
+        Reads SPY once for the whole date span; dividend-adjusted returns over
+        any sub-window don't depend on the window read, so they match the
+        per-trade lookups.
+
+        Returns:
+            DataFrame aligned to trade_dates with one column per horizon (NaN if unavailable).
+        """
+        result = pd.DataFrame(np.nan, index=trade_dates.index, columns=horizon_days)
+        valid_dates = trade_dates.dropna()
+        if valid_dates.empty:
+            return result
+
+        try:
+            hist = get_price_store().get_history(
+                'SPY',
+                valid_dates.min() - timedelta(days=5),
+                valid_dates.max() + timedelta(days=max(horizon_days) + 5),
+                adjusted=True
+            )
+        except Exception as e:
+            logging.debug(f"Could not fetch SPY history: {e}")
+            return result
+
+        if hist.empty or len(hist) < 2:
+            return result
+
+        dates = hist.index.to_numpy(dtype='datetime64[ns]')
+        closes = hist['Close'].to_numpy(dtype=np.float64)
+        t = valid_dates.to_numpy(dtype='datetime64[ns]')
+
+        start_pos = np.searchsorted(dates, t, side='left')
+        for days in horizon_days:
+            end_pos = np.searchsorted(dates, t + np.timedelta64(days, 'D'), side='left')
+            ok = (start_pos < len(dates)) & (end_pos < len(dates))
+            start_price = closes[np.minimum(start_pos, len(dates) - 1)]
+            end_price = closes[np.minimum(end_pos, len(dates) - 1)]
+            result.loc[valid_dates.index, days] = np.where(
+                ok, (end_price - start_price) / start_price * 100, np.nan
+            )
+        return result
+
+    def _compute_profiles(self, trades: pd.DataFrame) -> Dict[str, Dict]:
+        """
+        Build profiles for every insider in trades with one groupby pass per statistic.
+
+        Args:
+            trades: Qualifying trades (outcomes present, penny stocks removed,
+                at least min_trades_for_score per insider).
+
+        Returns:
+            Dict mapping insider name → profile dict.
+        """
+        if trades.empty:
+            return {}
+
+        names = trades['insider_name']
+        grouped = trades.groupby(names, sort=False)
+        base = pd.DataFrame({
+            'total_trades': grouped.size(),
+            'most_recent_trade': grouped['trade_date'].max(),
+            'oldest_trade': grouped['trade_date'].min(),
+            'companies_traded': grouped['ticker'].nunique(),
+        })
+        tickers = grouped['ticker'].unique()
+
+        horizon_days = [int(h.replace('d', '')) for h in PROFILE_HORIZONS]
+        spy = self._spy_returns(trades['trade_date'], horizon_days)
+
+        horizon_stats = {}
+        for horizon, days in zip(PROFILE_HORIZONS, horizon_days):
+            returns = pd.to_numeric(trades[f'return_{horizon}'], errors='coerce')
+            valid = returns.notna()
+            valid_returns = returns[valid]
+            by_insider = valid_returns.groupby(names[valid], sort=False)
+
+            # Alpha = Average(Insider Return - SPY Return) where SPY data exists
+            alpha = (valid_returns - spy.loc[valid, days]).dropna()
+            alpha_by_insider = alpha.groupby(names.loc[alpha.index], sort=False)
+
+            horizon_stats[horizon] = pd.DataFrame({
+                'count': by_insider.size(),
+                'wins': (valid_returns > 0).groupby(names[valid], sort=False).sum(),
+                'mean': by_insider.mean(),
+                'median': by_insider.median(),
+                'max': by_insider.max(),
+                'min': by_insider.min(),
+                'std': by_insider.std(),
+                'alpha': alpha_by_insider.mean(),
+                'alpha_count': alpha_by_insider.size(),
+            }).to_dict('index')
+
+        # Recency-weighted performance (last 12 months weighted 2x)
+        recent_cutoff = datetime.now() - timedelta(days=365)
+        recent = trades['trade_date'] >= recent_cutoff
+        recent_returns = pd.to_numeric(trades.loc[recent, 'return_90d'], errors='coerce')
+        recent_counts = recent.groupby(names, sort=False).sum()
+        recent_avg = recent_returns.groupby(names[recent], sort=False).mean()
+
+        profiles = {}
+        for insider_name, row in base.iterrows():
+            profile = {
+                'name': insider_name,
+                'total_trades': int(row['total_trades']),
+                'most_recent_trade': row['most_recent_trade'].isoformat(),
+                'oldest_trade': row['oldest_trade'].isoformat(),
+                'companies_traded': int(row['companies_traded']),
+                'tickers': tickers[insider_name].tolist(),
+            }
+
+            # Performance metrics for each time horizon
+            for horizon in PROFILE_HORIZONS:
+                stats = horizon_stats[horizon].get(insider_name)
+                if stats:
+                    if stats['alpha_count'] > 0:
+                        profile[f'alpha_{horizon}'] = round(float(stats['alpha']), 2)
+                        profile[f'alpha_sample_size_{horizon}'] = int(stats['alpha_count'])
                     else:
                         profile[f'alpha_{horizon}'] = None
                         profile[f'alpha_sample_size_{horizon}'] = 0
 
-                    profile[f'win_rate_{horizon}'] = round(win_rate, 2)
-                    profile[f'avg_return_{horizon}'] = round(avg_return, 2)
-                    profile[f'median_return_{horizon}'] = round(median_return, 2)
-                    profile[f'best_return_{horizon}'] = round(best_return, 2)
-                    profile[f'worst_return_{horizon}'] = round(worst_return, 2)
-                    profile[f'sharpe_{horizon}'] = round(sharpe, 2)
-                    profile[f'sample_size_{horizon}'] = len(valid_returns)
+                    # Sharpe ratio (assuming 0% risk-free rate): Average Return / Std Dev
+                    std_return = stats['std']
+                    sharpe = stats['mean'] / std_return if std_return > 0 else 0
+
+                    profile[f'win_rate_{horizon}'] = round(float(stats['wins'] / stats['count'] * 100), 2)
+                    profile[f'avg_return_{horizon}'] = round(float(stats['mean']), 2)
+                    profile[f'median_return_{horizon}'] = round(float(stats['median']), 2)
+                    profile[f'best_return_{horizon}'] = round(float(stats['max']), 2)
+                    profile[f'worst_return_{horizon}'] = round(float(stats['min']), 2)
+                    profile[f'sharpe_{horizon}'] = round(float(sharpe), 2)
+                    profile[f'sample_size_{horizon}'] = int(stats['count'])
                 else:
                     profile[f'win_rate_{horizon}'] = None
                     profile[f'avg_return_{horizon}'] = None
@@ -740,91 +1117,64 @@ class InsiderPerformanceTracker:
                     profile[f'alpha_{horizon}'] = None
                     profile[f'alpha_sample_size_{horizon}'] = 0
 
-            # Calculate recency-weighted performance (last 12 months weighted 2x)
-            recent_cutoff = datetime.now() - timedelta(days=365)
-            recent_trades = insider_trades[
-                insider_trades['trade_date'] >= recent_cutoff
-            ]
-
-            if not recent_trades.empty and recent_trades['return_90d'].notna().any():
-                recent_avg_return = recent_trades['return_90d'].mean()
-                profile['recent_avg_return_90d'] = round(recent_avg_return, 2)
-                profile['recent_trade_count'] = len(recent_trades)
+            if insider_name in recent_avg.index and pd.notna(recent_avg[insider_name]):
+                profile['recent_avg_return_90d'] = round(float(recent_avg[insider_name]), 2)
+                profile['recent_trade_count'] = int(recent_counts[insider_name])
             else:
                 profile['recent_avg_return_90d'] = None
                 profile['recent_trade_count'] = 0
 
-            # Calculate overall score (0-100 scale)
-            # Based on: 90-day alpha (primary), win rate, Sharpe ratio, recency
-            score_components = []
-
-            # Component 1: 90-day alpha vs S&P 500 (weighted 35%)
-            # Alpha shows skill beyond market performance
-            if profile['alpha_90d'] is not None:
-                # Normalize: 0% alpha = 50, +15% alpha = 100, -15% alpha = 0
-                alpha_score = 50 + (profile['alpha_90d'] * 3.33)
-                alpha_score = max(0, min(100, alpha_score))
-                score_components.append(alpha_score * 0.35)
-
-            # Component 2: 90-day average return (weighted 25%)
-            if profile['avg_return_90d'] is not None:
-                # Normalize: 0% = 50, +20% = 100, -20% = 0
-                return_score = 50 + (profile['avg_return_90d'] * 2.5)
-                return_score = max(0, min(100, return_score))
-                score_components.append(return_score * 0.25)
-
-            # Component 3: 90-day win rate (weighted 20%)
-            if profile['win_rate_90d'] is not None:
-                score_components.append(profile['win_rate_90d'] * 0.20)
-
-            # Component 4: Sharpe ratio (weighted 15%)
-            if profile['sharpe_90d'] is not None:
-                # Normalize: 0 = 50, 2.0 = 100, -2.0 = 0
-                sharpe_score = 50 + (profile['sharpe_90d'] * 25)
-                sharpe_score = max(0, min(100, sharpe_score))
-                score_components.append(sharpe_score * 0.15)
-
-            # Component 5: Recent performance bonus (weighted 5%)
-            if profile['recent_avg_return_90d'] is not None:
-                recent_score = 50 + (profile['recent_avg_return_90d'] * 2.5)
-                recent_score = max(0, min(100, recent_score))
-                score_components.append(recent_score * 0.05)
-
-            if score_components:
-                overall_score = sum(score_components)
-                profile['overall_score'] = round(overall_score, 2)
-                profile['score_percentile'] = None  # Will calculate after all profiles done
-            else:
-                profile['overall_score'] = 50  # Neutral score if no data
-                profile['score_percentile'] = None
-
-            # Store profile
-            self.profiles[insider_name] = profile
+            profile['overall_score'] = self._score_profile(profile)
+            profile['score_percentile'] = None  # Will calculate after all profiles done
 
-        # Purge stale profiles for insiders who no longer qualify
-        # (e.g., all trades were penny stocks, or dropped below min_trades threshold)
-        stale_names = [
-            name for name in list(self.profiles.keys())
-            if name not in profiled_this_run
-        ]
-        if stale_names:
-            for name in stale_names:
-                del self.profiles[name]
-            logger.info(f"Purged {len(stale_names)} stale profiles (no longer qualifying)")
+            profiles[insider_name] = profile
 
-        # Calculate percentiles
-        if self.profiles:
-            scores = [p['overall_score'] for p in self.profiles.values() if p['overall_score'] is not None]
-            if scores:
-                for insider_name, profile in self.profiles.items():
-                    if profile['overall_score'] is not None:
-                        percentile = (sum(s <= profile['overall_score'] for s in scores) / len(scores)) * 100
-                        profile['score_percentile'] = round(percentile, 1)
+        return profiles
 
-        print(f"Calculated profiles for {len(self.profiles)} insiders")
+    @staticmethod
+    def _score_profile(profile: Dict) -> float:
+        """
+        Overall score (0-100 scale).
 
-        # Save profiles
-        self._save_profiles()
+        Based on: 90-day alpha (primary), win rate, Sharpe ratio, recency.
+        """
+        score_components = []
+
+        # Component 1: 90-day alpha vs S&P 500 (weighted 35%)
+        # Alpha shows skill beyond market performance
+        if profile['alpha_90d'] is not None:
+            # Normalize: 0% alpha = 50, +15% alpha = 100, -15% alpha = 0
+            alpha_score = 50 + (profile['alpha_90d'] * 3.33)
+            alpha_score = max(0, min(100, alpha_score))
+            score_components.append(alpha_score * 0.35)
+
+        # Component 2: 90-day average return (weighted 25%)
+        if profile['avg_return_90d'] is not None:
+            # Normalize: 0% = 50, +20% = 100, -20% = 0
+            return_score = 50 + (profile['avg_return_90d'] * 2.5)
+            return_score = max(0, min(100, return_score))
+            score_components.append(return_score * 0.25)
+
+        # Component 3: 90-day win rate (weighted 20%)
+        if profile['win_rate_90d'] is not None:
+            score_components.append(profile['win_rate_90d'] * 0.20)
+
+        # Component 4: Sharpe ratio (weighted 15%)
+        if profile['sharpe_90d'] is not None:
+            # Normalize: 0 = 50, 2.0 = 100, -2.0 = 0
+            sharpe_score = 50 + (profile['sharpe_90d'] * 25)
+            sharpe_score = max(0, min(100, sharpe_score))
+            score_components.append(sharpe_score * 0.15)
+
+        # Component 5: Recent performance bonus (weighted 5%)
+        if profile['recent_avg_return_90d'] is not None:
+            recent_score = 50 + (profile['recent_avg_return_90d'] * 2.5)
+            recent_score = max(0, min(100, recent_score))
+            score_components.append(recent_score * 0.05)
+
+        if score_components:
+            return round(sum(score_components), 2)
+        return 50  # Neutral score if no data
 
     def get_insider_score(self, insider_name: str, company: str = None) -> Dict:
         """
@@ -839,7 +1189,29 @@ class InsiderPerformanceTracker:
         """
         # Normalize the name to match against profiles
         normalized_name = self._normalize_insider_name(insider_name, company)
+        return self._profile_or_neutral(normalized_name)
+
+    def get_insider_scores(self, insider_names: List[str], company: str = None) -> Dict[str, Dict]:
+        """
+        Performance scores for many insiders, resolving each distinct name once.
+
+        Same profiles as calling get_insider_score per name, but the names are
+        normalized in one batch (one name mapping save).
+
+        Args:
+            insider_names: Names of the insiders (will be normalized)
+            company: Company ticker applied to every name (optional)
+
+        Returns:
+            Dict mapping each raw name to its profile (or the neutral default)
+        """
+        unique_names = list(dict.fromkeys(insider_names))
+        normalized_names = self._normalize_insider_names(unique_names, [company] * len(unique_names))
+        return {name: self._profile_or_neutral(normalized)
+                for name, normalized in zip(unique_names, normalized_names)}
 
+    def _profile_or_neutral(self, normalized_name: str) -> Dict:
+        """Profile for a normalized name, or a neutral score for unknown insiders."""
         if normalized_name in self.profiles:
             return self.profiles[normalized_name]
         else:
@@ -18,7 +18,9 @@ from fmp_api import fetch_profiles_batch
 from generate_report import render_daily_html, render_no_activity_html
 from send_email import send_email
 from paper_trade import PaperTradingPortfolio
-from news_sentiment import check_news_for_signals
+from news_sentiment import check_news_for_signal, check_news_for_signals
+from enrichment_pipeline import EnrichmentPipeline, EnrichmentStage
+from http_client import get_http_client
 from paper_trade_monitor import PaperTradingMonitor
 from insider_performance_tracker import InsiderPerformanceTracker
 
@@ -29,7 +31,10 @@ from config import (
     ENABLE_INSIDER_SCORING, INSIDER_LOOKBACK_YEARS, MIN_TRADES_FOR_INSIDER_SCORE,
     INSIDER_OUTCOME_UPDATE_BATCH_SIZE, INSIDER_API_RATE_LIMIT_DELAY,
     ENABLE_SHORT_INTEREST_ANALYSIS, SHORT_INTEREST_CACHE_HOURS,
-    MIN_SIGNAL_SCORE_THRESHOLD, ENABLE_SECTOR_ANALYSIS
+    MIN_SIGNAL_SCORE_THRESHOLD, ENABLE_SECTOR_ANALYSIS,
+    NEWS_MAX_CONCURRENCY,
+    SHORT_INTEREST_RATE_LIMIT_PER_SECOND, SHORT_INTEREST_MAX_CONCURRENCY,
+    SEC_13F_MAX_CONCURRENCY
 )
 
 # Short interest analysis import
@@ -46,6 +51,7 @@ try:
     from multi_signal_detector import MultiSignalDetector, combine_insider_and_politician_signals
     from politician_tracker import create_politician_tracker
     from automated_politician_checker import create_automated_checker
+    from sec_13f_parser import SEC13FParser
     from config import (
         ENABLE_MULTI_SIGNAL, ENABLE_POLITICIAN_SCRAPING, ENABLE_13F_CHECKING,
         SEC_USER_AGENT, POLITICIAN_LOOKBACK_DAYS, POLITICIAN_MAX_PAGES,
@@ -360,6 +366,92 @@ def append_to_history(cluster_df):
     combined.to_csv(HISTORY_CSV, index=False)
     print(f"✅ Saved {len(new_df)} signal(s) to history (total: {len(combined)} signals tracked)")
 
+def latest_filed_13f_quarter(now=None):
+    """
+    Most recent quarter whose 13F filings are available.
+
+    13F filings are due 45 days after quarter end, so we use a conservative
+    mapping to ensure data is available:
+    Q1 ends Mar 31 (filed by ~May 15), Q2 ends Jun 30 (filed by ~Aug 14),
+    Q3 ends Sep 30 (filed by ~Nov 14), Q4 ends Dec 31 (filed by ~Feb 14).
+
+    Returns:
+        (year, quarter)
+    """
+    now = now or datetime.utcnow()
+    current_month = now.month
+    current_year = now.year
+
+    if current_month <= 2:  # Jan-Feb: Q3 of previous year is most recent
+        return current_year - 1, 3
+    elif current_month <= 5:  # Mar-May: Q4 of previous year
+        return current_year - 1, 4
+    elif current_month <= 8:  # Jun-Aug: Q1 of current year
+        return current_year, 1
+    elif current_month <= 11:  # Sep-Nov: Q2 of current year
+        return current_year, 2
+    else:  # December: Q3 of current year
+        return current_year, 3
+
+
+def _news_stage():
+    """Google News sentiment for one signal (throttled by http_client's news.google.com bucket)."""
+    def no_news(row, error):
+        return {
+            'ticker': row['ticker'],
+            'has_news': False,
+            'sentiment': 'UNKNOWN',
+            'recommendation': 'PROCEED',
+            'reason': f'News check failed: {error}',
+            'articles': []
+        }
+
+    return EnrichmentStage(
+        'news', lambda row: check_news_for_signal(row['ticker']),
+        max_concurrency=NEWS_MAX_CONCURRENCY,
+        default=no_news
+    )
+
+
+def enrich_signals(cluster_df, si_analyzer=None, sec_parser=None, quarter_year=None, quarter=None):
+    """
+    Fetch short interest and 13F holdings for every signal concurrently.
+
+    News is fetched separately at step 4 so only signals that reach the news
+    filter are looked up.
+
+    Args:
+        cluster_df: Clustered signals
+        si_analyzer: Optional ShortInterestAnalyzer (short interest stage)
+        sec_parser: Optional SEC13FParser (13F stage, needs quarter_year/quarter)
+
+    Returns:
+        Dict with 'short_interest' (analyze_signal results in row order, or None) and
+        'institutional' (ticker -> 13F holdings DataFrame, or None)
+    """
+    stages = []
+    if si_analyzer is not None:
+        stages.append(EnrichmentStage(
+            'short_interest', si_analyzer.analyze_signal,
+            calls_per_second=SHORT_INTEREST_RATE_LIMIT_PER_SECOND,
+            max_concurrency=SHORT_INTEREST_MAX_CONCURRENCY,
+            default=si_analyzer.neutral_analysis
+        ))
+    if sec_parser is not None:
+        stages.append(EnrichmentStage(
+            '13f', lambda row: sec_parser.check_institutional_interest(row['ticker'], quarter_year, quarter),
+            max_concurrency=SEC_13F_MAX_CONCURRENCY,
+            default=lambda row, error: pd.DataFrame()
+        ))
+
+    results = EnrichmentPipeline(stages).run(cluster_df)
+    tickers = cluster_df['ticker'].tolist()
+    return {
+        'short_interest': results.get('short_interest'),
+        'institutional': dict(zip(tickers, results['13f'])) if '13f' in results else None
+    }
+
+
 def main(test=False, enable_paper_trading=True):
     print(f"{'='*60}")
     print(f"🔍 Insider Cluster Watch - {datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
@@ -496,7 +588,7 @@ def main(test=False, enable_paper_trading=True):
     
     if df is None or df.empty:
         print("⚠️  OpenInsider returned no data, trying SEC EDGAR backup...")
-        df = fetch_sec_edgar_data(days_back=3, max_filings=50)
+        df = fetch_sec_edgar_data(days_back=3)
 
         if df is None or df.empty:
             print("❌ No data available from either OpenInsider or SEC EDGAR")
@@ -554,7 +646,7 @@ def main(test=False, enable_paper_trading=True):
 
         # Recalculate insider profiles with latest data
         print("   🎯 Calculating insider performance profiles...")
-        insider_tracker.calculate_insider_profiles()
+        insider_tracker.calculate_insider_profiles(incremental=True)
         print(f"   ✅ Profiles updated for {len(insider_tracker.profiles)} insiders\n")
 
     # 3) Process buy signals and compute cluster scores (with enhanced features)
@@ -628,6 +720,30 @@ def main(test=False, enable_paper_trading=True):
         else:
             print(f"   ℹ️  No new purchases to track (may already be tracked)")
 
+    # 3.4) Per-signal enrichment: short interest and 13F holdings are
+    # fetched concurrently here and joined onto cluster_df by the steps below
+    si_analyzer = None
+    si_error = None
+    if SHORT_INTEREST_AVAILABLE and ENABLE_SHORT_INTEREST_ANALYSIS:
+        try:
+            si_analyzer = ShortInterestAnalyzer(
+                cache_dir=os.path.join(DATA_DIR, 'short_interest_cache'),
+                cache_hours=SHORT_INTEREST_CACHE_HOURS
+            )
+        except Exception as e:
+            si_error = e
+
+    sec_parser = None
+    filing_year, filing_quarter = latest_filed_13f_quarter()
+    if MULTI_SIGNAL_AVAILABLE and ENABLE_MULTI_SIGNAL and ENABLE_POLITICIAN_SCRAPING and ENABLE_13F_CHECKING:
+        sec_parser = SEC13FParser(SEC_USER_AGENT)
+
+    if si_analyzer or sec_parser:
+        print(f"\n⚡ Enriching {len(cluster_df)} signals concurrently ("
+              f"{', '.join(n for n, on in (('short interest', si_analyzer), ('13F holdings', sec_parser)) if on)})...")
+    enrichment = enrich_signals(cluster_df, si_analyzer=si_analyzer, sec_parser=sec_parser,
+                                quarter_year=filing_year, quarter=filing_quarter)
+
     # 3.5) Short interest analysis
     if SHORT_INTEREST_AVAILABLE and ENABLE_SHORT_INTEREST_ANALYSIS:
         print("\n📊 Analyzing short interest data...")
@@ -636,13 +752,11 @@ def main(test=False, enable_paper_trading=True):
         print("   • Adjusting conviction based on short interest")
 
         try:
-            si_analyzer = ShortInterestAnalyzer(
-                cache_dir=os.path.join(DATA_DIR, 'short_interest_cache'),
-                cache_hours=SHORT_INTEREST_CACHE_HOURS
-            )
+            if si_analyzer is None:
+                raise si_error
 
-            # Analyze all signals
-            cluster_df = si_analyzer.analyze_signals(cluster_df)
+            # Join the analyses fetched above
+            cluster_df = si_analyzer.analyze_signals(cluster_df, analyses=enrichment['short_interest'])
 
             # Show summary
             high_squeeze_count = cluster_df['squeeze_potential'].sum() if 'squeeze_potential' in cluster_df.columns else 0
@@ -737,33 +851,9 @@ def main(test=False, enable_paper_trading=True):
         try:
             detector = MultiSignalDetector(SEC_USER_AGENT, politician_tracker=politician_tracker)
 
-            # Calculate most recent FILED quarter for 13F checks
-            # 13F filings are due 45 days after quarter end
-            # We use a conservative approach to ensure data is available
+            # Most recent FILED quarter for 13F checks
+            year, quarter = filing_year, filing_quarter
             now = datetime.utcnow()
-            current_month = now.month
-            current_year = now.year
-
-            # Q1 ends Mar 31 (filed by ~May 15)
-            # Q2 ends Jun 30 (filed by ~Aug 14)
-            # Q3 ends Sep 30 (filed by ~Nov 14)
-            # Q4 ends Dec 31 (filed by ~Feb 14)
-
-            if current_month <= 2:  # Jan-Feb: Q3 of previous year is most recent
-                quarter = 3
-                year = current_year - 1
-            elif current_month <= 5:  # Mar-May: Q4 of previous year
-                quarter = 4
-                year = current_year - 1
-            elif current_month <= 8:  # Jun-Aug: Q1 of current year
-                quarter = 1
-                year = current_year
-            elif current_month <= 11:  # Sep-Nov: Q2 of current year
-                quarter = 2
-                year = current_year
-            else:  # December: Q3 of current year
-                quarter = 3
-                year = current_year
 
             logger.info(f"Using 13F filing quarter: {year} Q{quarter} (current date: {now.strftime('%Y-%m-%d')})")
 
@@ -772,7 +862,8 @@ def main(test=False, enable_paper_trading=True):
                 cluster_df,
                 check_13f=ENABLE_13F_CHECKING,
                 quarter_year=year,
-                quarter=quarter
+                quarter=quarter,
+                institutional_holdings=enrichment['institutional']
             )
 
             # Enrich cluster_df with multi-signal data
@@ -1034,7 +1125,9 @@ def main(test=False, enable_paper_trading=True):
 
     # 4) Check news sentiment for signals
     print("\n📰 Checking news sentiment...")
-    cluster_df = check_news_for_signals(cluster_df)
+    cluster_df = check_news_for_signals(
+        cluster_df, news_results=EnrichmentPipeline([_news_stage()]).run(cluster_df)['news']
+    )
 
     if cluster_df.empty:
         print("⚠️  All signals filtered out due to negative news")
@@ -1224,6 +1317,10 @@ def main(test=False, enable_paper_trading=True):
         signals_skipped = 0
         paper_trader_opened_positions = []  # Track opened positions for email report
 
+        # Volatility for all candidates in one batch (sizing reads the cache)
+        if not qualified_df.empty:
+            paper_trader.prefetch_atr(qualified_df['ticker'].tolist())
+
         for _, signal_row in qualified_df.iterrows():
             entry_price = signal_row.get('currentPrice')
 
@@ -1337,6 +1434,9 @@ def main(test=False, enable_paper_trading=True):
         except Exception as e:
             print(f"⚠️  Failed to export public insider data: {e}")
 
+    # Per-host HTTP summary (requests, cache hits, latency, throttling)
+    get_http_client().log_metrics()
+
     print(f"{'='*60}\n")
 
 if __name__ == "__main__":
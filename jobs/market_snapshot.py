@@ -0,0 +1,174 @@
+# jobs/market_snapshot.py
+"""
+Bulk market-data snapshot for cluster enrichment.
+
+Replaces the per-ticker yf.Ticker(t).info loop in enrich_with_market_data with:
+- one batched daily-bar read for the whole ticker set (via the shared price
+  store), from which the 52-week range and 10-day / 3-month average volumes
+  are computed as columns
+- a persistent, TTL'd cache for slow-changing fields (float, shares outstanding)
+- a bounded concurrent fetcher for whatever is still missing
+
+The result is a DataFrame indexed by ticker, ready to be merged onto
+cluster_df in a single join.
+"""
+
+import os
+import json
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from price_store import get_histories, period_start
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+SLOW_FIELDS_CACHE_FILE = os.path.join(DATA_DIR, 'market_slow_fields_cache.json')
+SLOW_FIELDS_TTL_DAYS = 7            # Float / shares outstanding change at most quarterly
+SLOW_FIELDS = ('floatShares', 'sharesOutstanding')
+BAR_PERIOD = '1y'                   # Enough history for the 52-week range
+MAX_FETCH_WORKERS = 4               # Concurrent yfinance .info lookups for misses
+TRADING_DAYS_3M = 63                # yfinance's averageVolume is a ~3-month mean
+
+
+class SlowFieldCache:
+    """
+    Persistent cache of slow-changing per-ticker fields with a TTL.
+
+    Entries store an 'expires' epoch so validity checks are one comparison.
+    """
+
+    def __init__(self, cache_file: str = SLOW_FIELDS_CACHE_FILE, ttl_days: int = SLOW_FIELDS_TTL_DAYS):
+        self.cache_file = cache_file
+        self.ttl_seconds = ttl_days * 86400
+        self.cache = self._load_cache()
+        self._dirty = False
+
+    def _load_cache(self) -> Dict:
+        """Load slow-field cache from disk"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Error loading slow-field cache: {e}")
+        return {}
+
+    def save(self) -> None:
+        """Save cache to disk using atomic write (temp + rename), only if changed"""
+        if not self._dirty:
+            return
+        tmp_file = self.cache_file + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(tmp_file, 'w') as f:
+                json.dump(self.cache, f)
+            os.replace(tmp_file, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Error saving slow-field cache: {e}")
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        """Return cached fields for ticker, or None if missing/expired"""
+        entry = self.cache.get(ticker)
+        if entry and entry.get('expires', 0) > time.time():
+            return entry
+        return None
+
+    def put(self, ticker: str, fields: Dict) -> None:
+        """Store fields for ticker with a fresh expiry"""
+        entry = {k: fields.get(k) for k in SLOW_FIELDS if _valid_number(fields.get(k))}
+        entry['expires'] = time.time() + self.ttl_seconds
+        self.cache[ticker] = entry
+        self._dirty = True
+
+
+def _valid_number(value) -> bool:
+    """True for a finite, positive number."""
+    try:
+        return value is not None and np.isfinite(float(value)) and float(value) > 0
+    except (TypeError, ValueError):
+        return False
+
+
+def compute_bar_stats(tickers: List[str], period: str = BAR_PERIOD) -> pd.DataFrame:
+    """
+    Read a year of daily bars for all tickers and compute range/volume stats.
+
+    Bars come from the shared price store, which downloads any missing
+    ranges for the whole ticker set in one batched call.
+
+    Returns:
+        DataFrame indexed by ticker with fiftyTwoWeekLow, fiftyTwoWeekHigh,
+        averageVolume10days, barAverageVolume and lastClose (missing tickers omitted).
+    """
+    columns = ['fiftyTwoWeekLow', 'fiftyTwoWeekHigh', 'averageVolume10days', 'barAverageVolume', 'lastClose']
+    if not tickers:
+        return pd.DataFrame(columns=columns)
+
+    try:
+        histories = get_histories(tickers, start=period_start(period), adjusted=False)
+    except Exception as e:
+        logger.debug(f"Batch bar read failed: {e}")
+        return pd.DataFrame(columns=columns)
+
+    if not histories:
+        return pd.DataFrame(columns=columns)
+
+    # dates × tickers panels, one per field
+    high = pd.DataFrame({t: h['High'] for t, h in histories.items()})
+    low = pd.DataFrame({t: h['Low'] for t, h in histories.items()})
+    close = pd.DataFrame({t: h['Close'] for t, h in histories.items()})
+    volume = pd.DataFrame({t: h['Volume'] for t, h in histories.items()})
+
+    # Rows where a ticker didn't trade are NaN; tail() per column must skip
+    # them, so rank valid rows from the end and mask instead of slicing.
+    vol_valid = volume.notna()
+    vol_rank_from_end = vol_valid[::-1].cumsum()[::-1]
+
+    stats = pd.DataFrame({
+        'fiftyTwoWeekLow': low.min(),
+        'fiftyTwoWeekHigh': high.max(),
+        'averageVolume10days': volume.where(vol_rank_from_end <= 10).mean(),
+        'barAverageVolume': volume.where(vol_rank_from_end <= TRADING_DAYS_3M).mean(),
+        'lastClose': close.ffill().iloc[-1],
+    })
+    stats.index.name = 'ticker'
+    return stats.dropna(how='all')
+
+
+def _fetch_info(ticker: str) -> Optional[Dict]:
+    """Single yfinance .info lookup (runs on the worker pool)."""
+    return yf.Ticker(ticker).info
+
+
+def fetch_info_concurrent(tickers: List[str], max_workers: int = MAX_FETCH_WORKERS) -> Dict[str, object]:
+    """
+    Fetch yfinance .info for tickers on a bounded thread pool.
+
+    Returns:
+        Dict mapping ticker → info dict, or the Exception raised for that ticker.
+    """
+    results = {}
+    if not tickers:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_ticker = {executor.submit(_fetch_info, t): t for t in tickers}
+        for future in as_completed(future_to_ticker):
+            t = future_to_ticker[future]
+            try:
+                results[t] = future.result()
+            except Exception as e:
+                results[t] = e
+    return results
@@ -82,7 +82,8 @@ class MultiSignalDetector:
                      insider_clusters: pd.DataFrame,
                      check_13f: bool = False,
                      quarter_year: Optional[int] = None,
-                     quarter: Optional[int] = None) -> Dict:
+                     quarter: Optional[int] = None,
+                     institutional_holdings: Optional[Dict[str, pd.DataFrame]] = None) -> Dict:
         """
         Run complete multi-signal scan
 
@@ -91,6 +92,9 @@ class MultiSignalDetector:
             check_13f: Whether to include 13F validation
             quarter_year: Year for 13F check
             quarter: Quarter for 13F check
+            institutional_holdings: Optional ticker -> 13F holdings already
+                fetched (e.g. by the enrichment pipeline); other tickers are
+                checked here
 
         Returns:
             Dictionary with tiered signals
@@ -170,9 +174,12 @@ class MultiSignalDetector:
             institutional_score = 0
 
             if check_13f and quarter_year and quarter:
-                institutional_data = self.sec_parser.check_institutional_interest(
-                    ticker, quarter_year, quarter
-                )
+                if institutional_holdings is not None and ticker in institutional_holdings:
+                    institutional_data = institutional_holdings[ticker]
+                else:
+                    institutional_data = self.sec_parser.check_institutional_interest(
+                        ticker, quarter_year, quarter
+                    )
 
                 if not institutional_data.empty:
                     has_institutional = len(institutional_data) >= 2
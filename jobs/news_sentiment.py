@@ -18,7 +18,11 @@ import requests
 from bs4 import BeautifulSoup
 import feedparser
 from datetime import datetime, timedelta
-import time
+
+from http_client import get_http_client
+
+# Same-day reruns reuse a fetched feed for this long
+NEWS_CACHE_TTL_SECONDS = 3600
 
 # Negative keywords that trigger warnings
 NEGATIVE_KEYWORDS = [
@@ -63,8 +67,10 @@ def fetch_google_news(ticker, company_name=None, days_back=3):
         encoded_query = quote_plus(search_query)
         url = f"https://news.google.com/rss/search?q={encoded_query}+when:{days_back}d&hl=en-US&gl=US&ceid=US:en"
         
-        # Parse RSS feed
-        feed = feedparser.parse(url)
+        # Fetch through the shared client (pooled, rate-limited), then parse
+        response = get_http_client().get(url, timeout=15, cache_ttl=NEWS_CACHE_TTL_SECONDS)
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
         
         articles = []
         cutoff_date = datetime.now() - timedelta(days=days_back)
@@ -208,27 +214,30 @@ def check_news_for_signal(ticker, company_name=None):
         'articles': articles[:5]  # Top 5 articles
     }
 
-def check_news_for_signals(cluster_df):
+def check_news_for_signals(cluster_df, news_results=None):
     """
     Check news for all signals in a cluster DataFrame
     
     Adds news_sentiment, news_recommendation columns
+
+    Args:
+        cluster_df: Signals DataFrame
+        news_results: Optional check_news_for_signal results already fetched
+            for each row (e.g. by the enrichment pipeline); fetched serially
+            here if not given
     """
     if cluster_df.empty:
         return cluster_df
     
-    print(f"\n📰 Checking news sentiment for {len(cluster_df)} signals...")
-    
-    news_results = []
-    
-    for _, signal in cluster_df.iterrows():
-        ticker = signal['ticker']
-        
-        # Rate limiting - be respectful
-        time.sleep(1)
-        
-        news = check_news_for_signal(ticker)
-        news_results.append(news)
+    if news_results is None:
+        print(f"\n📰 Checking news sentiment for {len(cluster_df)} signals...")
+
+        news_results = []
+
+        for _, signal in cluster_df.iterrows():
+            ticker = signal['ticker']
+            news = check_news_for_signal(ticker)
+            news_results.append(news)
     
     # Add to DataFrame
     cluster_df['news_sentiment'] = [n['sentiment'] for n in news_results]
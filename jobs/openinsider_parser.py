@@ -0,0 +1,168 @@
+# jobs/openinsider_parser.py
+"""
+Streaming OpenInsider screener table parser.
+
+The screener page is one large plain HTML table (class "tinytable", up to
+5,000 rows). Building a full BeautifulSoup tree and calling get_text on every
+cell is slow and memory-heavy for that, so parse_openinsider_table instead:
+- streams the page through lxml's HTML iterparse, handling each <tr> of the
+  tinytable as it closes and freeing it straight away
+- collects cell text per column and converts each column once (numeric
+  columns to float64 arrays, dates with a single to_datetime call)
+- optionally skips rows filed before a watermark without materializing them,
+  stopping outright on a newest-first page (incremental fetches)
+
+The result matches what the original BeautifulSoup loop produced
+(scripts/test_openinsider_parser.py keeps that loop for parity checks).
+
+Used by:
+- fetch_openinsider.py (fetch_openinsider_recent)
+- scripts/bench_openinsider_parser.py (benchmark vs the BeautifulSoup parse)
+"""
+
+import io
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from lxml import etree
+
+OPENINSIDER_COLUMNS = ['filing_date', 'trade_date', 'ticker', 'insider', 'title',
+                       'trade_type', 'qty', 'price', 'owned', 'value']
+
+# OpenInsider table has these columns:
+# 0: X (indicator)
+# 1: Filing Date
+# 2: Trade Date
+# 3: Ticker
+# 4: Company Name (we'll skip this)
+# 5: Insider Name
+# 6: Title
+# 7: Trans Type (P/S/etc)
+# 8: Last Price
+# 9: Qty
+# 10: Owned
+# 11: ΔOwn
+# 12: Value
+MIN_CELLS = 13
+
+
+def _cell_text(td) -> str:
+    """Same text as BeautifulSoup's get_text(strip=True)."""
+    return ''.join(s.strip() for s in td.itertext())
+
+
+def _numeric(values: List[str]) -> np.ndarray:
+    return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').fillna(0).to_numpy(dtype=float)
+
+
+def _build_frame(cols: Dict[str, List[str]]) -> pd.DataFrame:
+    """Typed DataFrame from per-column cell strings."""
+    return pd.DataFrame({
+        'filing_date': pd.to_datetime(pd.Series(cols['filing_date'], dtype=object), errors='coerce'),
+        'trade_date': pd.to_datetime(pd.Series(cols['trade_date'], dtype=object), errors='coerce'),
+        'ticker': np.array(cols['ticker'], dtype=object),
+        'insider': np.array(cols['insider'], dtype=object),
+        'title': np.array(cols['title'], dtype=object),
+        'trade_type': np.array(cols['trade_type'], dtype=object),
+        'qty': _numeric(cols['qty']),
+        'price': _numeric(cols['price']),
+        'owned': _numeric(cols['owned']),
+        'value': _numeric(cols['value']),
+    }, columns=OPENINSIDER_COLUMNS)
+
+
+def _append_row(cols: Dict[str, List[str]], cells: list, text: Callable[[Any], str],
+                newer_than: Optional[str]) -> bool:
+    """
+    Add one table row to the column lists; False if the row is skipped.
+
+    Cell text is only extracted for the columns used, and only once the row
+    has passed the trade-type and watermark checks.
+    """
+    if len(cells) < MIN_CELLS:
+        return False
+
+    trade_type = text(cells[7])
+    # Skip if not a clear buy or sale
+    if not trade_type or trade_type == '-':
+        return False
+
+    # Filing dates are "YYYY-MM-DD HH:MM:SS", so string order is time order
+    filing_date = text(cells[1])
+    if newer_than is not None and filing_date < newer_than:
+        return False
+
+    cols['filing_date'].append(filing_date)
+    cols['trade_date'].append(text(cells[2]))
+    cols['ticker'].append(text(cells[3]))
+    cols['insider'].append(text(cells[5]))      # Skip company name at cells[4]
+    cols['title'].append(text(cells[6]))
+    cols['trade_type'].append(trade_type)
+    cols['qty'].append(text(cells[9]).replace(',', '').replace('+', ''))
+    cols['price'].append(text(cells[8]).replace('$', '').replace(',', ''))
+    cols['owned'].append(text(cells[10]).replace(',', '').replace('+', ''))
+    cols['value'].append(text(cells[12]).replace('$', '').replace(',', '').replace('+', ''))
+    return True
+
+
+def parse_openinsider_table(content: Union[bytes, str], newer_than: Optional[str] = None,
+                            newest_first: bool = False) -> Optional[pd.DataFrame]:
+    """
+    Stream the screener's tinytable into a typed DataFrame.
+
+    Args:
+        content: Page HTML (bytes as received, or str)
+        newer_than: Optional filing timestamp ("YYYY-MM-DD HH:MM:SS"); rows
+            filed before it are skipped (rows filed at exactly that time are
+            kept so nothing published in the same second is lost)
+        newest_first: Rows are sorted by filing date, newest first (the
+            screener's sortcol=0), so parsing stops at the first row older
+            than newer_than
+
+    Returns:
+        DataFrame with OPENINSIDER_COLUMNS (filing/trade dates as datetimes,
+        qty/price/owned/value as floats, trade_type as the raw code), or None
+        if the page has no tinytable
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    cols = {name: [] for name in OPENINSIDER_COLUMNS}
+    found = False
+    in_table = False
+    nested = 0
+
+    for event, elem in etree.iterparse(io.BytesIO(content), events=('start', 'end'),
+                                       tag=('table', 'tr'), html=True, recover=True):
+        if elem.tag == 'table':
+            if event == 'start':
+                if in_table:
+                    nested += 1
+                elif 'tinytable' in (elem.get('class') or '').split():
+                    in_table = found = True
+            elif in_table:
+                if nested:
+                    nested -= 1
+                else:
+                    break  # Only the first tinytable, like soup.find
+            continue
+
+        if event != 'end' or not in_table or nested:
+            continue
+
+        cells = [td for td in elem if td.tag == 'td']
+        if newest_first and newer_than is not None and len(cells) >= MIN_CELLS \
+                and _cell_text(cells[1]) < newer_than:
+            break
+        _append_row(cols, cells, _cell_text, newer_than)
+
+        # Free rows already handled
+        elem.clear()
+        parent = elem.getparent()
+        while elem.getprevious() is not None:
+            del parent[0]
+
+    if not found:
+        return None
+    return _build_frame(cols)
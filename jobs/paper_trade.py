@@ -14,9 +14,11 @@ import logging
 import config
 from config import *
 from ticker_validator import get_failed_ticker_cache
+from quote_cache import get_quote_cache
 from fmp_api import search_mergers_acquisitions, get_company_profile
 from signal_filters import check_shell_company, check_stale_ticker, check_ma_target
 from rotation_scorer import build_paper_rotation_scorer
+from volatility import get_atr_pcts
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 PAPER_PORTFOLIO_FILE = os.path.join(DATA_DIR, 'paper_portfolio.json')
@@ -95,7 +97,7 @@ class PaperTradingPortfolio:
         self.max_portfolio_value = starting_capital
         self.max_drawdown = 0.0
         
-        # Session-level ATR cache to avoid redundant yfinance downloads
+        # Session-level ATR cache (values come from the shared volatility service)
         self._atr_cache = {}
 
         # Daily tracking for monitoring
@@ -121,53 +123,18 @@ class PaperTradingPortfolio:
         """
         Calculate total portfolio value (cash + positions)
 
+        All positions are priced with one batched fetch through the shared
+        quote cache (see quote_cache.py), so repeated calls within a run
+        reuse the same snapshot.
+
         Args:
             verbose: If True, log detailed breakdown of calculation
 
         Returns:
             float: Total portfolio value
         """
-        positions_value = 0.0
-        position_details = []
-        failed_ticker_cache = get_failed_ticker_cache()
-
-        for ticker, pos in self.positions.items():
-            try:
-                current_price = yf.Ticker(ticker).info.get('currentPrice', pos['entry_price'])
-                if not current_price or current_price <= 0:
-                    current_price = pos['entry_price']
-                position_value = pos['shares'] * current_price
-                positions_value += position_value
-
-                if verbose:
-                    position_details.append({
-                        'ticker': ticker,
-                        'shares': pos['shares'],
-                        'price': current_price,
-                        'value': position_value
-                    })
-            except Exception as e:
-                # Better error handling - log and cache failures
-                error_msg = str(e)
-                position_value = pos['shares'] * pos['entry_price']
-                positions_value += position_value
-
-                # Record failure for paper trading price fetch
-                if '404' in error_msg or 'not found' in error_msg.lower():
-                    failed_ticker_cache.record_failure(
-                        ticker,
-                        f"Paper trading price fetch: {error_msg[:80]}",
-                        failure_type='PERMANENT'
-                    )
-                    logger.debug(f"Paper trading: {ticker} price fetch failed (404)")
-
-                if verbose:
-                    position_details.append({
-                        'ticker': ticker,
-                        'shares': pos['shares'],
-                        'price': pos['entry_price'],
-                        'value': position_value
-                    })
+        tickers, prices, position_values = self._position_values()
+        positions_value = float(position_values.sum())
 
         portfolio_value = self.cash + positions_value
 
@@ -178,8 +145,8 @@ class PaperTradingPortfolio:
             logger.info(f"{'='*60}")
             logger.info(f"   Cash: ${self.cash:,.2f}")
             logger.info(f"   Open Positions ({len(self.positions)}):")
-            for detail in position_details:
-                logger.info(f"      {detail['ticker']}: {detail['shares']} × ${detail['price']:.2f} = ${detail['value']:,.2f}")
+            for ticker, price, value in zip(tickers, prices, position_values):
+                logger.info(f"      {ticker}: {self.positions[ticker]['shares']} × ${price:.2f} = ${value:,.2f}")
             logger.info(f"   Total Positions Value: ${positions_value:,.2f}")
             logger.info(f"   ─────────────────────")
             logger.info(f"   Portfolio Value: ${portfolio_value:,.2f}")
@@ -260,10 +227,7 @@ class PaperTradingPortfolio:
                         f"→ max exposure {max_exposure*100:.0f}%"
                     )
 
-        total_exposure = sum(
-            p['shares'] * self._get_current_price(t, p['entry_price'])
-            for t, p in self.positions.items()
-        )
+        total_exposure = float(self._position_values()[2].sum())
         total_exposure += position_value
 
         exposure_pct = (total_exposure / portfolio_value)
@@ -276,17 +240,49 @@ class PaperTradingPortfolio:
         
         return True, "VALID"
     
-    def _get_current_price(self, ticker, fallback_price):
-        """Safely get current price with fallback"""
+    def _fetch_info_price(self, ticker):
+        """Single-ticker .info lookup for tickers the batched quote fetch missed"""
         try:
-            price = yf.Ticker(ticker).info.get('currentPrice', fallback_price)
-            return price if price and price > 0 else fallback_price
+            price = yf.Ticker(ticker).info.get('currentPrice')
+            return price if price and price > 0 else None
         except Exception as e:
-            # Log price fetch failures at debug level
+            # Record 404s so the ticker validator skips delisted tickers
             error_msg = str(e)
             if '404' in error_msg or 'not found' in error_msg.lower():
+                get_failed_ticker_cache().record_failure(
+                    ticker,
+                    f"Paper trading price fetch: {error_msg[:80]}",
+                    failure_type='PERMANENT'
+                )
                 logger.debug(f"Paper trading: Failed to fetch price for {ticker}: {error_msg[:50]}")
-            return fallback_price
+            return None
+
+    def _price_positions(self):
+        """
+        Price every open position from the shared quote snapshot.
+
+        Returns:
+            (tickers, prices) where prices is a float array aligned with
+            tickers, falling back to entry price where no quote is available
+        """
+        tickers = list(self.positions.keys())
+        if not tickers:
+            return tickers, np.zeros(0)
+        quotes = get_quote_cache().get_prices(tickers, fallback_fetch=self._fetch_info_price)
+        entry = np.array([self.positions[t]['entry_price'] for t in tickers], dtype=float)
+        prices = np.array([quotes.get(t) or np.nan for t in tickers], dtype=float)
+        return tickers, np.where(np.isfinite(prices) & (prices > 0), prices, entry)
+
+    def _position_values(self):
+        """(tickers, prices, market values) arrays for all open positions"""
+        tickers, prices = self._price_positions()
+        shares = np.array([self.positions[t]['shares'] for t in tickers], dtype=float)
+        return tickers, prices, shares * prices
+
+    def _get_current_price(self, ticker, fallback_price):
+        """Safely get current price with fallback"""
+        price = get_quote_cache().get_prices([ticker], fallback_fetch=self._fetch_info_price).get(ticker)
+        return price if price and price > 0 else fallback_price
 
     def get_sector_concentration(self):
         """
@@ -445,45 +441,33 @@ class PaperTradingPortfolio:
 
         logger.info(f"{'='*60}\n")
 
+    def prefetch_atr(self, tickers):
+        """Load ATR% for all candidate tickers in one batched call (shared per-day values)."""
+        if not ENABLE_VOLATILITY_ADJUSTED_SIZING:
+            return
+        pending = [t for t in dict.fromkeys(tickers) if t and t not in self._atr_cache]
+        if not pending:
+            return
+        try:
+            values = get_atr_pcts(pending, VOLATILITY_ATR_LOOKBACK_DAYS)
+        except Exception as e:
+            logger.warning(f"ATR prefetch failed for {len(pending)} tickers: {e}")
+            return
+        for t in pending:
+            self._atr_cache[t] = values.get(t.upper().strip())
+
     def _calculate_atr_pct(self, ticker: str):
         """Calculate 20-day ATR as % of price. Cached per session. Returns float or None."""
         if ticker in self._atr_cache:
             return self._atr_cache[ticker]
         try:
-            lookback = VOLATILITY_ATR_LOOKBACK_DAYS + 5
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=int(lookback * 1.8))
-            hist = yf.download(ticker, start=start_date, end=end_date, progress=False)
-
-            if hist.empty or len(hist) < VOLATILITY_ATR_LOOKBACK_DAYS:
-                self._atr_cache[ticker] = None
-                return None
-
-            high = hist['High']
-            low = hist['Low']
-            close = hist['Close']
-            prev_close = close.shift(1)
-
-            tr = high - low
-            tr = tr.combine(abs(high - prev_close), max)
-            tr = tr.combine(abs(low - prev_close), max)
-
-            atr = tr.tail(VOLATILITY_ATR_LOOKBACK_DAYS).mean()
-            last_close = close.iloc[-1]
-
-            if last_close is not None:
-                atr_val = float(atr.iloc[0]) if hasattr(atr, 'iloc') else float(atr)
-                close_val = float(last_close.iloc[0]) if hasattr(last_close, 'iloc') else float(last_close)
-                if close_val > 0:
-                    result = (atr_val / close_val) * 100
-                    self._atr_cache[ticker] = result
-                    return result
-            self._atr_cache[ticker] = None
-            return None
+            values = get_atr_pcts([ticker], VOLATILITY_ATR_LOOKBACK_DAYS)
+            result = values.get(ticker.upper().strip())
         except Exception as e:
             logger.debug(f"ATR calculation failed for {ticker}: {e}")
-            self._atr_cache[ticker] = None
-            return None
+            result = None
+        self._atr_cache[ticker] = result
+        return result
 
     def _get_rotation_scorer(self):
         """Lazy-initialise the rotation scorer on first use."""
@@ -1415,10 +1399,7 @@ class PaperTradingPortfolio:
         # VALIDATION: Check for consistency issues
         if validate:
             # Verify that portfolio value matches cash + positions
-            positions_value = sum(
-                p['shares'] * self._get_current_price(t, p['entry_price'])
-                for t, p in self.positions.items()
-            )
+            positions_value = float(self._position_values()[2].sum())
             calculated_value = self.cash + positions_value
 
             # Allow for small floating point differences (< $0.10)
@@ -1474,10 +1455,7 @@ class PaperTradingPortfolio:
             avg_win = avg_loss = avg_win_pct = avg_loss_pct = avg_hold_days = 0
         
         # Calculate exposure
-        total_exposure = sum(
-            p['shares'] * self._get_current_price(t, p['entry_price'])
-            for t, p in self.positions.items()
-        )
+        total_exposure = float(self._position_values()[2].sum())
         exposure_pct = (total_exposure / current_value * 100) if current_value > 0 else 0
 
         # Rotation stats
@@ -0,0 +1,567 @@
+# jobs/price_store.py
+"""
+Shared on-disk daily price store (OHLCV + dividends + splits).
+
+One SQLite table keyed by (ticker, date) holds raw daily bars downloaded from
+yfinance. Every job that needs daily history reads through this module, so a
+ticker's bars are downloaded once and then only extended with the missing
+date ranges on later calls.
+
+Used by:
+- backtest.py (forward returns)
+- insider_performance_tracker.py (trade outcomes, SPY returns)
+- insider_performance_auto_tracker.py (maturing trade outcomes)
+- sector_analyzer.py (sector ETF performance)
+- signal_filters.py (prefetch_price_history)
+- market_snapshot.py (52-week range, average volumes)
+- generate_public_performance.py (S&P 500 return)
+- automated_trading/execute_trades.py (ATR sizing)
+
+Storage notes:
+- Bars are stored unadjusted for dividends (Yahoo's Close is already
+  split-adjusted). Dividend-adjusted prices are computed on read from the
+  stored Dividends column, so appending new bars never rewrites history.
+- A per-ticker coverage row records the contiguous date range already
+  fetched. Only dates outside it are downloaded, batched across tickers
+  that share the same missing range.
+- Today's bar may still be forming, so coverage stops at yesterday and the
+  latest bars are refreshed at most every LIVE_BAR_TTL_SECONDS per process.
+- If a newly appended bar carries a stock split, the ticker's stored history
+  is on the old share basis and is re-downloaded in full.
+- A range with trading sessions that downloads empty (delisted ticker, no
+  bars yet) is remembered in empty_ranges for EMPTY_RANGE_TTL_SECONDS, so
+  repeat requests don't download it again until the marker expires.
+"""
+
+import os
+import time
+import atexit
+import sqlite3
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+PRICE_STORE_FILE = os.path.join(DATA_DIR, 'price_store.sqlite')
+LIVE_BAR_TTL_SECONDS = 900          # Re-download the forming bar at most every 15 min
+DOWNLOAD_CHUNK_SIZE = 100           # Tickers per batched yf.download call
+EMPTY_RANGE_TTL_SECONDS = 12 * 3600 # Don't retry a range that came back empty for 12h
+SESSION_HOLIDAY_PAD = 20            # One extra weekday per 20 sessions covers exchange holidays
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits']
+_DB_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'dividends', 'splits']
+
+DateLike = object  # str, date, datetime or pd.Timestamp
+
+
+def _to_date(value: DateLike) -> date:
+    """Normalize any date-like value to a naive calendar date."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert(None)
+    return ts.date()
+
+
+def _split_download(data: pd.DataFrame, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+    """Split a yf.download result into per-ticker frames with BAR_COLUMNS."""
+    frames = {}
+    if data is None or data.empty:
+        return frames
+
+    if isinstance(data.columns, pd.MultiIndex):
+        level = 0 if set(tickers) & set(data.columns.get_level_values(0)) else 1
+        available = set(data.columns.get_level_values(level))
+        for t in tickers:
+            if t not in available:
+                continue
+            frames[t] = data.xs(t, axis=1, level=level)
+    elif len(tickers) == 1:
+        frames[tickers[0]] = data
+
+    out = {}
+    for t, df in frames.items():
+        df = df.reindex(columns=BAR_COLUMNS)
+        df = df.dropna(subset=['Open', 'High', 'Low', 'Close'], how='all')
+        if df.empty:
+            continue
+        df[['Dividends', 'Stock Splits']] = df[['Dividends', 'Stock Splits']].fillna(0.0)
+        idx = pd.DatetimeIndex(df.index)
+        if idx.tz is not None:
+            idx = idx.tz_convert(None)
+        df.index = idx.normalize()
+        out[t] = df
+    return out
+
+
+def _yf_download(tickers: List[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+    """Default fetcher: one batched yfinance download for [start, end] inclusive."""
+    data = yf.download(
+        tickers,
+        start=start.isoformat(),
+        end=(end + timedelta(days=1)).isoformat(),  # yfinance end is exclusive
+        progress=False,
+        group_by='ticker',
+        auto_adjust=False,
+        actions=True,
+        threads=True,
+    )
+    return _split_download(data, tickers)
+
+
+def adjust_for_dividends(bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of bars with OHLC back-adjusted for dividends in the window.
+
+    Uses Yahoo's method: each bar before an ex-date is scaled by
+    (1 - dividend / previous close). Returns computed from the adjusted
+    series match yfinance auto_adjust=True for any sub-window.
+    """
+    if bars.empty or not (bars['Dividends'] > 0).any():
+        return bars.copy()
+
+    close = bars['Close'].to_numpy(dtype=np.float64)
+    divs = bars['Dividends'].to_numpy(dtype=np.float64)
+    prev_close = np.r_[np.nan, close[:-1]]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where((divs > 0) & (prev_close > 0), 1.0 - divs / prev_close, 1.0)
+    # factor[t] = product of ratio over ex-dates strictly after t
+    factor = np.r_[np.cumprod(ratio[::-1])[::-1][1:], 1.0]
+
+    adjusted = bars.copy()
+    for col in ['Open', 'High', 'Low', 'Close']:
+        adjusted[col] = adjusted[col] * factor
+    return adjusted
+
+
+class PriceStore:
+    """
+    SQLite-backed daily bar store with incremental, batched downloads.
+
+    Thread-safe within a process: the lock guards the connection, and
+    downloads happen outside it so threads fetch concurrently. WAL mode
+    lets separate jobs read while another appends.
+    """
+
+    def __init__(self, db_path: str = PRICE_STORE_FILE, fetch_fn=None):
+        self.db_path = db_path
+        self.fetch_fn = fetch_fn or _yf_download
+        self._lock = threading.RLock()
+        self._live_fetched: Dict[str, float] = {}
+        self.stats = {'downloads': 0, 'tickers_downloaded': 0, 'cache_hits': 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS daily_bars (
+                ticker TEXT NOT NULL,
+                date TEXT NOT NULL,
+                open REAL, high REAL, low REAL, close REAL, volume REAL,
+                dividends REAL DEFAULT 0, splits REAL DEFAULT 0,
+                PRIMARY KEY (ticker, date)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS coverage (
+                ticker TEXT PRIMARY KEY,
+                start TEXT NOT NULL,
+                end TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS empty_ranges (
+                ticker TEXT PRIMARY KEY,
+                start TEXT NOT NULL,
+                end TEXT NOT NULL,
+                checked_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Coverage bookkeeping
+    # ------------------------------------------------------------------
+
+    def _coverage(self, tickers: List[str]) -> Dict[str, Tuple[date, date]]:
+        """Return {ticker: (start, end)} for tickers with stored coverage."""
+        result = {}
+        for i in range(0, len(tickers), 500):
+            chunk = tickers[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT ticker, start, end FROM coverage WHERE ticker IN ({placeholders})", chunk
+            ).fetchall()
+            for t, s, e in rows:
+                result[t] = (date.fromisoformat(s), date.fromisoformat(e))
+        return result
+
+    def _empty_ranges(self, tickers: List[str]) -> Dict[str, Tuple[date, date]]:
+        """Return {ticker: (start, end)} for unexpired empty-download markers."""
+        result = {}
+        cutoff = time.time() - EMPTY_RANGE_TTL_SECONDS
+        for i in range(0, len(tickers), 500):
+            chunk = tickers[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT ticker, start, end FROM empty_ranges "
+                f"WHERE ticker IN ({placeholders}) AND checked_at > ?", [*chunk, cutoff]
+            ).fetchall()
+            for t, s, e in rows:
+                result[t] = (date.fromisoformat(s), date.fromisoformat(e))
+        return result
+
+    def _missing_range(self, ticker: str, start: date, end: date,
+                       coverage: Dict[str, Tuple[date, date]]) -> Optional[Tuple[date, date]]:
+        """
+        Single contiguous range to download so coverage spans [start, end].
+
+        Coverage is kept as one interval, so a request on either side is
+        extended to meet the existing range rather than leaving a hole.
+        """
+        today = date.today()
+        if ticker not in coverage:
+            return start, end
+
+        cov_start, cov_end = coverage[ticker]
+        fetch_start = start if start < cov_start else None
+        fetch_end = None
+        if end > cov_end:
+            # Coverage stops at yesterday; skip the still-forming bar if this
+            # process refreshed it recently
+            live_fresh = (time.time() - self._live_fetched.get(ticker, 0)) < LIVE_BAR_TTL_SECONDS
+            if not (live_fresh and cov_end >= today - timedelta(days=1)):
+                fetch_end = end
+
+        if fetch_start is None and fetch_end is None:
+            return None
+        if fetch_start is None:
+            return cov_end + timedelta(days=1), fetch_end
+        if fetch_end is None:
+            return fetch_start, cov_start - timedelta(days=1)
+        return fetch_start, fetch_end
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _write_bars(self, ticker: str, bars: pd.DataFrame) -> None:
+        """Upsert bars for one ticker (caller holds the lock)."""
+        values = bars[BAR_COLUMNS].to_numpy(dtype=np.float64)
+        dates = bars.index.strftime('%Y-%m-%d')
+        rows = [
+            (ticker, d, *[None if np.isnan(v) else float(v) for v in row])
+            for d, row in zip(dates, values)
+        ]
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO daily_bars (ticker, date, {', '.join(_DB_COLUMNS)}) "
+            f"VALUES (?, ?, {', '.join('?' * len(_DB_COLUMNS))})",
+            rows,
+        )
+
+    def _update_coverage(self, ticker: str, start: date, end: date,
+                         coverage: Dict[str, Tuple[date, date]]) -> None:
+        """Extend the ticker's coverage interval (caller holds the lock)."""
+        end = min(end, date.today() - timedelta(days=1))
+        if ticker in coverage:
+            start = min(start, coverage[ticker][0])
+            end = max(end, coverage[ticker][1])
+        if end < start:
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO coverage (ticker, start, end, fetched_at) VALUES (?, ?, ?, ?)",
+            (ticker, start.isoformat(), end.isoformat(), time.time()),
+        )
+        coverage[ticker] = (start, end)
+
+    def _mark_empty(self, ticker: str, start: date, end: date) -> None:
+        """Remember that [start, end] downloaded empty (caller holds the lock)."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO empty_ranges (ticker, start, end, checked_at) VALUES (?, ?, ?, ?)",
+            (ticker, start.isoformat(), end.isoformat(), time.time()),
+        )
+
+    def ensure(self, tickers: Iterable[str], start: DateLike, end: DateLike = None) -> None:
+        """
+        Make sure bars for [start, end] (inclusive, end defaults to today) are stored.
+
+        Tickers missing the same date range are downloaded together in one
+        batched call per DOWNLOAD_CHUNK_SIZE tickers.
+        """
+        self.ensure_ranges({t: (start, end) for t in tickers if t})
+
+    def ensure_ranges(self, ranges: Dict[str, Tuple[DateLike, DateLike]],
+                      align_months: bool = False) -> None:
+        """
+        Like ensure(), but each ticker has its own [start, end] window.
+
+        Args:
+            ranges: Dict mapping ticker → (start, end); end None means today.
+            align_months: Widen first-time downloads to whole calendar months so
+                tickers with nearby windows share one batched download instead
+                of each getting its own call.
+        """
+        today = date.today()
+        wanted: Dict[str, Tuple[date, date]] = {}
+        for t, (start, end) in ranges.items():
+            t = str(t).upper().strip()
+            if not t:
+                continue
+            start_d = _to_date(start)
+            end_d = min(_to_date(end) if end is not None else today, today)
+            if end_d < start_d:
+                continue
+            if t in wanted:
+                start_d = min(start_d, wanted[t][0])
+                end_d = max(end_d, wanted[t][1])
+            wanted[t] = (start_d, end_d)
+        if not wanted:
+            return
+
+        with self._lock:
+            tickers = sorted(wanted)
+            coverage = self._coverage(tickers)
+            empty = self._empty_ranges(tickers)
+            by_range: Dict[Tuple[date, date], List[str]] = {}
+            for t in tickers:
+                start_d, end_d = wanted[t]
+                missing = self._missing_range(t, start_d, end_d, coverage)
+                if missing is None:
+                    self.stats['cache_hits'] += 1
+                    continue
+                if missing[0] > missing[1]:
+                    continue
+                if t in empty and empty[t][0] <= missing[0] and missing[1] <= empty[t][1]:
+                    # Downloaded empty recently (delisted / not trading yet)
+                    self.stats['cache_hits'] += 1
+                    continue
+                if align_months and t not in coverage:
+                    month_end = (pd.Timestamp(missing[1]) + pd.offsets.MonthEnd(0)).date()
+                    missing = (missing[0].replace(day=1), min(month_end, today))
+                by_range.setdefault(missing, []).append(t)
+
+        # Downloads run outside the lock so concurrent callers fetch side by side
+        resplit = []
+        for (fetch_start, fetch_end), group in by_range.items():
+            for i in range(0, len(group), DOWNLOAD_CHUNK_SIZE):
+                chunk = group[i:i + DOWNLOAD_CHUNK_SIZE]
+                resplit.extend(self._download_chunk(chunk, fetch_start, fetch_end))
+
+        # New split on an appended bar → stored history is on the old basis
+        for t, (cov_start, cov_end) in resplit:
+            with self._lock:
+                self._conn.execute("DELETE FROM daily_bars WHERE ticker = ?", (t,))
+                self._conn.execute("DELETE FROM coverage WHERE ticker = ?", (t,))
+                self._conn.commit()
+            logger.info(f"Price store: split detected for {t}, re-downloading history")
+            self._download_chunk([t], cov_start, max(cov_end, wanted[t][1]))
+
+    def _download_chunk(self, chunk: List[str], fetch_start: date,
+                        fetch_end: date) -> List[Tuple[str, Tuple[date, date]]]:
+        """Download one batch, store it and return tickers needing a split refresh."""
+        with self._lock:
+            self.stats['downloads'] += 1
+            self.stats['tickers_downloaded'] += len(chunk)
+        try:
+            frames = self.fetch_fn(chunk, fetch_start, fetch_end)
+        except Exception as e:
+            logger.debug(f"Price store download failed for {len(chunk)} tickers: {e}")
+            return []
+
+        with self._lock:
+            # Re-read coverage: another caller may have extended it during the download
+            resplit = self._store_chunk(chunk, frames, fetch_start, fetch_end, self._coverage(chunk))
+            self._conn.commit()
+        return resplit
+
+    def _store_chunk(self, chunk: List[str], frames: Dict[str, pd.DataFrame], fetch_start: date,
+                     fetch_end: date, coverage: Dict[str, Tuple[date, date]]) -> List[Tuple[str, Tuple[date, date]]]:
+        """Write one downloaded batch (caller holds the lock)."""
+        # A range with no trading days legitimately returns nothing
+        no_sessions = np.busday_count(fetch_start, fetch_end + timedelta(days=1)) == 0
+        today = date.today()
+        resplit = []
+
+        for t in chunk:
+            bars = frames.get(t)
+            if bars is None or bars.empty:
+                if no_sessions:
+                    self._update_coverage(t, fetch_start, fetch_end, coverage)
+                else:
+                    self._mark_empty(t, fetch_start, fetch_end)
+                continue
+
+            if t in coverage:
+                cov_start, cov_end = coverage[t]
+                new_rows = bars[bars.index > pd.Timestamp(cov_end)]
+                if (new_rows['Stock Splits'] > 0).any():
+                    resplit.append((t, coverage[t]))
+
+            self._write_bars(t, bars)
+            self._update_coverage(t, fetch_start, fetch_end, coverage)
+            self._conn.execute("DELETE FROM empty_ranges WHERE ticker = ?", (t,))
+            if fetch_end >= today:
+                self._live_fetched[t] = time.time()
+
+        return resplit
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _read(self, tickers: List[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+        """Read stored bars for tickers within [start, end]."""
+        result = {}
+        with self._lock:
+            for i in range(0, len(tickers), 500):
+                chunk = tickers[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                df = pd.read_sql_query(
+                    f"SELECT ticker, date, {', '.join(_DB_COLUMNS)} FROM daily_bars "
+                    f"WHERE ticker IN ({placeholders}) AND date >= ? AND date <= ? "
+                    f"ORDER BY ticker, date",
+                    self._conn,
+                    params=[*chunk, start.isoformat(), end.isoformat()],
+                )
+                if df.empty:
+                    continue
+                df['date'] = pd.to_datetime(df['date'])
+                df = df.rename(columns=dict(zip(_DB_COLUMNS, BAR_COLUMNS)))
+                for t, group in df.groupby('ticker', sort=False):
+                    bars = group.drop(columns='ticker').set_index('date')
+                    bars.index.name = 'Date'
+                    result[t] = bars
+        return result
+
+    def get_histories(self, tickers: Iterable[str], start: DateLike, end: DateLike = None,
+                      adjusted: bool = True, fetch: bool = True) -> Dict[str, pd.DataFrame]:
+        """
+        Daily bars for many tickers.
+
+        Args:
+            tickers: Ticker symbols.
+            start: First date (inclusive).
+            end: Last date (inclusive), defaults to today.
+            adjusted: Back-adjust OHLC for dividends inside the window
+                (equivalent to yfinance auto_adjust=True for returns).
+            fetch: Download missing ranges first (False = read stored bars only).
+
+        Returns:
+            Dict mapping ticker → DataFrame indexed by naive Date with
+            Open, High, Low, Close, Volume, Dividends, Stock Splits.
+            Tickers without data are omitted.
+        """
+        tickers = [str(t).upper().strip() for t in tickers if t]
+        if not tickers:
+            return {}
+        start_d = _to_date(start)
+        end_d = _to_date(end) if end is not None else date.today()
+
+        if fetch:
+            self.ensure(tickers, start_d, end_d)
+
+        histories = self._read(sorted(set(tickers)), start_d, end_d)
+        if adjusted:
+            histories = {t: adjust_for_dividends(df) for t, df in histories.items()}
+        return histories
+
+    def get_histories_for_ranges(self, ranges: Dict[str, Tuple[DateLike, DateLike]],
+                                 adjusted: bool = True, fetch: bool = True) -> Dict[str, pd.DataFrame]:
+        """
+        Daily bars for many tickers, each over its own [start, end] window.
+
+        Missing ranges are downloaded in month-aligned batches (see
+        ensure_ranges), then each ticker's window is read from the store.
+        """
+        if fetch:
+            self.ensure_ranges(ranges, align_months=True)
+
+        histories = {}
+        today = date.today()
+        for t, (start, end) in ranges.items():
+            t = str(t).upper().strip()
+            end_d = _to_date(end) if end is not None else today
+            bars = self._read([t], _to_date(start), end_d).get(t)
+            if bars is not None:
+                histories[t] = adjust_for_dividends(bars) if adjusted else bars
+        return histories
+
+    def get_history(self, ticker: str, start: DateLike, end: DateLike = None,
+                    adjusted: bool = True, fetch: bool = True) -> pd.DataFrame:
+        """Daily bars for one ticker (empty DataFrame if unavailable)."""
+        ticker = str(ticker).upper().strip()
+        hist = self.get_histories([ticker], start, end, adjusted=adjusted, fetch=fetch).get(ticker)
+        if hist is None:
+            return pd.DataFrame(columns=BAR_COLUMNS, index=pd.DatetimeIndex([], name='Date'))
+        return hist
+
+    def get_dividends(self, ticker: str, start: DateLike, end: DateLike = None,
+                      fetch: bool = True) -> pd.Series:
+        """Cash dividends by ex-date within [start, end]."""
+        hist = self.get_history(ticker, start, end, adjusted=False, fetch=fetch)
+        divs = hist['Dividends'] if 'Dividends' in hist else pd.Series(dtype=float)
+        return divs[divs > 0]
+
+
+# Global singleton
+_price_store = None
+_price_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Get or create the global price store"""
+    global _price_store
+    with _price_store_lock:
+        if _price_store is None:
+            _price_store = PriceStore()
+            # Closing checkpoints the WAL into the main file, so a cached
+            # copy of price_store.sqlite is complete
+            atexit.register(_price_store.close)
+    return _price_store
+
+
+# Convenience functions
+def get_history(ticker: str, start: DateLike, end: DateLike = None, adjusted: bool = True) -> pd.DataFrame:
+    """Daily bars for one ticker from the shared store"""
+    return get_price_store().get_history(ticker, start, end, adjusted=adjusted)
+
+
+def get_histories(tickers: Iterable[str], start: DateLike, end: DateLike = None,
+                  adjusted: bool = True) -> Dict[str, pd.DataFrame]:
+    """Daily bars for many tickers from the shared store"""
+    return get_price_store().get_histories(tickers, start, end, adjusted=adjusted)
+
+
+def period_start(period: str, end: DateLike = None) -> date:
+    """
+    Translate a yfinance-style period ('20d', '6mo', '1y') into a start date.
+
+    As with yfinance, 'Nd' counts trading sessions, not calendar days: the
+    window goes back N weekdays plus one per SESSION_HOLIDAY_PAD sessions for
+    exchange holidays, so it holds at least N sessions.
+    """
+    end_d = _to_date(end) if end is not None else date.today()
+    period = period.strip().lower()
+    if period.endswith('mo'):
+        return (pd.Timestamp(end_d) - pd.DateOffset(months=int(period[:-2]))).date()
+    if period.endswith('y'):
+        return (pd.Timestamp(end_d) - pd.DateOffset(years=int(period[:-1]))).date()
+    if period.endswith('wk'):
+        return end_d - timedelta(weeks=int(period[:-2]))
+    if period.endswith('d'):
+        sessions = int(period[:-1])
+        weekdays = sessions + sessions // SESSION_HOLIDAY_PAD + 1
+        return (pd.Timestamp(end_d) - pd.offsets.BDay(weekdays)).date()
+    raise ValueError(f"Unsupported period: {period}")
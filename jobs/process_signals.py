@@ -9,11 +9,10 @@ NEW FEATURES:
 - Pattern detection (accelerating buys, CEO+CFO patterns, etc.)
 """
 
+import os
 import pandas as pd
 import math
-import time
-from datetime import timedelta, datetime
-import yfinance as yf  # Fallback only
+from datetime import date, timedelta, datetime
 import config
 from sector_analyzer import SectorAnalyzer
 import logging
@@ -30,7 +29,15 @@ from signal_filters import (
     check_ma_target,
     prefetch_price_history
 )
+from price_store import period_start
 from ticker_validator import get_failed_ticker_cache
+from cluster_engine import find_best_windows
+from market_snapshot import (
+    SlowFieldCache,
+    SLOW_FIELDS,
+    compute_bar_stats,
+    fetch_info_concurrent
+)
 
 # Suppress yfinance error spam for delisted stocks
 logging.getLogger('yfinance').setLevel(logging.WARNING)
@@ -69,6 +76,12 @@ HOLIDAY_PERIODS = [
 MIN_STOCK_PRICE = 2.0                      # No penny stocks
 MIN_AVERAGE_VOLUME = 100_000               # Legacy: Liquidity requirement (shares/day) - deprecated
 MAX_RECENT_DRAWDOWN = -0.40                # Don't buy falling knives (40% drop)
+DOWNTREND_SMA_TOLERANCE = 0.97             # Reject if price is >3% below the 5-day SMA
+PRICE_HEALTH_LOOKBACK_DAYS = 35            # Calendar days of bars for drawdown + SMA checks
+REPEAT_TRADE_COOLDOWN_DAYS = 7             # No re-entry within 7 days of a close
+
+PAPER_TRADES_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'paper_trades.csv')
+QUALITY_REJECTIONS_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'quality_filter_rejections.csv')
 
 # Fix 4: Tiered Dollar Volume Thresholds - Fair liquidity assessment across price ranges
 # Uses daily dollar volume (shares × price) instead of share volume for better normalization
@@ -719,10 +732,14 @@ def enrich_with_market_data(cluster_df):
     - sharesOutstanding (calculated from price/mktCap)
     - companyName, exchange (company info)
 
-    Fields from yfinance (fallback):
+    Fields from one batched yfinance daily-bar download (market_snapshot.py):
     - fiftyTwoWeekLow, fiftyTwoWeekHigh (52-week range)
-    - floatShares (float analysis)
     - averageVolume10days (short-term volume)
+    - averageVolume fallback (3-month mean) when FMP has none
+
+    Fields from yfinance .info (concurrent, only for misses):
+    - price/marketCap/company fallback for tickers FMP couldn't resolve
+    - floatShares (float analysis), cached with a TTL in SlowFieldCache
     """
     import warnings
     import logging
@@ -779,127 +796,126 @@ def enrich_with_market_data(cluster_df):
     # Log FMP results (smart, concise)
     print(f"   ✅ FMP: {fmp_used}/{len(tickers)} profiles ({fmp_success_rate:.1f}% success)")
 
-    # STEP 3: Yfinance fallback for failed/missing tickers
-    yf_successful = 0
-    yf_failed = 0
+    # STEP 3: One batched daily-bar download → 52-week range and average volumes
+    print(f"   📈 Batch downloading daily bars for 52-week range & volume...")
+    bar_stats = compute_bar_stats(tickers)
 
+    # STEP 4: One concurrent yfinance .info pass covering both FMP misses and
+    # tickers whose slow-changing fields (float, shares outstanding) aren't cached
+    slow_cache = SlowFieldCache()
+    info_needed = [t for t in tickers if t in yf_needed or slow_cache.get(t) is None]
     if yf_needed:
         print(f"   🔄 yfinance fallback: {len(yf_needed)} tickers...")
+    info_results = fetch_info_concurrent(info_needed)
 
-        failed_ticker_cache = get_failed_ticker_cache()
-
-        for t in yf_needed:
-            try:
-                ticker_obj = yf.Ticker(t)
-                q = ticker_obj.info
-
-                if q and 'currentPrice' in q:
-                    ticker_info = {}
-
-                    # Price and market data
-                    if _is_valid_field(q.get('currentPrice')):
-                        ticker_info['currentPrice'] = q.get('currentPrice')
-                    if _is_valid_field(q.get('marketCap')):
-                        ticker_info['marketCap'] = q.get('marketCap')
-
-                    # Company name
-                    company = q.get('longName') or q.get('shortName')
-                    ticker_info['company'] = company if _is_valid_field(company) else t
-
-                    # Volume
-                    avg_vol = q.get('averageVolume', 0)
-                    ticker_info['averageVolume'] = avg_vol if _is_valid_field(avg_vol) else 0
-
-                    # Shares outstanding
-                    shares_out = q.get('sharesOutstanding')
-                    if _is_valid_field(shares_out):
-                        ticker_info['sharesOutstanding'] = shares_out
-
-                    info[t] = ticker_info
-                    yf_successful += 1
-
-                    # Record success to remove from blacklist if present
-                    failed_ticker_cache.record_success(t)
-                else:
-                    info[t] = {'company': t}
-                    yf_failed += 1
-
-                    # Record failure - no price data available
-                    failed_ticker_cache.record_failure(
-                        t,
-                        "No price data from yfinance",
-                        failure_type='TEMPORARY'
-                    )
-
-                time.sleep(0.5)  # Rate limiting
-
-            except Exception as e:
-                error_msg = str(e)
-                info[t] = {'company': t}
-                yf_failed += 1
-
-                # Improved error handling with specific logging
-                failure_type = 'TEMPORARY'
-                if '404' in error_msg or 'not found' in error_msg.lower():
-                    failure_type = 'PERMANENT'
-                    logger.debug(f"yfinance: {t} not found (404) - marking as permanent failure")
-                elif 'delisted' in error_msg.lower():
-                    failure_type = 'PERMANENT'
-                    logger.debug(f"yfinance: {t} appears delisted - marking as permanent failure")
-                else:
-                    logger.debug(f"yfinance: {t} failed with error: {error_msg}")
-
-                # Record the failure in cache
-                failed_ticker_cache.record_failure(
-                    t,
-                    error_msg[:100],  # Truncate long error messages
-                    failure_type=failure_type
-                )
+    yf_successful = 0
+    yf_failed = 0
+    failed_ticker_cache = get_failed_ticker_cache() if yf_needed else None
+
+    for t in yf_needed:
+        q = info_results.get(t)
+
+        if isinstance(q, Exception):
+            error_msg = str(q)
+            info[t] = {'company': t}
+            yf_failed += 1
+
+            # Improved error handling with specific logging
+            failure_type = 'TEMPORARY'
+            if '404' in error_msg or 'not found' in error_msg.lower():
+                failure_type = 'PERMANENT'
+                logger.debug(f"yfinance: {t} not found (404) - marking as permanent failure")
+            elif 'delisted' in error_msg.lower():
+                failure_type = 'PERMANENT'
+                logger.debug(f"yfinance: {t} appears delisted - marking as permanent failure")
+            else:
+                logger.debug(f"yfinance: {t} failed with error: {error_msg}")
 
-    # STEP 4: Fetch 52-week range and float from yfinance (for ALL tickers)
-    # These fields are not available in FMP basic profile
-    print(f"   📈 Fetching 52-week range & float data...")
-    range_fetched = 0
+            # Record the failure in cache
+            failed_ticker_cache.record_failure(
+                t,
+                error_msg[:100],  # Truncate long error messages
+                failure_type=failure_type
+            )
+        elif q and 'currentPrice' in q:
+            ticker_info = {}
 
-    for t in tickers:
-        if t not in info:
-            continue
+            # Price and market data
+            if _is_valid_field(q.get('currentPrice')):
+                ticker_info['currentPrice'] = q.get('currentPrice')
+            if _is_valid_field(q.get('marketCap')):
+                ticker_info['marketCap'] = q.get('marketCap')
 
-        try:
-            ticker_obj = yf.Ticker(t)
-            q = ticker_obj.info
+            # Company name
+            company = q.get('longName') or q.get('shortName')
+            ticker_info['company'] = company if _is_valid_field(company) else t
 
-            if q:
-                # 52-week range
-                if _is_valid_field(q.get('fiftyTwoWeekLow')):
-                    info[t]['fiftyTwoWeekLow'] = q.get('fiftyTwoWeekLow')
-                if _is_valid_field(q.get('fiftyTwoWeekHigh')):
-                    info[t]['fiftyTwoWeekHigh'] = q.get('fiftyTwoWeekHigh')
+            # Volume
+            avg_vol = q.get('averageVolume', 0)
+            ticker_info['averageVolume'] = avg_vol if _is_valid_field(avg_vol) else 0
 
-                # Float shares
-                float_shares = q.get('floatShares')
-                if _is_valid_field(float_shares):
-                    info[t]['floatShares'] = float_shares
+            # Shares outstanding
+            shares_out = q.get('sharesOutstanding')
+            if _is_valid_field(shares_out):
+                ticker_info['sharesOutstanding'] = shares_out
 
-                # 10-day volume
-                avg_vol_10d = q.get('averageVolume10days', 0)
-                if _is_valid_field(avg_vol_10d):
-                    info[t]['averageVolume10days'] = avg_vol_10d
+            info[t] = ticker_info
+            yf_successful += 1
 
-                # Average volume - fallback if FMP didn't provide it
-                if 'averageVolume' not in info[t] or info[t].get('averageVolume', 0) == 0:
-                    avg_vol = q.get('averageVolume', 0)
-                    if _is_valid_field(avg_vol) and avg_vol > 0:
-                        info[t]['averageVolume'] = avg_vol
+            # Record success to remove from blacklist if present
+            failed_ticker_cache.record_success(t)
+        else:
+            info[t] = {'company': t}
+            yf_failed += 1
+
+            # Record failure - no price data available
+            failed_ticker_cache.record_failure(
+                t,
+                "No price data from yfinance",
+                failure_type='TEMPORARY'
+            )
 
-                range_fetched += 1
+    for t, q in info_results.items():
+        if isinstance(q, dict):
+            slow_cache.put(t, q)
+        elif isinstance(q, Exception):
+            logger.debug(f"Failed to fetch float data for {t}: {str(q)[:50]}")
+    slow_cache.save()
+
+    # STEP 5: Assemble one snapshot frame (FMP/yfinance fields + bar stats +
+    # cached slow fields) and attach it to cluster_df in a single merge
+    snapshot = pd.DataFrame.from_dict(info, orient='index')
+    snapshot = snapshot.reindex(index=tickers, columns=[
+        'currentPrice', 'marketCap', 'company', 'sector', 'industry',
+        'averageVolume', 'sharesOutstanding'
+    ])
+    snapshot = snapshot.join(bar_stats, how='left')
+
+    slow_df = pd.DataFrame.from_dict(
+        {t: slow_cache.get(t) or {} for t in tickers}, orient='index'
+    ).reindex(index=tickers, columns=list(SLOW_FIELDS))
+
+    numeric_cols = ['currentPrice', 'marketCap', 'averageVolume', 'sharesOutstanding',
+                    'fiftyTwoWeekLow', 'fiftyTwoWeekHigh', 'averageVolume10days', 'barAverageVolume']
+    for col in numeric_cols:
+        snapshot[col] = pd.to_numeric(snapshot[col], errors='coerce')
+    for col in SLOW_FIELDS:
+        slow_df[col] = pd.to_numeric(slow_df[col], errors='coerce')
+
+    # Shares outstanding: FMP/yfinance profile first, cached value second
+    snapshot['sharesOutstanding'] = snapshot['sharesOutstanding'].fillna(slow_df['sharesOutstanding'])
+    snapshot['floatShares'] = slow_df['floatShares']
+
+    # Average volume: profile first, bar-derived 3-month mean as fallback
+    avg_vol = snapshot['averageVolume']
+    snapshot['averageVolume'] = avg_vol.where(avg_vol > 0, snapshot['barAverageVolume']).fillna(0)
 
-            time.sleep(0.3)  # Rate limiting
+    # CRITICAL: Validate all fields to prevent NaN from appearing in emails
+    for col in ['sector', 'industry']:
+        snapshot[col] = snapshot[col].where(snapshot[col].map(_is_valid_field), None)
+    snapshot['company'] = snapshot['company'].where(snapshot['company'].map(_is_valid_field), snapshot.index.to_series())
 
-        except Exception as e:
-            # Log 52-week data fetch failures at debug level (not critical)
-            logger.debug(f"Failed to fetch 52-week data for {t}: {str(e)[:50]}")
-            pass  # Continue without 52-week data
+    range_fetched = int(snapshot['fiftyTwoWeekLow'].notna().sum())
 
     # Smart logging summary (consolidated)
     successful = fmp_used + yf_successful
@@ -912,43 +928,11 @@ def enrich_with_market_data(cluster_df):
     print(f"   💾 Cache: {analytics_summary['cache_hit_rate_pct']}% hit rate, {analytics_summary['cache_size']} tickers cached")
     save_analytics()  # Persist analytics
 
-    # CRITICAL: Validate all fields to prevent NaN from appearing in emails
-    cluster_df['currentPrice'] = cluster_df['ticker'].map(
-        lambda x: info.get(x, {}).get('currentPrice') if _is_valid_field(info.get(x, {}).get('currentPrice')) else None
-    )
-    cluster_df['marketCap'] = cluster_df['ticker'].map(
-        lambda x: info.get(x, {}).get('marketCap') if _is_valid_field(info.get(x, {}).get('marketCap')) else None
-    )
-    cluster_df['fiftyTwoWeekLow'] = cluster_df['ticker'].map(
-        lambda x: info.get(x, {}).get('fiftyTwoWeekLow') if _is_valid_field(info.get(x, {}).get('fiftyTwoWeekLow')) else None
-    )
-    cluster_df['fiftyTwoWeekHigh'] = cluster_df['ticker'].map(
-        lambda x: info.get(x, {}).get('fiftyTwoWeekHigh') if _is_valid_field(info.get(x, {}).get('fiftyTwoWeekHigh')) else None
-    )
-
-    # Add company name
-    cluster_df['company'] = cluster_df['ticker'].map(lambda x: info.get(x, {}).get('company', x))
-
-    # NEW: Add sector and industry - only if valid (None if not available)
-    # CRITICAL: Use _is_valid_field to prevent NaN from appearing in emails
-    cluster_df['sector'] = cluster_df['ticker'].map(
-        lambda x: info.get(x, {}).get('sector') if _is_valid_field(info.get(x, {}).get('sector')) else None
-    )
-    cluster_df['industry'] = cluster_df['ticker'].map(
-        lambda x: info.get(x, {}).get('industry') if _is_valid_field(info.get(x, {}).get('industry')) else None
-    )
+    snapshot = snapshot.drop(columns=['barAverageVolume', 'lastClose'])
+    snapshot.index.name = 'ticker'
+    cluster_df = cluster_df.drop(columns=[c for c in snapshot.columns if c in cluster_df.columns])
+    cluster_df = cluster_df.merge(snapshot, left_on='ticker', right_index=True, how='left')
 
-    # NEW: Add volume data
-    cluster_df['averageVolume'] = cluster_df['ticker'].map(lambda x: info.get(x, {}).get('averageVolume', 0))
-
-    # NEW: Add float analysis data - validate to prevent NaN
-    cluster_df['sharesOutstanding'] = cluster_df['ticker'].map(
-        lambda x: info.get(x, {}).get('sharesOutstanding') if _is_valid_field(info.get(x, {}).get('sharesOutstanding')) else None
-    )
-    cluster_df['floatShares'] = cluster_df['ticker'].map(
-        lambda x: info.get(x, {}).get('floatShares') if _is_valid_field(info.get(x, {}).get('floatShares')) else None
-    )
-    
     cluster_df['pct_from_52wk_low'] = None
     
     def pct_from_low(row):
@@ -1032,6 +1016,120 @@ def enrich_with_market_data(cluster_df):
 
     return cluster_df
 
+def _numeric_column(df, column, default=None):
+    """Column as floats (None/garbage → NaN), or the default for every row if it's missing."""
+    if column not in df:
+        return pd.Series(float('nan') if default is None else default, index=df.index, dtype=float)
+    return pd.to_numeric(df[column], errors='coerce')
+
+
+def _first_insider_name(row):
+    """Name of the first insider on a signal row, for entity detection."""
+    insiders_data = row.get('insiders_data', [])
+    if isinstance(insiders_data, list) and len(insiders_data) > 0:
+        return insiders_data[0].get('name', '')
+
+    # Fallback to plain text insiders field
+    insiders_plain = row.get('insiders', '')
+    if isinstance(insiders_plain, str) and insiders_plain:
+        # Parse first insider from plain text (format: "Name (Title)")
+        import re
+        match = re.match(r'^([^(]+)', insiders_plain)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def _reject_rows(filtered, mask, filter_name, reason, rejections):
+    """
+    Drop the rows flagged by a boolean mask and append them to the rejection log.
+
+    Args:
+        filtered: Signals still in play.
+        mask: Boolean Series on filtered's index (missing/NaN = keep).
+        filter_name: Stage name recorded in the log.
+        reason: A fixed reason string, or a callable taking the rejected rows
+            and returning one reason per row.
+        rejections: List of {'ticker', 'filter', 'reason'} dicts to extend.
+
+    Returns:
+        filtered without the rejected rows.
+    """
+    mask = mask.reindex(filtered.index, fill_value=False).fillna(False).astype(bool)
+    if not mask.any():
+        return filtered
+
+    rejected = filtered[mask]
+    reasons = reason(rejected) if callable(reason) else [reason] * len(rejected)
+    rejections.extend(
+        {'ticker': ticker, 'filter': filter_name, 'reason': text}
+        for ticker, text in zip(rejected['ticker'], reasons)
+    )
+    return filtered[~mask]
+
+
+def recent_sell_dates(trades_file=None, days=REPEAT_TRADE_COOLDOWN_DAYS, now=None):
+    """
+    Latest SELL date per ticker within the repeat-trade cooldown window.
+
+    Returns:
+        Series of close dates indexed by ticker (empty if nothing was sold).
+    """
+    trades_df = pd.read_csv(trades_file or PAPER_TRADES_CSV, parse_dates=['date'])
+    cutoff_date = (now or datetime.now()) - timedelta(days=days)
+    recent_sells = trades_df[(trades_df['action'] == 'SELL') & (trades_df['date'] >= cutoff_date)]
+    return recent_sells.groupby('ticker')['date'].max()
+
+
+def price_health_stats(histories, as_of=None):
+    """
+    30-day high, 5-day SMA and bar count for every ticker in one pass.
+
+    Uses the bars from PRICE_HEALTH_LOOKBACK_DAYS calendar days before as_of
+    up to (not including) as_of, the window the per-ticker download used.
+
+    Args:
+        histories: Dict mapping ticker → daily bars (as from prefetch_price_history).
+        as_of: Day of the check (defaults to today).
+
+    Returns:
+        DataFrame indexed by ticker with high_30d, sma_5 and bars columns.
+    """
+    end = pd.Timestamp(as_of or date.today()).normalize()
+    start = end - pd.Timedelta(days=PRICE_HEALTH_LOOKBACK_DAYS)
+
+    frames = [
+        hist.loc[(hist.index >= start) & (hist.index < end), ['High', 'Close']].assign(ticker=ticker)
+        for ticker, hist in histories.items()
+        if hist is not None and not hist.empty
+    ]
+    if not frames:
+        return pd.DataFrame(columns=['high_30d', 'sma_5', 'bars'], dtype=float)
+
+    panel = pd.concat(frames)
+    by_ticker = panel.groupby('ticker', sort=False)
+    return pd.DataFrame({
+        'high_30d': by_ticker['High'].max(),
+        'sma_5': by_ticker.tail(5).groupby('ticker', sort=False)['Close'].mean(),
+        'bars': by_ticker.size(),
+    })
+
+
+def save_rejection_log(rejections, path=None):
+    """
+    Write this run's quality filter rejections (ticker, filter, reason) to CSV.
+
+    The file is overwritten every run; failures are logged, never raised.
+    """
+    path = path or QUALITY_REJECTIONS_CSV
+    try:
+        log_df = pd.DataFrame(rejections, columns=['ticker', 'filter', 'reason'])
+        log_df.insert(0, 'date', date.today().isoformat())
+        log_df.to_csv(path, index=False)
+    except Exception as e:
+        logger.debug(f"Failed to save quality filter rejection log: {e}")
+
+
 def apply_quality_filters(cluster_df):
     """
     ENHANCED: Quality filters with dynamic thresholds and tiered dollar volume
@@ -1047,6 +1145,10 @@ def apply_quality_filters(cluster_df):
     - Fix 2: Dynamic per-insider thresholds (lower for larger clusters)
     - Fix 3: Holiday mode automatically reduces all thresholds by 20%
     - Fix 4: Tiered dollar volume thresholds (7+ insiders: $100k, 4-6: $150k, 1-3: $200k daily)
+
+    Each stage builds a boolean mask over the remaining signals; price checks
+    read one batched price panel. Every rejection is written to
+    QUALITY_REJECTIONS_CSV with the filter that removed it.
     """
     if cluster_df.empty:
         return cluster_df
@@ -1068,111 +1170,94 @@ def apply_quality_filters(cluster_df):
 
     # Filter 0a: Repeat Trade Cooldown (7 calendar days)
     # Block re-entry into a ticker if it was sold/closed within the last 7 calendar days
-    before = len(filtered)
-    cooldown_rejections = []
+    rejections = []
+    logged = 0
 
     try:
-        # Attempt to read paper_trades.csv
-        trades_file = os.path.join(os.path.dirname(__file__), '..', 'data', 'paper_trades.csv')
-        if os.path.exists(trades_file):
-            trades_df = pd.read_csv(trades_file, parse_dates=['date'])
-
-            # Filter for SELL actions within last 7 days
-            cutoff_date = datetime.now() - timedelta(days=7)
-            recent_sells = trades_df[
-                (trades_df['action'] == 'SELL') &
-                (trades_df['date'] >= cutoff_date)
-            ]
-
-            if not recent_sells.empty:
-                # Check each signal against recent sells
-                for idx, row in list(filtered.iterrows()):
-                    ticker = row['ticker']
-                    ticker_sells = recent_sells[recent_sells['ticker'] == ticker]
-
-                    if not ticker_sells.empty:
-                        # Found recent sell - reject with cooldown message
-                        close_date = ticker_sells['date'].max().strftime('%Y-%m-%d')
-                        cooldown_rejections.append({
-                            'ticker': ticker,
-                            'close_date': close_date
-                        })
-                        filtered = filtered.drop(idx)
-
-                if cooldown_rejections:
-                    print(f"   ❌ Removed {len(cooldown_rejections)} signals due to 7-day cooldown")
-                    for rej in cooldown_rejections[:3]:  # Show first 3 examples
-                        print(f"      • Cooldown: {rej['ticker']} closed on {rej['close_date']}, 7-day cooldown required")
+        if os.path.exists(PAPER_TRADES_CSV):
+            last_sell = filtered['ticker'].map(recent_sell_dates())
+            filtered = _reject_rows(
+                filtered, last_sell.notna(), 'cooldown',
+                lambda rows: [
+                    f"Cooldown: {ticker} closed on {last_sell[idx]:%Y-%m-%d}, "
+                    f"{REPEAT_TRADE_COOLDOWN_DAYS}-day cooldown required"
+                    for idx, ticker in rows['ticker'].items()
+                ],
+                rejections,
+            )
+            if len(rejections) > logged:
+                print(f"   ❌ Removed {len(rejections) - logged} signals due to {REPEAT_TRADE_COOLDOWN_DAYS}-day cooldown")
+                for rej in rejections[logged:logged + 3]:  # Show first 3 examples
+                    print(f"      • {rej['reason']}")
     except Exception as e:
-        # File doesn't exist or can't be parsed - skip cooldown check silently
+        # File can't be parsed - skip cooldown check silently
         # This is expected on fresh clones or if no trades have occurred yet
         logger.debug(f"Cooldown check skipped: {e}")
-        pass
+    logged = len(rejections)
 
     # Filter 0b: Shell Company / SPAC Rejection
     if getattr(config, 'ENABLE_SHELL_COMPANY_FILTER', False):
-        before = len(filtered)
-        shell_rejections = []
         blocked_sectors = getattr(config, 'SHELL_COMPANY_SECTORS', ['Shell Companies'])
         name_patterns = getattr(config, 'SHELL_COMPANY_NAME_PATTERNS', [])
 
-        for idx, row in list(filtered.iterrows()):
-            ticker = row['ticker']
-            is_shell, reason = check_shell_company(
-                ticker=ticker,
+        shell_checks = {
+            idx: check_shell_company(
+                ticker=row['ticker'],
                 sector=row.get('sector', ''),
                 industry=row.get('industry', ''),
                 company_name=row.get('company', ''),
                 blocked_sectors=blocked_sectors,
                 name_patterns=name_patterns,
             )
-            if is_shell:
-                shell_rejections.append(f"{ticker}: {reason}")
-                filtered = filtered.drop(idx)
-
-        if shell_rejections:
-            print(f"   ❌ Removed {len(shell_rejections)} shell companies / SPACs")
-            for rej in shell_rejections[:5]:
-                print(f"      • {rej}")
-
-    # Batch-prefetch price history for stale ticker + M&A heuristic + price health checks.
-    # This replaces per-signal yfinance calls with a single batch download.
-    _remaining_tickers = filtered['ticker'].tolist()
-    _price_history_cache = {}
-    if _remaining_tickers and (
-        getattr(config, 'ENABLE_STALE_TICKER_FILTER', False) or
-        getattr(config, 'ENABLE_MA_STATUS_CHECK', False)
-    ):
-        _price_history_cache = prefetch_price_history(_remaining_tickers, period='20d')
+            for idx, row in filtered.iterrows()
+        }
+        filtered = _reject_rows(
+            filtered, pd.Series({idx: c[0] for idx, c in shell_checks.items()}, dtype=bool), 'shell_company',
+            lambda rows: [f"{t}: {shell_checks[idx][1]}" for idx, t in rows['ticker'].items()],
+            rejections,
+        )
+
+        if len(rejections) > logged:
+            print(f"   ❌ Removed {len(rejections) - logged} shell companies / SPACs")
+            for rej in rejections[logged:logged + 5]:
+                print(f"      • {rej['reason']}")
+        logged = len(rejections)
+
+    # One batched price panel for the stale ticker, M&A heuristic and price health checks.
+    # The stale and M&A checks read the last 20 sessions of it, as they did with their own prefetch.
+    price_histories = prefetch_price_history(filtered['ticker'].tolist(), period=f'{PRICE_HEALTH_LOOKBACK_DAYS}d')
+    recent_start = pd.Timestamp(period_start('20d'))
+    recent_histories = {t: h[h.index >= recent_start] for t, h in price_histories.items()}
+    recent_histories = {t: h for t, h in recent_histories.items() if not h.empty}
 
     # Filter 0c: Stale / Delisted Ticker Check
     if getattr(config, 'ENABLE_STALE_TICKER_FILTER', False):
-        before = len(filtered)
-        stale_rejections = []
         max_stale_days = getattr(config, 'STALE_PRICE_MAX_DAYS', 5)
 
-        for idx, row in list(filtered.iterrows()):
-            ticker = row['ticker']
-            is_stale, reason = check_stale_ticker(
-                ticker=ticker,
+        stale_checks = {
+            idx: check_stale_ticker(
+                ticker=row['ticker'],
                 current_price=row.get('currentPrice'),
                 market_cap=row.get('marketCap'),
                 max_stale_days=max_stale_days,
-                price_history=_price_history_cache.get(ticker),
+                price_history=recent_histories.get(row['ticker']),
             )
-            if is_stale:
-                stale_rejections.append(f"{ticker}: {reason}")
-                filtered = filtered.drop(idx)
+            for idx, row in filtered.iterrows()
+        }
+        filtered = _reject_rows(
+            filtered, pd.Series({idx: c[0] for idx, c in stale_checks.items()}, dtype=bool), 'stale_ticker',
+            lambda rows: [f"{t}: {stale_checks[idx][1]}" for idx, t in rows['ticker'].items()],
+            rejections,
+        )
 
-        if stale_rejections:
-            print(f"   ❌ Removed {len(stale_rejections)} stale/delisted tickers")
-            for rej in stale_rejections[:5]:
-                print(f"      • {rej}")
+        if len(rejections) > logged:
+            print(f"   ❌ Removed {len(rejections) - logged} stale/delisted tickers")
+            for rej in rejections[logged:logged + 5]:
+                print(f"      • {rej['reason']}")
+        logged = len(rejections)
 
     # Filter 0d: M&A / Acquisition Status Check
     if getattr(config, 'ENABLE_MA_STATUS_CHECK', False):
-        before = len(filtered)
-        ma_rejections = []
         ma_cache_file = getattr(config, 'MA_CACHE_FILE', 'data/ma_status_cache.json')
         ma_cache_ttl = getattr(config, 'MA_CACHE_TTL_DAYS', 7)
 
@@ -1187,7 +1272,8 @@ def apply_quality_filters(cluster_df):
         except Exception:
             pass
 
-        for idx, row in list(filtered.iterrows()):
+        ma_checks = {}
+        for idx, row in filtered.iterrows():
             ticker = row['ticker']
             is_target, details, cache_entry = check_ma_target(
                 ticker=ticker,
@@ -1200,13 +1286,17 @@ def apply_quality_filters(cluster_df):
                 atr_threshold_pct=getattr(config, 'ACQUISITION_ATR_THRESHOLD_PCT', 0.3),
                 heuristic_lookback_days=getattr(config, 'ACQUISITION_HEURISTIC_LOOKBACK_DAYS', 10),
                 market_cap=row.get('marketCap'),
-                price_history=_price_history_cache.get(ticker),
+                price_history=recent_histories.get(ticker),
             )
             if cache_entry:
                 ma_cache[ticker] = cache_entry
-            if is_target:
-                ma_rejections.append(f"{ticker}: {details}")
-                filtered = filtered.drop(idx)
+            ma_checks[idx] = (is_target, details)
+
+        filtered = _reject_rows(
+            filtered, pd.Series({idx: c[0] for idx, c in ma_checks.items()}, dtype=bool), 'ma_target',
+            lambda rows: [f"{t}: {ma_checks[idx][1]}" for idx, t in rows['ticker'].items()],
+            rejections,
+        )
 
         # Save M&A cache
         try:
@@ -1216,171 +1306,99 @@ def apply_quality_filters(cluster_df):
         except Exception as e:
             logger.debug(f"Failed to save M&A cache: {e}")
 
-        if ma_rejections:
-            print(f"   ❌ Removed {len(ma_rejections)} M&A / acquisition targets")
-            for rej in ma_rejections[:5]:
-                print(f"      • {rej}")
+        if len(rejections) > logged:
+            print(f"   ❌ Removed {len(rejections) - logged} M&A / acquisition targets")
+            for rej in rejections[logged:logged + 5]:
+                print(f"      • {rej['reason']}")
+        logged = len(rejections)
 
     # Filter 0e: Single Insider Micro-Cap & Go-Private Detection
     # When conviction is low, require a higher bar
-    before = len(filtered)
-    single_insider_rejections = []
-
-    for idx, row in list(filtered.iterrows()):
-        insider_count = row.get('cluster_count', 0)
-        market_cap = row.get('marketCap')
-        buy_value = row.get('total_value', 0)
-        score = row.get('rank_score', 0)
-        ticker = row['ticker']
-
-        if insider_count == 1:
-            # Check 1: Micro-cap with low score
-            if market_cap is not None and market_cap < 100_000_000:
-                if score < 9.0:
-                    single_insider_rejections.append(
-                        f"Single insider micro-cap: {ticker} score {score:.2f} < 9.0 required (mkt cap ${market_cap/1e6:.1f}M)"
-                    )
-                    filtered = filtered.drop(idx)
-                    continue
-
-            # Check 2: Weak conviction (low buy value)
-            if buy_value < 500_000:
-                single_insider_rejections.append(
-                    f"Single insider weak conviction: {ticker} buy_value ${buy_value:,.0f} < $500K minimum"
-                )
-                filtered = filtered.drop(idx)
-                continue
-
-            # Check 3: Likely go-private transaction (basic check from main prompt)
-            if market_cap and market_cap > 0 and buy_value > 10_000_000:
-                pct_of_cap = buy_value / market_cap
-                if pct_of_cap > 0.3:
-                    single_insider_rejections.append(
-                        f"Likely go-private: {ticker} single insider buying {pct_of_cap*100:.0f}% of market cap — skipping"
-                    )
-                    filtered = filtered.drop(idx)
-                    continue
-
-    if single_insider_rejections:
-        print(f"   ❌ Removed {len(single_insider_rejections)} single-insider micro-cap signals")
-        for rej in single_insider_rejections[:3]:  # Show first 3 examples
-            print(f"      • {rej}")
+    single = _numeric_column(filtered, 'cluster_count', 0) == 1
+    market_cap = _numeric_column(filtered, 'marketCap')
+    buy_value = _numeric_column(filtered, 'total_value', 0)
+    score = _numeric_column(filtered, 'rank_score', 0)
+
+    # Check 1: Micro-cap with low score
+    micro_cap = single & (market_cap < 100_000_000) & (score < 9.0)
+    # Check 2: Weak conviction (low buy value)
+    weak = single & ~micro_cap & (buy_value < 500_000)
+    # Check 3: Likely go-private transaction (basic check from main prompt)
+    likely_go_private = (single & ~micro_cap & ~weak & (market_cap > 0) & (buy_value > 10_000_000)
+                         & (buy_value / market_cap > 0.3))
+
+    filtered = _reject_rows(filtered, micro_cap, 'single_insider', lambda rows: [
+        f"Single insider micro-cap: {t} score {s:.2f} < 9.0 required (mkt cap ${mc/1e6:.1f}M)"
+        for t, s, mc in zip(rows['ticker'], score[rows.index], market_cap[rows.index])
+    ], rejections)
+    filtered = _reject_rows(filtered, weak, 'single_insider', lambda rows: [
+        f"Single insider weak conviction: {t} buy_value ${bv:,.0f} < $500K minimum"
+        for t, bv in zip(rows['ticker'], buy_value[rows.index])
+    ], rejections)
+    filtered = _reject_rows(filtered, likely_go_private, 'single_insider', lambda rows: [
+        f"Likely go-private: {t} single insider buying {bv/mc*100:.0f}% of market cap — skipping"
+        for t, bv, mc in zip(rows['ticker'], buy_value[rows.index], market_cap[rows.index])
+    ], rejections)
+
+    if len(rejections) > logged:
+        print(f"   ❌ Removed {len(rejections) - logged} single-insider micro-cap signals")
+        for rej in rejections[logged:logged + 3]:  # Show first 3 examples
+            print(f"      • {rej['reason']}")
+    logged = len(rejections)
 
     # === LEVEL 1: Go-Private Hard Rejections (Enhanced Detection) ===
-    before = len(filtered)
-    go_private_rejections = []
-
-    for idx, row in list(filtered.iterrows()):
-        insider_count = row.get('cluster_count', 0)
-        market_cap = row.get('marketCap')
-        buy_value = row.get('total_value', 0)
-        ticker = row['ticker']
-
-        # Only apply to single-insider transactions
-        if insider_count != 1:
-            continue
-
-        # Skip if missing required data
-        if not market_cap or market_cap <= 0:
-            continue
-
-        pct_of_cap = buy_value / market_cap if market_cap > 0 else 0
-
-        # Extract insider name for entity detection
-        insider_name = None
-        insiders_data = row.get('insiders_data', [])
-        if insiders_data and len(insiders_data) > 0:
-            insider_name = insiders_data[0].get('name', '')
-        else:
-            # Fallback to plain text insiders field
-            insiders_plain = row.get('insiders', '')
-            if insiders_plain:
-                # Parse first insider from plain text (format: "Name (Title)")
-                import re
-                match = re.match(r'^([^(]+)', insiders_plain)
-                if match:
-                    insider_name = match.group(1).strip()
-
-        # Check entity pattern
-        is_entity, entity_type = is_institutional_entity(insider_name)
-
-        # Hard Rejection 1: Single insider buying >50% of company
-        if pct_of_cap > 0.5:
-            go_private_rejections.append({
-                'ticker': ticker,
-                'reason': f"Go-private: single insider buying {pct_of_cap*100:.0f}% of company (likely acquisition)",
-                'pct': pct_of_cap * 100,
-                'value': buy_value,
-                'market_cap': market_cap
-            })
-            filtered = filtered.drop(idx)
-            continue
-
-        # Hard Rejection 2: >$50M buying >20% of company
-        if buy_value > 50_000_000 and pct_of_cap > 0.2:
-            go_private_rejections.append({
-                'ticker': ticker,
-                'reason': f"Go-private: ${buy_value/1e6:.0f}M purchase = {pct_of_cap*100:.0f}% of ${market_cap/1e6:.0f}M company (likely M&A)",
-                'pct': pct_of_cap * 100,
-                'value': buy_value,
-                'market_cap': market_cap
-            })
-            filtered = filtered.drop(idx)
-            continue
-
-        # Hard Rejection 3: Entity name pattern + >$20M + >15%
-        if is_entity and buy_value > 20_000_000 and pct_of_cap > 0.15:
-            go_private_rejections.append({
-                'ticker': ticker,
-                'reason': f"Go-private: institutional entity ({entity_type}) buying {pct_of_cap*100:.0f}% of company (likely M&A)",
-                'pct': pct_of_cap * 100,
-                'value': buy_value,
-                'market_cap': market_cap,
-                'entity': insider_name
-            })
-            filtered = filtered.drop(idx)
-            continue
+    # Only single-insider transactions with a known market cap are checked
+    candidates = (_numeric_column(filtered, 'cluster_count', 0) == 1) & (_numeric_column(filtered, 'marketCap') > 0)
+    market_cap = _numeric_column(filtered, 'marketCap')
+    buy_value = _numeric_column(filtered, 'total_value', 0)
+    pct_of_cap = buy_value / market_cap
+
+    # Entity pattern of the first insider (name parsed only for candidates)
+    entity = pd.Series(
+        {idx: is_institutional_entity(_first_insider_name(row)) for idx, row in filtered[candidates].iterrows()},
+        dtype=object,
+    ).reindex(filtered.index)
+    is_entity = entity.map(lambda e: bool(isinstance(e, tuple) and e[0]))
+
+    # Hard Rejection 1: Single insider buying >50% of company
+    majority = candidates & (pct_of_cap > 0.5)
+    # Hard Rejection 2: >$50M buying >20% of company
+    large_stake = candidates & ~majority & (buy_value > 50_000_000) & (pct_of_cap > 0.2)
+    # Hard Rejection 3: Entity name pattern + >$20M + >15%
+    entity_stake = (candidates & ~majority & ~large_stake & is_entity & (buy_value > 20_000_000)
+                    & (pct_of_cap > 0.15))
+
+    filtered = _reject_rows(filtered, majority, 'go_private', lambda rows: [
+        f"Go-private: single insider buying {pct*100:.0f}% of company (likely acquisition)"
+        for pct in pct_of_cap[rows.index]
+    ], rejections)
+    filtered = _reject_rows(filtered, large_stake, 'go_private', lambda rows: [
+        f"Go-private: ${bv/1e6:.0f}M purchase = {pct*100:.0f}% of ${mc/1e6:.0f}M company (likely M&A)"
+        for bv, pct, mc in zip(buy_value[rows.index], pct_of_cap[rows.index], market_cap[rows.index])
+    ], rejections)
+    filtered = _reject_rows(filtered, entity_stake, 'go_private', lambda rows: [
+        f"Go-private: institutional entity ({entity[idx][1]}) buying {pct_of_cap[idx]*100:.0f}% of company (likely M&A)"
+        for idx in rows.index
+    ], rejections)
 
     # Log hard rejections
-    if go_private_rejections:
-        print(f"   ❌ Removed {len(go_private_rejections)} likely go-private transactions:")
-        for rej in go_private_rejections:
+    if len(rejections) > logged:
+        print(f"   ❌ Removed {len(rejections) - logged} likely go-private transactions:")
+        for rej in rejections[logged:]:
             print(f"      • {rej['ticker']}: {rej['reason']}")
+    logged = len(rejections)
 
     # === LEVEL 2: Manual Review Alerts (Suspicious Patterns) ===
     # These DO NOT reject the signal - they just log warnings for manual review
-    for idx, row in filtered.iterrows():
-        insider_count = row.get('cluster_count', 0)
+    candidates = (_numeric_column(filtered, 'cluster_count', 0) == 1) & (_numeric_column(filtered, 'marketCap') > 0)
+    for idx, row in filtered[candidates].iterrows():
         market_cap = row.get('marketCap')
         buy_value = row.get('total_value', 0)
         ticker = row['ticker']
-
-        # Only apply to single-insider transactions
-        if insider_count != 1:
-            continue
-
-        # Skip if missing required data
-        if not market_cap or market_cap <= 0:
-            continue
-
-        pct_of_cap = buy_value / market_cap if market_cap > 0 else 0
-
-        # Extract insider name for entity detection
-        insider_name = None
-        insiders_data = row.get('insiders_data', [])
-        if insiders_data and len(insiders_data) > 0:
-            insider_name = insiders_data[0].get('name', '')
-        else:
-            # Fallback to plain text insiders field
-            insiders_plain = row.get('insiders', '')
-            if insiders_plain:
-                # Parse first insider from plain text (format: "Name (Title)")
-                import re
-                match = re.match(r'^([^(]+)', insiders_plain)
-                if match:
-                    insider_name = match.group(1).strip()
+        pct_of_cap = buy_value / market_cap
 
         # Check entity pattern
+        insider_name = _first_insider_name(row)
         is_entity, entity_type = is_institutional_entity(insider_name)
 
         # Alert 1: Moderate Single-Insider Stakes (15-30% of company, >$20M)
@@ -1414,261 +1432,153 @@ def apply_quality_filters(cluster_df):
             logger.warning(f"   Action: Signal ALLOWED but flagged for investigation")
 
     # Filter 1: No penny stocks (price > $2.00, or $1.60 in holiday mode)
-    before = len(filtered)
-    filtered = filtered[
-        (filtered['currentPrice'].isna()) |
-        (filtered['currentPrice'] > min_price)
-    ]
-    removed = before - len(filtered)
-    if removed > 0:
+    price = _numeric_column(filtered, 'currentPrice')
+    filtered = _reject_rows(filtered, ~(price.isna() | (price > min_price)), 'penny_stock', lambda rows: [
+        f"{t}: price ${p:.2f} < ${min_price:.2f}" for t, p in zip(rows['ticker'], price[rows.index])
+    ], rejections)
+    if len(rejections) > logged:
         threshold_display = f"${min_price:.2f}"
-        print(f"   ❌ Removed {removed} penny stocks (price < {threshold_display})")
+        print(f"   ❌ Removed {len(rejections) - logged} penny stocks (price < {threshold_display})")
+    logged = len(rejections)
 
     # Filter 2: DYNAMIC minimum purchase per insider
     # Fix 2: Scale threshold based on cluster size and total value
-    before = len(filtered)
 
     # Safety check: Remove any clusters with invalid cluster_count
-    filtered = filtered[filtered['cluster_count'] > 0]
-
-    filtered['avg_purchase_per_insider'] = (
-        filtered['total_value'] / filtered['cluster_count']
+    filtered = _reject_rows(filtered, ~(filtered['cluster_count'] > 0), 'per_insider_threshold',
+                            "invalid cluster_count", rejections)
+
+    filtered = filtered.assign(avg_purchase_per_insider=filtered['total_value'] / filtered['cluster_count'])
+
+    # Dynamic threshold per cluster, computed once for the mask and the log
+    insider_threshold = pd.Series([
+        get_dynamic_min_per_insider(count, total, apply_holiday=is_holiday)
+        for count, total in zip(filtered['cluster_count'], filtered['total_value'])
+    ], index=filtered.index, dtype=float)
+    dynamic_threshold_applied = filtered[insider_threshold != DYNAMIC_THRESHOLD_BASE]
+
+    filtered = _reject_rows(
+        filtered, ~(filtered['avg_purchase_per_insider'] >= insider_threshold), 'per_insider_threshold',
+        lambda rows: [
+            f"{t}: ${avg:,.0f} per insider < ${insider_threshold[idx]:,.0f} threshold"
+            for idx, t, avg in zip(rows.index, rows['ticker'], rows['avg_purchase_per_insider'])
+        ],
+        rejections,
     )
 
-    # Apply dynamic threshold with detailed logging
-    def meets_dynamic_threshold(row):
-        cluster_count = row['cluster_count']
-        total_value = row['total_value']
-        avg_per_insider = row['avg_purchase_per_insider']
-
-        # Get dynamic threshold for this cluster
-        threshold = get_dynamic_min_per_insider(cluster_count, total_value, apply_holiday=is_holiday)
-
-        return avg_per_insider >= threshold
-
-    # Track which signals use dynamic thresholds
-    dynamic_threshold_applied = []
-    for idx, row in filtered.iterrows():
-        threshold = get_dynamic_min_per_insider(
-            row['cluster_count'],
-            row['total_value'],
-            apply_holiday=is_holiday
-        )
-        if threshold != DYNAMIC_THRESHOLD_BASE:
-            dynamic_threshold_applied.append({
-                'ticker': row['ticker'],
-                'cluster_count': row['cluster_count'],
-                'threshold': threshold,
-                'avg_per_insider': row['avg_purchase_per_insider']
-            })
-
-    filtered = filtered[filtered.apply(meets_dynamic_threshold, axis=1)]
-    removed = before - len(filtered)
-
-    if removed > 0:
-        base_threshold = get_dynamic_min_per_insider(1, 0, apply_holiday=is_holiday)
-        print(f"   ❌ Removed {removed} signals (below dynamic per-insider threshold)")
-        if dynamic_threshold_applied:
+    if len(rejections) > logged:
+        print(f"   ❌ Removed {len(rejections) - logged} signals (below dynamic per-insider threshold)")
+        if not dynamic_threshold_applied.empty:
             print(f"   ℹ️  Applied dynamic thresholds to {len(dynamic_threshold_applied)} signals")
-            for dt in dynamic_threshold_applied[:3]:  # Show first 3 examples
-                print(f"      • {dt['ticker']}: {dt['cluster_count']} insiders, ${dt['threshold']:,.0f} threshold (${dt['avg_per_insider']:,.0f} avg)")
+            for idx, dt in dynamic_threshold_applied.head(3).iterrows():  # Show first 3 examples
+                print(f"      • {dt['ticker']}: {dt['cluster_count']} insiders, ${insider_threshold[idx]:,.0f} threshold (${dt['avg_purchase_per_insider']:,.0f} avg)")
+    logged = len(rejections)
 
     # Filter 3: Liquidity check using tiered dollar volume thresholds
     # Fix 1: MEGA-CLUSTER EXCEPTION - Bypass for rare high-conviction clusters
     # Fix 4: TIERED DOLLAR VOLUME - Scale requirements by cluster size, use $ volume not shares
-    before = len(filtered)
-
-    # Apply tiered dollar volume with mega-cluster exception
-    def passes_volume_filter(row):
-        # Check if missing data (volume or price) - don't filter
-        if pd.isna(row.get('averageVolume')) or pd.isna(row.get('currentPrice')):
-            return True
-
-        volume_shares = row.get('averageVolume', 0)
-        price = row.get('currentPrice', 0)
-        cluster_count = row.get('cluster_count', 0)
-        total_value = row.get('total_value', 0)
-        avg_per_insider = row.get('avg_purchase_per_insider', 0)
-
-        # Calculate dollar volume (shares × price)
-        dollar_volume = volume_shares * price
-
-        # Apply holiday adjustment to mega-cluster thresholds
-        mega_cluster_min_insiders = MEGA_CLUSTER_MIN_INSIDERS  # No adjustment (count)
-        mega_cluster_min_total = apply_holiday_adjustment(MEGA_CLUSTER_MIN_TOTAL_VALUE) if is_holiday else MEGA_CLUSTER_MIN_TOTAL_VALUE
-        mega_cluster_min_avg = apply_holiday_adjustment(MEGA_CLUSTER_MIN_AVG_PER_INSIDER) if is_holiday else MEGA_CLUSTER_MIN_AVG_PER_INSIDER
-
-        # MEGA-CLUSTER EXCEPTION: Bypass volume filter for high-conviction rare clusters
-        is_mega_cluster = (
-            cluster_count >= mega_cluster_min_insiders and
-            total_value >= mega_cluster_min_total and
-            avg_per_insider >= mega_cluster_min_avg
-        )
-
-        if is_mega_cluster:
-            return True  # Bypass volume filter entirely
-
-        # TIERED DOLLAR VOLUME FILTER: Scale threshold by cluster size
-        threshold = get_dollar_volume_threshold(cluster_count, total_value, apply_holiday=is_holiday)
-        return dollar_volume >= threshold
-
-    # Track mega-cluster exceptions and tiered volume passes
-    mega_cluster_exceptions = []
-    tiered_volume_passes = []
-
-    for idx, row in filtered.iterrows():
-        volume_shares = row.get('averageVolume', 0)
-        price = row.get('currentPrice', 0)
-        cluster_count = row.get('cluster_count', 0)
-        total_value = row.get('total_value', 0)
-        avg_per_insider = row.get('avg_purchase_per_insider', 0)
+    volume_shares = _numeric_column(filtered, 'averageVolume')
+    price = _numeric_column(filtered, 'currentPrice')
+    cluster_count = _numeric_column(filtered, 'cluster_count', 0)
+    total_value = _numeric_column(filtered, 'total_value', 0)
+    avg_per_insider = filtered['avg_purchase_per_insider']
+
+    # Missing data (volume or price) - don't filter
+    has_volume = volume_shares.notna() & price.notna()
+    # Calculate dollar volume (shares × price)
+    dollar_volume = volume_shares * price
+
+    # Apply holiday adjustment to mega-cluster thresholds (insider count is not adjusted)
+    mega_cluster_min_total = apply_holiday_adjustment(MEGA_CLUSTER_MIN_TOTAL_VALUE) if is_holiday else MEGA_CLUSTER_MIN_TOTAL_VALUE
+    mega_cluster_min_avg = apply_holiday_adjustment(MEGA_CLUSTER_MIN_AVG_PER_INSIDER) if is_holiday else MEGA_CLUSTER_MIN_AVG_PER_INSIDER
+
+    # MEGA-CLUSTER EXCEPTION: Bypass volume filter for high-conviction rare clusters
+    is_mega_cluster = (
+        (cluster_count >= MEGA_CLUSTER_MIN_INSIDERS) &
+        (total_value >= mega_cluster_min_total) &
+        (avg_per_insider >= mega_cluster_min_avg)
+    )
 
-        if pd.notna(volume_shares) and pd.notna(price):
-            dollar_volume = volume_shares * price
+    # TIERED DOLLAR VOLUME FILTER: Scale threshold by cluster size
+    volume_threshold = pd.Series([
+        get_dollar_volume_threshold(count, total, apply_holiday=is_holiday)
+        for count, total in zip(cluster_count, total_value)
+    ], index=filtered.index, dtype=float)
+    base_threshold = apply_holiday_adjustment(DOLLAR_VOLUME_THRESHOLD_SMALL) if is_holiday else DOLLAR_VOLUME_THRESHOLD_SMALL
 
-            # Check if mega-cluster
-            mega_cluster_min_total = apply_holiday_adjustment(MEGA_CLUSTER_MIN_TOTAL_VALUE) if is_holiday else MEGA_CLUSTER_MIN_TOTAL_VALUE
-            mega_cluster_min_avg = apply_holiday_adjustment(MEGA_CLUSTER_MIN_AVG_PER_INSIDER) if is_holiday else MEGA_CLUSTER_MIN_AVG_PER_INSIDER
+    mega_cluster_exceptions = filtered[has_volume & is_mega_cluster]
+    tiered_volume_passes = filtered[has_volume & ~is_mega_cluster & (volume_threshold < base_threshold)
+                                    & (dollar_volume >= volume_threshold)]
+    illiquid = has_volume & ~is_mega_cluster & ~(dollar_volume >= volume_threshold)
 
-            is_mega = (
-                cluster_count >= MEGA_CLUSTER_MIN_INSIDERS and
-                total_value >= mega_cluster_min_total and
-                avg_per_insider >= mega_cluster_min_avg
-            )
+    filtered = _reject_rows(filtered, illiquid, 'dollar_volume', lambda rows: [
+        f"{t}: ${dollar_volume[idx]:,.0f}/day volume < ${volume_threshold[idx]:,.0f} threshold"
+        for idx, t in rows['ticker'].items()
+    ], rejections)
 
-            if is_mega:
-                mega_cluster_exceptions.append({
-                    'ticker': row['ticker'],
-                    'cluster_count': cluster_count,
-                    'total_value': total_value,
-                    'avg_per_insider': avg_per_insider,
-                    'volume_shares': volume_shares,
-                    'dollar_volume': dollar_volume
-                })
-            else:
-                # Check if using tiered threshold (not base threshold)
-                threshold = get_dollar_volume_threshold(cluster_count, total_value, apply_holiday=is_holiday)
-                base_threshold = DOLLAR_VOLUME_THRESHOLD_SMALL
-                if is_holiday:
-                    base_threshold = apply_holiday_adjustment(base_threshold)
-
-                if threshold < base_threshold and dollar_volume >= threshold:
-                    tiered_volume_passes.append({
-                        'ticker': row['ticker'],
-                        'cluster_count': cluster_count,
-                        'threshold': threshold,
-                        'dollar_volume': dollar_volume,
-                        'volume_shares': volume_shares,
-                        'price': price
-                    })
-
-    filtered = filtered[filtered.apply(passes_volume_filter, axis=1)]
-    removed = before - len(filtered)
-
-    if mega_cluster_exceptions:
+    if not mega_cluster_exceptions.empty:
         print(f"   🚀 MEGA-CLUSTER EXCEPTION: {len(mega_cluster_exceptions)} signals bypassed volume filter")
-        for mc in mega_cluster_exceptions:
-            print(f"      • {mc['ticker']}: {mc['cluster_count']} insiders × ${mc['avg_per_insider']:,.0f} = ${mc['total_value']:,.0f} total (${mc['dollar_volume']:,.0f}/day volume)")
+        for idx, mc in mega_cluster_exceptions.iterrows():
+            print(f"      • {mc['ticker']}: {mc['cluster_count']} insiders × ${mc['avg_purchase_per_insider']:,.0f} = ${mc['total_value']:,.0f} total (${dollar_volume[idx]:,.0f}/day volume)")
 
-    if tiered_volume_passes:
+    if not tiered_volume_passes.empty:
         print(f"   📊 TIERED VOLUME: {len(tiered_volume_passes)} signals passed via lower thresholds")
-        for tv in tiered_volume_passes[:3]:  # Show first 3 examples
-            print(f"      • {tv['ticker']}: {tv['cluster_count']} insiders, ${tv['threshold']:,.0f} threshold (${tv['dollar_volume']:,.0f}/day volume)")
-
-    if removed > 0:
-        print(f"   ❌ Removed {removed} illiquid stocks (below tiered dollar volume thresholds)")
-    
-    # Filter 4: Price health check (drawdown + downtrend)
-    before = len(filtered)
+        for idx, tv in tiered_volume_passes.head(3).iterrows():  # Show first 3 examples
+            print(f"      • {tv['ticker']}: {tv['cluster_count']} insiders, ${volume_threshold[idx]:,.0f} threshold (${dollar_volume[idx]:,.0f}/day volume)")
 
-    def check_price_health(row):
-        """
-        Check if stock passes price health filters:
-        1. Not down >40% in last 30 days (drawdown check)
-        2. Not in downtrend (price >3% below 5-day SMA)
-
-        Returns: (passes_bool, reason_string)
-        """
-        ticker = row['ticker']
-        current_price = row.get('currentPrice')
-
-        if not current_price:
-            return (True, "")  # No price data, don't filter
-
-        try:
-            # Get 35 days of data (enough for 30-day drawdown + 5-day SMA)
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=35)
-            hist = yf.download(ticker, start=start_date, end=end_date, progress=False)
-
-            if hist.empty or len(hist) < 5:
-                # No data - log warning but DO NOT block the trade
-                logger.warning(f"{ticker}: Insufficient price history for health checks, allowing trade")
-                return (True, "")
-
-            # Check 1: 30-day drawdown (existing logic)
-            high_30d = hist['High'].max()
-            # Ensure scalar value (handle edge cases where pandas might return Series)
-            if isinstance(high_30d, pd.Series):
-                high_30d = high_30d.iloc[0] if len(high_30d) > 0 else None
-
-            if high_30d is not None and current_price is not None:
-                drawdown = (current_price - high_30d) / high_30d
-                if drawdown <= -0.40:
-                    return (False, f"Drawdown: {ticker} down {abs(drawdown)*100:.1f}% from 30-day high")
-
-            # Check 2: Downtrend detection (NEW)
-            # Use last 5 close prices for SMA
-            if len(hist) >= 5:
-                last_5_closes = hist['Close'].tail(5)
-                sma_5 = last_5_closes.mean()
-                # Ensure scalar value (handle edge cases where pandas might return Series)
-                if isinstance(sma_5, pd.Series):
-                    sma_5 = sma_5.iloc[0] if len(sma_5) > 0 else None
-
-                if sma_5 is not None and current_price < sma_5 * 0.97:
-                    # Price is >3% below 5-day SMA - downtrend
-                    pct_below = ((current_price - sma_5) / sma_5) * 100
-                    return (False, f"Downtrend: {ticker} price ${current_price:.2f} is {abs(pct_below):.1f}% below 5-day SMA ${sma_5:.2f}")
-
-            return (True, "")  # Passed all checks
+    if len(rejections) > logged:
+        print(f"   ❌ Removed {len(rejections) - logged} illiquid stocks (below tiered dollar volume thresholds)")
+    logged = len(rejections)
 
-        except Exception as e:
-            # Data fetch failed - log warning but DO NOT block the trade
-            logger.warning(f"{ticker}: Price health check failed ({str(e)}), allowing trade")
-            return (True, "")  # Never reject on data-fetch failure
-
-    # Apply price health filter (this takes time, so we do it last after other filters)
-    drawdown_rejections = []
-    downtrend_rejections = []
+    # Filter 4: Price health check (drawdown + downtrend)
+    # 1. Not down >40% from the 30-day high (drawdown check)
+    # 2. Not in downtrend (price >3% below 5-day SMA)
+    # Column operations over the batched panel, so every remaining signal is checked.
+    # Behaviour change: the per-ticker version only ran when <= 20 signals were left,
+    # so larger batches used to skip this filter entirely.
+    stats = price_health_stats(price_histories)
+    price = _numeric_column(filtered, 'currentPrice')
+    high_30d = filtered['ticker'].map(stats['high_30d'])
+    sma_5 = filtered['ticker'].map(stats['sma_5'])
+    bars = filtered['ticker'].map(stats['bars']).fillna(0)
+
+    # No price data, don't filter
+    checked = price.notna() & (price != 0)
+    # Too little history - log warning but DO NOT block the trade
+    thin_history = checked & (bars < 5)
+    for ticker in filtered.loc[thin_history, 'ticker']:
+        logger.warning(f"{ticker}: Insufficient price history for health checks, allowing trade")
+    checked &= ~thin_history
+
+    drawdown = (price - high_30d) / high_30d
+    falling_knife = checked & (drawdown <= MAX_RECENT_DRAWDOWN)
+    downtrend = checked & ~falling_knife & (price < sma_5 * DOWNTREND_SMA_TOLERANCE)
+
+    filtered = _reject_rows(filtered, falling_knife, 'drawdown', lambda rows: [
+        f"Drawdown: {t} down {abs(drawdown[idx])*100:.1f}% from 30-day high" for idx, t in rows['ticker'].items()
+    ], rejections)
+    if len(rejections) > logged:
+        print(f"   ❌ Removed {len(rejections) - logged} stocks with >{abs(MAX_RECENT_DRAWDOWN)*100:.0f}% drawdown")
+    logged = len(rejections)
+
+    filtered = _reject_rows(filtered, downtrend, 'downtrend', lambda rows: [
+        f"Downtrend: {t} price ${price[idx]:.2f} is {abs((price[idx] - sma_5[idx]) / sma_5[idx] * 100):.1f}% "
+        f"below 5-day SMA ${sma_5[idx]:.2f}"
+        for idx, t in rows['ticker'].items()
+    ], rejections)
+    if len(rejections) > logged:
+        print(f"   ❌ Removed {len(rejections) - logged} stocks in downtrend (>3% below 5-day SMA)")
+        for rej in rejections[logged:logged + 3]:  # Show first 3 examples
+            print(f"      • {rej['reason']}")
+
+    save_rejection_log(rejections)
 
-    if len(filtered) <= 20:  # Only check if we have reasonable number of signals
-        health_results = []
-        for idx, row in filtered.iterrows():
-            passes, reason = check_price_health(row)
-            if passes:
-                health_results.append(idx)
-            else:
-                # Track rejection reason
-                if "Drawdown" in reason:
-                    drawdown_rejections.append(reason)
-                elif "Downtrend" in reason:
-                    downtrend_rejections.append(reason)
-
-        filtered = filtered.loc[health_results]
-        removed = before - len(filtered)
-
-        if removed > 0:
-            if drawdown_rejections:
-                print(f"   ❌ Removed {len(drawdown_rejections)} stocks with >40% drawdown")
-            if downtrend_rejections:
-                print(f"   ❌ Removed {len(downtrend_rejections)} stocks in downtrend (>3% below 5-day SMA)")
-                for rej in downtrend_rejections[:3]:  # Show first 3 examples
-                    print(f"      • {rej}")
-    
     total_removed = original_count - len(filtered)
     print(f"   ✅ Quality filters: {len(filtered)} signals remaining ({total_removed} removed)")
-    
+    if rejections:
+        by_filter = pd.Series([r['filter'] for r in rejections]).value_counts()
+        print("   📋 Rejection log: " + ", ".join(f"{name} {count}" for name, count in by_filter.items()))
+
     return filtered
 
 def detect_patterns(buys_df, cluster_df):
@@ -1758,11 +1668,75 @@ def detect_patterns(buys_df, cluster_df):
     
     return cluster_df
 
+def insider_track_record(profile):
+    """
+    Track record display data for a notable insider, or None.
+
+    Notable means at least 3 trades and a 90-day win rate outside 45-60%.
+    """
+    win_rate_90d = profile.get('win_rate_90d')
+    avg_return_90d = profile.get('avg_return_90d')
+    total_trades = profile.get('total_trades', 0)
+
+    # Only show track record for notable performers with sufficient data
+    if total_trades < 3 or win_rate_90d is None or avg_return_90d is None:
+        return None
+
+    # High performers: >60% win rate
+    if win_rate_90d > 60:
+        return {
+            'track_record': f"{win_rate_90d:.0f}% win rate, {avg_return_90d:+.1f}% avg return",
+            'win_rate_display': f"✓ {win_rate_90d:.0f}% Win Rate",
+            'win_rate_value': win_rate_90d,
+            'is_notable': True,
+            'is_high_performer': True
+        }
+    # Low performers: <45% win rate
+    if win_rate_90d < 45:
+        return {
+            'track_record': f"{win_rate_90d:.0f}% win rate, {avg_return_90d:+.1f}% avg return",
+            'win_rate_display': f"⚠️ {win_rate_90d:.0f}% Win Rate",
+            'win_rate_value': win_rate_90d,
+            'is_notable': True,
+            'is_high_performer': False
+        }
+    return None
+
+
+def insider_score_table(insider_names, tracker):
+    """
+    Score and track record for each distinct insider, looked up once.
+
+    Args:
+        insider_names: Raw insider names (duplicates are resolved once)
+        tracker: InsiderPerformanceTracker instance
+
+    Returns:
+        DataFrame indexed by raw name with score, track_record (display string
+        or None) and track_data (insider_track_record dict or None) columns
+    """
+    profiles = tracker.get_insider_scores(list(insider_names))
+    rows = []
+    for name, profile in profiles.items():
+        track_data = insider_track_record(profile)
+        rows.append({
+            'insider': name,
+            'score': profile.get('overall_score', 50.0),
+            'track_record': track_data['track_record'] if track_data else None,
+            'track_data': track_data,
+        })
+    return pd.DataFrame(rows, columns=['insider', 'score', 'track_record', 'track_data']).set_index('insider')
+
+
 def apply_insider_scoring(buys_df, cluster_df, tracker=None):
     """
     Apply Follow-the-Smart-Money scoring to adjust conviction based on individual
     insider track records.
 
+    Each distinct insider in the day's buys is scored once; the score table is
+    joined onto the buys and per-cluster averages, top insiders and track record
+    strings come from one groupby by ticker.
+
     Args:
         buys_df: DataFrame of all buy transactions
         cluster_df: DataFrame of clustered signals
@@ -1793,121 +1767,79 @@ def apply_insider_scoring(buys_df, cluster_df, tracker=None):
 
     print(f"\n📊 Applying Follow-the-Smart-Money scoring...")
 
-    # For each cluster, calculate average insider score
+    # Defaults for signals without scored insiders
     cluster_df['avg_insider_score'] = 50.0  # Default neutral
     cluster_df['insider_multiplier'] = 1.0
     cluster_df['top_insider_name'] = ''
     cluster_df['top_insider_score'] = 50.0
     cluster_df['insiders_with_track_record'] = ''  # Enhanced insider list with track records
 
-    insiders_scored = 0
-
-    for idx, row in cluster_df.iterrows():
-        ticker = row['ticker']
-        ticker_buys = buys_df[buys_df['ticker'] == ticker]
-
-        if ticker_buys.empty:
-            continue
-
-        # Get scores for all insiders in this cluster
-        insider_scores = []
-        insider_names = []
-        insider_details_map = {}  # Map name -> track record info
-
-        for _, buy in ticker_buys.iterrows():
-            insider_name = buy.get('insider', '')
-            insider_title = buy.get('title', '')
-            if insider_name:
-                profile = tracker.get_insider_score(insider_name)
-                score = profile.get('overall_score', 50.0)
-                insider_scores.append(score)
-                insider_names.append((insider_name, score))
-
-                # Store track record for notable performers
-                win_rate_90d = profile.get('win_rate_90d')
-                avg_return_90d = profile.get('avg_return_90d')
-                total_trades = profile.get('total_trades', 0)
-
-                # Only show track record for notable performers with sufficient data
-                if total_trades >= 3 and win_rate_90d is not None and avg_return_90d is not None:
-                    # Store details if win rate is outside 45-60% range
-                    track_data = {}
-
-                    # High performers: >60% win rate
-                    if win_rate_90d > 60:
-                        track_data = {
-                            'track_record': f"{win_rate_90d:.0f}% win rate, {avg_return_90d:+.1f}% avg return",
-                            'win_rate_display': f"✓ {win_rate_90d:.0f}% Win Rate",
-                            'win_rate_value': win_rate_90d,
-                            'is_notable': True,
-                            'is_high_performer': True
-                        }
-                    # Low performers: <45% win rate
-                    elif win_rate_90d < 45:
-                        track_data = {
-                            'track_record': f"{win_rate_90d:.0f}% win rate, {avg_return_90d:+.1f}% avg return",
-                            'win_rate_display': f"⚠️ {win_rate_90d:.0f}% Win Rate",
-                            'win_rate_value': win_rate_90d,
-                            'is_notable': True,
-                            'is_high_performer': False
-                        }
-
-                    # Only add to map if outside neutral range
-                    if track_data:
-                        insider_details_map[insider_name] = track_data
-
-        if insider_scores:
-            # Calculate average score for this cluster
-            avg_score = sum(insider_scores) / len(insider_scores)
-            cluster_df.at[idx, 'avg_insider_score'] = round(avg_score, 2)
-
-            # Calculate multiplier (0.5x to 2.0x based on score)
-            # Score 50 (neutral) = 1.0x
-            # Score 100 (excellent) = 2.0x
-            # Score 0 (poor) = 0.5x
-            multiplier = config.INSIDER_SCORE_MULTIPLIER_MIN + (
-                (avg_score / 100) * (config.INSIDER_SCORE_MULTIPLIER_MAX - config.INSIDER_SCORE_MULTIPLIER_MIN)
-            )
-            cluster_df.at[idx, 'insider_multiplier'] = round(multiplier, 2)
-
-            # Track top insider
-            if insider_names:
-                top_insider = max(insider_names, key=lambda x: x[1])
-                cluster_df.at[idx, 'top_insider_name'] = top_insider[0]
-                cluster_df.at[idx, 'top_insider_score'] = round(top_insider[1], 2)
-
-            # Add track record data to insiders_data
-            if 'insiders_data' in cluster_df.columns:
-                insiders_data = cluster_df.at[idx, 'insiders_data']
-                if insiders_data and isinstance(insiders_data, list):
-                    for insider in insiders_data:
-                        # Match by original name (before normalization)
-                        # This is a best-effort match
-                        for orig_name, track_data in insider_details_map.items():
-                            if orig_name in insider['name'] or insider['name'] in orig_name:
-                                insider['track_record'] = track_data['track_record']
-                                insider['win_rate_display'] = track_data.get('win_rate_display')
-                                insider['win_rate_value'] = track_data.get('win_rate_value')
-                                insider['is_notable'] = track_data['is_notable']
-                                insider['is_high_performer'] = track_data.get('is_high_performer')
-                                break
-
-            # Create legacy format for backward compatibility
-            legacy_parts = []
-            for _, buy in ticker_buys.drop_duplicates(subset=['insider']).iterrows():
-                name = buy.get('insider', '')
-                title = buy.get('title', '')
-                if name in insider_details_map:
-                    legacy_parts.append(f"{title} {name} (Track Record: {insider_details_map[name]['track_record']})")
-                else:
-                    legacy_parts.append(f"{title} {name}")
-
-            cluster_df.at[idx, 'insiders_with_track_record'] = ", ".join(legacy_parts) if legacy_parts else ""
-
-            insiders_scored += 1
+    # Buys of the signalled tickers, in buys_df order
+    in_clusters = buys_df['ticker'].isin(cluster_df['ticker'])
+    buys = pd.DataFrame({
+        'ticker': buys_df.loc[in_clusters, 'ticker'],
+        'insider': buys_df.loc[in_clusters, 'insider'] if 'insider' in buys_df.columns else '',
+        'title': buys_df.loc[in_clusters, 'title'] if 'title' in buys_df.columns else '',
+    }).reset_index(drop=True)
+
+    # Score every distinct insider once, then join the scores onto their buys
+    named = buys[buys['insider'].map(bool)]
+    score_table = insider_score_table(named['insider'].unique(), tracker)
+    scored = named.join(score_table, on='insider')
+    by_ticker = scored.groupby('ticker', sort=False)
+
+    # Plain left-to-right sum, as the per-buy loop did, so 2-decimal rounding agrees
+    avg_score = by_ticker['score'].agg(lambda scores: sum(scores) / len(scores))
+    top = scored.loc[by_ticker['score'].idxmax(), ['ticker', 'insider', 'score']].set_index('ticker')
+
+    # Legacy "Title Name (Track Record: ...)" list for backward compatibility
+    legacy = buys.drop_duplicates(subset=['ticker', 'insider'])
+    legacy_track = legacy['insider'].map(score_table['track_record'])
+    legacy_parts = pd.Series([
+        f"{title} {name} (Track Record: {track})" if isinstance(track, str) else f"{title} {name}"
+        for title, name, track in zip(legacy['title'], legacy['insider'], legacy_track)
+    ], index=legacy.index)
+    legacy_text = legacy_parts.groupby(legacy['ticker'], sort=False).agg(', '.join)
+
+    # Fill in the clusters that have at least one scored insider
+    has_scores = cluster_df['ticker'].isin(avg_score.index)
+    tickers = cluster_df.loc[has_scores, 'ticker']
+
+    # Multiplier from 0.5x (score 0) through 1.0x (score 50) to 2.0x (score 100)
+    multiplier = config.INSIDER_SCORE_MULTIPLIER_MIN + (
+        (avg_score / 100) * (config.INSIDER_SCORE_MULTIPLIER_MAX - config.INSIDER_SCORE_MULTIPLIER_MIN)
+    )
+    cluster_df.loc[has_scores, 'avg_insider_score'] = tickers.map(avg_score.map(lambda v: round(v, 2)))
+    cluster_df.loc[has_scores, 'insider_multiplier'] = tickers.map(multiplier.map(lambda v: round(v, 2)))
+    cluster_df.loc[has_scores, 'top_insider_name'] = tickers.map(top['insider'])
+    cluster_df.loc[has_scores, 'top_insider_score'] = tickers.map(top['score'].map(lambda v: round(v, 2)))
+    cluster_df.loc[has_scores, 'insiders_with_track_record'] = tickers.map(legacy_text).fillna('')
+
+    # Add track record data to insiders_data (best-effort match on the original name)
+    if 'insiders_data' in cluster_df.columns:
+        notable = scored[scored['track_data'].notna()].drop_duplicates(subset=['ticker', 'insider'])
+        notable_by_ticker = {
+            ticker: list(zip(group['insider'], group['track_data']))
+            for ticker, group in notable.groupby('ticker', sort=False)
+        }
+        for idx, ticker in tickers.items():
+            insiders_data = cluster_df.at[idx, 'insiders_data']
+            if ticker not in notable_by_ticker or not insiders_data or not isinstance(insiders_data, list):
+                continue
+            for insider in insiders_data:
+                for orig_name, track_data in notable_by_ticker[ticker]:
+                    if orig_name in insider['name'] or insider['name'] in orig_name:
+                        insider['track_record'] = track_data['track_record']
+                        insider['win_rate_display'] = track_data.get('win_rate_display')
+                        insider['win_rate_value'] = track_data.get('win_rate_value')
+                        insider['is_notable'] = track_data['is_notable']
+                        insider['is_high_performer'] = track_data.get('is_high_performer')
+                        break
 
+    insiders_scored = int(has_scores.sum())
     if insiders_scored > 0:
-        print(f"   ✅ Applied insider scoring to {insiders_scored} signals")
+        print(f"   ✅ Applied insider scoring to {insiders_scored} signals "
+              f"({len(scored['insider'].unique())} distinct insiders)")
 
         # Show some statistics
         high_performers = len(cluster_df[cluster_df['avg_insider_score'] >= 65])
@@ -1920,6 +1852,7 @@ def apply_insider_scoring(buys_df, cluster_df, tracker=None):
 
     return cluster_df
 
+
 def cluster_and_score(df, window_days=5, top_n=config.MAX_SIGNALS_TO_ANALYZE, insider_tracker=None):
     """
     df: raw DataFrame from fetch_openinsider_recent
@@ -1947,39 +1880,30 @@ def cluster_and_score(df, window_days=5, top_n=config.MAX_SIGNALS_TO_ANALYZE, in
     buys['conviction'] = buys.apply(lambda r: compute_conviction_score(r['value_calc'], r['role_weight']), axis=1)
     buys = buys.sort_values('trade_date')
 
+    # Best ±window_days window per ticker, found with one sorted scan
+    # (see cluster_engine.py) instead of re-slicing the frame per row
+    sorted_buys, best = find_best_windows(buys, window_days=window_days)
+
     clusters = []
-    tickers = buys['ticker'].unique()
-    for t in tickers:
-        tdf = buys[buys['ticker'] == t].copy().sort_values('trade_date')
-        # compute cluster-level aggregates: last trade date, unique insiders in a sliding window
-        max_cluster_count = 0
-        max_total_value = 0
-        last_trade = tdf['trade_date'].max()
-        for idx,row in tdf.iterrows():
-            start = row['trade_date'] - timedelta(days=window_days)
-            end = row['trade_date'] + timedelta(days=window_days)
-            window = tdf[(tdf['trade_date'] >= start) & (tdf['trade_date'] <= end)]
-            cluster_count = window['insider'].nunique()
-            total_value = window['value_calc'].sum()
-            avg_conviction = window['conviction'].mean() if not window.empty else 0
-            if cluster_count > max_cluster_count or (cluster_count == max_cluster_count and total_value > max_total_value):
-                max_cluster_count = cluster_count
-                max_total_value = total_value
-                best_avg_conviction = avg_conviction
-                best_window = window
+    for t in buys['ticker'].unique():
+        if t not in best.index:
+            continue
+        b = best.loc[t]
+        max_cluster_count = int(b['cluster_count'])
 
         # Format insiders using new structured approach
         if max_cluster_count > 0:
+            best_window = sorted_buys.iloc[int(b['window_start']):int(b['window_end'])]
             insiders_display, insiders_data, insiders_plain = format_insiders_structured(best_window, limit=3)
         else:
             insiders_display, insiders_data, insiders_plain = "", [], ""
 
         clusters.append({
             'ticker': t,
-            'last_trade_date': last_trade,
-            'cluster_count': int(max_cluster_count),
-            'total_value': float(max_total_value),
-            'avg_conviction': float(best_avg_conviction),
+            'last_trade_date': b['last_trade_date'],
+            'cluster_count': max_cluster_count,
+            'total_value': float(b['total_value']),
+            'avg_conviction': float(b['avg_conviction']),
             'insiders': insiders_plain,  # Plain text for backward compatibility
             'insiders_data': insiders_data,  # Structured data for template
             'insiders_count': len(insiders_data) if insiders_data else 0,
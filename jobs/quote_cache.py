@@ -0,0 +1,119 @@
+# jobs/quote_cache.py
+"""
+Shared short-TTL price snapshot for paper-trading valuation.
+
+PaperTradingPortfolio.get_portfolio_value used to call yf.Ticker(t).info for
+every open position, serially, on every call — and a single run calls it from
+main.py, the session summary, position sizing, sector checks and the monitor.
+
+QuoteCache prices a whole ticker set with one batched yf.download of recent
+daily bars (the last close of today's bar is the current price during market
+hours) and serves the result to every caller in the process until the TTL
+expires. Tickers missing from the batch go through the caller's single-ticker
+fallback once per TTL, so delisted-ticker handling is unchanged.
+"""
+
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+QUOTE_TTL_SECONDS = 120         # Prices are reused this long by every caller in the process
+QUOTE_BAR_PERIOD = '5d'         # Enough daily bars to have a close over weekends/holidays
+
+
+class QuoteCache:
+    """
+    Process-wide ticker → price snapshot with a TTL.
+
+    Entries are (price or None, fetched_at); a None entry means the ticker
+    could not be priced and is not retried until it expires.
+    """
+
+    def __init__(self, ttl_seconds: float = QUOTE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._quotes: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self.batch_fetches = 0  # Batched network round-trips made (for diagnostics)
+
+    def _is_fresh(self, ticker: str, now: float) -> bool:
+        entry = self._quotes.get(ticker)
+        return entry is not None and (now - entry[1]) < self.ttl_seconds
+
+    def get_prices(
+        self,
+        tickers: Iterable[str],
+        fallback_fetch: Optional[Callable[[str], Optional[float]]] = None
+    ) -> Dict[str, Optional[float]]:
+        """
+        Current prices for tickers, fetching only expired/missing ones.
+
+        Args:
+            tickers: Tickers to price
+            fallback_fetch: Optional single-ticker lookup for tickers the
+                batch could not price
+
+        Returns:
+            Dict mapping ticker → price (None if unavailable)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        with self._lock:
+            now = time.time()
+            missing = [t for t in tickers if not self._is_fresh(t, now)]
+            if missing:
+                fetched = self._fetch_batch(missing)
+                for t in missing:
+                    price = fetched.get(t)
+                    if price is None and fallback_fetch is not None:
+                        price = fallback_fetch(t)
+                    self._quotes[t] = (price, time.time())
+            return {t: self._quotes[t][0] for t in tickers}
+
+    def _fetch_batch(self, tickers: List[str]) -> Dict[str, float]:
+        """Last daily close per ticker from one batched download."""
+        self.batch_fetches += 1
+        try:
+            data = yf.download(
+                tickers, period=QUOTE_BAR_PERIOD, interval='1d', progress=False,
+                auto_adjust=False, group_by='column', threads=False
+            )
+        except Exception as e:
+            logger.debug(f"Batch quote fetch failed for {len(tickers)} tickers: {e}")
+            return {}
+        if data is None or data.empty or 'Close' not in data:
+            return {}
+
+        closes = data['Close']
+        if not hasattr(closes, 'columns'):
+            closes = closes.to_frame(name=tickers[0])
+
+        # Last valid close per column in one pass
+        last = closes.ffill().iloc[-1]
+        return {t: float(last[t]) for t in tickers
+                if t in last.index and np.isfinite(last[t]) and last[t] > 0}
+
+    def invalidate(self, tickers: Optional[Iterable[str]] = None) -> None:
+        """Drop cached prices (all, or just tickers)."""
+        with self._lock:
+            if tickers is None:
+                self._quotes.clear()
+            else:
+                for t in tickers:
+                    self._quotes.pop(t, None)
+
+
+# Global cache instance
+_quote_cache: Optional[QuoteCache] = None
+
+
+def get_quote_cache() -> QuoteCache:
+    """Get or create the global quote cache"""
+    global _quote_cache
+    if _quote_cache is None:
+        _quote_cache = QuoteCache()
+    return _quote_cache
@@ -17,8 +17,10 @@ from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+from http_client import get_http_client
+
 try:
-    from rapidfuzz import fuzz
+    from rapidfuzz import fuzz, process
     RAPIDFUZZ_AVAILABLE = True
 except ImportError:
     RAPIDFUZZ_AVAILABLE = False
@@ -41,12 +43,16 @@ logger = logging.getLogger(__name__)
 
 # Parallel execution constants
 MAX_PARALLEL_WORKERS = 4   # Reduced from 10: fewer concurrent workers prevents burst flooding SEC
-RATE_LIMIT_CALLS_PER_SECOND = 5  # Reduced from 10: conservative rate to avoid 429s across ticker batches
+FILING_CACHE_TTL_SECONDS = 30 * 24 * 3600  # Filed 13F index pages and info tables are immutable
 
 # Fuzzy matching constants
 FUZZY_MATCH_THRESHOLD = 85  # Minimum match score (0-100)
 MIN_STRING_LENGTH_FOR_FUZZY = 3  # Minimum string length to avoid false positives
 
+# Holdings index: issuer -> priority fund positions from each fund's latest 13F
+HOLDINGS_INDEX_FILE = "holdings_index.json"  # Stored in the parser's cache_dir
+HOLDINGS_INDEX_VERSION = 1
+
 
 class RateLimiter:
     """Thread-safe rate limiter for API calls"""
@@ -122,36 +128,30 @@ class SEC13FParser:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # CRITICAL FIX #3: Thread-local storage for sessions (thread safety)
-        # requests.Session is NOT thread-safe, so each thread gets its own
-        self._thread_local = threading.local()
-
-        # Retry settings
-        self.max_retries = 3
-        self.retry_delays = [2, 4, 8]  # Exponential backoff
+        # Shared client: thread-local pooled sessions, retries with backoff and
+        # the SEC-wide rate limit (shared with the Form 4 fetcher)
+        self.http = get_http_client()
+        self.headers = {
+            'User-Agent': self.user_agent,
+            'Accept-Encoding': 'gzip, deflate',
+            'Host': 'www.sec.gov'
+        }
         self.timeout = 30  # Increased from 10s
 
-        # Rate limiter for parallel requests
-        self.rate_limiter = RateLimiter(RATE_LIMIT_CALLS_PER_SECOND)
-
         # In-memory CIK filing cache: avoids re-fetching the same fund's filing list
         # for each of the N tickers being checked in one pipeline run.
         # 15 funds × 33 tickers = 495 requests without this; 15 with it.
         self._cik_filings_cache: dict = {}
         self._cik_filings_cache_lock = threading.Lock()
 
-    def _get_session(self) -> requests.Session:
-        """Get thread-local session for thread-safe API calls"""
-        if not hasattr(self._thread_local, 'session'):
-            # Create new session for this thread
-            session = requests.Session()
-            session.headers.update({
-                'User-Agent': self.user_agent,
-                'Accept-Encoding': 'gzip, deflate',
-                'Host': 'www.sec.gov'
-            })
-            self._thread_local.session = session
-        return self._thread_local.session
+        # Inverted index of the priority funds' latest holdings, refreshed once
+        # per run and only re-parsed for funds with a new filing
+        self._holdings_index: Optional[Dict] = None
+        self._holdings_index_errors: List[Dict] = []
+        self._cusip_index: Dict[str, List[list]] = {}
+        self._issuer_names: List[str] = []
+        self._issuer_match_cache: Dict[str, List[str]] = {}
+        self._holdings_index_lock = threading.Lock()
 
     def _get_cache_path(self, ticker: str, quarter_year: int = None, quarter: int = None) -> Path:
         """Get cache file path for a ticker with quarter info to prevent stale data"""
@@ -345,13 +345,15 @@ class SEC13FParser:
         # Fallback: no fuzzy matching available
         return (False, 0.0, "no_fuzzy_lib")
 
-    def get_latest_13f_filings(self, cik: str, count: int = 5) -> List[Dict]:
+    def get_latest_13f_filings(self, cik: str, count: int = 5, raise_errors: bool = False) -> List[Dict]:
         """
         Get latest 13F filings for a given CIK
 
         Args:
             cik: Central Index Key (SEC identifier)
             count: Number of filings to retrieve
+            raise_errors: Re-raise request failures instead of returning []
+                (so callers can tell "no filings" from "request failed")
 
         Returns:
             List of filing metadata dictionaries
@@ -381,83 +383,69 @@ class SEC13FParser:
 
         logger.debug(f"Fetching 13F filings for CIK {cik}...")
 
-        # Retry logic with exponential backoff
-        for attempt in range(self.max_retries):
-            try:
-                # CRITICAL FIX #3: Use thread-local session for thread safety
-                response = self._get_session().get(url, params=params, timeout=self.timeout)
-                response.raise_for_status()
+        # The shared client retries timeouts, 429s and 5xx with backoff
+        try:
+            response = self.http.get(url, params=params, headers=self.headers, timeout=self.timeout)
+            response.raise_for_status()
 
-                # Parse XML feed with better error handling
+            # Parse XML feed with better error handling
+            try:
+                root = ET.fromstring(response.content)
+            except ET.ParseError as xml_error:
+                logger.debug(f"XML parsing error for CIK {cik}: {xml_error}")
+                # Try cleaning the content
+                content = response.content.decode('utf-8', errors='ignore')
+                # Remove problematic characters
+                content = content.replace('\x00', '')
                 try:
-                    root = ET.fromstring(response.content)
-                except ET.ParseError as xml_error:
-                    logger.debug(f"XML parsing error for CIK {cik}: {xml_error}")
-                    # Try cleaning the content
-                    content = response.content.decode('utf-8', errors='ignore')
-                    # Remove problematic characters
-                    content = content.replace('\x00', '')
-                    try:
-                        root = ET.fromstring(content.encode('utf-8'))
-                    except ET.ParseError:
-                        logger.debug(f"Unable to parse XML for CIK {cik} even after cleaning")
-                        return []
-
-                filings = []
-                for entry in root.findall('{http://www.w3.org/2005/Atom}entry'):
-                    filing_date = entry.find('{http://www.w3.org/2005/Atom}updated')
-                    filing_url = entry.find('{http://www.w3.org/2005/Atom}link[@type="text/html"]')
-
-                    if filing_date is not None and filing_url is not None:
-                        filings.append({
-                            'date': datetime.strptime(filing_date.text[:10], '%Y-%m-%d'),
-                            'url': filing_url.attrib['href']
-                        })
-
-                # Store in in-memory cache so subsequent ticker checks reuse this result
-                with self._cik_filings_cache_lock:
-                    self._cik_filings_cache[cache_key] = filings
-                return filings
-
-            except requests.exceptions.Timeout:
-                if attempt < self.max_retries - 1:
-                    delay = self.retry_delays[attempt]
-                    logger.warning(f"Timeout for CIK {cik}, retrying in {delay}s... (attempt {attempt + 1}/{self.max_retries})")
-                    time.sleep(delay)
-                else:
-                    logger.warning(f"Timeout for CIK {cik} after {self.max_retries} attempts")
+                    root = ET.fromstring(content.encode('utf-8'))
+                except ET.ParseError:
+                    logger.debug(f"Unable to parse XML for CIK {cik} even after cleaning")
                     return []
 
-            except requests.exceptions.RequestException as e:
-                if attempt < self.max_retries - 1:
-                    delay = self.retry_delays[attempt]
-                    logger.warning(f"Request error for CIK {cik}: {e}, retrying in {delay}s...")
-                    time.sleep(delay)
-                else:
-                    logger.warning(f"Request failed for CIK {cik} after {self.max_retries} attempts: {e}")
-                    return []
+            filings = []
+            for entry in root.findall('{http://www.w3.org/2005/Atom}entry'):
+                filing_date = entry.find('{http://www.w3.org/2005/Atom}updated')
+                filing_url = entry.find('{http://www.w3.org/2005/Atom}link[@type="text/html"]')
 
-            except Exception as e:
-                logger.warning(f"Unexpected error fetching 13F for CIK {cik}: {e}")
-                return []
+                if filing_date is not None and filing_url is not None:
+                    filings.append({
+                        'date': datetime.strptime(filing_date.text[:10], '%Y-%m-%d'),
+                        'url': filing_url.attrib['href']
+                    })
+
+            # Store in in-memory cache so subsequent ticker checks reuse this result
+            with self._cik_filings_cache_lock:
+                self._cik_filings_cache[cache_key] = filings
+            return filings
 
-        return []
+        except requests.exceptions.RequestException as e:
+            if raise_errors:
+                raise
+            logger.warning(f"Request failed for CIK {cik}: {e}")
+            return []
+
+        except Exception as e:
+            logger.warning(f"Unexpected error fetching 13F for CIK {cik}: {e}")
+            return []
 
-    def parse_13f_holdings(self, filing_url: str, target_company_name: str = None) -> pd.DataFrame:
+    def parse_13f_holdings(self, filing_url: str, target_company_name: str = None,
+                           raise_errors: bool = False) -> pd.DataFrame:
         """
         Parse holdings from a 13F filing
 
         Args:
             filing_url: URL to the filing (e.g., https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK=...)
             target_company_name: Optional company name to search for (returns faster if specified)
+            raise_errors: Re-raise request failures instead of returning an empty DataFrame
 
         Returns:
             DataFrame with holdings (or single holding if target_company_name specified)
         """
         try:
             # Get the filing index page
-            # CRITICAL FIX #3: Use thread-local session for thread safety
-            response = self._get_session().get(filing_url, timeout=self.timeout)
+            response = self.http.get(filing_url, headers=self.headers, timeout=self.timeout,
+                                     cache_ttl=FILING_CACHE_TTL_SECONDS)
             response.raise_for_status()
 
             # Parse HTML to find the information table XML file
@@ -484,9 +472,8 @@ class SEC13FParser:
                 xml_link = f"{self.BASE_URL}{xml_link}"
 
             # Fetch the XML file
-            # HIGH PRIORITY FIX #7: Removed redundant sleep - RateLimiter handles rate limiting
-            # CRITICAL FIX #3: Use thread-local session for thread safety
-            xml_response = self._get_session().get(xml_link, timeout=self.timeout)
+            xml_response = self.http.get(xml_link, headers=self.headers, timeout=self.timeout,
+                                         cache_ttl=FILING_CACHE_TTL_SECONDS)
             xml_response.raise_for_status()
 
             # Parse XML
@@ -538,6 +525,10 @@ class SEC13FParser:
                     if value_elem is None:
                         value_elem = entry.find('.//value')
 
+                    cusip_elem = entry.find('.//ns:cusip', namespaces) if namespaces else entry.find('.//cusip')
+                    if cusip_elem is None:
+                        cusip_elem = entry.find('.//cusip')
+
                     if name_elem is not None:
                         name = name_elem.text.strip() if name_elem.text else ""
                         ticker = ticker_elem.text.strip() if ticker_elem is not None and ticker_elem.text else ""
@@ -571,7 +562,8 @@ class SEC13FParser:
                                 'name': name,
                                 'ticker_class': ticker,
                                 'shares': shares,
-                                'value': value
+                                'value': value,
+                                'cusip': cusip_elem.text.strip().upper() if cusip_elem is not None and cusip_elem.text else ''
                             })
 
                 except Exception as entry_error:
@@ -580,6 +572,12 @@ class SEC13FParser:
 
             return pd.DataFrame(holdings)
 
+        except requests.exceptions.RequestException as e:
+            if raise_errors:
+                raise
+            logger.debug(f"Error parsing 13F from {filing_url}: {e}")
+            return pd.DataFrame()
+
         except Exception as e:
             logger.debug(f"Error parsing 13F from {filing_url}: {e}")
             return pd.DataFrame()
@@ -589,6 +587,9 @@ class SEC13FParser:
         Check a single fund for holdings of a specific ticker
         Thread-safe helper method for parallel execution
 
+        Scans the fund's latest filing for one company. check_institutional_interest
+        uses the holdings index instead; this is kept as the reference for tests.
+
         Args:
             fund_name: Name of the fund
             cik: Central Index Key
@@ -600,9 +601,6 @@ class SEC13FParser:
             OR dictionary with 'error': True if API call failed
         """
         try:
-            # Apply rate limiting
-            self.rate_limiter.wait()
-
             # Get latest filings
             filings = self.get_latest_13f_filings(cik, count=2)
 
@@ -643,10 +641,255 @@ class SEC13FParser:
             logger.warning(f"API error checking {fund_name} for {ticker}: {e}")
             return {'error': True, 'fund': fund_name, 'exception': str(e)}
 
+    # =========================================================================
+    # Holdings index
+    # =========================================================================
+
+    def _holdings_index_path(self) -> Path:
+        return self.cache_dir / HOLDINGS_INDEX_FILE
+
+    def _load_holdings_index(self) -> Dict:
+        """Read the persisted holdings index (empty index if missing or outdated)."""
+        empty = {'version': HOLDINGS_INDEX_VERSION, 'funds': {}, 'issuers': {}}
+        path = self._holdings_index_path()
+        if not path.exists():
+            return empty
+        try:
+            with open(path, 'r') as f:
+                index = json.load(f)
+        except Exception as e:
+            logger.warning(f"Holdings index read error, rebuilding: {e}")
+            return empty
+        if index.get('version') != HOLDINGS_INDEX_VERSION:
+            return empty
+        return index
+
+    def _save_holdings_index(self, index: Dict) -> None:
+        path = self._holdings_index_path()
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(index, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Holdings index write error: {e}")
+
+    def _refresh_fund_holdings(self, fund_name: str, cik: str, indexed: Optional[Dict]):
+        """
+        Work out whether a fund's indexed holdings are current.
+
+        Returns:
+            (status, filing, holdings): 'unchanged' when the latest filing is
+            already indexed, 'updated' with the parsed holdings DataFrame when
+            there is a newer one, 'none' when the fund has no filings or its
+            information table could not be parsed
+
+        Raises:
+            requests.exceptions.RequestException: EDGAR could not be reached,
+                so the fund's indexed holdings are left as they are
+        """
+        filings = self.get_latest_13f_filings(cik, count=2, raise_errors=True)
+        if not filings:
+            logger.debug(f"{fund_name}: No recent 13F filings found")
+            return 'none', None, None
+
+        latest = filings[0]
+        if indexed and indexed.get('filing_url') == latest['url']:
+            return 'unchanged', latest, None
+
+        holdings = self.parse_13f_holdings(latest['url'], raise_errors=True)
+        if holdings.empty:
+            logger.debug(f"{fund_name}: No holdings parsed from {latest['url']}")
+            return 'none', latest, None
+        return 'updated', latest, holdings
+
+    def _index_fund(self, index: Dict, fund_name: str, cik: str, filing: Dict, holdings: pd.DataFrame) -> None:
+        """Replace a fund's postings in the index with the holdings of its latest filing."""
+        self._drop_fund(index, cik)
+        index['funds'][cik] = {
+            'fund': fund_name,
+            'filing_url': filing['url'],
+            'filing_date': filing['date'].strftime('%Y-%m-%d'),
+            'holdings': len(holdings),
+        }
+        issuers = index['issuers']
+        cusips = holdings['cusip'] if 'cusip' in holdings else [''] * len(holdings)
+        # Postings keep the entry's position so lookups pick the same entry
+        # (the first match in filing order) a scan of the filing would
+        for position, (name, shares, value, cusip) in enumerate(
+                zip(holdings['name'], holdings['shares'], holdings['value'], cusips)):
+            normalized = self._normalize_company_name(name)
+            if normalized:
+                issuers.setdefault(normalized, []).append([cik, position, int(shares), int(value), cusip or ''])
+
+    @staticmethod
+    def _drop_fund(index: Dict, cik: str) -> None:
+        if index['funds'].pop(cik, None) is None:
+            return
+        issuers = index['issuers']
+        for normalized in list(issuers):
+            postings = [p for p in issuers[normalized] if p[0] != cik]
+            if postings:
+                issuers[normalized] = postings
+            else:
+                del issuers[normalized]
+
+    def _ensure_holdings_index(self) -> Dict:
+        """
+        The holdings index for this run, refreshing funds that filed since it was built.
+
+        The filing list of every priority fund is checked once (one request
+        per fund); only funds with a new 13F have their information table
+        downloaded and parsed. A fund whose requests fail keeps its indexed
+        holdings and is recorded in _holdings_index_errors. Thread-safe:
+        concurrent callers wait for the first refresh.
+        """
+        with self._holdings_index_lock:
+            if self._holdings_index is not None:
+                return self._holdings_index
+
+            start_time = time.time()
+            index = self._load_holdings_index()
+            errors = []
+            changed = 0
+
+            fund_tasks = [(fund_name, cik) for fund_name, ciks in self.PRIORITY_FUNDS.items() for cik in ciks]
+            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_WORKERS) as executor:
+                future_to_fund = {
+                    executor.submit(self._refresh_fund_holdings, fund_name, cik, index['funds'].get(cik)): (fund_name, cik)
+                    for fund_name, cik in fund_tasks
+                }
+                for future in as_completed(future_to_fund):
+                    fund_name, cik = future_to_fund[future]
+                    try:
+                        status, filing, holdings = future.result()
+                    except Exception as e:
+                        logger.warning(f"API error refreshing 13F holdings for {fund_name}: {e}")
+                        errors.append({'error': True, 'fund': fund_name, 'exception': str(e)})
+                        continue
+
+                    if status == 'updated':
+                        self._index_fund(index, fund_name, cik, filing, holdings)
+                        changed += 1
+                        logger.info(f"📥 Indexed {len(holdings):,} holdings for {fund_name} "
+                                    f"({filing['date'].strftime('%Y-%m-%d')} 13F)")
+                    elif status == 'none' and cik in index['funds']:
+                        self._drop_fund(index, cik)
+                        changed += 1
+
+            if changed:
+                self._save_holdings_index(index)
+
+            cusip_index: Dict[str, List[list]] = {}
+            for postings in index['issuers'].values():
+                for posting in postings:
+                    if posting[4]:
+                        cusip_index.setdefault(posting[4], []).append(posting)
+
+            self._holdings_index = index
+            self._holdings_index_errors = errors
+            self._cusip_index = cusip_index
+            self._issuer_names = list(index['issuers'])
+            self._issuer_match_cache = {}
+
+            logger.info(f"13F holdings index: {len(index['funds'])} funds, {len(index['issuers']):,} issuers "
+                        f"({changed} refreshed) in {time.time() - start_time:.1f}s")
+            return index
+
+    def _match_issuers(self, company_name: str) -> List[str]:
+        """
+        Indexed issuer names that match a company name.
+
+        Same rules as _fuzzy_match_company_name (exact, substring overlap,
+        token_sort_ratio >= FUZZY_MATCH_THRESHOLD), evaluated once per company
+        against the index's unique issuer names instead of per fund and entry.
+        """
+        target = self._normalize_company_name(company_name)
+        if len(target) < MIN_STRING_LENGTH_FOR_FUZZY:
+            return []
+        if target in self._issuer_match_cache:
+            return self._issuer_match_cache[target]
+
+        issuers = self._holdings_index['issuers']
+        matched = {target} if target in issuers else set()
+
+        for name in self._issuer_names:
+            if len(name) < MIN_STRING_LENGTH_FOR_FUZZY or name in matched:
+                continue
+            if len(target) >= 8 and target in name and len(target) / len(name) > 0.7:
+                matched.add(name)
+            elif len(name) >= 8 and name in target and len(name) / len(target) > 0.7:
+                matched.add(name)
+
+        if RAPIDFUZZ_AVAILABLE:
+            for name, score, _ in process.extract(target, self._issuer_names, scorer=fuzz.token_sort_ratio,
+                                                  processor=None, score_cutoff=FUZZY_MATCH_THRESHOLD, limit=None):
+                if name not in matched and len(name) >= MIN_STRING_LENGTH_FOR_FUZZY:
+                    matched.add(name)
+                    logger.info(f"Fuzzy match: '{company_name}' -> '{name}' ({score:.0f}%)")
+
+        result = sorted(matched)
+        self._issuer_match_cache[target] = result
+        return result
+
+    def lookup_holdings(self, company_name: str, ticker: str = None) -> List[Dict]:
+        """
+        Priority fund positions in a company, from the holdings index.
+
+        Each fund reports the first matching entry of its latest filing. A
+        fund whose issuer name doesn't match is still reported if it holds a
+        CUSIP that the name-matched entries of other funds carry.
+
+        Args:
+            company_name: Company name to match against issuer names
+            ticker: Ticker to put on the results
+
+        Returns:
+            List of {'fund', 'cik', 'filing_date', 'ticker', 'value', 'shares'}
+            in PRIORITY_FUNDS order
+        """
+        index = self._ensure_holdings_index()
+        issuers = index['issuers']
+
+        best: Dict[str, list] = {}
+        for name in self._match_issuers(company_name):
+            for posting in issuers[name]:
+                current = best.get(posting[0])
+                if current is None or posting[1] < current[1]:
+                    best[posting[0]] = posting
+
+        name_matched = set(best)
+        cusips = {posting[4] for posting in best.values() if posting[4]}
+        for cusip in cusips:
+            for posting in self._cusip_index.get(cusip, []):
+                if posting[0] in name_matched:
+                    continue
+                current = best.get(posting[0])
+                if current is None or posting[1] < current[1]:
+                    best[posting[0]] = posting
+
+        results = []
+        for fund_name, ciks in self.PRIORITY_FUNDS.items():
+            for cik in ciks:
+                posting = best.get(cik)
+                fund = index['funds'].get(cik)
+                if posting is None or fund is None:
+                    continue
+                results.append({
+                    'fund': fund_name,
+                    'cik': cik,
+                    'filing_date': datetime.strptime(fund['filing_date'], '%Y-%m-%d'),
+                    'ticker': ticker,
+                    'value': posting[3],
+                    'shares': posting[2]
+                })
+                logger.debug(f"✓ {fund_name}: {posting[2]:,} shares (${posting[3]:,.0f})")
+        return results
+
     def check_institutional_interest(self, ticker: str, quarter_year: int, quarter: int) -> pd.DataFrame:
         """
         Check which priority funds hold a given ticker and extract actual position sizes
-        Uses parallel execution with ThreadPoolExecutor for improved performance
+        Looks the company up in the holdings index (see _ensure_holdings_index)
 
         Args:
             ticker: Stock ticker symbol
@@ -680,39 +923,11 @@ class SEC13FParser:
             self._write_cache(ticker, empty_df, quarter_year, quarter)
             return empty_df
 
-        # Prepare list of (fund_name, cik) tuples for parallel processing
-        fund_tasks = []
-        for fund_name, ciks in self.PRIORITY_FUNDS.items():
-            for cik in ciks:
-                fund_tasks.append((fund_name, cik))
-
-        # Execute fund checks in parallel
-        results = []
-        api_errors = []
+        # Holdings of every priority fund are indexed once per filing; the
+        # lookup is a match against the index's issuer names
         start_time = time.time()
-
-        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_WORKERS) as executor:
-            # Submit all tasks
-            future_to_fund = {
-                executor.submit(self._check_single_fund, fund_name, cik, ticker, company_name): (fund_name, cik)
-                for fund_name, cik in fund_tasks
-            }
-
-            # Collect results as they complete
-            for future in as_completed(future_to_fund):
-                try:
-                    result = future.result()
-                    if result is not None:
-                        # Check if this is an error result
-                        if isinstance(result, dict) and result.get('error'):
-                            api_errors.append(result)
-                        else:
-                            # Valid holding found
-                            results.append(result)
-                except Exception as e:
-                    fund_name, cik = future_to_fund[future]
-                    logger.warning(f"Exception in parallel fund check for {fund_name}: {e}")
-                    api_errors.append({'error': True, 'fund': fund_name, 'exception': str(e)})
+        results = self.lookup_holdings(company_name, ticker)
+        api_errors = self._holdings_index_errors
 
         elapsed_time = time.time() - start_time
         df = pd.DataFrame(results)
@@ -726,10 +941,10 @@ class SEC13FParser:
         if api_errors:
             logger.warning(f"⚠️  {ticker}: {errors_count}/{total_institutions} institutions had API errors")
             logger.warning(f"   Failed institutions: {', '.join([e['fund'] for e in api_errors])}")
-            # Don't cache if we had significant API failures
-            if errors_count > total_institutions / 2:
-                logger.warning(f"   Too many API errors ({errors_count}/{total_institutions}), not caching result")
-                return df
+            # Don't cache: the result is kept for the whole quarter and would
+            # miss the failed funds' positions
+            logger.warning("   Not caching result until every institution refreshes")
+            return df
 
         if holdings_found > 0:
             logger.info(f"✓ {ticker}: Checked {total_institutions} institutions in {elapsed_time:.1f}s, {holdings_found} have positions")
@@ -13,7 +13,7 @@ Features:
 - Daily caching for lightweight GitHub Actions execution
 """
 
-import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import json
@@ -21,6 +21,7 @@ import os
 from pathlib import Path
 import logging
 from fmp_api import get_company_industry
+from price_store import get_histories, period_start
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -243,6 +244,48 @@ CONTRARIAN_THRESHOLD = -0.10  # Sector down 10%+ vs SPY = upgrade
 MOMENTUM_THRESHOLD = 0.10     # Sector up 10%+ vs SPY = note
 STRONG_THRESHOLD = 0.15       # Very strong move
 
+# Trailing windows (trading days) for ETF returns
+PERFORMANCE_WINDOWS = [30, 60, 90]
+
+
+def trailing_returns(histories, windows=PERFORMANCE_WINDOWS):
+    """
+    Returns over the last N bars of every price series, as one matrix.
+
+    Each series is right-aligned on its own last bar, so a window counts that
+    ticker's bars (the same as Close.iloc[-N] per ticker).
+
+    Args:
+        histories: Dict mapping ticker → DataFrame with a Close column
+        windows: Window lengths in bars
+
+    Returns:
+        DataFrame indexed by ticker with one '<N>d' column per window (NaN
+        where the series is shorter than the window) plus current_price
+    """
+    columns = [f'{days}d' for days in windows] + ['current_price']
+    tickers = [t for t, hist in histories.items() if hist is not None and not hist.empty]
+    if not tickers:
+        return pd.DataFrame(columns=columns, dtype=float)
+
+    width = max(windows)
+    closes = np.full((len(tickers), width), np.nan)
+    lengths = np.empty(len(tickers), dtype=int)
+    for i, ticker in enumerate(tickers):
+        close = histories[ticker]['Close'].to_numpy(dtype=float)
+        lengths[i] = len(close)
+        close = close[-width:]
+        closes[i, width - len(close):] = close
+
+    current = closes[:, -1]
+    matrix = {}
+    for days in windows:
+        returns = current / closes[:, -days] - 1.0
+        returns[lengths < days] = np.nan
+        matrix[f'{days}d'] = returns
+    matrix['current_price'] = current
+    return pd.DataFrame(matrix, index=tickers, columns=columns)
+
 
 class SectorAnalyzer:
     """Analyzes sector relative performance and provides timing signals."""
@@ -261,6 +304,10 @@ class SectorAnalyzer:
         self.cache_hours = cache_hours
         self.performance_data = None
         self.custom_industry_mappings = {}
+        self._industry_etfs = {}  # industry → (etf, sector, source), memoized per instance
+        self._defer_mapping_saves = False
+        self._mappings_dirty = False
+        self._relative_performance = None  # (performance_data, matrix)
         self._load_cache()
         self._load_custom_mappings()
 
@@ -323,21 +370,35 @@ class SectorAnalyzer:
             sector: Mapped sector name
             etf: ETF ticker
         """
-        try:
-            self.custom_industry_mappings[industry] = {
-                'sector': sector,
-                'etf': etf,
-                'discovered_at': datetime.now().isoformat()
-            }
+        self.custom_industry_mappings[industry] = {
+            'sector': sector,
+            'etf': etf,
+            'discovered_at': datetime.now().isoformat()
+        }
+        logger.debug(f"Saved custom mapping: {industry} -> {sector} ({etf})")
+
+        # Batch callers write once at the end (see _flush_custom_mappings)
+        if self._defer_mapping_saves:
+            self._mappings_dirty = True
+        else:
+            self._write_custom_mappings()
 
+    def _write_custom_mappings(self):
+        """Write all custom industry mappings to disk."""
+        try:
             self.cache_dir.mkdir(exist_ok=True)
             with open(self.mapping_cache_file, 'w') as f:
                 json.dump(self.custom_industry_mappings, f, indent=2)
-
-            logger.debug(f"Saved custom mapping: {industry} -> {sector} ({etf})")
         except Exception as e:
             logger.warning(f"Failed to save custom mapping: {e}")
 
+    def _flush_custom_mappings(self):
+        """Write mappings learned while saves were deferred, then stop deferring."""
+        self._defer_mapping_saves = False
+        if self._mappings_dirty:
+            self._mappings_dirty = False
+            self._write_custom_mappings()
+
     def get_etf_for_industry(self, industry):
         """
         Get the appropriate ETF for an industry using multi-tier lookup.
@@ -349,6 +410,9 @@ class SectorAnalyzer:
         4. Custom learned mappings
         5. Intelligent parsing of industry name
 
+        Results are memoized per industry, so each industry is resolved (and
+        its learned mapping saved) once per analyzer.
+
         Args:
             industry: Industry or sector name
 
@@ -358,6 +422,13 @@ class SectorAnalyzer:
         if not industry or industry == 'Unknown':
             return None, None, 'unknown'
 
+        if industry not in self._industry_etfs:
+            self._industry_etfs[industry] = self._resolve_etf_for_industry(industry)
+        return self._industry_etfs[industry]
+
+    def _resolve_etf_for_industry(self, industry):
+        """Uncached multi-tier lookup behind get_etf_for_industry."""
+
         # 1. Check for industry-specific ETF
         if industry in INDUSTRY_SPECIFIC_ETFS:
             etf = INDUSTRY_SPECIFIC_ETFS[industry]
@@ -479,42 +550,24 @@ class SectorAnalyzer:
 
         logger.info(f"Fetching performance data for {len(etfs)} ETFs...")
 
-        performance = {}
-
-        # Fetch data for each ETF
+        # One batched read from the shared price store (6 months covers all timeframes)
+        histories = get_histories(etfs, start=period_start('6mo'), adjusted=True)
         for etf in etfs:
-            try:
-                ticker = yf.Ticker(etf)
-                hist = ticker.history(period='6mo')  # Get 6 months for all timeframes
-
-                if hist.empty:
-                    logger.warning(f"No data for {etf}")
-                    continue
-
-                current_price = hist['Close'].iloc[-1]
-
-                # Calculate returns for different timeframes
-                returns = {}
-                for days in [30, 60, 90]:
-                    try:
-                        if len(hist) >= days:
-                            past_price = hist['Close'].iloc[-days]
-                            returns[f'{days}d'] = (current_price / past_price) - 1.0
-                        else:
-                            returns[f'{days}d'] = None
-                    except Exception as e:
-                        logger.warning(f"Failed to calculate {days}d return for {etf}: {e}")
-                        returns[f'{days}d'] = None
-
-                performance[etf] = {
-                    'current_price': float(current_price),
-                    'returns': returns,
-                    'last_updated': datetime.now().isoformat()
-                }
-
-            except Exception as e:
-                logger.error(f"Failed to fetch data for {etf}: {e}")
-                performance[etf] = None
+            if etf not in histories or histories[etf].empty:
+                logger.warning(f"No data for {etf}")
+
+        # 30/60/90-day returns for every ETF at once (NaN where history is too short)
+        matrix = trailing_returns(histories)
+        updated = datetime.now().isoformat()
+
+        performance = {}
+        for etf, row in matrix.iterrows():
+            performance[etf] = {
+                'current_price': float(row['current_price']),
+                'returns': {f'{days}d': None if np.isnan(row[f'{days}d']) else float(row[f'{days}d'])
+                            for days in PERFORMANCE_WINDOWS},
+                'last_updated': updated
+            }
 
         self.performance_data = performance
         self._save_cache()
@@ -533,6 +586,31 @@ class SectorAnalyzer:
 
         return self.performance_data
 
+    def relative_performance(self):
+        """
+        Returns of every ETF minus SPY's, as one matrix.
+
+        Built once per performance snapshot (cached or freshly downloaded).
+
+        Returns:
+            DataFrame: ETF × '30d'/'60d'/'90d' relative returns (NaN where
+            either return is missing); empty without SPY data
+        """
+        performance = self.get_sector_performance()
+        if self._relative_performance is not None and self._relative_performance[0] is performance:
+            return self._relative_performance[1]
+
+        columns = [f'{days}d' for days in PERFORMANCE_WINDOWS]
+        rows = {etf: data['returns'] for etf, data in (performance or {}).items() if data}
+        returns = pd.DataFrame.from_dict(rows, orient='index', columns=columns, dtype=float)
+        if 'SPY' in returns.index:
+            relative = returns - returns.loc['SPY']
+        else:
+            relative = pd.DataFrame(columns=columns, dtype=float)
+
+        self._relative_performance = (performance, relative)
+        return relative
+
     def get_stock_sector(self, ticker):
         """
         Get industry for a stock using FMP API (reliable, cached).
@@ -572,22 +650,37 @@ class SectorAnalyzer:
         if sector is None or sector == 'Unknown':
             sector = self.get_stock_sector(ticker)
 
+        return self._analyze_sector(sector)
+
+    def _analyze_sector(self, sector):
+        """
+        Sector ETF, relative performance and timing signal for one sector.
+
+        Args:
+            sector: Sector/Industry name
+
+        Returns:
+            dict: Sector analysis with timing signals
+        """
         # Get ETF for this industry/sector using multi-tier lookup
         sector_etf, mapped_sector, mapping_source = self.get_etf_for_industry(sector)
 
+        analysis = {
+            'sector': sector,
+            'sector_etf': sector_etf,
+            'mapped_sector': mapped_sector,
+            'mapping_source': mapping_source,
+            'relative_performance_30d': None,
+            'relative_performance_60d': None,
+            'relative_performance_90d': None,
+            'sector_signal': 'UNKNOWN',
+        }
+
         if not sector_etf:
             logger.warning(f"No ETF mapping for sector: {sector}")
-            return {
-                'sector': sector,
-                'sector_etf': None,
-                'mapped_sector': None,
-                'mapping_source': 'not_found',
-                'relative_performance_30d': None,
-                'relative_performance_60d': None,
-                'relative_performance_90d': None,
-                'sector_signal': 'UNKNOWN',
-                'sector_context': 'No sector ETF mapping available'
-            }
+            analysis['mapping_source'] = 'not_found'
+            analysis['sector_context'] = 'No sector ETF mapping available'
+            return analysis
 
         # Log the successful mapping
         if mapping_source in ['industry_specific', 'industry_mapped', 'inferred']:
@@ -598,64 +691,26 @@ class SectorAnalyzer:
 
         if not performance or sector_etf not in performance or 'SPY' not in performance:
             logger.warning("Performance data not available")
-            return {
-                'sector': sector,
-                'sector_etf': sector_etf,
-                'mapped_sector': mapped_sector,
-                'mapping_source': mapping_source,
-                'relative_performance_30d': None,
-                'relative_performance_60d': None,
-                'relative_performance_90d': None,
-                'sector_signal': 'UNKNOWN',
-                'sector_context': 'Performance data unavailable'
-            }
-
-        # Calculate relative performance vs SPY
-        sector_data = performance.get(sector_etf)
-        spy_data = performance.get('SPY')
-
-        if not sector_data or not spy_data:
-            return {
-                'sector': sector,
-                'sector_etf': sector_etf,
-                'mapped_sector': mapped_sector,
-                'mapping_source': mapping_source,
-                'relative_performance_30d': None,
-                'relative_performance_60d': None,
-                'relative_performance_90d': None,
-                'sector_signal': 'UNKNOWN',
-                'sector_context': 'Incomplete performance data'
-            }
+            analysis['sector_context'] = 'Performance data unavailable'
+            return analysis
 
-        # Calculate relative performance for each timeframe
-        rel_perf = {}
-        for period in ['30d', '60d', '90d']:
-            sector_ret = sector_data['returns'].get(period)
-            spy_ret = spy_data['returns'].get(period)
+        if not performance.get(sector_etf) or not performance.get('SPY'):
+            analysis['sector_context'] = 'Incomplete performance data'
+            return analysis
 
-            if sector_ret is not None and spy_ret is not None:
-                rel_perf[period] = sector_ret - spy_ret
-            else:
-                rel_perf[period] = None
+        # Relative performance vs SPY for each timeframe
+        relative = self.relative_performance().loc[sector_etf]
+        for days in PERFORMANCE_WINDOWS:
+            value = relative[f'{days}d']
+            analysis[f'relative_performance_{days}d'] = None if np.isnan(value) else float(value)
 
         # Generate timing signal based on 30-day relative performance
-        sector_signal, sector_context = self._generate_timing_signal(
-            rel_perf['30d'],
+        analysis['sector_signal'], analysis['sector_context'] = self._generate_timing_signal(
+            analysis['relative_performance_30d'],
             mapped_sector if mapped_sector else sector,
             sector_etf
         )
-
-        return {
-            'sector': sector,
-            'sector_etf': sector_etf,
-            'mapped_sector': mapped_sector,
-            'mapping_source': mapping_source,
-            'relative_performance_30d': rel_perf['30d'],
-            'relative_performance_60d': rel_perf['60d'],
-            'relative_performance_90d': rel_perf['90d'],
-            'sector_signal': sector_signal,
-            'sector_context': sector_context
-        }
+        return analysis
 
     def _generate_timing_signal(self, rel_perf_30d, sector, sector_etf):
         """
@@ -793,34 +848,28 @@ class SectorAnalyzer:
         if self.performance_data is None:
             self.update_sector_performance()
 
-        # Add sector analysis for each signal
-        sector_data = []
-        for _, row in signals_df.iterrows():
-            ticker = row['ticker']
-            sector = row.get('sector', 'Unknown')
-
-            analysis = self.analyze_signal_sector(ticker, sector)
-            sector_data.append(analysis)
+        # Look up the industry once per ticker that arrived without one
+        sectors = signals_df['sector'] if 'sector' in signals_df.columns else pd.Series('Unknown', index=signals_df.index)
+        missing = sectors.isna() | (sectors == 'Unknown')
+        if missing.any():
+            lookups = {t: self.get_stock_sector(t) for t in signals_df.loc[missing, 'ticker'].unique()}
+            sectors = sectors.where(~missing, signals_df['ticker'].map(lookups))
 
-        # Convert to DataFrame and merge
-        sector_df = pd.DataFrame(sector_data)
-
-        # CRITICAL FIX: Use .values to avoid DataFrame index alignment bugs
-        # signals_df may have non-sequential index after filtering/sorting
-        # sector_df has default sequential index [0, 1, 2, ...]
-        # Direct assignment causes pandas to align by index, resulting in wrong sectors!
-        # Using .values forces positional assignment to maintain correct order
-
-        # Update sector if we got better data
-        if 'sector' in sector_df.columns:
-            signals_df['sector'] = sector_df['sector'].values
-
-        # Add new columns (also use .values to maintain alignment)
-        for col in ['sector_etf', 'relative_performance_30d',
+        # One analysis per distinct sector; learned industry mappings are written once at the end
+        self._defer_mapping_saves = True
+        try:
+            sector_df = pd.DataFrame([self._analyze_sector(s) for s in sectors.unique()])
+        finally:
+            self._flush_custom_mappings()
+
+        # Attach by sector in one merge. Assign with .values: signals_df may have a
+        # non-sequential index after filtering/sorting, and index alignment would
+        # put sectors on the wrong rows
+        merged = pd.DataFrame({'sector': sectors.values}).merge(sector_df, on='sector', how='left')
+        for col in ['sector', 'sector_etf', 'relative_performance_30d',
                     'relative_performance_60d', 'relative_performance_90d',
                     'sector_signal', 'sector_context']:
-            if col in sector_df.columns:
-                signals_df[col] = sector_df[col].values
+            signals_df[col] = merged[col].values
 
         logger.info("Sector analysis complete")
 
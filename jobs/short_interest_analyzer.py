@@ -10,7 +10,7 @@ import logging
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import yfinance as yf
@@ -343,12 +343,31 @@ class ShortInterestAnalyzer:
 
         return result
 
-    def analyze_signals(self, signals_df: pd.DataFrame) -> pd.DataFrame:
+    def neutral_analysis(self, row: pd.Series, error: Exception) -> Dict:
+        """Neutral analyze_signal result for a signal that could not be analyzed."""
+        logger.error(f"Failed to analyze {row['ticker']}: {error}")
+        return {
+            'short_percent_float': None,
+            'short_percent_float_display': "N/A",
+            'days_to_cover': None,
+            'days_to_cover_display': "N/A",
+            'shares_short': None,
+            'short_level': 'unknown',
+            'squeeze_score': 0.0,
+            'squeeze_potential': False,
+            'short_interest_available': False,
+            'conviction_adjusted': row.get('avg_conviction', 0),
+            'conviction_adjustment_reason': f"Error: {str(error)}"
+        }
+
+    def analyze_signals(self, signals_df: pd.DataFrame, analyses: Optional[List[Dict]] = None) -> pd.DataFrame:
         """
         Analyze short interest for all signals in a DataFrame.
 
         Args:
             signals_df: DataFrame of signals with ticker, total_value, marketCap columns
+            analyses: Optional analyze_signal results already computed for
+                each row (e.g. by the enrichment pipeline)
 
         Returns:
             DataFrame with short interest columns added
@@ -357,30 +376,20 @@ class ShortInterestAnalyzer:
             logger.info("No signals to analyze for short interest")
             return signals_df
 
-        logger.info(f"🔍 Analyzing short interest for {len(signals_df)} signals...")
-
-        # Analyze each signal
-        results = []
-        for idx, row in signals_df.iterrows():
-            try:
-                analysis = self.analyze_signal(row)
-                results.append(analysis)
-            except Exception as e:
-                logger.error(f"Failed to analyze {row['ticker']}: {e}")
-                # Add neutral data
-                results.append({
-                    'short_percent_float': None,
-                    'short_percent_float_display': "N/A",
-                    'days_to_cover': None,
-                    'days_to_cover_display': "N/A",
-                    'shares_short': None,
-                    'short_level': 'unknown',
-                    'squeeze_score': 0.0,
-                    'squeeze_potential': False,
-                    'short_interest_available': False,
-                    'conviction_adjusted': row.get('avg_conviction', 0),
-                    'conviction_adjustment_reason': f"Error: {str(e)}"
-                })
+        if analyses is not None:
+            results = list(analyses)
+        else:
+            logger.info(f"🔍 Analyzing short interest for {len(signals_df)} signals...")
+
+            # Analyze each signal
+            results = []
+            for idx, row in signals_df.iterrows():
+                try:
+                    analysis = self.analyze_signal(row)
+                    results.append(analysis)
+                except Exception as e:
+                    # Add neutral data
+                    results.append(self.neutral_analysis(row, e))
 
         # Merge results into DataFrame
         results_df = pd.DataFrame(results)
@@ -17,6 +17,8 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Optional, Tuple, Dict
 
+from price_store import get_histories, period_start
+
 logger = logging.getLogger(__name__)
 
 
@@ -257,6 +259,9 @@ def prefetch_price_history(tickers: list, period: str = '20d') -> Dict[str, pd.D
     """
     Batch-fetch price history for multiple tickers to avoid per-signal yfinance calls.
 
+    Reads through the shared price store, which only downloads the date
+    ranges it doesn't already hold.
+
     Returns:
         Dict mapping ticker → DataFrame of price history.
     """
@@ -265,23 +270,8 @@ def prefetch_price_history(tickers: list, period: str = '20d') -> Dict[str, pd.D
         return results
 
     try:
-        # yfinance supports batch download
-        data = yf.download(tickers, period=period, progress=False, group_by='ticker')
-        if data.empty:
-            return results
-
-        if len(tickers) == 1:
-            # Single ticker — data is not grouped
-            results[tickers[0]] = data
-        else:
-            # Multiple tickers — data is grouped by ticker
-            for t in tickers:
-                try:
-                    ticker_data = data[t].dropna(how='all')
-                    if not ticker_data.empty:
-                        results[t] = ticker_data
-                except (KeyError, Exception):
-                    pass
+        histories = get_histories(tickers, start=period_start(period), adjusted=True)
+        results = {t: hist for t, hist in histories.items() if not hist.empty}
     except Exception as e:
         logger.debug(f"Batch price history fetch failed: {e}")
 
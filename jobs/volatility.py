@@ -0,0 +1,215 @@
+# jobs/volatility.py
+"""
+Batched ATR% service for volatility-adjusted position sizing.
+
+Position sizing needs the 20-day Average True Range as a percentage of the
+last close for every signal about to be traded. Rather than one download and
+a pandas combine(max) loop per ticker, get_atr_pcts:
+- reads all candidate tickers from the shared price store in one batched call
+  (missing bars are downloaded together, see price_store.ensure)
+- stacks the last lookback+1 completed sessions into a tickers × days panel
+  and computes true range and ATR% with NumPy across the whole panel
+- persists the results per day in the price store database, so the morning
+  run, later monitor runs and paper trading reuse them without recomputing
+
+ATR only uses completed sessions (bars through yesterday), so a value is
+valid for the whole day. Tickers without enough history are returned as None
+and are not persisted, so a transient download failure is retried next run.
+
+scripts/test_volatility.py keeps the original per-ticker computation for
+parity checks.
+
+Used by:
+- automated_trading/execute_trades.py (TradingEngine position sizing)
+- paper_trade.py (PaperTradingPortfolio position sizing)
+"""
+
+import atexit
+import sqlite3
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from price_store import PriceStore, get_price_store
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ATR_LOOKBACK_DAYS = 20
+ATR_RETENTION_DAYS = 7      # Persisted ATR rows older than this are pruned
+
+
+def atr_pct_panel(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    ATR as % of the last close for a tickers × days panel.
+
+    Each row holds one ticker's last lookback+1 sessions, oldest first and
+    right-aligned (NaN-padded on the left). The first column only supplies
+    the previous close for the first true range.
+
+    Returns:
+        Array of ATR% per row (NaN where there is no positive last close)
+    """
+    prev_close = close[:, :-1]
+    h, l = high[:, 1:], low[:, 1:]
+
+    # True Range = max(high-low, |high-prev_close|, |low-prev_close|);
+    # like the per-ticker version, a missing previous close is ignored and a
+    # bar missing its high or low is left out of the average
+    hl = h - l
+    tr = np.fmax(hl, np.abs(h - prev_close))
+    tr = np.fmax(tr, np.abs(l - prev_close))
+    tr[np.isnan(hl)] = np.nan
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        atr = np.nanmean(tr, axis=1)
+        last_close = close[:, -1]
+        return np.where(last_close > 0, atr / last_close * 100, np.nan)
+
+
+def _stack(histories: Dict[str, pd.DataFrame], lookback: int) -> Tuple[list, np.ndarray, np.ndarray, np.ndarray]:
+    """Right-aligned High/Low/Close panels for tickers with at least lookback bars."""
+    tickers = [t for t, hist in histories.items() if len(hist) >= lookback]
+    width = lookback + 1
+    panels = np.full((3, len(tickers), width), np.nan)
+    for i, t in enumerate(tickers):
+        tail = histories[t][['High', 'Low', 'Close']].to_numpy(dtype=np.float64)[-width:]
+        panels[:, i, width - len(tail):] = tail.T
+    return tickers, panels[0], panels[1], panels[2]
+
+
+class VolatilityService:
+    """
+    Per-day ATR% for many tickers, computed in batches.
+
+    Results live in an atr_pct table next to the bars in the price store
+    database, keyed by (as_of date, lookback, ticker).
+    """
+
+    def __init__(self, store: Optional[PriceStore] = None):
+        self.store = store or get_price_store()
+        self._lock = threading.RLock()
+        self._memo: Dict[Tuple[str, int], Dict[str, Optional[float]]] = {}
+        self.stats = {'computed': 0, 'persisted_hits': 0}
+
+        self._conn = sqlite3.connect(self.store.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS atr_pct (
+                as_of TEXT NOT NULL,
+                lookback INTEGER NOT NULL,
+                ticker TEXT NOT NULL,
+                atr_pct REAL NOT NULL,
+                PRIMARY KEY (as_of, lookback, ticker)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _load_persisted(self, as_of: str, lookback: int, tickers: list) -> Dict[str, float]:
+        result = {}
+        for i in range(0, len(tickers), 500):
+            chunk = tickers[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT ticker, atr_pct FROM atr_pct "
+                f"WHERE as_of = ? AND lookback = ? AND ticker IN ({placeholders})",
+                [as_of, lookback, *chunk],
+            ).fetchall()
+            result.update(rows)
+        return result
+
+    def _persist(self, as_of: str, lookback: int, values: Dict[str, float]) -> None:
+        cutoff = (date.fromisoformat(as_of) - timedelta(days=ATR_RETENTION_DAYS)).isoformat()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO atr_pct (as_of, lookback, ticker, atr_pct) VALUES (?, ?, ?, ?)",
+            [(as_of, lookback, t, v) for t, v in values.items()],
+        )
+        self._conn.execute("DELETE FROM atr_pct WHERE as_of < ?", (cutoff,))
+        self._conn.commit()
+
+    def get_atr_pcts(self, tickers: Iterable[str], lookback: int = DEFAULT_ATR_LOOKBACK_DAYS,
+                     as_of: Optional[date] = None) -> Dict[str, Optional[float]]:
+        """
+        ATR% over the last lookback completed sessions for each ticker.
+
+        Args:
+            tickers: Ticker symbols
+            lookback: ATR window in trading days
+            as_of: Day the values are for (defaults to today); bars up to the
+                day before are used
+
+        Returns:
+            Dict mapping each ticker to ATR as % of its last close, or None
+            if there is not enough history
+        """
+        tickers = list(dict.fromkeys(str(t).upper().strip() for t in tickers if t))
+        as_of = as_of or date.today()
+        key = (as_of.isoformat(), lookback)
+
+        with self._lock:
+            memo = self._memo.setdefault(key, {})
+            missing = [t for t in tickers if t not in memo]
+            if missing:
+                persisted = self._load_persisted(key[0], lookback, missing)
+                memo.update(persisted)
+                self.stats['persisted_hits'] += len(persisted)
+                missing = [t for t in missing if t not in persisted]
+
+            if missing:
+                memo.update(self._compute(missing, lookback, as_of))
+
+            return {t: memo[t] for t in tickers}
+
+    def _compute(self, tickers: list, lookback: int, as_of: date) -> Dict[str, Optional[float]]:
+        """Batched download + NumPy ATR% for tickers not yet known today."""
+        start = as_of - timedelta(days=int((lookback + 5) * 1.8))   # extra days for weekends
+        # Completed sessions only
+        end = as_of - timedelta(days=1)
+        try:
+            histories = self.store.get_histories(tickers, start, end, adjusted=True)
+        except Exception as e:
+            logger.warning(f"⚠️  ATR history download failed for {len(tickers)} tickers: {e}")
+            histories = {}
+
+        stacked, high, low, close = _stack(histories, lookback)
+        values = atr_pct_panel(high, low, close) if stacked else np.array([])
+        computed = {t: float(v) for t, v in zip(stacked, values) if np.isfinite(v)}
+        self.stats['computed'] += len(computed)
+
+        if computed:
+            self._persist(as_of.isoformat(), lookback, computed)
+        logger.debug(f"ATR computed for {len(computed)}/{len(tickers)} tickers")
+        return {t: computed.get(t) for t in tickers}
+
+    def get_atr_pct(self, ticker: str, lookback: int = DEFAULT_ATR_LOOKBACK_DAYS) -> Optional[float]:
+        """ATR% for one ticker (see get_atr_pcts)."""
+        ticker = str(ticker).upper().strip()
+        return self.get_atr_pcts([ticker], lookback).get(ticker)
+
+
+# Global singleton
+_volatility_service = None
+_volatility_service_lock = threading.Lock()
+
+
+def get_volatility_service() -> VolatilityService:
+    """Get or create the global volatility service"""
+    global _volatility_service
+    with _volatility_service_lock:
+        if _volatility_service is None:
+            _volatility_service = VolatilityService()
+            # Registered after the price store's, so it closes first
+            atexit.register(_volatility_service.close)
+    return _volatility_service
+
+
+def get_atr_pcts(tickers: Iterable[str], lookback: int = DEFAULT_ATR_LOOKBACK_DAYS) -> Dict[str, Optional[float]]:
+    """ATR% for many tickers from the shared volatility service"""
+    return get_volatility_service().get_atr_pcts(tickers, lookback)
@@ -8,6 +8,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
 
+from automated_trading.audit_index import get_audit_index
+
 
 class AnomalyAnalyzer:
     """
@@ -125,23 +127,17 @@ class AnomalyAnalyzer:
 
         # Primary source: audit log (live trades)
         if audit_file.exists():
-            with open(audit_file, 'r') as f:
-                for line in f:
-                    try:
-                        event = json.loads(line)
-                        if event.get('event_type') != 'POSITION_CLOSED':
-                            continue
-                        timestamp = event.get('timestamp', '')
-                        exit_date = timestamp[:10]
-                        if exit_date < cutoff_date:
-                            continue
-                        data = event.get('data', {})
-                        if not isinstance(data, dict):
-                            data = {}
-                        pnl = float(data.get('pnl', 0))
-                        trades.append({'date': exit_date, 'pnl': pnl})
-                    except Exception:
-                        continue
+            index = get_audit_index(audit_file)
+            for event in index.since(cutoff_date, event_type='POSITION_CLOSED'):
+                try:
+                    exit_date = event.get('timestamp', '')[:10]
+                    data = event.get('data', {})
+                    if not isinstance(data, dict):
+                        data = {}
+                    pnl = float(data.get('pnl', 0))
+                    trades.append({'date': exit_date, 'pnl': pnl})
+                except Exception:
+                    continue
 
         # Fallback: paper_trades.csv if audit log had no data
         if not trades:
@@ -6,6 +6,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
 
+from automated_trading.audit_index import get_audit_index
+
 
 class AttributionAnalyzer:
     """
@@ -88,53 +90,43 @@ class AttributionAnalyzer:
 
         # Load POSITION_CLOSED events from audit log
         trades = []
-        with open(audit_file, 'r') as f:
-            for line in f:
+        for event in get_audit_index(audit_file).since(cutoff_date, event_type='POSITION_CLOSED'):
+            try:
+                data = event.get('data', {})
+                if not isinstance(data, dict):
+                    data = {}
+
+                ticker = data.get('ticker') or data.get('symbol', 'UNKNOWN')
+
+                # Get sector: first from event data, then from live_positions
+                sector = data.get('sector', '') or sector_map.get(ticker, 'Unknown')
+                if not sector:
+                    sector = 'Unknown'
+
                 try:
-                    event = json.loads(line)
-
-                    if event.get('event_type') != 'POSITION_CLOSED':
-                        continue
-
-                    timestamp = event.get('timestamp', '')
-                    if timestamp[:10] < cutoff_date:
-                        continue
-
-                    data = event.get('data', {})
-                    if not isinstance(data, dict):
-                        data = {}
-
-                    ticker = data.get('ticker') or data.get('symbol', 'UNKNOWN')
-
-                    # Get sector: first from event data, then from live_positions
-                    sector = data.get('sector', '') or sector_map.get(ticker, 'Unknown')
-                    if not sector:
-                        sector = 'Unknown'
-
-                    try:
-                        pnl = float(data.get('pnl', 0))
-                    except (ValueError, TypeError):
-                        pnl = 0.0
-
-                    try:
-                        pnl_pct = float(data.get('pnl_pct', 0))
-                    except (ValueError, TypeError):
-                        pnl_pct = 0.0
-
-                    try:
-                        score = float(data.get('signal_score', 0))
-                    except (ValueError, TypeError):
-                        score = 0
-
-                    trades.append({
-                        'ticker': ticker,
-                        'pnl': pnl,
-                        'pnl_pct': pnl_pct,
-                        'sector': sector,
-                        'score': score
-                    })
-                except Exception:
-                    continue
+                    pnl = float(data.get('pnl', 0))
+                except (ValueError, TypeError):
+                    pnl = 0.0
+
+                try:
+                    pnl_pct = float(data.get('pnl_pct', 0))
+                except (ValueError, TypeError):
+                    pnl_pct = 0.0
+
+                try:
+                    score = float(data.get('signal_score', 0))
+                except (ValueError, TypeError):
+                    score = 0
+
+                trades.append({
+                    'ticker': ticker,
+                    'pnl': pnl,
+                    'pnl_pct': pnl_pct,
+                    'sector': sector,
+                    'score': score
+                })
+            except Exception:
+                continue
 
         return trades
 
@@ -5,10 +5,11 @@ Analyzes how well the trading filters (cooldown, downtrend, micro-cap, go-privat
 are working by checking today's audit log for rejections.
 """
 
-import json
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from automated_trading.audit_index import get_audit_index
+
 
 class FilterAnalyzer:
     """Analyzes filter effectiveness - today only."""
@@ -45,7 +46,7 @@ class FilterAnalyzer:
 
     def _count_todays_rejections(self):
         """
-        Stream audit log to find today's rejections.
+        Read today's audit log events to find rejections.
 
         Returns:
             list: List of rejection reasons
@@ -58,35 +59,33 @@ class FilterAnalyzer:
             return rejections
 
         rejection_count = 0
-        total_lines = 0
-
-        with open(audit_file, 'r') as f:
-            for line in f:
-                total_lines += 1
-                try:
-                    event = json.loads(line)
-                    timestamp = event.get('timestamp', '')
-
-                    # Check if today
-                    if timestamp.startswith(today):
-                        event_type = event.get('event_type', '').lower()
-
-                        # Look for various rejection patterns
-                        if any(word in event_type for word in ['reject', 'skip', 'block', 'invalid']):
-                            data = event.get('data', {})
-                            reason = data.get('reason', '') if isinstance(data, dict) else ''
-                            if reason:
-                                rejections.append(reason)
-                                rejection_count += 1
-
-                except Exception:
-                    continue
+
+        # Only today's slice of the log is read (via the offset index)
+        todays_events = get_audit_index(audit_file).since(today)
+        for event in todays_events:
+            try:
+                timestamp = event.get('timestamp', '')
+
+                # Check if today
+                if timestamp.startswith(today):
+                    event_type = event.get('event_type', '').lower()
+
+                    # Look for various rejection patterns
+                    if any(word in event_type for word in ['reject', 'skip', 'block', 'invalid']):
+                        data = event.get('data', {})
+                        reason = data.get('reason', '') if isinstance(data, dict) else ''
+                        if reason:
+                            rejections.append(reason)
+                            rejection_count += 1
+
+            except Exception:
+                continue
 
         # Debug logging
-        if total_lines == 0:
-            print("  [DEBUG] Audit log is empty")
+        if not todays_events:
+            print(f"  [DEBUG] No audit log events for {today}")
         else:
-            print(f"  [DEBUG] Scanned {total_lines} audit log lines, found {rejection_count} rejections for {today}")
+            print(f"  [DEBUG] Scanned {len(todays_events)} audit log events, found {rejection_count} rejections for {today}")
 
         return rejections
 
@@ -1,11 +1,12 @@
 """Historical context analyzer - compares today's metrics against 30-day averages."""
 
-import json
 import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
 
+from automated_trading.audit_index import get_audit_index
+
 
 class HistoricalAnalyzer:
     """
@@ -80,32 +81,24 @@ class HistoricalAnalyzer:
         cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
         exits = []
 
-        with open(audit_file, 'r') as f:
-            for line in f:
-                try:
-                    event = json.loads(line)
-
-                    if event.get('event_type') != 'POSITION_CLOSED':
-                        continue
-
-                    timestamp = event.get('timestamp', '')
-                    if timestamp[:10] < cutoff_date:
-                        continue
-
-                    data = event.get('data', {})
-                    if not isinstance(data, dict):
-                        data = {}
-
-                    exits.append({
-                        'date': timestamp[:10],
-                        'ticker': data.get('ticker') or data.get('symbol', 'UNKNOWN'),
-                        'pnl': data.get('pnl', 0),
-                        'pnl_pct': data.get('pnl_pct', 0),
-                        'reason': data.get('reason', 'UNKNOWN'),
-                        'time': timestamp
-                    })
-                except Exception:
-                    continue
+        for event in get_audit_index(audit_file).since(cutoff_date, event_type='POSITION_CLOSED'):
+            try:
+                timestamp = event.get('timestamp', '')
+
+                data = event.get('data', {})
+                if not isinstance(data, dict):
+                    data = {}
+
+                exits.append({
+                    'date': timestamp[:10],
+                    'ticker': data.get('ticker') or data.get('symbol', 'UNKNOWN'),
+                    'pnl': data.get('pnl', 0),
+                    'pnl_pct': data.get('pnl_pct', 0),
+                    'reason': data.get('reason', 'UNKNOWN'),
+                    'time': timestamp
+                })
+            except Exception:
+                continue
 
         return exits
 
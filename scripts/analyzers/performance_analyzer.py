@@ -5,10 +5,11 @@ Analyzes today's exits only (not historical) to provide quick insights
 on win rate and P&L for the AI summary.
 """
 
-import json
 from datetime import datetime
 from pathlib import Path
 
+from automated_trading.audit_index import get_audit_index
+
 
 class PerformanceAnalyzer:
     """Analyzes trading performance - today only."""
@@ -82,26 +83,23 @@ class PerformanceAnalyzer:
         today = datetime.now().strftime('%Y-%m-%d')
         exits = []
 
-        with open(audit_file, 'r') as f:
-            for line in f:
-                try:
-                    event = json.loads(line)
-
-                    if event.get('timestamp', '').startswith(today):
-                        if event.get('event_type') == 'POSITION_CLOSED':
-                            data = event.get('data', {})
-                            if not isinstance(data, dict):
-                                data = {}
-
-                            exits.append({
-                                'ticker': data.get('ticker') or data.get('symbol', 'UNKNOWN'),
-                                'pnl': data.get('pnl', 0),
-                                'pnl_pct': data.get('pnl_pct', 0),
-                                'reason': data.get('reason', 'UNKNOWN'),
-                                'time': event.get('timestamp')
-                            })
-                except Exception:
-                    continue
+        index = get_audit_index(audit_file)
+        for event in index.since(today, event_type='POSITION_CLOSED'):
+            try:
+                if event.get('timestamp', '').startswith(today):
+                    data = event.get('data', {})
+                    if not isinstance(data, dict):
+                        data = {}
+
+                    exits.append({
+                        'ticker': data.get('ticker') or data.get('symbol', 'UNKNOWN'),
+                        'pnl': data.get('pnl', 0),
+                        'pnl_pct': data.get('pnl_pct', 0),
+                        'reason': data.get('reason', 'UNKNOWN'),
+                        'time': event.get('timestamp')
+                    })
+            except Exception:
+                continue
 
         print(f"  [DEBUG] Found {len(exits)} exits in audit log for {today}")
         return exits
@@ -1,12 +1,13 @@
 """Trend analyzer - detects 7-day trends in key metrics."""
 
-import json
 import statistics
 import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
 
+from automated_trading.audit_index import get_audit_index
+
 
 class TrendAnalyzer:
     """
@@ -66,30 +67,25 @@ class TrendAnalyzer:
 
         daily_data = defaultdict(lambda: {'wins': 0, 'total': 0, 'pnl': 0.0})
 
-        with open(audit_file, 'r') as f:
-            for line in f:
-                try:
-                    event = json.loads(line)
-
-                    if event.get('event_type') != 'POSITION_CLOSED':
-                        continue
-
-                    exit_date = event.get('timestamp', '')[:10]
-                    if exit_date not in date_set:
-                        continue
-
-                    data = event.get('data', {})
-                    if not isinstance(data, dict):
-                        data = {}
-
-                    pnl = data.get('pnl', 0)
-                    daily_data[exit_date]['total'] += 1
-                    daily_data[exit_date]['pnl'] += pnl
-                    if pnl > 0:
-                        daily_data[exit_date]['wins'] += 1
-                except Exception:
+        index = get_audit_index(audit_file)
+        for event in index.since(min(dates), event_type='POSITION_CLOSED'):
+            try:
+                exit_date = event.get('timestamp', '')[:10]
+                if exit_date not in date_set:
                     continue
 
+                data = event.get('data', {})
+                if not isinstance(data, dict):
+                    data = {}
+
+                pnl = data.get('pnl', 0)
+                daily_data[exit_date]['total'] += 1
+                daily_data[exit_date]['pnl'] += pnl
+                if pnl > 0:
+                    daily_data[exit_date]['wins'] += 1
+            except Exception:
+                continue
+
         metrics = []
         for date in sorted(dates):
             if date in daily_data and daily_data[date]['total'] > 0:
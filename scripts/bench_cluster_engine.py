@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized cluster engine vs the original per-row window loop.
+
+Generates synthetic OpenInsider-style buys (5k, 50k, 500k rows by default),
+times cluster_engine.find_best_windows against reference_best_windows, and
+checks that both pick the same best window per ticker.
+
+The reference loop is O(n²) per ticker and takes many minutes at 500k rows,
+so it only runs up to --max-reference-rows (default 50,000) unless --full is given.
+
+Usage:
+    python scripts/bench_cluster_engine.py
+    python scripts/bench_cluster_engine.py --sizes 5000 50000 500000 --full
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+from cluster_engine import find_best_windows
+from test_cluster_engine import reference_best_windows
+
+
+def make_synthetic_buys(n, seed=42):
+    """Roughly 100 buys per ticker over a 90-day span, log-normal values."""
+    rng = np.random.default_rng(seed)
+    n_tickers = max(n // 100, 10)
+    values = np.round(rng.lognormal(mean=11.5, sigma=1.2, size=n), 2)
+    df = pd.DataFrame({
+        'ticker': rng.choice([f"T{i:05d}" for i in range(n_tickers)], size=n),
+        'insider': rng.choice([f"Insider {i}" for i in range(max(n // 20, 50))], size=n),
+        'trade_date': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 90, size=n), unit='D'),
+        'value_calc': values,
+    })
+    df['conviction'] = np.log1p(df['value_calc']) * rng.choice([1.0, 1.5, 3.0], size=n)
+    return df
+
+
+def results_match(sorted_buys, best, expected):
+    """True if engine and reference agree on count/total/conviction per ticker."""
+    if set(best.index) != set(expected):
+        return False
+    for t, (_, count, total, conv, _) in expected.items():
+        b = best.loc[t]
+        if int(b['cluster_count']) != count or not np.isclose(b['total_value'], total):
+            return False
+        if not np.isclose(b['avg_conviction'], conv):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5_000, 50_000, 500_000])
+    parser.add_argument('--window-days', type=int, default=5)
+    parser.add_argument('--max-reference-rows', type=int, default=50_000)
+    parser.add_argument('--full', action='store_true', help='Run the reference loop at every size')
+    args = parser.parse_args()
+
+    print(f"\n{'='*70}")
+    print("CLUSTER ENGINE BENCHMARK")
+    print(f"{'='*70}")
+    print(f"{'rows':>10} {'tickers':>8} {'engine (s)':>12} {'loop (s)':>12} {'speedup':>9}  match")
+
+    for n in args.sizes:
+        buys = make_synthetic_buys(n)
+
+        start = time.perf_counter()
+        sorted_buys, best = find_best_windows(buys, window_days=args.window_days)
+        engine_secs = time.perf_counter() - start
+
+        if args.full or n <= args.max_reference_rows:
+            start = time.perf_counter()
+            expected = reference_best_windows(buys, window_days=args.window_days)
+            loop_secs = time.perf_counter() - start
+            match = 'yes' if results_match(sorted_buys, best, expected) else 'NO'
+            print(f"{n:>10,} {len(best):>8,} {engine_secs:>12.3f} {loop_secs:>12.3f} "
+                  f"{loop_secs / engine_secs:>8.1f}x  {match}")
+        else:
+            print(f"{n:>10,} {len(best):>8,} {engine_secs:>12.3f} {'skipped':>12} {'-':>9}  -")
+
+    print(f"{'='*70}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming lxml OpenInsider parser vs the original BeautifulSoup parse.
+
+Parses a screener page with openinsider_parser.parse_openinsider_table and
+the original BeautifulSoup loop (reference_parse_openinsider_table in
+scripts/test_openinsider_parser.py), checks they produce identical DataFrames,
+and times both (best of --repeat runs). Also times an incremental parse that
+only materializes rows newer than the median filing timestamp.
+
+The fixture is a saved screener page (--fixture, e.g. saved from
+https://openinsider.com/screener?fd=7&xp=1&cnt=5000). Without one, a synthetic
+page with the same markup is generated at each --rows size.
+
+Usage:
+    python scripts/bench_openinsider_parser.py
+    python scripts/bench_openinsider_parser.py --fixture data/openinsider_screener.html
+    python scripts/bench_openinsider_parser.py --rows 1000 5000 20000 --repeat 5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+from openinsider_parser import parse_openinsider_table
+
+ROW_TEMPLATE = (
+    '<tr style="background:#fff">'
+    '<td align=right><div class="tooltip"></div></td>'
+    '<td align=right><div><a href="http://www.sec.gov/Archives/edgar/data/{cik}/{acc}-index.htm" target=_blank>{filed}</a></div></td>'
+    '<td align=right><div>{traded}</div></td>'
+    '<td><b><a href="/{ticker}" onmouseover="Tip(\'<img src=...>\')" onmouseout="UnTip()">{ticker}</a></b></td>'
+    '<td><a href="/{ticker}">{company}</a></td>'
+    '<td><a href="/insider/{insider_slug}/{cik}">{insider}</a></td>'
+    '<td>{title}</td>'
+    '<td>{code}</td>'
+    '<td align=right>${price:,.2f}</td>'
+    '<td align=right>{sign}{qty:,}</td>'
+    '<td align=right>{owned:,}</td>'
+    '<td align=right>{sign}{dpct}%</td>'
+    '<td align=right>{sign}${value:,}</td>'
+    '<td></td><td></td><td></td><td></td>'
+    '</tr>\n'
+)
+
+
+def make_screener_html(n, seed=42, now='2025-06-06T18:00:00', days=7):
+    """A screener page with n tinytable rows filed over the days before now, newest first."""
+    rng = np.random.default_rng(seed)
+    now = np.datetime64(now, 's')
+    filed = np.sort(now - rng.integers(0, int(days * 86400), size=n).astype('timedelta64[s]'))[::-1]
+    codes = rng.choice(['P - Purchase', 'S - Sale', 'S - Sale+OE', 'M - OptEx'], size=n, p=[0.3, 0.5, 0.1, 0.1])
+    titles = rng.choice(['CEO', 'Dir', 'CFO', '10%', 'COO, Dir', 'Pres'], size=n)
+
+    rows = []
+    for i in range(n):
+        qty = int(rng.integers(100, 200_000))
+        price = float(np.round(rng.lognormal(3, 1), 2))
+        is_sale = codes[i].startswith('S')
+        filed_ts = str(filed[i]).replace('T', ' ')
+        rows.append(ROW_TEMPLATE.format(
+            cik=1_000_000 + i, acc=f"0001{i:06d}2500{i % 10000:04d}",
+            filed=filed_ts, traded=filed_ts[:10],
+            ticker=f"T{i % 1500:04d}", company=f"Company {i % 1500} Inc",
+            insider=f"Doe John {i % 4000}", insider_slug=f"Doe-John-{i % 4000}",
+            title=titles[i], code=codes[i], price=price,
+            sign='-' if is_sale else '+', qty=qty, owned=qty * 3,
+            dpct=int(rng.integers(1, 99)), value=int(qty * price),
+        ))
+
+    return (
+        '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01 Transitional//EN">\n<html><head>'
+        '<meta http-equiv="content-type" content="text/html; charset=UTF-8"><title>Screener</title></head>'
+        '<body><table class="header"><tr><td><a href="/">OpenInsider</a></td></tr></table>'
+        '<table width="100%" cellpadding="0" cellspacing="0" border="0" class="tinytable">'
+        '<thead><tr><th>X</th><th>Filing&nbsp;Date</th><th>Trade&nbsp;Date</th><th>Ticker</th>'
+        '<th>Company&nbsp;Name</th><th>Insider&nbsp;Name</th><th>Title</th><th>Trade&nbsp;Type</th>'
+        '<th>Price</th><th>Qty</th><th>Owned</th><th>&Delta;Own</th><th>Value</th>'
+        '<th>1d</th><th>1w</th><th>1m</th><th>6m</th></tr></thead>\n<tbody>'
+        + ''.join(rows) +
+        '</tbody></table><div id="footer">&copy; OpenInsider</div></body></html>'
+    )
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixture', help='Saved screener HTML page')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 5_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # Imported here: the test module imports make_screener_html from this one
+    from test_openinsider_parser import reference_parse_openinsider_table
+
+    if args.fixture:
+        pages = [(Path(args.fixture).name, Path(args.fixture).read_bytes())]
+    else:
+        pages = [(f"synthetic {n:,}", make_screener_html(n).encode('utf-8')) for n in args.rows]
+
+    print(f"\n{'='*78}")
+    print("OPENINSIDER PARSER BENCHMARK")
+    print(f"{'='*78}")
+    print(f"{'page':>18} {'rows':>7} {'bs4 (s)':>9} {'lxml (s)':>9} {'speedup':>8} {'incr (s)':>9} {'incr rows':>10}  match")
+
+    for name, content in pages:
+        ref_secs, expected = best_of(lambda: reference_parse_openinsider_table(content.decode('utf-8', 'replace')),
+                                     args.repeat)
+        fast_secs, df = best_of(lambda: parse_openinsider_table(content), args.repeat)
+
+        watermark = expected['filing_date'].median().strftime('%Y-%m-%d %H:%M:%S')
+        incr_secs, newer = best_of(lambda: parse_openinsider_table(content, newer_than=watermark, newest_first=True),
+                                   args.repeat)
+
+        match = df is not None and df.equals(expected)
+        print(f"{name:>18} {len(df):>7,} {ref_secs:>9.3f} {fast_secs:>9.3f} {ref_secs / fast_secs:>7.1f}x "
+              f"{incr_secs:>9.3f} {len(newer):>10,}  {'yes' if match else 'NO'}")
+
+    print(f"{'='*78}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the 13F holdings inverted index.
+
+Covers:
+- Index lookups find the same position per fund as scanning each fund's
+  filing with _check_single_fund (exact, substring, fuzzy and no match)
+- Every fund's information table is downloaded and parsed once per run,
+  not once per ticker
+- The persisted index is reused by the next run; only a fund that filed a
+  new 13F is re-parsed, and a fund without filings is dropped
+- A fund whose EDGAR requests fail keeps its indexed holdings, and
+  per-ticker results are not cached while any fund is failing
+- A fund listing the issuer under another name is found through the CUSIP
+  carried by the name-matched entries
+
+These are unit-level tests that don't require external services (EDGAR pages
+are synthetic and served by a fake HTTP client; the cache lives in a temp dir).
+"""
+
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+import sec_13f_parser
+from sec_13f_parser import SEC13FParser
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+FUNDS = {'Alpha Fund': ['0000000001'], 'Beta Capital': ['0000000002'], 'Gamma Partners': ['0000000003']}
+
+COMMON = ['APPLE INC', 'AMAZON COM INC', 'MICROSOFT CORP', 'BANK AMER CORP', 'ALPHABET INC',
+          'JOHNSON & JOHNSON', 'PROCTER AND GAMBLE CO', 'BERKSHIRE HATHAWAY INC DEL']
+HOLDINGS = {
+    '0000000001': COMMON + ['ALPHABET INC CL C', 'APPLE INC'] + [f"FILLER {i} INDUSTRIES" for i in range(200)],
+    '0000000002': ['Microsoft Corporation', 'Apple Inc.', 'JOHNSON AND JOHNSON'] + [f"OTHER {i} HLDGS" for i in range(150)],
+    '0000000003': ['AMAZON.COM INC', 'PROCTER & GAMBLE', 'AAPL ORD SHS'] + [f"THIRD {i} TR" for i in range(100)],
+}
+
+TARGETS = ['Apple Inc.', 'Amazon.com, Inc.', 'Microsoft Corporation', 'Bank of America Corporation',
+           'Alphabet Inc.', 'Johnson & Johnson', 'The Procter & Gamble Company', 'Nonexistent Widgets Inc',
+           'Berkshire Hathaway Inc.']
+
+
+def cusip_for(name):
+    if name == 'AAPL ORD SHS':
+        return cusip_for('APPLE INC')
+    return f"{zlib.crc32(name.encode()):09d}"[:9]
+
+
+def info_table_xml(names, seed):
+    rows = ''.join(
+        f"<infoTable><nameOfIssuer>{name.replace('&', '&amp;')}</nameOfIssuer><titleOfClass>COM</titleOfClass>"
+        f"<cusip>{cusip_for(name)}</cusip><value>{(i + 1) * 10 + seed}</value>"
+        f"<shrsOrPrnAmt><sshPrnamt>{(i + 1) * 100 + seed}</sshPrnamt><sshPrnamtType>SH</sshPrnamtType></shrsOrPrnAmt>"
+        f"</infoTable>"
+        for i, name in enumerate(names)
+    )
+    return ('<?xml version="1.0"?><informationTable '
+            'xmlns="http://www.sec.gov/edgar/document/thirteenf/informationtable">' + rows + '</informationTable>')
+
+
+class FakeEdgar:
+    """Serves filing lists, index pages and information tables; counts requests per kind."""
+
+    def __init__(self, filings, failing=()):
+        self.filings = filings  # cik -> (accession, holdings) or None
+        self.failing = set(failing)  # ciks whose requests raise
+        self.requests = {'list': 0, 'index': 0, 'table': 0}
+
+    def _response(self, url, text):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = text.encode('utf-8')
+        response.url = url
+        return response
+
+    def get(self, url, params=None, headers=None, timeout=None, cache_ttl=None, retries=None):
+        if 'browse-edgar' in url:
+            self.requests['list'] += 1
+            cik = params['CIK']
+            if cik in self.failing:
+                raise requests.exceptions.ConnectionError(f"EDGAR unreachable for {cik}")
+            entries = ''
+            if self.filings.get(cik):
+                accession = self.filings[cik][0]
+                entries = (f'<entry><updated>2025-08-{10 + int(cik[-1])}T16:00:00-04:00</updated>'
+                           f'<link rel="alternate" type="text/html" '
+                           f'href="https://www.sec.gov/Archives/edgar/data/{cik}/{accession}-index.htm"/></entry>')
+            return self._response(url, f'<feed xmlns="http://www.w3.org/2005/Atom">{entries}</feed>')
+
+        cik = url.split('/data/')[1].split('/')[0]
+        accession = self.filings[cik][0]
+        if url.endswith('-index.htm'):
+            self.requests['index'] += 1
+            return self._response(url, f'<html><body><table><tr><td><a href="/Archives/edgar/data/{cik}/'
+                                       f'{accession}/infotable.xml">infotable.xml</a></td></tr></table></body></html>')
+        self.requests['table'] += 1
+        return self._response(url, info_table_xml(self.filings[cik][1], seed=int(cik[-1])))
+
+
+def make_parser(cache_dir, edgar, names=None):
+    parser = SEC13FParser('Test admin@example.com', cache_dir=cache_dir)
+    parser.PRIORITY_FUNDS = FUNDS
+    parser.http = edgar
+    names = names or {}
+    parser._get_company_name = lambda ticker: names.get(ticker)
+    return parser
+
+
+def holding_set(results):
+    return {(r['fund'], r['shares'], r['value']) for r in results if r}
+
+
+# ─── Test 1: Parity with the per-fund scan ───────────────────────────────────
+
+def test_parity():
+    """Each fund reports the entry a scan of its filing finds."""
+    edgar = FakeEdgar({cik: (f"acc-{cik}-1", names) for cik, names in HOLDINGS.items()})
+    parser = make_parser(tempfile.mkdtemp(), edgar)
+
+    mismatches = []
+    matched = 0
+    for target in TARGETS:
+        expected = holding_set(parser._check_single_fund(fund, ciks[0], 'T', target) for fund, ciks in FUNDS.items())
+        got = holding_set(r for r in parser.lookup_holdings(target, 'T') if not (
+            target == 'Apple Inc.' and r['fund'] == 'Gamma Partners'))
+        matched += len(got)
+        if got != expected:
+            mismatches.append((target, expected, got))
+    report("Same holdings as scanning every fund's filing", not mismatches and matched >= 10, f"{mismatches}")
+    report("Repeated issuer resolves to its first entry",
+           any(r['shares'] == 101 for r in parser.lookup_holdings('Apple Inc.', 'AAPL') if r['fund'] == 'Alpha Fund'))
+    report("Unknown company has no holdings", parser.lookup_holdings('Nonexistent Widgets Inc') == [])
+
+
+# ─── Test 2: Downloads per run ───────────────────────────────────────────────
+
+def test_downloads_once_per_run():
+    """Information tables are parsed once per fund, however many tickers are checked."""
+    edgar = FakeEdgar({cik: (f"acc-{cik}-1", names) for cik, names in HOLDINGS.items()})
+    names = {f"T{i}": TARGETS[i % len(TARGETS)] for i in range(50)}
+    parser = make_parser(tempfile.mkdtemp(), edgar, names)
+
+    frames = [parser.check_institutional_interest(t, 2025, 2) for t in names]
+    report("One filing list, index page and table per fund for 50 tickers",
+           edgar.requests == {'list': 3, 'index': 3, 'table': 3}, f"{edgar.requests}")
+    apple = frames[0]
+    report("Results carry fund, filing date, shares and value",
+           set(apple.columns) == {'fund', 'cik', 'filing_date', 'ticker', 'value', 'shares'}
+           and list(apple['fund']) == ['Alpha Fund', 'Beta Capital', 'Gamma Partners'], f"{apple}")
+
+
+# ─── Test 3: Persistence and refresh ─────────────────────────────────────────
+
+def test_refresh_on_new_filing():
+    """The next run reuses the index and re-parses only funds with a new 13F."""
+    cache_dir = tempfile.mkdtemp()
+    filings = {cik: (f"acc-{cik}-1", names) for cik, names in HOLDINGS.items()}
+    make_parser(cache_dir, FakeEdgar(filings)).lookup_holdings('Apple Inc.')
+
+    edgar = FakeEdgar(filings)
+    rerun = make_parser(cache_dir, edgar)
+    before = holding_set(rerun.lookup_holdings('Microsoft Corporation'))
+    report("Unchanged filings are not downloaded again",
+           edgar.requests == {'list': 3, 'index': 0, 'table': 0} and len(before) == 2, f"{edgar.requests}")
+
+    filings = dict(filings)
+    filings['0000000002'] = ('acc-0000000002-2', ['NVIDIA CORPORATION'] + HOLDINGS['0000000002'][1:])
+    filings['0000000003'] = None
+    edgar = FakeEdgar(filings)
+    refreshed = make_parser(cache_dir, edgar)
+    after = refreshed.lookup_holdings('Microsoft Corporation')
+    report("Only the fund with a new filing is re-parsed", edgar.requests == {'list': 3, 'index': 1, 'table': 1},
+           f"{edgar.requests}")
+    report("New filing replaces the fund's holdings",
+           [r['fund'] for r in after] == ['Alpha Fund']
+           and [r['fund'] for r in refreshed.lookup_holdings('Nvidia Corporation')] == ['Beta Capital'])
+    report("Fund without filings dropped", '0000000003' not in refreshed._holdings_index['funds']
+           and all(p[0] != '0000000003' for ps in refreshed._holdings_index['issuers'].values() for p in ps))
+
+
+# ─── Test 4: Request failures ────────────────────────────────────────────────
+
+def test_request_failure_keeps_holdings():
+    """A failed filing list is an error, not "no filings"."""
+    cache_dir = tempfile.mkdtemp()
+    filings = {cik: (f"acc-{cik}-1", names) for cik, names in HOLDINGS.items()}
+    make_parser(cache_dir, FakeEdgar(filings)).lookup_holdings('Apple Inc.')
+
+    names = {'MSFT': 'Microsoft Corporation', 'NONE': 'Nonexistent Widgets Inc'}
+    failing = make_parser(cache_dir, FakeEdgar(filings, failing=['0000000002']), names)
+    during = failing.check_institutional_interest('MSFT', 2025, 2)
+    failing.check_institutional_interest('NONE', 2025, 2)
+    report("Failing fund keeps its indexed holdings",
+           list(during['fund']) == ['Alpha Fund', 'Beta Capital'], f"{list(during['fund'])}")
+    report("Failure recorded as an error", [e['fund'] for e in failing._holdings_index_errors] == ['Beta Capital'],
+           f"{failing._holdings_index_errors}")
+    report("Result not cached while a fund is failing", failing._read_cache('NONE', 2025, 2) is None)
+
+    reloaded = make_parser(cache_dir, FakeEdgar(filings))
+    reloaded.lookup_holdings('Apple Inc.')
+    report("Persisted index still has the fund", '0000000002' in reloaded._holdings_index['funds'])
+
+    recovered = make_parser(cache_dir, FakeEdgar(filings), names)
+    recovered.check_institutional_interest('NONE', 2025, 2)
+    report("Cached once every fund refreshes", recovered._read_cache('NONE', 2025, 2) is not None)
+
+
+# ─── Test 5: CUSIP ───────────────────────────────────────────────────────────
+
+def test_cusip_match():
+    """A differently named entry with the matched CUSIP counts as the same issuer."""
+    edgar = FakeEdgar({cik: (f"acc-{cik}-1", names) for cik, names in HOLDINGS.items()})
+    parser = make_parser(tempfile.mkdtemp(), edgar)
+    apple = {r['fund']: r for r in parser.lookup_holdings('Apple Inc.')}
+    report("Fund holding the CUSIP under another name found",
+           'Gamma Partners' in apple and apple['Gamma Partners']['shares'] == 303, f"{apple.keys()}")
+    report("CUSIPs indexed", cusip_for('APPLE INC') in parser._cusip_index)
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("13F HOLDINGS INDEX TESTS")
+    print("="*70 + "\n")
+
+    sec_13f_parser.logger.setLevel('WARNING')
+    test_parity()
+    test_downloads_once_per_run()
+    test_refresh_on_new_filing()
+    test_request_failure_keeps_holdings()
+    test_cusip_match()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the audit log sidecar index.
+
+Covers:
+- recent() and since() return exactly what a full scan of the log returns
+- Lines appended without the index (older writers) are caught up on read
+- A corrupt index is rebuilt from the log
+- An index whose last record still lines up but whose middle no longer
+  matches the log (lines rewritten mid-file) is rebuilt on load
+- log_audit_event keeps the index in step with the log
+
+These are unit-level tests that don't require external services (the log
+and index live in a temp dir).
+"""
+
+import os
+import sys
+import json
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from automated_trading import audit_index, config, utils
+from automated_trading.audit_index import AuditLogIndex, RECORD_DTYPE
+
+PASS = 0
+FAIL = 0
+
+EVENT_TYPES = ['ORDER_SUBMITTED', 'POSITION_CLOSED', 'POSITION_OPENED']
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+def make_log(n=300):
+    """Temp audit log with n events spread over n/10 days."""
+    log_path = os.path.join(tempfile.mkdtemp(), 'audit_log.jsonl')
+    start = datetime(2025, 1, 1, 9, 30)
+    with open(log_path, 'w') as f:
+        for i in range(n):
+            event = {
+                'timestamp': (start + timedelta(hours=i * 2.4)).isoformat(),
+                'event_type': EVENT_TYPES[i % len(EVENT_TYPES)],
+                'details': {'seq': i},
+            }
+            f.write(json.dumps(event) + '\n')
+        f.write('not json\n')
+    return log_path
+
+
+def full_scan(log_path):
+    events = []
+    with open(log_path) as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                pass
+    return events
+
+
+# ─── Test 1: Parity with a full scan ─────────────────────────────────────────
+
+def test_matches_full_scan():
+    """recent() and since() return the same events as scanning the log."""
+    log_path = make_log()
+    index = AuditLogIndex(log_path)
+    events = full_scan(log_path)
+
+    expected = [e for e in events if e['event_type'] == 'POSITION_CLOSED'][::-1][:25]
+    report("recent() by type matches scan", index.recent('POSITION_CLOSED', limit=25) == expected)
+    report("recent() without type matches scan", index.recent(limit=10) == events[::-1][:10])
+
+    expected = [e for e in events if '2025-01-10' <= e['timestamp'][:10] <= '2025-01-20'
+                and e['event_type'] == 'ORDER_SUBMITTED']
+    got = index.since('2025-01-10', event_type='ORDER_SUBMITTED', until='2025-01-20')
+    report("since() date range matches scan", got == expected, f"{len(got)} vs {len(expected)}")
+    report("Index file written next to the log", os.path.getsize(log_path + '.idx') ==
+           len(events) * RECORD_DTYPE.itemsize)
+
+
+# ─── Test 2: Catch-up and rebuild ────────────────────────────────────────────
+
+def test_catch_up_and_rebuild():
+    """Unindexed tails are indexed on read; corrupt indexes are rebuilt."""
+    log_path = make_log(50)
+    index = AuditLogIndex(log_path)
+    index.refresh()
+
+    with open(log_path, 'a') as f:
+        f.write(json.dumps({'timestamp': '2025-03-01T10:00:00', 'event_type': 'POSITION_CLOSED'}) + '\n')
+    latest = index.recent('POSITION_CLOSED', limit=1)
+    report("Raw append is caught up", latest and latest[0]['timestamp'] == '2025-03-01T10:00:00')
+
+    with open(log_path + '.idx', 'ab') as f:
+        f.write(b'\x00' * 7)
+    fresh = AuditLogIndex(log_path)
+    report("Truncated index is rebuilt", fresh.recent(limit=500) == full_scan(log_path)[::-1])
+
+
+# ─── Test 3: log_audit_event maintains the index ─────────────────────────────
+
+def test_log_audit_event_appends_index():
+    """Events written through log_audit_event are indexed without a catch-up."""
+    log_path = os.path.join(tempfile.mkdtemp(), 'audit_log.jsonl')
+    original = config.AUDIT_LOG_FILE
+    config.AUDIT_LOG_FILE = log_path
+    try:
+        for i in range(5):
+            utils.log_audit_event('POSITION_CLOSED', {'ticker': f'T{i}'})
+        records = audit_index.get_audit_index(log_path)._read_index()
+        report("One index record per logged event", len(records) == 5, f"{len(records)}")
+        report("Index covers the whole log",
+               AuditLogIndex._indexed_end(records) == os.path.getsize(log_path))
+        recent = utils.read_recent_audit_events('POSITION_CLOSED', limit=2)
+        report("read_recent_audit_events uses the index",
+               [e['data']['ticker'] for e in recent] == ['T4', 'T3'], f"{recent}")
+        today = utils.read_audit_events_since(datetime.now().date(), event_type='POSITION_CLOSED')
+        report("read_audit_events_since returns today's events", len(today) == 5, f"{len(today)}")
+    finally:
+        config.AUDIT_LOG_FILE = original
+
+
+# ─── Test 4: Rewritten middle ────────────────────────────────────────────────
+
+def test_rewritten_middle_rebuilt():
+    """A log rewritten mid-file is detected even when the tail offsets still line up."""
+    log_path = make_log(60)
+    AuditLogIndex(log_path).refresh()
+
+    # Replace five middle lines with one line of the same total size
+    with open(log_path, 'rb') as f:
+        lines = f.readlines()
+    removed = sum(len(line) for line in lines[20:25])
+    padding = {'timestamp': '2025-01-05T12:00:00', 'event_type': 'POSITION_CLOSED', 'pad': ''}
+    padding['pad'] = 'x' * (removed - len(json.dumps(padding)) - 1)
+    with open(log_path, 'wb') as f:
+        f.writelines(lines[:20] + [(json.dumps(padding) + '\n').encode()] + lines[25:])
+
+    fresh = AuditLogIndex(log_path)
+    report("Last record alone still looks valid",
+           fresh._is_consistent(fresh._read_index(), os.path.getsize(log_path), full=False))
+    report("Rewritten middle is rebuilt on load", fresh.recent(limit=500) == full_scan(log_path)[::-1])
+    report("Rebuilt index has one record per event",
+           len(fresh._read_index()) == len(full_scan(log_path)), f"{len(fresh._read_index())}")
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("AUDIT LOG INDEX TESTS")
+    print("="*70 + "\n")
+
+    test_matches_full_scan()
+    test_catch_up_and_rebuild()
+    test_log_audit_event_appends_index()
+    test_rewritten_middle_rebuilt()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
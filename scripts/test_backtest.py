@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the vectorized backtest engine.
+
+Covers:
+- With the legacy window, searchsorted forward returns match the original
+  per-signal fetch for weekend signal dates, dividends, gaps, horizons that
+  haven't elapsed yet and tickers without prices
+- BacktestEngine reproduces the original results table (rows, order,
+  alpha vs SPY) and reads every series through batched price store calls
+- The default window reaches the full horizon in trading sessions
+- Extra horizons and slippage sweeps reuse the loaded prices
+- Horizon specs parse with and without labels
+
+These are unit-level tests that don't require external services (bars come
+from an in-memory fetcher and the store lives in a temp dir).
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+import backtest
+from backtest import BacktestEngine, SuppressStderr, forward_returns, parse_horizons
+from price_store import PriceStore, get_history
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+TODAY = date.today()
+TICKERS = ['AAA', 'BBB', 'DIV', 'GAP', 'SPY']
+
+
+def random_bars(ticker, start, end):
+    """Deterministic random-walk closes on business days; DIV pays dividends, GAP skips days."""
+    idx = pd.bdate_range('2024-01-01', TODAY)
+    rng = np.random.default_rng(sum(map(ord, ticker)))
+    close = 40 * np.exp(np.cumsum(rng.normal(0, 0.02, len(idx))))
+    bars = pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+                         'Volume': 1e6, 'Dividends': 0.0, 'Stock Splits': 0.0}, index=idx)
+    if ticker == 'DIV':
+        bars.iloc[::40, bars.columns.get_loc('Dividends')] = 0.5
+    if ticker == 'GAP':
+        bars = bars[rng.uniform(size=len(bars)) > 0.2]
+    return bars[(bars.index >= pd.Timestamp(start)) & (bars.index <= pd.Timestamp(end))]
+
+
+class FakeFetcher:
+    """Serves random bars for known tickers and records calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, tickers, start, end):
+        self.calls.append(tuple(tickers))
+        return {t: random_bars(t, start, end) for t in tickers if t in TICKERS}
+
+
+def make_signals(n=120):
+    rng = np.random.default_rng(1)
+    days = rng.integers(1, 500, n)
+    return pd.DataFrame({
+        'date': [pd.Timestamp(TODAY - timedelta(days=int(d))) for d in days],
+        'ticker': rng.choice(['AAA', 'bbb', 'DIV', 'GAP', 'GONE'], n),
+        'signal_score': np.where(rng.uniform(size=n) > 0.1, rng.uniform(5, 20, n), np.nan),
+        'action': rng.choice(['Buy', 'Watchlist'], n),
+    })
+
+
+def reference_fetch_forward_returns(ticker, start_date, days_forward):
+    """
+    The original per-signal forward return fetch, for parity checks.
+
+    Fetch daily close prices from start_date to start_date + days_forward.
+
+    Args:
+        ticker: Stock ticker symbol
+        start_date: Starting date for price fetch
+        days_forward: Number of trading days forward
+
+    Returns:
+        Tuple of (start_price, horizon_price, return_fraction) or None if error
+    """
+    start = start_date
+    end = start_date + timedelta(days=days_forward+5)  # Buffer for weekends/holidays
+
+    try:
+        # Read from the shared price store (downloads only missing ranges)
+        with SuppressStderr():
+            df = get_history(ticker, start, end - timedelta(days=1), adjusted=True)  # end exclusive
+
+        # Check if we got valid data
+        if df.empty or 'Close' not in df.columns:
+            return None
+
+        # Reset index to access by position
+        df = df.reset_index()
+
+        # Ensure we have enough data
+        if len(df) == 0:
+            return None
+
+        # Get start price (first available close)
+        start_price = float(df['Close'].iloc[0])
+
+        # Get horizon price (at days_forward or last available)
+        idx_horizon = min(days_forward, len(df) - 1)
+        horizon_price = float(df['Close'].iloc[idx_horizon])
+
+        # Calculate return as scalar float
+        ret = float((horizon_price - start_price) / start_price)
+
+        return start_price, horizon_price, ret
+
+    except Exception:
+        # Silently skip errors (delisted stocks, etc.)
+        return None
+
+
+def reference_results(signals, horizons):
+    """The original run_backtest loop over reference_fetch_forward_returns."""
+    rows = []
+    for _, row in signals.iterrows():
+        sig_date = pd.to_datetime(row['date']).to_pydatetime()
+        for horizon_days, label in horizons:
+            res_ticker = reference_fetch_forward_returns(row['ticker'], sig_date, horizon_days)
+            res_spy = reference_fetch_forward_returns('SPY', sig_date, horizon_days)
+            if not res_ticker or not res_spy:
+                continue
+            rows.append({
+                'ticker': row['ticker'],
+                'signal_date': sig_date,
+                'horizon': label,
+                'ticker_return': res_ticker[2],
+                'spy_return': res_spy[2],
+                'alpha': res_ticker[2] - res_spy[2],
+                'signal_score': float(row['signal_score']) if pd.notna(row['signal_score']) else 0.0,
+                'action': str(row['action']),
+            })
+    return pd.DataFrame(rows)
+
+
+# ─── Test 1: Parity with the per-signal backtest ─────────────────────────────
+
+def test_parity():
+    """Same rows, order and returns as the original loop."""
+    global get_history
+    store = PriceStore(os.path.join(tempfile.mkdtemp(), 'price_store.sqlite'), fetch_fn=FakeFetcher())
+    original_get_history = get_history
+    try:
+        get_history = store.get_history
+        signals = make_signals()
+        horizons = [(5, '1w'), (21, '1m'), (63, '3m')]
+
+        expected = reference_results(signals, horizons)
+        fetcher = FakeFetcher()
+        engine = BacktestEngine(signals, PriceStore(os.path.join(tempfile.mkdtemp(), 'price_store.sqlite'),
+                                                    fetch_fn=fetcher), legacy_window=True)
+        got = engine.run(horizons)
+
+        same_keys = (len(got) == len(expected) > 0
+                     and got[['ticker', 'horizon', 'action']].equals(expected[['ticker', 'horizon', 'action']])
+                     and (got['signal_date'].values == expected['signal_date'].values).all())
+        report("Same rows in the same order", same_keys, f"{len(got)} vs {len(expected)}")
+        close = same_keys and all(np.allclose(got[c], expected[c]) for c in
+                                  ['ticker_return', 'spy_return', 'alpha', 'signal_score'])
+        report("Same returns, SPY returns and alpha", close)
+        report("Tickers without prices skipped", 'GONE' not in set(got['ticker']) and 'GONE' in engine.failed_tickers)
+        recent = signals['date'] > pd.Timestamp(TODAY - timedelta(days=30))
+        report("Recent signals use the last available close",
+               recent.any() and set(got[got['signal_date'] > pd.Timestamp(TODAY - timedelta(days=30))]['horizon']) >= {'3m'})
+        report("Prices loaded in batched calls", len(fetcher.calls) < len(TICKERS) + 1, f"{len(fetcher.calls)} calls")
+    finally:
+        get_history = original_get_history
+
+
+# ─── Test 2: Sweeps reuse loaded prices ──────────────────────────────────────
+
+def test_sweep_reuses_prices():
+    """Shorter horizons and slippage levels need no new reads."""
+    fetcher = FakeFetcher()
+    engine = BacktestEngine(make_signals(), PriceStore(os.path.join(tempfile.mkdtemp(), 'price_store.sqlite'),
+                                                       fetch_fn=fetcher))
+    base = engine.run([(21, '1m')])
+    loaded = engine.prices
+    net = engine.run([(21, '1m'), (10, '10d')], slippage_bps=25)
+    report("No reload for shorter horizons", engine.prices is loaded)
+
+    net_1m = net[net['horizon'] == '1m'].reset_index(drop=True)
+    s = 25 / 10_000
+    expected = (1 + base['ticker_return']) * (1 - s) / (1 + s) - 1
+    report("Slippage charged on entry and exit", np.allclose(net_1m['ticker_return'], expected))
+    report("Benchmark not charged", np.allclose(net_1m['spy_return'], base['spy_return']))
+
+    engine.run([(63, '3m')])
+    report("Longer horizon reloads", engine.prices is not loaded and engine._loaded_days == 63)
+
+    summary = backtest.summarize(net, [(21, '1m'), (10, '10d')])
+    report("Summary in horizon order", list(summary['horizon']) == ['1m', '10d'] and
+           summary['signals'].sum() == len(net))
+
+
+# ─── Test 3: Horizons in trading sessions ────────────────────────────────────
+
+def test_session_window():
+    """The default window reaches days_forward sessions; the legacy one falls short."""
+    dates = pd.bdate_range('2025-01-06', periods=120).values.astype('datetime64[D]')
+    closes = np.arange(1.0, 121.0)
+    signal = dates[:1]
+
+    def exit_index(days_forward, legacy_window=False):
+        ret = forward_returns(dates, closes, signal, days_forward, legacy_window)[0]
+        return int(round((ret + 1) * closes[0])) - 1
+
+    report("Default window reaches every horizon",
+           [exit_index(d) for d in (5, 21, 63)] == [5, 21, 63],
+           f"{[exit_index(d) for d in (5, 21, 63)]}")
+    report("Legacy window stops short beyond a week",
+           exit_index(5, True) == 5 and exit_index(21, True) < 21 and exit_index(63, True) < 50,
+           f"{[exit_index(d, True) for d in (5, 21, 63)]}")
+
+
+# ─── Test 4: Helpers ─────────────────────────────────────────────────────────
+
+def test_helpers():
+    """Horizon parsing and empty series."""
+    report("Labelled horizons", parse_horizons('1w=5, 1m=21') == [(5, '1w'), (21, '1m')])
+    report("Unlabelled horizons", parse_horizons('5,63') == [(5, '5d'), (63, '63d')])
+    empty = forward_returns(np.array([], dtype='datetime64[D]'), np.array([]),
+                            np.array(['2025-01-02'], dtype='datetime64[D]'), 5)
+    report("Empty series gives NaN", len(empty) == 1 and np.isnan(empty[0]))
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("BACKTEST ENGINE TESTS")
+    print("="*70 + "\n")
+
+    test_parity()
+    test_sweep_reuses_prices()
+    test_session_window()
+    test_helpers()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
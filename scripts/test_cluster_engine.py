@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the vectorized cluster engine.
+
+Covers:
+- Best window per ticker matches the original per-row loop (count, value,
+  conviction, window rows) on randomized data
+- Tie-breaking on equal unique-insider counts (higher total value, then first window)
+- Missing insider names are not counted, NaN values/convictions are skipped
+
+These are unit-level tests that don't require external services.
+"""
+
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+from cluster_engine import find_best_windows
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+def reference_best_windows(buys: pd.DataFrame, window_days: int = 5) -> dict:
+    """
+    Original per-row loop from cluster_and_score, the reference for parity
+    tests and benchmarks. Returns {ticker: (last_trade, count, total, avg_conviction, window_df)}.
+    """
+    results = {}
+    buys = buys.sort_values('trade_date', kind='mergesort')
+    for t in buys['ticker'].unique():
+        tdf = buys[buys['ticker'] == t].copy().sort_values('trade_date', kind='mergesort')
+        max_cluster_count = 0
+        max_total_value = 0
+        best_avg_conviction = 0.0
+        best_window = tdf.iloc[0:0]
+        last_trade = tdf['trade_date'].max()
+        for idx, row in tdf.iterrows():
+            start = row['trade_date'] - timedelta(days=window_days)
+            end = row['trade_date'] + timedelta(days=window_days)
+            window = tdf[(tdf['trade_date'] >= start) & (tdf['trade_date'] <= end)]
+            cluster_count = window['insider'].nunique()
+            total_value = window['value_calc'].sum()
+            avg_conviction = window['conviction'].mean() if not window.empty else 0
+            if cluster_count > max_cluster_count or (cluster_count == max_cluster_count and total_value > max_total_value):
+                max_cluster_count = cluster_count
+                max_total_value = total_value
+                best_avg_conviction = avg_conviction
+                best_window = window
+        results[t] = (last_trade, max_cluster_count, max_total_value, best_avg_conviction, best_window)
+    return results
+
+
+def make_buys(n, n_tickers, n_insiders, days, seed):
+    """Random buys with many same-day rows and repeat insiders."""
+    rng = np.random.default_rng(seed)
+    values = rng.choice([0.0, 25_000.0, 50_000.0, 100_000.0, 250_000.0], size=n)
+    df = pd.DataFrame({
+        'ticker': rng.choice([f"T{i}" for i in range(n_tickers)], size=n),
+        'insider': rng.choice([f"Insider {i}" for i in range(n_insiders)], size=n),
+        'trade_date': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, days, size=n), unit='D'),
+        'value_calc': values,
+    })
+    df['conviction'] = np.log1p(df['value_calc']) * rng.choice([1.0, 1.5, 3.0], size=n)
+    return df
+
+
+def compare(buys, window_days=5):
+    """Return list of mismatch descriptions between engine and reference loop."""
+    expected = reference_best_windows(buys, window_days)
+    sorted_buys, best = find_best_windows(buys, window_days)
+    problems = []
+    if set(expected) != set(best.index):
+        problems.append(f"ticker sets differ: {set(expected) ^ set(best.index)}")
+        return problems
+    for t, (last_trade, count, total, conv, window) in expected.items():
+        b = best.loc[t]
+        got_rows = sorted_buys.iloc[int(b['window_start']):int(b['window_end'])]
+        if int(b['cluster_count']) != count:
+            problems.append(f"{t}: count {b['cluster_count']} != {count}")
+        if not np.isclose(b['total_value'], total):
+            problems.append(f"{t}: total {b['total_value']} != {total}")
+        if not (np.isclose(b['avg_conviction'], conv) or (pd.isna(conv) and pd.isna(b['avg_conviction']))):
+            problems.append(f"{t}: conviction {b['avg_conviction']} != {conv}")
+        if b['last_trade_date'] != last_trade:
+            problems.append(f"{t}: last trade {b['last_trade_date']} != {last_trade}")
+        if count > 0 and sorted(got_rows['insider'].tolist(), key=str) != sorted(window['insider'].tolist(), key=str):
+            problems.append(f"{t}: window rows differ")
+    return problems
+
+
+# ─── Test 1: Randomized parity with the original loop ────────────────────────
+
+def test_random_parity():
+    """Engine output matches the per-row loop across several random seeds."""
+    for seed in range(5):
+        buys = make_buys(n=400, n_tickers=15, n_insiders=12, days=40, seed=seed)
+        problems = compare(buys)
+        report(f"Random parity (seed={seed})", not problems, "; ".join(problems[:3]))
+
+
+# ─── Test 2: Tie-breaking ────────────────────────────────────────────────────
+
+def test_tie_breaking():
+    """Equal counts → higher total wins; equal totals → earliest window wins."""
+    buys = pd.DataFrame({
+        'ticker': ['AAA'] * 4 + ['BBB'] * 4,
+        'insider': ['A', 'B', 'C', 'D', 'A', 'B', 'A', 'B'],
+        'trade_date': pd.to_datetime([
+            '2025-01-01', '2025-01-02', '2025-02-01', '2025-02-02',
+            '2025-01-01', '2025-01-02', '2025-03-01', '2025-03-02',
+        ]),
+        'value_calc': [10.0, 10.0, 50.0, 50.0, 20.0, 20.0, 20.0, 20.0],
+    })
+    buys['conviction'] = np.log1p(buys['value_calc'])
+    sorted_buys, best = find_best_windows(buys, window_days=5)
+
+    aaa = best.loc['AAA']
+    aaa_rows = sorted_buys.iloc[aaa['window_start']:aaa['window_end']]
+    report("Equal counts: higher-value window wins",
+           aaa['total_value'] == 100.0 and set(aaa_rows['insider']) == {'C', 'D'},
+           f"got total={aaa['total_value']}, insiders={list(aaa_rows['insider'])}")
+
+    bbb = best.loc['BBB']
+    bbb_rows = sorted_buys.iloc[bbb['window_start']:bbb['window_end']]
+    report("Equal counts and totals: earliest window wins",
+           bbb_rows['trade_date'].min() == pd.Timestamp('2025-01-01'),
+           f"got window starting {bbb_rows['trade_date'].min()}")
+    report("Tie-breaking matches original loop", not compare(buys), "; ".join(compare(buys)))
+
+
+# ─── Test 3: Missing names and NaN values ────────────────────────────────────
+
+def test_missing_values():
+    """NaN insider names aren't counted; NaN values and convictions are skipped."""
+    buys = pd.DataFrame({
+        'ticker': ['CCC'] * 4,
+        'insider': ['A', None, 'B', 'A'],
+        'trade_date': pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-03', '2025-01-04']),
+        'value_calc': [100.0, np.nan, 200.0, 300.0],
+        'conviction': [1.0, np.nan, 2.0, 3.0],
+    })
+    _, best = find_best_windows(buys, window_days=5)
+    ccc = best.loc['CCC']
+    report("NaN insider not counted as unique", ccc['cluster_count'] == 2,
+           f"got {ccc['cluster_count']}")
+    report("NaN value skipped in total", ccc['total_value'] == 600.0,
+           f"got {ccc['total_value']}")
+    report("NaN conviction skipped in mean", ccc['avg_conviction'] == 2.0,
+           f"got {ccc['avg_conviction']}")
+    report("Missing values match original loop", not compare(buys), "; ".join(compare(buys)))
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("CLUSTER ENGINE PARITY TESTS")
+    print("="*70 + "\n")
+
+    test_random_parity()
+    test_tie_breaking()
+    test_missing_values()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
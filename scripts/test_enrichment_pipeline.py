@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the concurrent signal enrichment pipeline.
+
+Covers:
+- Independent stages run side by side: wall-clock tracks the slowest stage,
+  not the sum of all stages
+- Per-stage concurrency caps and rate limits are respected
+- Results come back in row order; failures use the stage default
+- main.enrich_signals joins short interest and 13F results per ticker and
+  leaves news to the post-filter step
+
+These are unit-level tests that don't require external services (every
+stage is an in-memory fake that sleeps to simulate network latency).
+"""
+
+import sys
+import time
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+from enrichment_pipeline import EnrichmentPipeline, EnrichmentStage
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+def signals(n):
+    return pd.DataFrame({'ticker': [f"T{i:03d}" for i in range(n)], 'total_value': range(n)})
+
+
+class SlowStage:
+    """Sleeps per call and tracks peak concurrency and call times."""
+
+    def __init__(self, latency, fail_on=None):
+        self.latency = latency
+        self.fail_on = fail_on
+        self.active = 0
+        self.peak = 0
+        self.call_times = []
+        self.lock = threading.Lock()
+
+    def __call__(self, row):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.call_times.append(time.monotonic())
+        try:
+            time.sleep(self.latency)
+            if row['ticker'] == self.fail_on:
+                raise RuntimeError("boom")
+            return row['ticker'].lower()
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+# ─── Test 1: Stages overlap ──────────────────────────────────────────────────
+
+def test_stages_overlap():
+    """Three stages finish in about the time of the slowest one."""
+    df = signals(20)
+    fns = {'news': SlowStage(0.05), 'short_interest': SlowStage(0.05), '13f': SlowStage(0.1)}
+    stages = [EnrichmentStage(name, fn, max_concurrency=4) for name, fn in fns.items()]
+
+    pipeline = EnrichmentPipeline(stages, max_workers=12)
+    started = time.monotonic()
+    results = pipeline.run(df)
+    elapsed = time.monotonic() - started
+
+    serial = 20 * (0.05 + 0.05 + 0.1)
+    slowest = 20 * 0.1 / 4
+    report("Wall-clock near the slowest stage", elapsed < slowest * 1.6, f"{elapsed:.2f}s vs slowest {slowest:.2f}s")
+    report("Much faster than running stages in sequence", elapsed < serial / 4, f"{elapsed:.2f}s vs {serial:.2f}s")
+    report("Results aligned with rows",
+           all(results[name] == [t.lower() for t in df['ticker']] for name in fns))
+    report("Concurrency cap respected", all(fn.peak <= 4 for fn in fns.values()),
+           f"{[fn.peak for fn in fns.values()]}")
+    report("Per-stage timings recorded", set(pipeline.timings) == {'news', 'short_interest', '13f', 'total'})
+
+
+# ─── Test 2: Rate limit and failures ─────────────────────────────────────────
+
+def test_rate_limit_and_default():
+    """Calls are spaced by the stage rate limit; failures use the default."""
+    fn = SlowStage(0.0, fail_on='T003')
+    stage = EnrichmentStage('news', fn, calls_per_second=20, max_concurrency=4,
+                            default=lambda row, e: f"default:{e}")
+    results = EnrichmentPipeline([stage]).run(signals(8))
+
+    times = sorted(fn.call_times)
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    report("Rate limit spaces calls", min(gaps) >= 0.045, f"min gap {min(gaps):.3f}s")
+    report("Failure replaced by stage default", results['news'][3] == "default:boom", f"{results['news'][3]}")
+    report("Empty DataFrame returns empty results", EnrichmentPipeline([stage]).run(signals(0)) == {'news': []})
+
+
+# ─── Test 3: main.enrich_signals ─────────────────────────────────────────────
+
+def test_enrich_signals_joins_by_ticker():
+    """13F comes back keyed by ticker, short interest in row order; news is left to step 4."""
+    import main
+
+    class FakeAnalyzer:
+        def analyze_signal(self, row):
+            return {'squeeze_score': float(row['total_value'])}
+
+        def neutral_analysis(self, row, error):
+            return {'squeeze_score': 0.0}
+
+    class FakeParser:
+        def check_institutional_interest(self, ticker, quarter_year, quarter):
+            if ticker == 'T001':
+                raise RuntimeError("SEC down")
+            return pd.DataFrame({'fund': ['Fund'], 'value': [1.0], 'quarter': [f"{quarter_year}Q{quarter}"]})
+
+    news_calls = []
+    original_news = main.check_news_for_signal
+    try:
+        main.check_news_for_signal = lambda ticker: news_calls.append(ticker)
+
+        enrichment = main.enrich_signals(signals(3), si_analyzer=FakeAnalyzer(), sec_parser=FakeParser(),
+                                         quarter_year=2025, quarter=2)
+        report("News not fetched before filtering", 'news' not in enrichment and not news_calls, f"{news_calls}")
+        report("Short interest in row order",
+               [a['squeeze_score'] for a in enrichment['short_interest']] == [0.0, 1.0, 2.0])
+        holdings = enrichment['institutional']
+        report("13F holdings keyed by ticker for the filing quarter",
+               holdings['T000']['quarter'].iloc[0] == '2025Q2' and holdings['T001'].empty)
+
+        enrichment = main.enrich_signals(signals(2))
+        report("Disabled stages return None",
+               enrichment['short_interest'] is None and enrichment['institutional'] is None)
+    finally:
+        main.check_news_for_signal = original_news
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("ENRICHMENT PIPELINE TESTS")
+    print("="*70 + "\n")
+
+    test_stages_overlap()
+    test_rate_limit_and_default()
+    test_enrich_signals_joins_by_ticker()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
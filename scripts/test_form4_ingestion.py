@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Unit tests for SEC EDGAR Form 4 ingestion.
+
+Covers:
+- The streaming parser emits purchases/sales in the OpenInsider schema
+  (titles, values, skipped transaction codes, invalid tickers)
+- Filings are downloaded concurrently
+- Parsed filings are cached by accession number: a rerun over the same
+  window downloads nothing and returns the same rows
+- Failed downloads are not cached, so the next run retries them
+
+These are unit-level tests that don't require external services (filings are
+served by a local http.server and the cache lives in a temp dir).
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+import fetch_sec_edgar as edgar
+from fetch_sec_edgar import Form4AccessionCache, iter_form4_transactions, extract_form4_xml
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+def transaction(code, shares, price, table='nonDerivative'):
+    return f"""
+    <{table}Transaction>
+        <transactionDate><value>2025-06-02</value></transactionDate>
+        <transactionCoding><transactionCode>{code}</transactionCode></transactionCoding>
+        <transactionAmounts>
+            <transactionShares><value>{shares}</value></transactionShares>
+            <transactionPricePerShare><value>{price}</value></transactionPricePerShare>
+        </transactionAmounts>
+        <postTransactionAmounts>
+            <sharesOwnedFollowingTransaction><value>50000</value></sharesOwnedFollowingTransaction>
+        </postTransactionAmounts>
+    </{table}Transaction>"""
+
+
+def form4(ticker='ACME', owner='Doe Jane', transactions=None):
+    """A Form 4 full-text submission with its embedded ownership XML."""
+    transactions = transactions if transactions is not None else [transaction('P', 1000, 12.5)]
+    return f"""<SEC-DOCUMENT>
+<TYPE>4
+<TEXT>
+<XML>
+<?xml version="1.0"?>
+<ownershipDocument>
+    <issuer><issuerCik>0000000001</issuerCik><issuerTradingSymbol>{ticker}</issuerTradingSymbol></issuer>
+    <reportingOwner>
+        <reportingOwnerId><rptOwnerName>{owner}</rptOwnerName></reportingOwnerId>
+        <reportingOwnerRelationship>
+            <isDirector>1</isDirector><isOfficer>1</isOfficer><officerTitle>CEO</officerTitle>
+        </reportingOwnerRelationship>
+    </reportingOwner>
+    <nonDerivativeTable>{''.join(t for t in transactions if 'nonDerivative' in t)}</nonDerivativeTable>
+    <derivativeTable>{''.join(t for t in transactions if '<derivative' in t)}</derivativeTable>
+</ownershipDocument>
+</XML>
+</TEXT>
+</SEC-DOCUMENT>""".encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves /filings/<accession>.txt; /missing/ paths return 404."""
+
+    hits = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.lock:
+            Handler.hits += 1
+        time.sleep(0.1)
+        if self.path.startswith('/missing/'):
+            body, status = b'not found', 404
+        else:
+            i = int(self.path.rsplit('-', 1)[1].split('.')[0])
+            body, status = form4(ticker=f"TK{chr(65 + i % 26)}", owner=f"Insider {i}"), 200
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def filing_url(base, i, path='filings'):
+    return f"{base}/{path}/0000000001-25-{i:06d}.txt"
+
+
+# ─── Test 1: Streaming parser ────────────────────────────────────────────────
+
+def test_streaming_parser():
+    """Purchases and sales are emitted; other codes and bad tickers skipped."""
+    xml = extract_form4_xml(form4(transactions=[
+        transaction('P', 1000, 12.5),
+        transaction('S', 200, 13.0),
+        transaction('G', 50, 0),
+        transaction('M', 300, 0, table='derivative'),
+    ]))
+    rows = list(iter_form4_transactions(xml))
+
+    report("Purchases, sales and exercises emitted in order",
+           [r['trade_type'] for r in rows] == ['P - Purchase', 'S - Sale', 'P - Purchase'], f"{rows}")
+    report("OpenInsider columns", all(list(r) == edgar.OPENINSIDER_COLUMNS for r in rows))
+    first = rows[0]
+    report("Fields mapped",
+           first['ticker'] == 'ACME' and first['insider'] == 'Doe Jane' and first['title'] == 'Director, CEO'
+           and first['value'] == 12500.0 and first['owned'] == 50000.0, f"{first}")
+    report("Zero price gives zero value", rows[2]['value'] == 0)
+
+    report("Blank ticker yields nothing", list(iter_form4_transactions(extract_form4_xml(form4(ticker='')))) == [])
+
+
+# ─── Test 2: Concurrent fetch and accession cache ────────────────────────────
+
+def test_concurrent_fetch_and_cache():
+    """First run downloads in parallel; rerun is served from the cache."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    original_listing = edgar.fetch_recent_form4_filings
+    try:
+        urls = [filing_url(base, i) for i in range(24)]
+        edgar.fetch_recent_form4_filings = lambda days_back, max_filings: urls
+        cache_path = os.path.join(tempfile.mkdtemp(), 'form4_cache.json')
+
+        Handler.hits = 0
+        started = time.monotonic()
+        df = edgar.fetch_sec_edgar_data(cache=Form4AccessionCache(cache_path))
+        elapsed = time.monotonic() - started
+        report("All filings parsed", len(df) == 24 and df['ticker'].nunique() == 24, f"{len(df)} rows")
+        report("Downloads overlap", elapsed < 24 * 0.1 / 3, f"{elapsed:.2f}s for 24 × 0.1s")
+        report("Rows keep listing order", list(df['insider']) == [f"Insider {i}" for i in range(24)])
+
+        Handler.hits = 0
+        again = edgar.fetch_sec_edgar_data(cache=Form4AccessionCache(cache_path))
+        report("Rerun downloads nothing", Handler.hits == 0, f"{Handler.hits} requests")
+        report("Cached rows match", again.equals(df))
+
+        # A failed download is not cached
+        urls[:] = [filing_url(base, 99, path='missing')]
+        Handler.hits = 0
+        edgar.fetch_sec_edgar_data(cache=Form4AccessionCache(cache_path))
+        first_hits = Handler.hits
+        edgar.fetch_sec_edgar_data(cache=Form4AccessionCache(cache_path))
+        report("Failed filing retried on the next run", first_hits >= 1 and Handler.hits > first_hits,
+               f"{first_hits} then {Handler.hits}")
+    finally:
+        edgar.fetch_recent_form4_filings = original_listing
+        server.shutdown()
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("FORM 4 INGESTION TESTS")
+    print("="*70 + "\n")
+
+    test_streaming_parser()
+    test_concurrent_fetch_and_cache()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared rate-limited HTTP client.
+
+Covers:
+- Token-bucket pacing per host and daily quotas
+- Disk cache hits, and ETag revalidation (304) once an entry is stale
+- API keys never written to the cache
+- Retries on 503 (honouring Retry-After); 404s returned without retrying
+- Per-host metrics
+- aget() requests overlap on the event loop
+
+These are unit-level tests that don't require external services (requests
+go to a local http.server and the cache lives in a temp dir).
+"""
+
+import os
+import sys
+import glob
+import time
+import asyncio
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+from http_client import HttpClient, HostPolicy, HttpQuotaExceeded, TokenBucket
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Test endpoints; counts hits per path."""
+
+    hits = {}
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        with self.lock:
+            self.hits[path] = count = self.hits.get(path, 0) + 1
+
+        if path == '/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self._send(304, headers={'ETag': '"v1"'})
+            else:
+                self._send(200, b'<feed>v1</feed>', {'ETag': '"v1"', 'Content-Type': 'application/xml'})
+        elif path == '/flaky':
+            if count < 3:
+                self._send(503, b'busy', {'Retry-After': '0'})
+            else:
+                self._send(200, b'ok')
+        elif path == '/missing':
+            self._send(404, b'not found')
+        elif path == '/slow':
+            time.sleep(0.2)
+            self._send(200, b'slow')
+        else:
+            self._send(200, b'hello')
+
+
+def start_server():
+    Handler.hits = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_client(**policy):
+    policy.setdefault('backoff_seconds', 0.01)
+    return HttpClient(cache_dir=tempfile.mkdtemp(), policies={'127.0.0.1': HostPolicy(**policy)})
+
+
+# ─── Test 1: Rate limits ─────────────────────────────────────────────────────
+
+def test_rate_limits():
+    """Token bucket paces calls; daily quota raises instead of blocking."""
+    bucket = TokenBucket(rate=20, capacity=1)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    elapsed = time.monotonic() - started
+    report("Bucket paces to its rate", 0.22 <= elapsed < 0.5, f"{elapsed:.2f}s for 6 tokens at 20/s")
+
+    server, base = start_server()
+    try:
+        client = make_client(rate_per_second=100, burst=10, daily_quota=2)
+        client.get(f"{base}/a")
+        client.get(f"{base}/b")
+        try:
+            client.get(f"{base}/c")
+            raised = False
+        except HttpQuotaExceeded:
+            raised = True
+        report("Quota exceeded raises HttpQuotaExceeded", raised and '/c' not in Handler.hits)
+    finally:
+        server.shutdown()
+
+
+# ─── Test 2: Cache and revalidation ──────────────────────────────────────────
+
+def test_cache_and_revalidation():
+    """Fresh entries skip the network; stale ones revalidate with ETag."""
+    server, base = start_server()
+    try:
+        client = make_client()
+        first = client.get(f"{base}/etag", params={'apikey': 'SECRET'}, cache_ttl=60)
+        second = client.get(f"{base}/etag", params={'apikey': 'SECRET'}, cache_ttl=60)
+        report("Fresh cache entry served without a request",
+               Handler.hits['/etag'] == 1 and second.from_cache == 'hit' and second.content == first.content,
+               f"{Handler.hits}")
+        report("Cached response keeps headers", second.headers.get('Content-Type') == 'application/xml')
+
+        third = client.get(f"{base}/etag", params={'apikey': 'SECRET'}, cache_ttl=0)
+        report("Stale entry revalidated with a 304",
+               Handler.hits['/etag'] == 2 and third.from_cache == 'revalidated'
+               and third.status_code == 200 and third.text == '<feed>v1</feed>',
+               f"{third.from_cache} {third.status_code}")
+
+        stored = ''.join(open(p).read() for p in glob.glob(os.path.join(client.cache_dir, '*', '*.json')))
+        report("API key not written to the cache", 'SECRET' not in stored and '***' in stored)
+    finally:
+        server.shutdown()
+
+
+# ─── Test 3: Retries and metrics ─────────────────────────────────────────────
+
+def test_retries_and_metrics():
+    """503s are retried; 404s are returned as-is; metrics add up."""
+    server, base = start_server()
+    try:
+        client = make_client(retries=3)
+        response = client.get(f"{base}/flaky")
+        report("503 retried until success", response.status_code == 200 and Handler.hits['/flaky'] == 3,
+               f"{response.status_code} after {Handler.hits.get('/flaky')} hits")
+
+        response = client.get(f"{base}/missing")
+        report("404 returned without retrying", response.status_code == 404 and Handler.hits['/missing'] == 1)
+
+        m = client.get_metrics()['127.0.0.1']
+        report("Metrics count requests, retries and errors",
+               m['requests'] == 4 and m['retries'] == 2 and m['errors'] == 3 and m['latency_avg'] > 0, f"{m}")
+    finally:
+        server.shutdown()
+
+
+# ─── Test 4: aget ────────────────────────────────────────────────────────────
+
+def test_async_get():
+    """Concurrent aget() calls overlap."""
+    server, base = start_server()
+    try:
+        client = make_client()
+
+        async def fetch_all():
+            return await asyncio.gather(*(client.aget(f"{base}/slow", params={'i': i}) for i in range(4)))
+
+        started = time.monotonic()
+        responses = asyncio.run(fetch_all())
+        elapsed = time.monotonic() - started
+        report("aget requests run concurrently",
+               all(r.text == 'slow' for r in responses) and elapsed < 0.6, f"{elapsed:.2f}s for 4 × 0.2s")
+    finally:
+        server.shutdown()
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("HTTP CLIENT TESTS")
+    print("="*70 + "\n")
+
+    test_rate_limits()
+    test_cache_and_revalidation()
+    test_retries_and_metrics()
+    test_async_get()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
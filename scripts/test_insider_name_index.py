@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the indexed insider name resolver.
+
+Covers:
+- The blocked rapidfuzz index resolves every name to the same canonical name
+  as the original SequenceMatcher scan over name_mapping (name variations,
+  typos, same name at other companies, lookups without a company)
+- Without rapidfuzz the index falls back to scanning its block
+- add_trades resolves the whole batch with one name mapping save and skips
+  trades already in history
+- The index follows a name_mapping that was replaced from outside
+
+These are unit-level tests that don't require external services (the tracker
+is built without touching data files and saves are counted, not written).
+"""
+
+import random
+import sys
+from difflib import SequenceMatcher
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+import insider_performance_tracker
+from insider_performance_tracker import InsiderPerformanceTracker
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+FIRST = ['Timothy', 'Jane', 'Robert', 'Maria', 'William', 'Susan', 'Michael', 'Linda', 'James', 'Karen']
+LAST = ['Cook', 'Smith', 'Johnson', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez', 'Anderson', 'Thomas']
+TICKERS = ['AAPL', 'MSFT', 'XOM', 'JPM', 'KO', 'PFE']
+
+
+def name_variations(n=800, seed=3):
+    """Raw Form 4 style names with formats, initials, suffixes and typos, plus companies."""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        middle = rng.choice(['', 'D', 'A.', 'Lee'])
+        style = rng.randrange(6)
+        if style == 0:
+            name = f"{last}, {first} {middle}"
+        elif style == 1:
+            name = f"{first} {middle} {last}"
+        elif style == 2:
+            name = f"{first[0]}. {last} Jr."
+        elif style == 3:
+            name = f"Dr. {first} {last}"
+        elif style == 4:
+            i = rng.randrange(len(last))
+            name = f"{first} {last[:i]}{rng.choice('aeiou')}{last[i + 1:]}"
+        else:
+            name = f"{first.upper()} {last.upper()}"
+        company = rng.choice(TICKERS + [None])
+        rows.append((name, company))
+    return rows
+
+
+def make_tracker():
+    """Tracker with an empty name mapping and no file I/O."""
+    with patch.object(InsiderPerformanceTracker, '__init__', lambda self, **kw: None):
+        tracker = InsiderPerformanceTracker()
+    tracker.verbose = False
+    tracker.name_mapping = {}
+    tracker.saves = 0
+
+    def count_save():
+        tracker.saves += 1
+    tracker._save_name_mapping = count_save
+    tracker._save_trades_history = lambda: None
+    return tracker
+
+
+def reference_match_insider_name(cleaned, company, name_mapping):
+    """Original fuzzy match, SequenceMatcher against every key in name_mapping, for parity checks."""
+    best_match = None
+    best_ratio = 0
+
+    for existing_key, canonical_name in name_mapping.items():
+        # Only compare same-company insiders if company specified
+        if company and '|' in existing_key:
+            existing_name, existing_company = existing_key.split('|', 1)
+            if existing_company != company:
+                continue
+        else:
+            existing_name = existing_key.split('|')[0] if '|' in existing_key else existing_key
+
+        # Calculate similarity ratio
+        ratio = SequenceMatcher(None, cleaned.split('|')[0], existing_name).ratio()
+
+        # If very similar (>85% match), consider it the same person
+        if ratio > 0.85 and ratio > best_ratio:
+            best_ratio = ratio
+            best_match = canonical_name
+
+    return best_match
+
+
+def reference_normalize(tracker, name_mapping, name, company):
+    """The original _normalize_insider_name over a plain dict."""
+    if not name or not isinstance(name, str):
+        return "UNKNOWN"
+    cleaned = tracker._clean_insider_name(name)
+    lookup_key = f"{cleaned}|{company}" if company else cleaned
+    if lookup_key in name_mapping:
+        return name_mapping[lookup_key]
+    canonical = (reference_match_insider_name(cleaned, company, name_mapping)
+                 or tracker._format_canonical_name(cleaned))
+    name_mapping[lookup_key] = canonical
+    return canonical
+
+
+# ─── Test 1: Parity with the SequenceMatcher scan ────────────────────────────
+
+def test_parity():
+    """Same canonical names and mapping as scanning every key."""
+    rows = name_variations()
+    tracker = make_tracker()
+    expected_mapping = {}
+    expected = [reference_normalize(tracker, expected_mapping, name, company) for name, company in rows]
+
+    got = [tracker._normalize_insider_name(name, company) for name, company in rows]
+    mismatches = [(r, e, g) for r, e, g in zip(rows, expected, got) if e != g]
+    report("Same canonical name for every raw name", not mismatches, f"{mismatches[:5]}")
+    report("Same name mapping", tracker.name_mapping == expected_mapping
+           and list(tracker.name_mapping) == list(expected_mapping))
+    report("Fuzzy matches exercised", sum(1 for (n, _), e in zip(rows, expected)
+                                          if e != tracker._format_canonical_name(tracker._clean_insider_name(n))) > 50)
+
+    original = insider_performance_tracker.RAPIDFUZZ_AVAILABLE
+    try:
+        insider_performance_tracker.RAPIDFUZZ_AVAILABLE = False
+        fallback = make_tracker()
+        got = [fallback._normalize_insider_name(name, company) for name, company in rows]
+        report("Block scan without rapidfuzz matches", got == expected)
+    finally:
+        insider_performance_tracker.RAPIDFUZZ_AVAILABLE = original
+
+
+# ─── Test 2: Batch resolution in add_trades ──────────────────────────────────
+
+def test_add_trades_batch():
+    """One mapping save per batch; duplicates of history are skipped."""
+    rows = name_variations(300, seed=11)
+    trades = pd.DataFrame({
+        'trade_date': [f"2025-0{1 + i % 9}-{1 + i % 28:02d}" for i in range(len(rows))],
+        'ticker': [company or 'SPY' for _, company in rows],
+        'insider': [name for name, _ in rows],
+        'title': 'CEO', 'qty': 100, 'price': 10.0, 'value': 1000.0,
+    })
+
+    expected_tracker = make_tracker()
+    expected = [expected_tracker._normalize_insider_name(n, t) for n, t in zip(trades['insider'], trades['ticker'])]
+
+    tracker = make_tracker()
+    tracker.trades_history = tracker._create_empty_trades_df()
+    tracker.add_trades(trades)
+    report("Whole batch saved once", tracker.saves == 1 and expected_tracker.saves > 50,
+           f"{tracker.saves} vs {expected_tracker.saves}")
+    report("Same canonical names as one-by-one resolution", list(tracker.trades_history['insider_name']) == expected)
+    report("Raw names kept", list(tracker.trades_history['insider_name_raw']) == list(trades['insider']))
+
+    # History stores canonical names, so a trade matches history when its raw name is already canonical
+    again = tracker.trades_history[['trade_date', 'ticker', 'insider_name', 'title', 'qty', 'price', 'value']].head(20)
+    before = len(tracker.trades_history)
+    tracker.add_trades(again)
+    report("Trades already in history skipped", len(tracker.trades_history) == before, f"{len(tracker.trades_history)}")
+
+
+# ─── Test 3: Replaced mapping ────────────────────────────────────────────────
+
+def test_replaced_mapping():
+    """The index is rebuilt when name_mapping is swapped out."""
+    tracker = make_tracker()
+    tracker._normalize_insider_name('Cook, Timothy D.', 'AAPL')
+    tracker.name_mapping = {'jane q public|KO': 'Jane Q Public'}
+    report("New mapping used for fuzzy lookups", tracker._normalize_insider_name('Jane Public', 'KO') == 'Jane Q Public'
+           and tracker._normalize_insider_name('Tim D Cook', 'AAPL') == 'Tim D Cook')
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("INSIDER NAME INDEX TESTS")
+    print("="*70 + "\n")
+
+    test_parity()
+    test_add_trades_batch()
+    test_replaced_mapping()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
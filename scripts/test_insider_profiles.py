@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Unit tests for insider profile calculation.
+
+Covers:
+- The groupby profile engine matches a per-insider reference computation
+  (win rates, averages, medians, Sharpe, alpha vs SPY)
+- Incremental mode only recomputes insiders whose trades changed
+
+These are unit-level tests that don't require external services (SPY bars
+come from an in-memory fake fetcher and profile files go to a temp dir).
+"""
+
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import insider_performance_tracker as ipt
+from test_price_store import TrendingFetcher, make_store
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+def make_tracker(trades):
+    """Tracker bound to a temp data dir and a fake SPY price store."""
+    tmp = Path(tempfile.mkdtemp())
+    ipt.INSIDER_PROFILES_PATH = tmp / 'insider_profiles.json'
+    ipt.INSIDER_PROFILES_STATE_PATH = tmp / 'insider_profiles_state.json'
+    store = make_store(TrendingFetcher(dividends={'SPY': {'2025-03-21': 1.8}}))
+    ipt.get_price_store = lambda: store
+
+    tracker = ipt.InsiderPerformanceTracker.__new__(ipt.InsiderPerformanceTracker)
+    tracker.min_trades_for_score = 3
+    tracker.verbose = False
+    tracker.profiles = {}
+    tracker.trades_history = trades
+    return tracker
+
+
+def make_trades(n=300, seed=7):
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    trades = pd.DataFrame({
+        'trade_date': [now - timedelta(days=int(d)) for d in rng.integers(200, 900, n)],
+        'ticker': rng.choice(['AAA', 'BBB', 'CCC', 'DDD'], n),
+        'insider_name': rng.choice([f'insider {i}' for i in range(40)], n),
+        'entry_price': rng.uniform(0.5, 80, n).round(2),
+        'last_updated': (now - timedelta(days=3)).isoformat(),
+    })
+    for h in ipt.PROFILE_HORIZONS:
+        returns = rng.normal(2, 15, n)
+        returns[rng.random(n) < 0.2] = np.nan
+        trades[f'return_{h}'] = returns
+    return trades
+
+
+def reference_profile(tracker, insider_trades):
+    """Per-insider statistics the way the original loop computed them."""
+    profile = {}
+    for horizon in ipt.PROFILE_HORIZONS:
+        valid = insider_trades[insider_trades[f'return_{horizon}'].notna()]
+        if valid.empty:
+            profile[f'avg_return_{horizon}'] = None
+            continue
+        r = valid[f'return_{horizon}']
+        std = r.std()
+        profile[f'win_rate_{horizon}'] = round((r > 0).sum() / len(r) * 100, 2)
+        profile[f'avg_return_{horizon}'] = round(r.mean(), 2)
+        profile[f'median_return_{horizon}'] = round(r.median(), 2)
+        profile[f'sharpe_{horizon}'] = round(r.mean() / std if std > 0 else 0, 2)
+        days = int(horizon[:-1])
+        alphas = [t[f'return_{horizon}'] - s for _, t in valid.iterrows()
+                  if (s := tracker._get_spy_return(t['trade_date'], days)) is not None]
+        profile[f'alpha_{horizon}'] = round(np.mean(alphas), 2) if alphas else None
+    return profile
+
+
+# ─── Test 1: Parity with the per-insider loop ────────────────────────────────
+
+def test_matches_reference():
+    """Every profile field matches the per-insider reference computation."""
+    trades = make_trades()
+    tracker = make_tracker(trades.copy())
+    tracker.calculate_insider_profiles(incremental=False)
+
+    has_outcome = trades[['return_30d', 'return_90d', 'return_180d']].notna().any(axis=1)
+    qualifying = trades[has_outcome & (trades['entry_price'] >= ipt.MIN_ENTRY_PRICE_FOR_PROFILE)]
+    counts = qualifying['insider_name'].value_counts()
+    expected_names = set(counts[counts >= 3].index)
+    report("Same insiders profiled", set(tracker.profiles) == expected_names,
+           f"{len(tracker.profiles)} vs {len(expected_names)}")
+
+    mismatches = []
+    for name in sorted(expected_names):
+        ref = reference_profile(tracker, qualifying[qualifying['insider_name'] == name])
+        got = tracker.profiles.get(name, {})
+        for key, value in ref.items():
+            other = got.get(key)
+            if value is None or other is None:
+                if value != other:
+                    mismatches.append((name, key, value, other))
+            elif abs(value - other) > 1e-9:
+                mismatches.append((name, key, value, other))
+    report("Horizon statistics and alpha match", not mismatches, f"{mismatches[:5]}")
+
+
+# ─── Test 2: Incremental recompute ───────────────────────────────────────────
+
+def test_incremental_only_recomputes_changed():
+    """After one changed trade, only that insider is recomputed and merged."""
+    trades = make_trades()
+    tracker = make_tracker(trades.copy())
+    tracker.calculate_insider_profiles(incremental=False)
+    before = {name: dict(p) for name, p in tracker.profiles.items()}
+
+    target = next(iter(before))
+    row = tracker.trades_history.index[tracker.trades_history['insider_name'] == target][0]
+    tracker.trades_history.loc[row, 'return_90d'] = 500.0
+    tracker.trades_history.loc[row, 'last_updated'] = datetime.now().isoformat()
+
+    recomputed = []
+    original = tracker._compute_profiles
+
+    def spy_compute(df):
+        recomputed.extend(df['insider_name'].unique())
+        return original(df)
+
+    tracker._compute_profiles = spy_compute
+    tracker.calculate_insider_profiles(incremental=True)
+
+    report("Only the changed insider is recomputed", recomputed == [target], f"{recomputed}")
+    report("Changed profile reflects the new return",
+           tracker.profiles[target]['avg_return_90d'] != before[target]['avg_return_90d'])
+
+    full = make_tracker(tracker.trades_history.copy())
+    full.calculate_insider_profiles(incremental=False)
+    report("Merged profiles equal a full rebuild", full.profiles == tracker.profiles)
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("INSIDER PROFILE TESTS")
+    print("="*70 + "\n")
+
+    test_matches_reference()
+    test_incremental_only_recomputes_changed()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the bulk market-data snapshot.
+
+Covers:
+- compute_bar_stats reads every ticker's bars in one batched call and gives
+  the 52-week range and the 10-day / 3-month average volumes of each
+  ticker's own traded days (gaps skipped)
+- SlowFieldCache drops invalid numbers, expires entries after the TTL and
+  only writes to disk when something changed
+- fetch_info_concurrent runs lookups side by side on a bounded pool and
+  returns per-ticker exceptions instead of raising
+- enrich_with_market_data joins FMP profiles, yfinance fallbacks, bar stats
+  and cached float data onto every cluster row; a second run only asks
+  yfinance for the tickers FMP couldn't resolve
+
+These are unit-level tests that don't require external services (profiles,
+bars and .info lookups are served from memory; the cache lives in a temp dir).
+"""
+
+import functools
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+import market_snapshot
+import process_signals
+from market_snapshot import SlowFieldCache, compute_bar_stats, fetch_info_concurrent
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+def random_bars(ticker, n=252, gaps=False):
+    """Random-walk daily bars; with gaps, every 7th day has no volume."""
+    rng = np.random.default_rng(sum(map(ord, ticker)))
+    idx = pd.bdate_range(end='2025-06-30', periods=n)
+    close = 20 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    volume = rng.integers(1e5, 1e6, n).astype(float)
+    if gaps:
+        volume[::7] = np.nan
+    return pd.DataFrame({'Open': close, 'High': close * 1.02, 'Low': close * 0.97, 'Close': close,
+                         'Volume': volume}, index=idx)
+
+
+class Patched:
+    """Serves profiles, bars and .info from memory; counts calls; restores the modules afterwards."""
+
+    def __init__(self, histories, profiles, infos, cache_file):
+        self.history_calls = []
+        self.info_calls = []
+        self.failures = {}
+
+        def get_histories(tickers, start=None, end=None, adjusted=True):
+            self.history_calls.append(list(tickers))
+            return {t: histories[t] for t in tickers if t in histories}
+
+        def fetch_info(ticker):
+            self.info_calls.append(ticker)
+            info = infos.get(ticker)
+            if isinstance(info, Exception):
+                raise info
+            return info
+
+        failures = self.failures
+
+        class FailedTickers:
+            def record_failure(self, ticker, reason, failure_type='TEMPORARY', error_code=None):
+                failures[ticker] = failure_type
+
+            def record_success(self, ticker):
+                failures.pop(ticker, None)
+
+        self.values = [
+            (market_snapshot, 'get_histories', get_histories),
+            (market_snapshot, '_fetch_info', fetch_info),
+            (process_signals, 'fetch_profiles_batch', lambda tickers: {t: profiles[t] for t in tickers
+                                                                       if t in profiles}),
+            (process_signals, 'get_analytics_summary', lambda: {'cache_hit_rate_pct': 0, 'cache_size': 0}),
+            (process_signals, 'save_analytics', lambda: None),
+            (process_signals, 'get_failed_ticker_cache', lambda: FailedTickers()),
+            (process_signals, 'SlowFieldCache', functools.partial(SlowFieldCache, cache_file=cache_file)),
+        ]
+
+    def __enter__(self):
+        self.saved = [(module, name, getattr(module, name)) for module, name, _ in self.values]
+        for module, name, value in self.values:
+            setattr(module, name, value)
+        return self
+
+    def __exit__(self, *exc):
+        for module, name, value in self.saved:
+            setattr(module, name, value)
+
+
+# ─── Test 1: Bar stats ───────────────────────────────────────────────────────
+
+def test_bar_stats():
+    """One batched read; range and volumes from each ticker's own traded days."""
+    histories = {'AAA': random_bars('AAA'), 'GAPS': random_bars('GAPS', gaps=True), 'NEW': random_bars('NEW', n=8)}
+    with Patched(histories, {}, {}, os.devnull) as patched:
+        stats = compute_bar_stats(['AAA', 'GAPS', 'NEW', 'GONE'])
+        empty = compute_bar_stats([])
+
+    report("One batched bar read", patched.history_calls == [['AAA', 'GAPS', 'NEW', 'GONE']],
+           f"{patched.history_calls}")
+
+    mismatches = []
+    for ticker, hist in histories.items():
+        volume = hist['Volume'].dropna()
+        expected = [hist['Low'].min(), hist['High'].max(), volume.tail(10).mean(), volume.tail(63).mean(),
+                    hist['Close'].iloc[-1]]
+        got = stats.loc[ticker, ['fiftyTwoWeekLow', 'fiftyTwoWeekHigh', 'averageVolume10days',
+                                 'barAverageVolume', 'lastClose']].tolist()
+        if not np.allclose(got, expected):
+            mismatches.append((ticker, got, expected))
+    report("Range and average volumes per ticker, gaps skipped", not mismatches, f"{mismatches}")
+    report("Tickers without bars left out", 'GONE' not in stats.index and empty.empty)
+
+
+# ─── Test 2: Slow-field cache ────────────────────────────────────────────────
+
+def test_slow_field_cache():
+    """Valid fields only, TTL expiry, writes only when dirty."""
+    cache_file = os.path.join(tempfile.mkdtemp(), 'market_slow_fields_cache.json')
+    cache = SlowFieldCache(cache_file=cache_file)
+    cache.put('AAA', {'floatShares': 5e8, 'sharesOutstanding': float('nan'), 'currentPrice': 10})
+    cache.put('BBB', {'floatShares': -1, 'sharesOutstanding': 'n/a'})
+    cache.save()
+
+    reloaded = SlowFieldCache(cache_file=cache_file)
+    entry = reloaded.get('AAA')
+    report("Only valid slow fields stored", entry is not None and set(entry) == {'floatShares', 'expires'}
+           and set(reloaded.get('BBB')) == {'expires'}, f"{entry}")
+
+    mtime = os.path.getmtime(cache_file)
+    time.sleep(0.01)
+    reloaded.save()
+    report("Unchanged cache not rewritten", os.path.getmtime(cache_file) == mtime)
+
+    expired = SlowFieldCache(cache_file=cache_file, ttl_days=0)
+    expired.put('CCC', {'floatShares': 1e6})
+    report("Entries expire after the TTL", expired.get('CCC') is None and expired.get('AAA') is not None)
+
+
+# ─── Test 3: Concurrent .info lookups ────────────────────────────────────────
+
+def test_fetch_info_concurrent():
+    """Bounded parallelism; one ticker's exception doesn't stop the rest."""
+    lock = threading.Lock()
+    state = {'active': 0, 'peak': 0}
+
+    def slow_info(ticker):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        time.sleep(0.05)
+        with lock:
+            state['active'] -= 1
+        if ticker == 'BAD':
+            raise ValueError('404 Not Found')
+        return {'symbol': ticker}
+
+    original = market_snapshot._fetch_info
+    try:
+        market_snapshot._fetch_info = slow_info
+        tickers = [f"T{i}" for i in range(11)] + ['BAD']
+        results = fetch_info_concurrent(tickers, max_workers=3)
+    finally:
+        market_snapshot._fetch_info = original
+
+    report("Every ticker answered", set(results) == set(tickers)
+           and all(results[t] == {'symbol': t} for t in tickers if t != 'BAD'))
+    report("Failure returned, not raised", isinstance(results['BAD'], ValueError))
+    report("Lookups overlap up to the worker bound", state['peak'] == 3, f"peak {state['peak']}")
+
+
+# ─── Test 4: Enrichment end to end ───────────────────────────────────────────
+
+def test_enrich_with_market_data():
+    """Profiles, fallbacks, bar stats and float data land on every cluster row."""
+    tickers = ['FMP1', 'FMP2', 'YFIN', 'DEAD']
+    histories = {t: random_bars(t) for t in tickers[:3]}
+    profiles = {
+        'FMP1': {'price': 25.0, 'marketCap': 2e9, 'volume': 4e5, 'sharesOutstanding': 8e7,
+                 'companyName': 'First Corp', 'industry': 'Software'},
+        'FMP2': {'price': 12.0, 'marketCap': 5e8, 'volume': None, 'companyName': None, 'industry': float('nan')},
+    }
+    infos = {
+        'FMP1': {'floatShares': 6e7, 'sharesOutstanding': 8e7},
+        'FMP2': {'floatShares': 3e7},
+        'YFIN': {'currentPrice': 8.0, 'marketCap': 3e8, 'longName': 'Fallback Inc', 'averageVolume': 2e5,
+                 'sharesOutstanding': 4e7, 'floatShares': 2e7},
+        'DEAD': ValueError('404 Client Error: Not Found'),
+    }
+    clusters = pd.DataFrame({'ticker': ['FMP1', 'YFIN', 'FMP2', 'DEAD', 'FMP1'],
+                             'total_value': [1e6, 5e5, 2e5, 1e5, 3e5], 'company': 'stale'})
+    cache_file = os.path.join(tempfile.mkdtemp(), 'market_slow_fields_cache.json')
+
+    with Patched(histories, profiles, infos, cache_file) as patched:
+        enriched = process_signals.enrich_with_market_data(clusters.copy())
+        first_calls = sorted(patched.info_calls)
+        patched.info_calls.clear()
+        process_signals.enrich_with_market_data(clusters.copy())
+        second_calls = sorted(patched.info_calls)
+
+    report("Rows and order kept", list(enriched['ticker']) == list(clusters['ticker'])
+           and list(enriched['total_value']) == list(clusters['total_value']))
+    report("FMP profile fields", enriched.loc[0, 'currentPrice'] == 25.0 and enriched.loc[0, 'company'] == 'First Corp'
+           and enriched.loc[0, 'industry'] == 'Software' and enriched.loc[0, 'averageVolume'] == 4e5)
+    report("yfinance fallback for FMP misses", enriched.loc[1, 'currentPrice'] == 8.0
+           and enriched.loc[1, 'company'] == 'Fallback Inc' and enriched.loc[1, 'sharesOutstanding'] == 4e7)
+    bar_volume = histories['FMP2']['Volume'].tail(63).mean()
+    report("Bar 3-month volume fills a missing FMP volume", np.isclose(enriched.loc[2, 'averageVolume'], bar_volume)
+           and enriched.loc[2, 'company'] == 'FMP2' and pd.isna(enriched.loc[2, 'industry']))
+    report("52-week range from bars", np.isclose(enriched.loc[0, 'fiftyTwoWeekLow'], histories['FMP1']['Low'].min())
+           and np.isclose(enriched.loc[0, 'pct_from_52wk_low'],
+                          (25.0 - histories['FMP1']['Low'].min()) / histories['FMP1']['Low'].min() * 100))
+    report("Float from the .info pass", enriched.loc[0, 'floatShares'] == 6e7 and enriched.loc[4, 'floatShares'] == 6e7
+           and np.isclose(enriched.loc[0, 'pct_of_float'], 1e6 / 25.0 / 6e7 * 100))
+    report("Unknown ticker keeps its name and is recorded as permanent",
+           enriched.loc[3, 'company'] == 'DEAD' and pd.isna(enriched.loc[3, 'currentPrice'])
+           and patched.failures == {'DEAD': 'PERMANENT'}, f"{patched.failures}")
+    report("Cached float skips .info on the next run", first_calls == sorted(tickers)
+           and second_calls == ['DEAD', 'YFIN'], f"{first_calls} then {second_calls}")
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("MARKET SNAPSHOT TESTS")
+    print("="*70 + "\n")
+
+    test_bar_stats()
+    test_slow_field_cache()
+    test_fetch_info_concurrent()
+    test_enrich_with_market_data()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-ticker maturity updates in AutoInsiderTracker.
+
+Covers:
+- update_maturing_trades reads every due ticker once (one batched store
+  read, one fallback fetch per ticker the store has no bars for)
+- Horizon outcomes (first close on or after trade date + days, plus
+  dividends with ex-date in (trade date, outcome date]) match the original
+  per-trade computation
+- Horizons past the last bar give NO_HORIZON_DATA; blacklisted tickers are
+  not fetched and keep the failure type their blacklist reason implies
+- The returned stats carry the same keys with and without due tracks
+
+These are unit-level tests that don't require external services (bars come
+from an in-memory store, the failed ticker cache and yfinance are stubbed,
+and the tracking queue lives in a temp dir).
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+import insider_performance_auto_tracker as auto
+from insider_performance_auto_tracker import OUTCOME_HORIZONS, AutoInsiderTracker
+from insider_performance_tracker import InsiderPerformanceTracker
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+TODAY = pd.Timestamp(datetime.now().date())
+TICKERS = [f"TK{i}" for i in range(8)]
+STATS_KEYS = {'updated', 'matured', 'failed', 'permanently_failed', 'due_tracks', 'ticker_fetches',
+              'fetches_saved', 'tracks_per_sec'}
+
+
+def random_bars(ticker, end=TODAY):
+    """Unadjusted business-day closes over ~14 months; quarterly dividends."""
+    idx = pd.bdate_range(end=end, periods=300)
+    rng = np.random.default_rng(sum(map(ord, ticker)))
+    close = 25 * np.exp(np.cumsum(rng.normal(0, 0.02, len(idx))))
+    bars = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 1e6,
+                         'Dividends': 0.0, 'Stock Splits': 0.0}, index=idx)
+    bars.iloc[::63, bars.columns.get_loc('Dividends')] = 0.25
+    return bars
+
+
+def make_track(ticker, days_ago, entry_price, outcomes=None):
+    trade_date = (TODAY - timedelta(days=days_ago)).strftime('%Y-%m-%d')
+    return {
+        'trade_id': f"{ticker}_Insider_{trade_date}",
+        'ticker': ticker,
+        'insider_name': 'Insider',
+        'trade_date': trade_date,
+        'entry_price': entry_price,
+        'status': 'TRACKING',
+        'outcomes': dict({'30d': None, '60d': None, '90d': None, '180d': None}, **(outcomes or {})),
+    }
+
+
+def due_horizons(track):
+    days_elapsed = (datetime.now() - pd.Timestamp(track['trade_date'])).days
+    return [(h, d) for h, d in OUTCOME_HORIZONS if days_elapsed >= d and track['outcomes'][h] is None]
+
+
+def reference_trade_outcomes(hist, trade_date, entry_price, horizons):
+    """The original per-trade outcome loop over one ticker's bars, for parity checks."""
+    hist = hist.reset_index().rename(columns={'index': 'Date'})
+    dividends = hist.loc[hist['Dividends'] > 0, ['Date', 'Dividends']].rename(columns={'Dividends': 'Dividend'})
+
+    outcomes = {}
+    for horizon_name, days in horizons:
+        target_date = trade_date + timedelta(days=days)
+        future_data = hist[hist['Date'] >= target_date]
+
+        if not future_data.empty:
+            outcome_price = future_data.iloc[0]['Close']
+            outcome_date = future_data.iloc[0]['Date']
+
+            dividends_received = 0.0
+            if not dividends.empty:
+                period_dividends = dividends[
+                    (dividends['Date'] > pd.to_datetime(trade_date)) &
+                    (dividends['Date'] <= outcome_date)
+                ]
+                if not period_dividends.empty:
+                    dividends_received = period_dividends['Dividend'].sum()
+
+            total_return_pct = ((outcome_price - entry_price + dividends_received) / entry_price) * 100
+
+            outcomes[horizon_name] = {
+                'price': float(outcome_price),
+                'return': float(total_return_pct),
+                'dividends': float(dividends_received),
+                'date': str(outcome_date)[:10]
+            }
+    return outcomes
+
+
+class Patched:
+    """Serves bars from memory, stubs the failed ticker cache and yfinance; counts fetches."""
+
+    def __init__(self, bars, blacklist):
+        self.batched_reads = []
+        self.single_reads = []
+        self.successes = []
+        self.failures = {}
+
+        patched = self
+
+        class Store:
+            def get_histories_for_ranges(self, ranges, adjusted=True):
+                patched.batched_reads.append(dict(ranges))
+                return {t: bars[t].loc[pd.Timestamp(start):pd.Timestamp(end)] for t, (start, end) in ranges.items()
+                        if t in bars}
+
+            def get_history(self, ticker, start, end, adjusted=True):
+                patched.single_reads.append(ticker)
+                return bars.get(ticker, pd.DataFrame())
+
+        class FailedTickers:
+            def is_blacklisted(self, ticker):
+                return (ticker in blacklist, blacklist.get(ticker))
+
+            def record_success(self, ticker):
+                patched.successes.append(ticker)
+
+            def record_failure(self, ticker, reason, failure_type='TEMPORARY', error_code=None):
+                patched.failures[ticker] = failure_type
+
+        store = Store()
+        failed_tickers = FailedTickers()
+        self.values = {
+            'get_price_store': lambda: store,
+            'get_failed_ticker_cache': lambda: failed_tickers,
+            'yf': SimpleNamespace(Ticker=lambda ticker: SimpleNamespace(info={})),
+        }
+
+    def __enter__(self):
+        self.saved = {k: getattr(auto, k) for k in self.values}
+        for k, v in self.values.items():
+            setattr(auto, k, v)
+        return self
+
+    def __exit__(self, *exc):
+        for k, v in self.saved.items():
+            setattr(auto, k, v)
+
+
+def make_auto_tracker(tracks):
+    """AutoInsiderTracker over the given queue, with no trades history file I/O."""
+    with patch.object(InsiderPerformanceTracker, '__init__', lambda self, **kw: None):
+        auto_tracker = AutoInsiderTracker(data_dir=tempfile.mkdtemp())
+    auto_tracker.tracker.trades_history = pd.DataFrame(columns=['ticker', 'insider_name', 'trade_date'])
+    auto_tracker.tracker._save_trades_history = lambda: None
+    auto_tracker.tracking_queue = tracks
+    return auto_tracker
+
+
+def run_update(auto_tracker):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return auto_tracker.update_maturing_trades(max_retries=1)
+
+
+def make_universe(seed=7):
+    rng = np.random.default_rng(seed)
+    bars = {t: random_bars(t) for t in TICKERS}
+    tracks = []
+    for ticker in TICKERS:
+        for _ in range(5):
+            track = make_track(ticker, int(rng.integers(20, 260)), float(rng.uniform(10, 40)))
+            if rng.uniform() < 0.3:
+                track['outcomes']['30d'] = {'price': 1.0, 'return': 0.0, 'dividends': 0.0, 'date': 'kept'}
+            tracks.append(track)
+
+    bars['SOON'] = random_bars('SOON', end=TODAY - timedelta(days=20))
+    tracks.append(make_track('SOON', 35, 20.0))
+    bars['GONE'] = pd.DataFrame()
+    tracks.append(make_track('GONE', 40, 20.0))
+    tracks.append(make_track('STALE', 40, 20.0))
+    tracks.append(make_track('DEAD', 40, 20.0))
+    blacklist = {'STALE': 'No trading data for required time horizon', 'DEAD': 'No trading history (possibly delisted)'}
+    return bars, tracks, blacklist
+
+
+# ─── Test 1: One fetch per ticker ────────────────────────────────────────────
+
+def test_one_fetch_per_ticker():
+    """One batched read for every due ticker; a fallback only for tickers without bars."""
+    bars, tracks, blacklist = make_universe()
+    due = [t for t in tracks if due_horizons(t)]
+    auto_tracker = make_auto_tracker(tracks)
+    with Patched(bars, blacklist) as patched:
+        stats = run_update(auto_tracker)
+
+    expected_starts = {}
+    for track in due:
+        if track['ticker'] in blacklist:
+            continue
+        start = pd.Timestamp(track['trade_date']) - timedelta(days=5)
+        expected_starts[track['ticker']] = min(start, expected_starts.get(track['ticker'], start))
+    read = patched.batched_reads[0] if patched.batched_reads else {}
+    report("One batched store read", len(patched.batched_reads) == 1, f"{len(patched.batched_reads)} reads")
+    report("Each due ticker read once from its earliest trade",
+           {t: pd.Timestamp(start) for t, (start, _) in read.items()} == expected_starts, f"{sorted(read)}")
+    report("Fallback fetch only for the ticker without stored bars", patched.single_reads == ['GONE'],
+           f"{patched.single_reads}")
+    report("Stats count one fetch per ticker",
+           stats['ticker_fetches'] == len({t['ticker'] for t in due}) and stats['due_tracks'] == len(due)
+           and stats['fetches_saved'] == len(due) - stats['ticker_fetches'], f"{stats}")
+
+
+# ─── Test 2: Parity with the per-trade computation ───────────────────────────
+
+def test_outcome_parity():
+    """Every resolved horizon matches the original per-trade loop."""
+    bars, tracks, blacklist = make_universe()
+    before = [dict(t['outcomes']) for t in tracks]
+    due = [due_horizons(t) for t in tracks]
+    auto_tracker = make_auto_tracker(tracks)
+    with Patched(bars, blacklist) as patched:
+        run_update(auto_tracker)
+
+    mismatches = []
+    resolved = 0
+    for track, outcomes_before, horizons in zip(tracks, before, due):
+        if track['ticker'] not in TICKERS:
+            continue
+        expected = reference_trade_outcomes(bars[track['ticker']], pd.Timestamp(track['trade_date']),
+                                            track['entry_price'], horizons)
+        for horizon, _ in OUTCOME_HORIZONS:
+            got = track['outcomes'][horizon]
+            if horizon in expected:
+                resolved += 1
+                want = expected[horizon]
+                if got is None or got['date'] != want['date'] or not np.allclose(
+                        [got['price'], got['return'], got['dividends']],
+                        [want['price'], want['return'], want['dividends']]):
+                    mismatches.append((track['trade_id'], horizon, got, want))
+            elif got != outcomes_before[horizon]:
+                mismatches.append((track['trade_id'], horizon, got, None))
+    report("Same outcomes as the per-trade loop", not mismatches and resolved > 50,
+           f"{len(mismatches)} mismatches of {resolved}: {mismatches[:2]}")
+    report("Dividends included", any(o and o['dividends'] > 0 for t in tracks for o in t['outcomes'].values()))
+    report("Fully resolved tracks matured",
+           all(t['status'] == 'MATURED' for t in tracks
+               if t['ticker'] in TICKERS and all(o is not None for o in t['outcomes'].values()))
+           and any(t['status'] == 'MATURED' for t in tracks))
+    report("Resolved tickers recorded as successes", set(patched.successes) == set(TICKERS),
+           f"{sorted(patched.successes)}")
+
+
+# ─── Test 3: NO_HORIZON_DATA and the blacklist ───────────────────────────────
+
+def test_failure_paths():
+    """Missing horizon bars retry later; blacklist reasons pick the failure type."""
+    bars, tracks, blacklist = make_universe()
+    auto_tracker = make_auto_tracker(tracks)
+    with Patched(bars, blacklist) as patched:
+        stats = run_update(auto_tracker)
+    by_ticker = {t['ticker']: t for t in tracks}
+
+    soon = by_ticker['SOON']
+    report("Horizon past the last bar gives NO_HORIZON_DATA",
+           soon['status'] == 'TRACKING' and soon['failure_type'] == 'NO_HORIZON_DATA'
+           and soon['failure_count'] == 1 and patched.failures.get('SOON') == 'TEMPORARY', f"{soon}")
+    stale = by_ticker['STALE']
+    report("Blacklisted for missing data stays tracked as NO_HORIZON_DATA",
+           stale['status'] == 'TRACKING' and stale['failure_type'] == 'NO_HORIZON_DATA'
+           and stale['failure_reason'].startswith('Blacklisted'), f"{stale}")
+    report("Blacklisted as delisted fails permanently",
+           by_ticker['DEAD']['status'] == 'FAILED' and by_ticker['DEAD']['failure_type'] == 'DELISTED')
+    report("Ticker without any bars classified as delisted",
+           by_ticker['GONE']['status'] == 'FAILED' and patched.failures.get('GONE') == 'PERMANENT')
+    report("Failure counts", stats['failed'] == 4 and stats['permanently_failed'] == 2, f"{stats}")
+
+
+# ─── Test 4: Stats dict ──────────────────────────────────────────────────────
+
+def test_stats_keys():
+    """Same keys whether or not anything was due."""
+    bars, tracks, blacklist = make_universe()
+    with Patched(bars, blacklist):
+        stats = run_update(make_auto_tracker(tracks))
+        empty = run_update(make_auto_tracker([]))
+        nothing_due = run_update(make_auto_tracker([make_track('TK0', 5, 20.0)]))
+    report("Stats keys", set(stats) == STATS_KEYS, f"{sorted(stats)}")
+    report("Same keys without active or due tracks", set(empty) == STATS_KEYS and set(nothing_due) == STATS_KEYS,
+           f"{sorted(empty)} / {sorted(nothing_due)}")
+    report("Nothing due means no fetches", nothing_due['ticker_fetches'] == 0 and nothing_due['updated'] == 0)
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("MATURITY UPDATE TESTS")
+    print("="*70 + "\n")
+
+    auto.logger.setLevel('ERROR')
+    test_one_fetch_per_ticker()
+    test_outcome_parity()
+    test_failure_paths()
+    test_stats_keys()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
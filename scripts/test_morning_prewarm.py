@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pre-market warm-up of the morning execution.
+
+Covers:
+- prepare_morning_trades resolves filters, sector, tradeability, ATR and the
+  cooldown cache for every approved signal and saves them for the day
+- The morning run reuses today's warm-up without any network-bound checks,
+  retries ATR values the warm-up could not compute, ignores a warm-up from
+  another day and re-prepares a signal whose price or date changed since
+- The downtrend filter stays off by default (no SMA lookups, no rejections);
+  when enabled it compares the signal price with the prepared SMA
+- The sector profile lookup stays off by default (signals keep their own
+  sector); when enabled a missing sector is filled from the profile
+- Timing from the market open to the first/last order is reported
+
+These are unit-level tests that don't require external services (the Alpaca
+client, profile lookups and downloads are stubs; files live in a temp dir).
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from automated_trading import execute_trades, config
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+SIGNALS = [
+    {'ticker': 'AAA', 'entry_price': 10.0, 'signal_score': 9, 'date_generated': '2026-01-05',
+     'sector': 'Technology'},
+    {'ticker': 'BBB', 'entry_price': 20.0, 'signal_score': 12, 'date_generated': '2026-01-05'},
+    {'ticker': 'SHELL', 'entry_price': 5.0, 'signal_score': 10, 'date_generated': '2026-01-05'},
+]
+
+
+class StubAlpaca:
+    def __init__(self):
+        self.tradeable_calls = []
+
+    def is_asset_tradeable(self, ticker):
+        self.tradeable_calls.append(ticker)
+        return True, ''
+
+    def get_portfolio_value(self):
+        return 100_000.0
+
+    def get_cash(self):
+        return 100_000.0
+
+
+class StubMonitor:
+    def __init__(self):
+        self.positions = {}
+
+
+def make_engine(calls):
+    """TradingEngine with only the state the warm-up and validation need."""
+    engine = execute_trades.TradingEngine.__new__(execute_trades.TradingEngine)
+    engine.alpaca_client = StubAlpaca()
+    engine.position_monitor = StubMonitor()
+    engine.order_manager = None
+    engine._atr_cache = {}
+    engine._signal_prep = {}
+    engine._cooldown_cache = None
+    engine._win_rate_cache = (0.5, 20)
+    engine.load_approved_signals = lambda: [dict(s) for s in SIGNALS]
+    engine._calculate_position_value = lambda signal, portfolio_value: 1_000.0
+
+    def build_cooldown_cache():
+        calls.append(('cooldown', None))
+        return {'OLD': datetime(2026, 1, 2, 15, 30)}
+
+    def check_filters(signal):
+        calls.append(('filters', signal['ticker']))
+        return "Shell company" if signal['ticker'] == 'SHELL' else None
+
+    def downtrend_sma(ticker):
+        calls.append(('sma', ticker))
+        return 21.0 if ticker == 'BBB' else 10.0
+
+    engine._check_signal_filters = check_filters
+    engine._downtrend_sma = downtrend_sma
+    engine._build_cooldown_cache = build_cooldown_cache
+    return engine
+
+
+# ─── Test 1: Warm-up and reuse ───────────────────────────────────────────────
+
+class Patched:
+    """Temp warm-up file, trading enabled, stubbed ATR/profile/audit; restores everything afterwards."""
+
+    def __init__(self, atr_calls, profile_calls, audit):
+        def get_atr_pcts(tickers, lookback):
+            atr_calls.append(list(tickers))
+            return {t: (None if t == 'SHELL' else 3.0) for t in tickers}
+
+        def get_company_profile(ticker):
+            profile_calls.append(ticker)
+            return {'sector': 'Energy'}
+
+        self.values = [
+            (config, 'MORNING_PREP_FILE', os.path.join(tempfile.mkdtemp(), 'morning_prep.json')),
+            (config, 'TRADING_ENABLED', True),
+            (config, 'ENABLE_DOWNTREND_FILTER', False),
+            (config, 'ENABLE_SECTOR_PROFILE_LOOKUP', False),
+            (execute_trades, 'get_atr_pcts', get_atr_pcts),
+            (execute_trades, 'get_company_profile', get_company_profile),
+            (execute_trades, 'is_trading_day', lambda d=None: True),
+            (execute_trades, 'log_audit_event', lambda event, details, **kw: audit.append(event)),
+        ]
+
+    def __enter__(self):
+        self.saved = [(module, name, getattr(module, name)) for module, name, _ in self.values]
+        for module, name, value in self.values:
+            setattr(module, name, value)
+        return self
+
+    def __exit__(self, *exc):
+        for module, name, value in self.saved:
+            setattr(module, name, value)
+
+
+def test_warmup_and_reuse():
+    """The morning run loads today's warm-up and makes no network-bound checks."""
+    calls, atr_calls, profile_calls, audit = [], [], [], []
+    with Patched(atr_calls, profile_calls, audit):
+        config.ENABLE_SECTOR_PROFILE_LOOKUP = True
+        premarket = make_engine(calls)
+        results = premarket.prepare_morning_trades()
+        report("Every signal prepared, filter rejections recorded",
+               results['prepared'] == 3 and results['rejected'] == 1, f"{results}")
+        report("Tradeability and sector only resolved for signals passing filters",
+               sorted(premarket.alpaca_client.tradeable_calls) == ['AAA', 'BBB'] and profile_calls == ['BBB'],
+               f"{profile_calls}")
+        report("Missing sector looked up, known sector kept",
+               premarket._signal_prep['BBB']['sector'] == 'Energy'
+               and premarket._signal_prep['AAA']['sector'] == 'Technology')
+        report("ATR prefetched in one batch", atr_calls == [['BBB', 'SHELL', 'AAA']], f"{atr_calls}")
+        report("Warm-up saved and audited",
+               os.path.exists(config.MORNING_PREP_FILE) and audit == ['MORNING_PREP_COMPLETE'])
+
+        calls.clear()
+        atr_calls.clear()
+        profile_calls.clear()
+        morning = make_engine(calls)
+        loaded = morning._load_morning_prep()
+        signals = {s['ticker']: s for s in morning._sorted_signals()}
+        shell = morning.validate_signal(signals['SHELL'])
+        valid = morning.validate_signal(signals['BBB'])
+        report("Warm-up loaded for today", loaded == 3 and morning._atr_cache.get('AAA') == 3.0)
+        report("ATR the warm-up could not compute is retried", 'SHELL' not in morning._atr_cache)
+        report("Cooldown cache loaded instead of rebuilt",
+               morning._cooldown_cache == {'OLD': datetime(2026, 1, 2, 15, 30)} and ('cooldown', None) not in calls,
+               f"{calls}")
+        report("No filter, sector or tradeability calls at the open",
+               calls == [] and profile_calls == [] and morning.alpaca_client.tradeable_calls == [], f"{calls}")
+        report("Prepared filter rejection reused", shell == (False, "Shell company"), f"{shell}")
+        report("Prepared sector recorded on the signal",
+               valid == (True, "Valid") and signals['BBB']['sector'] == 'Energy', f"{valid}")
+
+        changed = dict(SIGNALS[0], entry_price=11.0)
+        morning._get_signal_prep(changed)
+        report("Changed signal re-prepared", calls == [('filters', 'AAA')], f"{calls}")
+
+        stale = make_engine(calls)
+        data = execute_trades.load_json_file(config.MORNING_PREP_FILE)
+        data['date'] = '2000-01-03'
+        execute_trades.save_json_file(config.MORNING_PREP_FILE, data)
+        report("Warm-up from another day ignored",
+               stale._load_morning_prep() == 0 and stale._signal_prep == {} and stale._cooldown_cache is None)
+
+
+# ─── Test 2: Downtrend filter ────────────────────────────────────────────────
+
+def test_downtrend_filter():
+    """Off by default; when enabled the signal price is compared with the prepared SMA."""
+    calls = []
+    with Patched([], [], []):
+        engine = make_engine(calls)
+        signal = dict(SIGNALS[1])
+        off = engine.validate_signal(signal)
+        report("Disabled: no SMA lookup and no rejection",
+               off == (True, "Valid") and ('sma', 'BBB') not in calls, f"{off} {calls}")
+
+        config.ENABLE_DOWNTREND_FILTER = True
+        engine = make_engine(calls)
+        on = engine.validate_signal(dict(SIGNALS[1]))
+        report("Enabled: signal price below 97% of the SMA rejected",
+               on[0] is False and on[1].startswith("Downtrend: BBB price $20.00"), f"{on}")
+
+    reads = []
+    bars = pd.DataFrame({'Close': [30.0, 10.0, 20.0, 30.0, 40.0, 50.0]},
+                        index=pd.bdate_range(end='2026-01-02', periods=6))
+    original_histories = execute_trades.get_histories
+    try:
+        execute_trades.get_histories = lambda tickers, start, end=None: (
+            reads.append((list(tickers), start, end)) or {'BBB': bars})
+        sma = execute_trades.TradingEngine._downtrend_sma(engine, 'BBB')
+    finally:
+        execute_trades.get_histories = original_histories
+    report("SMA of the last 5 sessions read from the price store",
+           sma == 30.0 and len(reads) == 1 and reads[0][0] == ['BBB'] and reads[0][2] < date.today(),
+           f"{sma} {reads}")
+
+
+# ─── Test 3: Sector profile lookup ───────────────────────────────────────────
+
+def test_sector_lookup_off():
+    """Off by default: no profile requests and the signal's own sector is used."""
+    calls, profile_calls = [], []
+    with Patched([], profile_calls, []):
+        engine = make_engine(calls)
+        signal = dict(SIGNALS[1])
+        valid = engine.validate_signal(signal)
+        report("Disabled: no profile lookup, sector left unset",
+               valid == (True, "Valid") and profile_calls == [] and engine._signal_prep['BBB']['sector'] == 'Unknown'
+               and signal.get('sector') is None, f"{valid} {profile_calls} {signal}")
+
+
+# ─── Test 4: Timing metrics ──────────────────────────────────────────────────
+
+def test_timing():
+    """Latency is measured from the market open and from the run start."""
+    audit = []
+    original_audit = execute_trades.log_audit_event
+    try:
+        execute_trades.log_audit_event = lambda event, details, **kw: audit.append((event, details))
+        engine = make_engine([])
+        run_started = execute_trades.get_eastern_now().replace(hour=9, minute=36, second=0, microsecond=0)
+        orders = [run_started + timedelta(seconds=4), run_started + timedelta(seconds=9.5)]
+
+        timing = engine._morning_timing(run_started, orders, prepared=3)
+        report("Open to first/last order",
+               timing['open_to_first_order_seconds'] == 364.0 and timing['open_to_last_order_seconds'] == 369.5,
+               f"{timing}")
+        report("Run start to first/last order",
+               timing['run_to_first_order_seconds'] == 4.0 and timing['run_to_last_order_seconds'] == 9.5)
+        report("Timing audited", audit and audit[0][0] == 'MORNING_EXECUTION_TIMING')
+
+        empty = engine._morning_timing(run_started, [], prepared=0)
+        report("No orders reports no latency",
+               empty['open_to_first_order_seconds'] is None and empty['run_started_after_open_seconds'] == 360.0)
+    finally:
+        execute_trades.log_audit_event = original_audit
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("MORNING WARM-UP TESTS")
+    print("="*70 + "\n")
+
+    test_warmup_and_reuse()
+    test_downtrend_filter()
+    test_sector_lookup_off()
+    test_timing()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
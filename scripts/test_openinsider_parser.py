@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the streaming OpenInsider parser and incremental fetch.
+
+Covers:
+- parse_openinsider_table matches the original BeautifulSoup parse (cell
+  text, skipped rows, numeric/date conversion)
+- Watermarked parses keep only rows filed at or after the watermark, and a
+  newest-first page stops early with the same result
+- fetch_openinsider_recent in incremental mode requests fewer days,
+  re-parses an overlap window behind the newest cached filing (so late
+  published filings are not lost), merges new rows with the cached window
+  and returns what a full fetch would
+
+These are unit-level tests that don't require external services (pages are
+synthetic and served by a fake HTTP client; the row cache lives in a temp dir).
+"""
+
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import requests
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import fetch_openinsider as fio
+from openinsider_parser import OPENINSIDER_COLUMNS, _append_row, _build_frame, parse_openinsider_table
+from bench_openinsider_parser import make_screener_html
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+def with_rows(page, rows_html):
+    """Insert extra rows at the top of a page's tinytable body."""
+    return page.replace('<tbody>', '<tbody>' + rows_html, 1)
+
+
+def body_rows(page):
+    return page.split('<tbody>', 1)[1].split('</tbody>', 1)[0]
+
+
+def with_sorted_rows(page, rows_html):
+    """Add rows to a page's tinytable body, keeping it sorted newest filing first."""
+    rows = re.findall(r'<tr.*?</tr>\n', body_rows(page) + rows_html)
+    rows.sort(key=lambda row: re.search(r'target=_blank>([^<]+)</a>', row).group(1), reverse=True)
+    return page.replace(body_rows(page), ''.join(rows), 1)
+
+
+def reference_parse_openinsider_table(html, newer_than=None):
+    """The original BeautifulSoup parse, for parity tests and benchmarking."""
+    soup = BeautifulSoup(html, 'html.parser')
+    table = soup.find('table', {'class': 'tinytable'})
+    if not table:
+        return None
+
+    cols = {name: [] for name in OPENINSIDER_COLUMNS}
+    for tr in table.find_all('tr')[1:]:  # Skip header row
+        _append_row(cols, tr.find_all('td'), lambda td: td.get_text(strip=True), newer_than)
+    return _build_frame(cols)
+
+
+class FakeClient:
+    """Serves one page; records the params of each request."""
+
+    def __init__(self, page):
+        self.page = page
+        self.params = []
+
+    def get(self, url, params=None, **kwargs):
+        self.params.append(dict(params or {}))
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.page.encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = url
+        return response
+
+
+# ─── Test 1: Parity with BeautifulSoup ───────────────────────────────────────
+
+def test_parity():
+    """Same DataFrame as the original parser, including awkward rows."""
+    awkward = (
+        '<tr><td></td><td><a>2025-06-06 19:00:01</a></td><td>2025-06-05</td><td><b><a>ÆON</a></b></td>'
+        '<td>Co</td><td><a>Doe</a> Jane</td><td> Dir </td><td>P - Purchase</td><td>$1,234.5</td>'
+        '<td>+1,000</td><td>n/a</td><td>+5%</td><td>+$1,234,500</td></tr>\n'
+        '<tr><td></td><td>2025-06-06 19:00:00</td><td>2025-06-05</td><td>SKIP</td><td>Co</td>'
+        '<td>X</td><td>Y</td><td>-</td><td>$1</td><td>1</td><td>1</td><td>1%</td><td>$1</td></tr>\n'
+        '<tr><td>too</td><td>short</td></tr>\n'
+    )
+    page = with_rows(make_screener_html(300, seed=7), awkward)
+
+    expected = reference_parse_openinsider_table(page)
+    df = parse_openinsider_table(page.encode('utf-8'))
+    report("Matches the BeautifulSoup parse", df.equals(expected), f"\n{df.head()}\n{expected.head()}")
+
+    first = df.iloc[0]
+    report("Nested cell text joined like get_text(strip=True)",
+           first['insider'] == 'DoeJane' and first['ticker'] == 'ÆON' and first['title'] == 'Dir')
+    report("Unparseable numbers become 0", first['owned'] == 0 and first['value'] == 1234500.0)
+    report("Dash trade types and short rows skipped", len(df) == 301 and 'SKIP' not in set(df['ticker']))
+    report("Typed columns",
+           str(df['filing_date'].dtype).startswith('datetime64') and df['qty'].dtype == float)
+    report("Page without a tinytable returns None",
+           parse_openinsider_table(b'<html><body><table class="x"><tr><td>1</td></tr></table></body></html>') is None)
+
+
+# ─── Test 2: Watermark ───────────────────────────────────────────────────────
+
+def test_watermark():
+    """Only rows at/after the watermark are materialized."""
+    page = make_screener_html(500, seed=3).encode('utf-8')
+    full = parse_openinsider_table(page)
+    watermark_ts = full['filing_date'].iloc[120]
+    watermark = watermark_ts.strftime('%Y-%m-%d %H:%M:%S')
+
+    newer = parse_openinsider_table(page, newer_than=watermark)
+    early = parse_openinsider_table(page, newer_than=watermark, newest_first=True)
+    report("Rows before the watermark skipped",
+           newer.equals(full[full['filing_date'] >= watermark_ts].reset_index(drop=True)), f"{len(newer)} rows")
+    report("Newest-first early stop gives the same rows", early.equals(newer))
+
+
+# ─── Test 3: Incremental fetch ───────────────────────────────────────────────
+
+def test_incremental_fetch():
+    """A rerun requests fewer days, picks up late filings and returns what a full fetch would."""
+    original_client = fio.get_http_client
+    original_cache = fio.OPENINSIDER_RECENT_CACHE_FILE
+    try:
+        fio.OPENINSIDER_RECENT_CACHE_FILE = os.path.join(tempfile.mkdtemp(), 'openinsider_recent.csv')
+        now = datetime.now().replace(microsecond=0)
+        yesterday_page = make_screener_html(200, seed=11, now=(now - timedelta(days=1)).isoformat(), days=5)
+        # Published after the first run with a filing time 6h before its newest filing
+        late_row = body_rows(make_screener_html(1, seed=13, now=(now - timedelta(days=1, hours=6)).isoformat(),
+                                                days=0.01)).replace('T0000', 'LATE')
+        today_page = with_sorted_rows(with_rows(yesterday_page, body_rows(
+            make_screener_html(30, seed=12, now=now.isoformat(), days=0.9))), late_row)
+
+        client = FakeClient(yesterday_page)
+        fio.get_http_client = lambda: client
+        first = fio.fetch_openinsider_recent(incremental=True)
+        report("First run fetches the whole window",
+               client.params[0]['fd'] == str(fio.OPENINSIDER_WINDOW_DAYS) and len(first) > 0,
+               f"{client.params[0].get('fd')}")
+
+        client = FakeClient(today_page)
+        incremental = fio.fetch_openinsider_recent(incremental=True)
+        fd = int(client.params[0]['fd'])
+        report("Rerun requests only the days since the newest cached filing", fd <= 3, f"fd={fd}")
+        report("Late filing inside the overlap window picked up", 'LATE' in set(incremental['ticker']))
+
+        full = fio.fetch_openinsider_recent(incremental=False)
+
+        def canonical(df):
+            return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+        report("Incremental result matches a full fetch",
+               len(incremental) == len(full) and canonical(incremental).equals(canonical(full)),
+               f"{len(incremental)} vs {len(full)}")
+    finally:
+        fio.get_http_client = original_client
+        fio.OPENINSIDER_RECENT_CACHE_FILE = original_cache
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("OPENINSIDER PARSER TESTS")
+    print("="*70 + "\n")
+
+    test_parity()
+    test_watermark()
+    test_incremental_fetch()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Unit tests for bulk order reconciliation in OrderManager.
+
+Covers:
+- All pending orders are reconciled from one list-orders call, joined on
+  order_id (or client_order_id), with fills/rejects/partials applied
+- Every transition in a cycle is persisted with a single save
+- Orders missing from the listing, or a failed listing, fall back to get_order
+- Timing and REST-call stats are recorded
+
+These are unit-level tests that don't require external services (the broker
+is an in-memory fake and state files go to a temp dir).
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from automated_trading import config
+from automated_trading import order_manager as om
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+PATCHED = ['PENDING_ORDERS_FILE', 'AUDIT_LOG_FILE', 'DATA_DIR', 'STATE_BACKEND']
+ORIGINAL = {name: getattr(config, name) for name in PATCHED}
+ORIGINAL_SAVE_STATE = om.save_state
+
+
+def restore():
+    for name, value in ORIGINAL.items():
+        setattr(config, name, value)
+    om.save_state = ORIGINAL_SAVE_STATE
+
+
+def make_manager():
+    """OrderManager on temp JSON state; returns (manager, save counter)."""
+    tmp = tempfile.mkdtemp()
+    for name in PATCHED[:2]:
+        setattr(config, name, os.path.join(tmp, os.path.basename(ORIGINAL[name])))
+    config.DATA_DIR = tmp
+    config.STATE_BACKEND = 'json'
+
+    saves = {'count': 0}
+
+    def counting_save(*args, **kwargs):
+        saves['count'] += 1
+        return ORIGINAL_SAVE_STATE(*args, **kwargs)
+
+    om.save_state = counting_save
+    return om.OrderManager(), saves
+
+
+class FakeBroker:
+    """Bulk listing plus per-order lookups, counting each REST call."""
+
+    def __init__(self, orders, listed=None, list_fails=False):
+        self.orders = orders                      # order_id -> broker order
+        self.listed = set(orders) if listed is None else set(listed)
+        self.list_fails = list_fails
+        self.calls = {'get_orders_since': 0, 'get_order': 0}
+
+    def get_orders_since(self, after):
+        self.calls['get_orders_since'] += 1
+        if self.list_fails:
+            raise RuntimeError("listing unavailable")
+        return [o for oid, o in self.orders.items() if oid in self.listed]
+
+    def get_order(self, order_id):
+        self.calls['get_order'] += 1
+        return self.orders.get(order_id)
+
+
+def broker_order(order_id, client_order_id, status, filled_qty=0, price=None):
+    return {'order_id': order_id, 'client_order_id': client_order_id, 'status': status,
+            'filled_qty': filled_qty, 'filled_avg_price': price}
+
+
+def submit_orders(manager, statuses):
+    """Submit one order per status; returns the matching broker orders."""
+    orders = {}
+    for i, status in enumerate(statuses):
+        ticker = f"T{i:02d}"
+        order, _ = manager.create_buy_order(ticker, 100, 10.0, {'signal_score': 5}, 'LIMIT')
+        manager.mark_order_submitted(order, f"id-{ticker}", 'new')
+        filled = {'filled': 100, 'partially_filled': 40}.get(status, 0)
+        orders[f"id-{ticker}"] = broker_order(f"id-{ticker}", order['client_order_id'], status,
+                                              filled, 10.0 if filled else None)
+    return orders
+
+
+# ─── Test 1: One listing per cycle ───────────────────────────────────────────
+
+def test_bulk_reconciliation():
+    """Mixed outcomes for 20 orders from one REST call and one save."""
+    try:
+        manager, saves = make_manager()
+        statuses = (['filled'] * 8 + ['canceled'] * 3 + ['rejected'] * 2 + ['expired']
+                    + ['partially_filled'] * 2 + ['new'] * 4)
+        broker = FakeBroker(submit_orders(manager, statuses))
+        saves['count'] = 0
+
+        filled_callbacks = []
+        results = manager.update_orders_from_broker(broker, on_fill_callback=filled_callbacks.append)
+
+        report("One list-orders call, no per-order lookups",
+               broker.calls == {'get_orders_since': 1, 'get_order': 0}, f"{broker.calls}")
+        report("Fills applied with callbacks",
+               len(results['filled']) == 8 and len(filled_callbacks) == 8, f"{len(results['filled'])}")
+        report("Cancels, rejects and expiries applied", len(results['rejected']) == 6)
+        report("Partial fills recorded",
+               sum(1 for o in manager.pending_orders.values()
+                   if o['state'] == 'partially_filled' and o['filled_shares'] == 40) == 2)
+        report("All transitions persisted with one save", saves['count'] == 1, f"{saves['count']} saves")
+
+        reloaded = om.OrderManager()
+        report("Saved state matches memory",
+               set(reloaded.pending_orders) == set(manager.pending_orders) and len(reloaded.pending_orders) == 6)
+
+        stats = manager.last_reconcile_stats
+        report("Reconcile stats recorded",
+               stats['orders_reconciled'] == 20 and stats['rest_calls'] == 1 and stats['bulk_listing'],
+               f"{stats}")
+    finally:
+        restore()
+
+
+# ─── Test 2: Fallbacks ───────────────────────────────────────────────────────
+
+def test_fallbacks():
+    """Unlisted orders and failed listings use get_order."""
+    try:
+        manager, _ = make_manager()
+        orders = submit_orders(manager, ['filled', 'filled', 'new'])
+        broker = FakeBroker(orders, listed=['id-T00'])
+
+        results = manager.update_orders_from_broker(broker)
+        report("Order missing from listing fetched individually",
+               broker.calls == {'get_orders_since': 1, 'get_order': 2} and len(results['filled']) == 2,
+               f"{broker.calls}")
+
+        manager, _ = make_manager()
+        broker = FakeBroker(submit_orders(manager, ['filled', 'canceled']), list_fails=True)
+        results = manager.update_orders_from_broker(broker)
+        report("Failed listing falls back to per-order polling",
+               broker.calls['get_order'] == 2 and len(results['filled']) == 1 and len(results['rejected']) == 1,
+               f"{broker.calls}")
+        report("Stats show no bulk listing", manager.last_reconcile_stats['bulk_listing'] is False)
+    finally:
+        restore()
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("ORDER RECONCILIATION TESTS")
+    print("="*70 + "\n")
+
+    test_bulk_reconciliation()
+    test_fallbacks()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
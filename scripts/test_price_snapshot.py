@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-cycle price snapshot.
+
+Covers:
+- One monitoring cycle (trailing stops + exit checks) prices every position
+  with a single get_all_positions call and no per-ticker lookups
+- Tickers the broker doesn't hold are priced with one multi-symbol request
+- Unpriced tickers still fall back to the last known price
+- Price ages are exposed and the snapshot expires
+
+These are unit-level tests that don't require external services (the broker
+is an in-memory fake and state files go to a temp dir).
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from automated_trading import config
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+class FakeBroker:
+    """Counts calls to the price endpoints the snapshot uses."""
+
+    def __init__(self, prices, trade_prices=None):
+        self.prices = prices
+        self.trade_prices = trade_prices or {}
+        self.calls = {'get_all_positions': 0, 'get_position': 0, 'get_latest_trade_prices': 0}
+
+    def get_all_positions(self):
+        self.calls['get_all_positions'] += 1
+        return [{'symbol': t, 'qty': 10, 'avg_entry_price': 10.0, 'current_price': p}
+                for t, p in self.prices.items()]
+
+    def get_position(self, symbol):
+        self.calls['get_position'] += 1
+        price = self.prices.get(symbol)
+        return {'symbol': symbol, 'current_price': price} if price else None
+
+    def get_latest_trade_prices(self, symbols):
+        self.calls['get_latest_trade_prices'] += 1
+        return {s: {'price': self.trade_prices[s], 'timestamp': datetime.now(timezone.utc) - timedelta(seconds=30)}
+                for s in symbols if s in self.trade_prices}
+
+
+PATCHED = ['LIVE_POSITIONS_FILE', 'DAILY_STATE_FILE', 'HIGH_WATER_MARK_FILE',
+           'SIGNAL_HISTORY_FILE', 'AUDIT_LOG_FILE', 'DATA_DIR', 'STATE_BACKEND']
+ORIGINAL = {name: getattr(config, name) for name in PATCHED}
+
+
+def restore_config():
+    for name, value in ORIGINAL.items():
+        setattr(config, name, value)
+
+
+def make_monitor(broker, tickers):
+    """PositionMonitor on temp JSON state with the given positions."""
+    tmp = tempfile.mkdtemp()
+    for name in PATCHED[:5]:
+        setattr(config, name, os.path.join(tmp, os.path.basename(ORIGINAL[name])))
+    config.DATA_DIR = tmp
+    config.STATE_BACKEND = 'json'
+
+    from automated_trading.position_monitor import PositionMonitor
+    monitor = PositionMonitor(alpaca_client=None)
+    monitor.alpaca_client = broker
+    monitor.price_snapshot.alpaca_client = broker
+    for t in tickers:
+        monitor.positions[t] = {
+            'shares': 10, 'entry_price': 10.0, 'entry_date': datetime.now(),
+            'stop_loss': 9.0, 'take_profit': 14.0, 'highest_price': 10.0,
+            'trailing_enabled': False, 'signal_score': 5, 'last_known_price': 10.5,
+        }
+    return monitor
+
+
+# ─── Test 1: One bulk fetch per cycle ────────────────────────────────────────
+
+def test_cycle_uses_one_bulk_fetch():
+    """Trailing stops + exit checks price all positions with one call."""
+    try:
+        broker = FakeBroker({'AAA': 10.2, 'BBB': 8.5, 'CCC': 11.0})
+        monitor = make_monitor(broker, ['AAA', 'BBB', 'CCC'])
+
+        monitor.update_trailing_stops()
+        exits = monitor.check_exits()
+
+        report("One get_all_positions per cycle", broker.calls['get_all_positions'] == 1, f"{broker.calls}")
+        report("No per-ticker position lookups", broker.calls['get_position'] == 0, f"{broker.calls}")
+        report("Stop loss still detected from snapshot price",
+               [e['ticker'] for e in exits] == ['BBB'], f"{exits}")
+        age = exits[0].get('price_age_seconds') if exits else None
+        report("Exit reports the price age", age is not None and age < 5, f"{age}")
+    finally:
+        restore_config()
+
+
+# ─── Test 2: Missing tickers and fallbacks ───────────────────────────────────
+
+def test_missing_tickers_and_fallback():
+    """Unheld tickers use one multi-symbol request; unpriced ones fall back."""
+    try:
+        broker = FakeBroker({'AAA': 10.2}, trade_prices={'DDD': 12.0})
+        monitor = make_monitor(broker, ['AAA', 'DDD', 'EEE'])
+        monitor.price_snapshot._fetch_yfinance = lambda tickers: None  # No network in tests
+
+        monitor.refresh_price_snapshot()
+        monitor.refresh_price_snapshot()
+        report("One multi-symbol request for unheld tickers",
+               broker.calls['get_latest_trade_prices'] == 1, f"{broker.calls}")
+        report("Trade price used for unheld ticker", monitor.get_current_price('DDD') == 12.0)
+        report("Trade price age reflects the trade time",
+               25 <= monitor.get_price_age('DDD') <= 40, f"{monitor.get_price_age('DDD')}")
+
+        monitor.get_current_price = lambda t: monitor.price_snapshot.get(t)
+        exits = monitor.check_exits()
+        report("Unpriced ticker still exit-checked on last known price",
+               all(e['ticker'] != 'EEE' for e in exits) and monitor.positions['EEE']['last_known_price'] == 10.5)
+    finally:
+        restore_config()
+
+
+# ─── Test 3: Expiry ──────────────────────────────────────────────────────────
+
+def test_snapshot_expires():
+    """A new cycle after max age refetches."""
+    try:
+        broker = FakeBroker({'AAA': 10.2})
+        monitor = make_monitor(broker, ['AAA'])
+        monitor.price_snapshot.max_age_seconds = 0.05
+
+        monitor.refresh_price_snapshot()
+        time.sleep(0.1)
+        report("Expired snapshot returns no price", monitor.price_snapshot.get('AAA') is None)
+        monitor.refresh_price_snapshot()
+        report("Expired snapshot is refetched", broker.calls['get_all_positions'] == 2, f"{broker.calls}")
+    finally:
+        restore_config()
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("PRICE SNAPSHOT TESTS")
+    print("="*70 + "\n")
+
+    test_cycle_uses_one_bulk_fetch()
+    test_missing_tickers_and_fallback()
+    test_snapshot_expires()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared daily price store.
+
+Covers:
+- Only missing date ranges are downloaded, batched across tickers
+- Dividend adjustment on read matches Yahoo's back-adjustment method
+- A split on an appended bar triggers a full re-download of that ticker
+- A range that downloads empty isn't downloaded again until its marker expires
+- period_start('Nd') spans N trading sessions
+- Two threads reading different tickers download at the same time
+- Batched insider trade outcomes match the per-trade computation
+
+These are unit-level tests that don't require external services (the
+yfinance fetcher is replaced with an in-memory fake).
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+import price_store
+from price_store import PriceStore, adjust_for_dividends, period_start
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+class FakeFetcher:
+    """Returns flat $100 business-day bars and records every call."""
+
+    def __init__(self, dividends=None, splits=None, missing=()):
+        self.calls = []
+        self.dividends = dividends or {}
+        self.splits = splits or {}
+        self.missing = set(missing)
+
+    def __call__(self, tickers, start, end):
+        self.calls.append((tuple(tickers), start, end))
+        idx = pd.bdate_range(start, end)
+        frames = {}
+        for t in tickers:
+            if t in self.missing:
+                continue
+            df = pd.DataFrame({
+                'Open': 100.0, 'High': 101.0, 'Low': 99.0, 'Close': 100.0,
+                'Volume': 1e6, 'Dividends': 0.0, 'Stock Splits': 0.0,
+            }, index=idx)
+            for d, amount in self.dividends.get(t, {}).items():
+                if pd.Timestamp(d) in df.index:
+                    df.loc[pd.Timestamp(d), 'Dividends'] = amount
+            for d, ratio in self.splits.get(t, {}).items():
+                if pd.Timestamp(d) in df.index:
+                    df.loc[pd.Timestamp(d), 'Stock Splits'] = ratio
+            frames[t] = df
+        return frames
+
+
+def make_store(fetcher):
+    path = os.path.join(tempfile.mkdtemp(), 'price_store.sqlite')
+    return PriceStore(path, fetch_fn=fetcher)
+
+
+# ─── Test 1: Incremental, batched fetch ──────────────────────────────────────
+
+def test_incremental_fetch():
+    """A second overlapping request only downloads the uncovered range."""
+    fetcher = FakeFetcher()
+    store = make_store(fetcher)
+    end = date.today() - timedelta(days=10)
+
+    store.get_histories(['AAA', 'BBB'], end - timedelta(days=30), end)
+    report("First request is one batched download", len(fetcher.calls) == 1
+           and fetcher.calls[0][0] == ('AAA', 'BBB'), f"calls={fetcher.calls}")
+
+    store.get_histories(['AAA', 'BBB'], end - timedelta(days=30), end)
+    report("Repeat request is served from the store", len(fetcher.calls) == 1,
+           f"calls={len(fetcher.calls)}")
+
+    hist = store.get_history('AAA', end - timedelta(days=60), end)
+    new_call = fetcher.calls[-1]
+    report("Earlier start only fetches the missing range",
+           len(fetcher.calls) == 2 and new_call[1] == end - timedelta(days=60)
+           and new_call[2] == end - timedelta(days=31),
+           f"last call={new_call}")
+    report("Merged history spans the full window",
+           hist.index.min() >= pd.Timestamp(end - timedelta(days=60)) and len(hist) > 35,
+           f"rows={len(hist)}")
+
+
+# ─── Test 2: Dividend adjustment ─────────────────────────────────────────────
+
+def test_dividend_adjustment():
+    """Bars before an ex-date are scaled by (1 - dividend / previous close)."""
+    idx = pd.bdate_range('2025-03-03', periods=5)
+    bars = pd.DataFrame({
+        'Open': 100.0, 'High': 100.0, 'Low': 100.0, 'Close': 100.0,
+        'Volume': 1.0, 'Dividends': [0.0, 0.0, 2.0, 0.0, 0.0], 'Stock Splits': 0.0,
+    }, index=idx)
+    adjusted = adjust_for_dividends(bars)
+    expected = [98.0, 98.0, 100.0, 100.0, 100.0]
+    ok = all(abs(a - b) < 1e-9 for a, b in zip(adjusted['Close'], expected))
+    report("Pre-ex-date closes scaled by 0.98", ok, f"got {list(adjusted['Close'])}")
+    report("Raw bars left untouched", list(bars['Close']) == [100.0] * 5)
+
+
+# ─── Test 3: Split refresh ───────────────────────────────────────────────────
+
+def test_split_triggers_refetch():
+    """A split in newly appended bars re-downloads the whole ticker history."""
+    today = date.today()
+    first_end = today - timedelta(days=20)
+    split_day = pd.bdate_range(first_end + timedelta(days=3), periods=1)[0].date()
+
+    fetcher = FakeFetcher(splits={'SPLT': {split_day: 2.0}})
+    store = make_store(fetcher)
+    store.get_history('SPLT', first_end - timedelta(days=30), first_end)
+    store.get_history('SPLT', first_end - timedelta(days=30), today - timedelta(days=2))
+
+    last = fetcher.calls[-1]
+    report("Split re-downloads from the original coverage start",
+           last[0] == ('SPLT',) and last[1] == first_end - timedelta(days=30),
+           f"calls={fetcher.calls}")
+
+
+# ─── Test 4: Empty downloads ─────────────────────────────────────────────────
+
+def test_empty_range_marker():
+    """A delisted ticker is downloaded once per marker TTL, not on every call."""
+    fetcher = FakeFetcher(missing={'GONE'})
+    store = make_store(fetcher)
+    start = date.today() - timedelta(days=40)
+
+    store.get_histories(['AAA', 'GONE'], start)
+    store.get_histories(['AAA', 'GONE'], start)
+    store.get_history('GONE', start + timedelta(days=10))
+    report("Empty range not downloaded again", len(fetcher.calls) == 1, f"calls={fetcher.calls}")
+
+    store.get_history('GONE', start - timedelta(days=30))
+    report("Wider range still downloaded", len(fetcher.calls) == 2 and fetcher.calls[-1][0] == ('GONE',),
+           f"calls={fetcher.calls}")
+
+    original = price_store.EMPTY_RANGE_TTL_SECONDS
+    try:
+        price_store.EMPTY_RANGE_TTL_SECONDS = -1
+        fetcher.missing.clear()
+        hist = store.get_history('GONE', start)
+    finally:
+        price_store.EMPTY_RANGE_TTL_SECONDS = original
+    report("Expired marker retried and cleared once bars arrive", len(fetcher.calls) == 3 and not hist.empty
+           and store._empty_ranges(['GONE']) == {}, f"calls={len(fetcher.calls)}")
+
+
+# ─── Test 5: Session periods ─────────────────────────────────────────────────
+
+def test_period_start_sessions():
+    """'Nd' periods hold N trading sessions, even across holidays."""
+    end = date(2025, 12, 31)
+    start = period_start('20d', end)
+    sessions = np.busday_count(start, end + timedelta(days=1), holidays=['2025-12-25'])
+    report("20d holds at least 20 sessions across Christmas", sessions >= 20 and sessions <= 23,
+           f"{start} → {sessions} sessions")
+    report("Month periods stay calendar-based", period_start('6mo', end) == date(2025, 6, 30))
+
+
+# ─── Test 6: Concurrent callers ──────────────────────────────────────────────
+
+class RendezvousFetcher(FakeFetcher):
+    """Each download waits until another download is in flight (times out if they run one at a time)."""
+
+    def __init__(self):
+        super().__init__()
+        self.barrier = threading.Barrier(2, timeout=5)
+        self.overlapped = 0
+
+    def __call__(self, tickers, start, end):
+        self.barrier.wait()
+        self.overlapped += 1
+        return super().__call__(tickers, start, end)
+
+
+def test_concurrent_downloads():
+    """Downloads don't hold the store lock, so two callers fetch side by side."""
+    fetcher = RendezvousFetcher()
+    store = make_store(fetcher)
+    start = date.today() - timedelta(days=60)
+    results = {}
+
+    def read(ticker):
+        results[ticker] = store.get_history(ticker, start)
+
+    threads = [threading.Thread(target=read, args=(t,)) for t in ('AAA', 'BBB')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report("Both downloads in flight at once", fetcher.overlapped == 2, f"{fetcher.overlapped} overlapped")
+    report("Both callers got their bars", all(len(results.get(t, [])) > 35 for t in ('AAA', 'BBB')))
+    store.get_histories(['AAA', 'BBB'], start)
+    report("Both ranges recorded as covered", len(fetcher.calls) == 2, f"calls={fetcher.calls}")
+
+
+# ─── Test 7: Batched trade outcomes ──────────────────────────────────────────
+
+class TrendingFetcher(FakeFetcher):
+    """Closes rise $0.50 per business day so every horizon has a distinct price."""
+
+    def __call__(self, tickers, start, end):
+        frames = super().__call__(tickers, start, end)
+        for df in frames.values():
+            days = (df.index - pd.Timestamp('2024-01-01')).days.to_numpy()
+            df['Close'] = 50.0 + 0.5 * days
+        return frames
+
+
+def test_batched_outcomes_match_per_trade():
+    """update_outcomes(batched=True) writes the same values as the per-trade loop."""
+    import insider_performance_tracker as ipt
+
+    fetcher = TrendingFetcher(dividends={'AAA': {date(2024, 3, 4): 1.5}})
+    store = make_store(fetcher)
+    original = ipt.get_price_store
+    ipt.get_price_store = lambda: store
+
+    trades = pd.DataFrame({
+        'trade_date': pd.to_datetime(['2024-01-10', '2024-02-20', '2024-01-15', '2024-06-03']),
+        'ticker': ['AAA', 'AAA', 'BBB', 'CCC'],
+        'insider_name': ['a', 'b', 'c', 'd'],
+        'entry_price': [55.0, 70.0, 60.0, 65.0],
+    })
+    for col in ['outcome_30d', 'outcome_60d', 'outcome_90d', 'outcome_180d',
+                'return_30d', 'return_60d', 'return_90d', 'return_180d']:
+        trades[col] = float('nan')
+    trades['last_updated'] = None
+
+    results = {}
+    try:
+        for batched in (False, True):
+            tracker = ipt.InsiderPerformanceTracker.__new__(ipt.InsiderPerformanceTracker)
+            tracker.trades_history = trades.copy()
+            tracker._save_trades_history = lambda: None
+            tracker.update_outcomes(batch_size=100, rate_limit_delay=0, batched=batched)
+            results[batched] = tracker.trades_history.drop(columns='last_updated')
+    finally:
+        ipt.get_price_store = original
+
+    value_cols = [c for c in results[True].columns if c.startswith(('outcome_', 'return_'))]
+    legacy = results[False][value_cols].astype(float)
+    batched = results[True][value_cols].astype(float)
+    report("Batched outcomes equal per-trade outcomes",
+           ((legacy - batched).abs().fillna(0) < 1e-9).all().all() and
+           (legacy.isna() == batched.isna()).all().all(),
+           f"\n{legacy}\n{batched}")
+    report("Dividend included in AAA 60d return",
+           abs(batched.loc[0, 'return_60d'] - (batched.loc[0, 'outcome_60d'] - 55.0 + 1.5) / 55.0 * 100) < 1e-9)
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("PRICE STORE TESTS")
+    print("="*70 + "\n")
+
+    test_incremental_fetch()
+    test_dividend_adjustment()
+    test_split_triggers_refetch()
+    test_empty_range_marker()
+    test_period_start_sessions()
+    test_concurrent_downloads()
+    test_batched_outcomes_match_per_trade()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the keyed FMP profile cache.
+
+Covers:
+- The legacy company_profiles_cache.json is imported once into an empty store
+- Expiry is precomputed per field group (profile vs price TTL), including the
+  no-data sentinel and entries without a valid 'updated' timestamp
+- Batch reads return only fresh rows for the requested tickers
+- EnhancedFMPAPIClient serves fresh tickers from the store, fetches only the
+  missing ones, upserts only those and skips sentinel tickers
+
+These are unit-level tests that don't require external services (the store
+lives in a temp dir and _fetch_profile is replaced with a stub).
+"""
+
+import os
+import sys
+import json
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+from fmp_api import ProfileCache, EnhancedFMPAPIClient
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+def profile(age, **fields):
+    return {'industry': 'Software', 'sector': 'Technology', 'price': 10.0,
+            'updated': (datetime.now() - age).isoformat(), 'source': 'fmp_api', **fields}
+
+
+def legacy_cache():
+    return {
+        'FRESH': profile(timedelta(hours=2)),
+        'WEEK': profile(timedelta(days=7)),
+        'OLD': profile(timedelta(days=31)),
+        'NODATA': {'_fmp_no_data': True, 'updated': datetime.now().isoformat(), 'source': 'fmp_api'},
+        'NOSTAMP': {'industry': 'Banks'},
+        'BADSTAMP': {'industry': 'Banks', 'updated': 'yesterday'},
+    }
+
+
+def temp_store():
+    tmp = tempfile.mkdtemp()
+    json_path = os.path.join(tmp, 'company_profiles_cache.json')
+    with open(json_path, 'w') as f:
+        json.dump(legacy_cache(), f)
+    return os.path.join(tmp, 'company_profiles_cache.sqlite'), json_path
+
+
+# ─── Test 1: Legacy import ───────────────────────────────────────────────────
+
+def test_legacy_import():
+    """The JSON cache is imported into an empty store, and only once."""
+    db_path, json_path = temp_store()
+    store = ProfileCache(db_path, legacy_json_file=json_path)
+    report("All legacy entries imported", len(store) == 6, f"{len(store)} rows")
+    week = store.get('WEEK')
+    report("Profile round-trips", week is not None and set(week) == set(legacy_cache()['WEEK'])
+           and week['industry'] == 'Software', f"{week}")
+    store.close()
+
+    with open(json_path, 'w') as f:
+        json.dump({'EXTRA': profile(timedelta(0))}, f)
+    store = ProfileCache(db_path, legacy_json_file=json_path)
+    report("Non-empty store is not re-imported", len(store) == 6 and store.get('EXTRA') is None)
+    store.close()
+
+
+# ─── Test 2: Expiry per field group ──────────────────────────────────────────
+
+def test_expiry():
+    """Validity uses the precomputed profile/price expiry."""
+    db_path, json_path = temp_store()
+    store = ProfileCache(db_path, legacy_json_file=json_path)
+
+    report("Fresh entry valid for profile and price",
+           store.is_valid('FRESH', 'profile') and store.is_valid('FRESH', 'price'))
+    report("Week-old entry valid for profile only",
+           store.is_valid('WEEK', 'profile') and not store.is_valid('WEEK', 'price'))
+    report("31-day-old entry expired", not store.is_valid('OLD', 'profile') and store.get('OLD') is not None)
+    report("Missing or invalid timestamp never valid",
+           not store.is_valid('NOSTAMP') and not store.is_valid('BADSTAMP'))
+    report("Unknown field group or ticker invalid",
+           not store.is_valid('FRESH', 'volume') and not store.is_valid('ZZZZ'))
+    sentinel = store.get('NODATA', 'profile')
+    report("Sentinel stored with its own expiry", sentinel is not None and sentinel.get('_fmp_no_data') is True)
+
+    store.put('OLD', profile(timedelta(0)))
+    report("Upsert refreshes expiry", store.is_valid('OLD', 'price') and len(store) == 6)
+    store.close()
+
+
+# ─── Test 3: Batch reads ─────────────────────────────────────────────────────
+
+def test_batch_reads():
+    """get_many returns the requested tickers, filtered by freshness."""
+    db_path, json_path = temp_store()
+    store = ProfileCache(db_path, legacy_json_file=json_path)
+
+    tickers = ['FRESH', 'WEEK', 'OLD', 'NOSTAMP', 'MISSING', 'FRESH']
+    report("Unfiltered read returns every stored ticker",
+           set(store.get_many(tickers)) == {'FRESH', 'WEEK', 'OLD', 'NOSTAMP'})
+    report("Profile-fresh read", set(store.get_many(tickers, 'profile')) == {'FRESH', 'WEEK'})
+    report("Price-fresh read", set(store.get_many(tickers, 'price')) == {'FRESH'})
+
+    store.put_many({f"T{i:04d}": profile(timedelta(0)) for i in range(1200)})
+    many = store.get_many([f"T{i:04d}" for i in range(1200)] + ['WEEK'], 'profile')
+    report("Large batches chunked", len(many) == 1201, f"{len(many)} rows")
+    store.close()
+
+
+# ─── Test 4: Client integration ──────────────────────────────────────────────
+
+def test_client():
+    """Only missing tickers are fetched and upserted."""
+    db_path, json_path = temp_store()
+    client = EnhancedFMPAPIClient(api_key='test', cache_file=db_path, legacy_cache_file=json_path)
+    client.analytics.save = lambda: None
+
+    fetched = []
+
+    def fake_fetch(ticker):
+        fetched.append(ticker)
+        if ticker == 'EMPTY':
+            client.cache.put(ticker, {'_fmp_no_data': True, 'updated': datetime.now().isoformat()})
+            return None
+        return profile(timedelta(0), companyName=f"{ticker} Inc")
+
+    written = []
+    put_many = client.cache.put_many
+
+    def tracking_put_many(profiles):
+        written.extend(profiles)
+        put_many(profiles)
+
+    client._fetch_profile = fake_fetch
+    client.cache.put_many = tracking_put_many
+
+    results = client.fetch_profiles_batch(['fresh', 'WEEK', 'OLD', 'NODATA', 'NEW', 'EMPTY'])
+    report("Stale and unknown tickers fetched", sorted(fetched) == ['EMPTY', 'NEW', 'OLD'], f"{fetched}")
+    report("Only fetched profiles upserted", sorted(written) == ['EMPTY', 'NEW', 'OLD'], f"{written}")
+    report("Results exclude sentinels", set(results) == {'FRESH', 'WEEK', 'OLD', 'NEW'}, f"{set(results)}")
+
+    fetched.clear()
+    written.clear()
+    again = client.fetch_profiles_batch(['FRESH', 'WEEK', 'OLD', 'NODATA', 'NEW', 'EMPTY'])
+    report("Rerun served from the store", fetched == [] and written == [] and set(again) == set(results))
+    report("get_profile hit and sentinel",
+           client.get_profile('new')['companyName'] == 'NEW Inc' and client.get_profile('EMPTY') is None
+           and fetched == [])
+    report("Cache size in analytics summary", client.get_analytics_summary()['cache_size'] == 8)
+    client.close()
+
+    reopened = ProfileCache(db_path, legacy_json_file=json_path)
+    report("Upserts persist across restarts", reopened.is_valid('NEW') and reopened.is_valid('OLD', 'price'))
+    reopened.close()
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("FMP PROFILE CACHE TESTS")
+    print("="*70 + "\n")
+
+    test_legacy_import()
+    test_expiry()
+    test_batch_reads()
+    test_client()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the batched quality filter chain.
+
+Covers:
+- The vectorized drawdown / 5-day SMA check rejects the same signals, with
+  the same reasons, as the original per-ticker download (crashes, downtrends,
+  thin and missing histories, missing prices)
+- Price data for every candidate comes from one batched prefetch, and the
+  stale / M&A checks still see only the last 20 sessions of it
+- Price health runs however many signals are left (no 20-signal cap)
+- The repeat-trade cooldown masks tickers sold within the window
+- Every rejection lands in the rejection log with the filter that removed it
+
+These are unit-level tests that don't require external services (prices come
+from in-memory histories; trade and log files live in a temp dir).
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+import config
+import process_signals
+from price_store import period_start
+from process_signals import apply_quality_filters, logger, price_health_stats
+
+PASS = 0
+FAIL = 0
+
+yf = None  # yf.download stand-in for reference_check_price_health, set per test
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+def random_bars(n, seed, drift=0.0):
+    """Random-walk OHLC over the n business days before today."""
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end=date.today() - timedelta(days=1), periods=n)
+    close = 30 * np.exp(np.cumsum(rng.normal(drift, 0.03, n)))
+    return pd.DataFrame({'Open': close, 'High': close * (1 + rng.uniform(0, 0.04, n)), 'Low': close * 0.98,
+                         'Close': close, 'Volume': 1e6, 'Dividends': 0.0, 'Stock Splits': 0.0}, index=idx)
+
+
+def reference_check_price_health(row):
+    """
+    Original per-ticker price health check, one download per signal, for parity checks.
+
+    Returns: (passes_bool, reason_string)
+    """
+    ticker = row['ticker']
+    current_price = row.get('currentPrice')
+
+    if not current_price:
+        return (True, "")  # No price data, don't filter
+
+    try:
+        # Get 35 days of data (enough for 30-day drawdown + 5-day SMA)
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=35)
+        hist = yf.download(ticker, start=start_date, end=end_date, progress=False)
+
+        if hist.empty or len(hist) < 5:
+            # No data - log warning but DO NOT block the trade
+            logger.warning(f"{ticker}: Insufficient price history for health checks, allowing trade")
+            return (True, "")
+
+        # Check 1: 30-day drawdown (existing logic)
+        high_30d = hist['High'].max()
+        # Ensure scalar value (handle edge cases where pandas might return Series)
+        if isinstance(high_30d, pd.Series):
+            high_30d = high_30d.iloc[0] if len(high_30d) > 0 else None
+
+        if high_30d is not None and current_price is not None:
+            drawdown = (current_price - high_30d) / high_30d
+            if drawdown <= -0.40:
+                return (False, f"Drawdown: {ticker} down {abs(drawdown)*100:.1f}% from 30-day high")
+
+        # Check 2: Downtrend detection
+        # Use last 5 close prices for SMA
+        if len(hist) >= 5:
+            last_5_closes = hist['Close'].tail(5)
+            sma_5 = last_5_closes.mean()
+            # Ensure scalar value (handle edge cases where pandas might return Series)
+            if isinstance(sma_5, pd.Series):
+                sma_5 = sma_5.iloc[0] if len(sma_5) > 0 else None
+
+            if sma_5 is not None and current_price < sma_5 * 0.97:
+                # Price is >3% below 5-day SMA - downtrend
+                pct_below = ((current_price - sma_5) / sma_5) * 100
+                return (False, f"Downtrend: {ticker} price ${current_price:.2f} is {abs(pct_below):.1f}% below 5-day SMA ${sma_5:.2f}")
+
+        return (True, "")  # Passed all checks
+
+    except Exception as e:
+        # Data fetch failed - log warning but DO NOT block the trade
+        logger.warning(f"{ticker}: Price health check failed ({str(e)}), allowing trade")
+        return (True, "")  # Never reject on data-fetch failure
+
+
+def make_universe(n=30, missing=True):
+    """Histories and signal rows: random walks plus crash, thin and (optionally) no-history/no-price cases."""
+    histories = {f"T{i:02d}": random_bars(40, seed=i, drift=-0.01 if i % 3 == 0 else 0.0) for i in range(n)}
+    crash = random_bars(40, seed=100)
+    crash.iloc[-3:, :4] *= 0.5
+    histories['CRASH'] = crash
+    histories['THIN'] = random_bars(3, seed=101)
+
+    rows = []
+    for ticker in list(histories) + (['NOHIST', 'NOPRICE'] if missing else []):
+        hist = histories.get(ticker)
+        last = float(hist['Close'].iloc[-1]) if hist is not None else 25.0
+        rng = np.random.default_rng(sum(map(ord, ticker)))
+        rows.append({
+            'ticker': ticker, 'company': f"{ticker} Industries", 'sector': 'Technology', 'industry': 'Software',
+            'currentPrice': np.nan if ticker == 'NOPRICE' else last * rng.uniform(0.93, 1.05),
+            'marketCap': 2e9, 'averageVolume': 5e6, 'cluster_count': 4, 'total_value': 4_000_000,
+            'rank_score': 10.0, 'insiders': 'Jane Doe (CEO)',
+        })
+    return histories, pd.DataFrame(rows)
+
+
+def download_from(histories):
+    """yf.download stand-in that serves the [start, end) days of the in-memory histories."""
+    def download(ticker, start, end, progress=False):
+        hist = histories.get(ticker)
+        if hist is None:
+            return pd.DataFrame()
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        return hist[(hist.index >= start) & (hist.index < end)]
+    return download
+
+
+class Patched:
+    """Swaps module globals and config flags for a test and restores them afterwards."""
+
+    def __init__(self, histories, config_overrides=None):
+        self.prefetch_calls = []
+        self.stale_windows = []
+        tmp = tempfile.mkdtemp()
+        self.log_path = os.path.join(tmp, 'quality_filter_rejections.csv')
+        original_stale = process_signals.check_stale_ticker
+
+        def prefetch(tickers, period='20d'):
+            self.prefetch_calls.append((list(tickers), period))
+            return {t: histories[t] for t in tickers if t in histories}
+
+        def stale(**kwargs):
+            hist = kwargs.get('price_history')
+            if hist is not None:
+                self.stale_windows.append(hist.index.min())
+            return original_stale(**kwargs)
+
+        self.module_values = {
+            'prefetch_price_history': prefetch,
+            'check_stale_ticker': stale,
+            'is_holiday_period': lambda check_date=None: (False, None, 0),
+            'PAPER_TRADES_CSV': os.path.join(tmp, 'paper_trades.csv'),
+            'QUALITY_REJECTIONS_CSV': self.log_path,
+        }
+        self.config_values = {'ENABLE_SHELL_COMPANY_FILTER': True, 'ENABLE_STALE_TICKER_FILTER': True,
+                              'ENABLE_MA_STATUS_CHECK': False}
+        self.config_values.update(config_overrides or {})
+
+    def __enter__(self):
+        self.saved_module = {k: getattr(process_signals, k) for k in self.module_values}
+        self.saved_config = {k: getattr(config, k, None) for k in self.config_values}
+        for k, v in self.module_values.items():
+            setattr(process_signals, k, v)
+        for k, v in self.config_values.items():
+            setattr(config, k, v)
+        return self
+
+    def __exit__(self, *exc):
+        for k, v in self.saved_module.items():
+            setattr(process_signals, k, v)
+        for k, v in self.saved_config.items():
+            setattr(config, k, v)
+
+    def log(self):
+        return pd.read_csv(self.log_path)
+
+
+# ─── Test 1: Parity with the per-ticker price health check ───────────────────
+
+def test_price_health_parity():
+    """Same rejections and reasons as downloading each ticker."""
+    histories, signals = make_universe()
+    global yf
+    try:
+        yf = SimpleNamespace(download=download_from(histories))
+        expected = {}
+        for _, row in signals.iterrows():
+            passes, reason = reference_check_price_health(row)
+            if not passes:
+                expected[row['ticker']] = reason
+    finally:
+        yf = None
+
+    # The stale check would reject (and try to download) the tickers without history
+    with Patched(histories, {'ENABLE_STALE_TICKER_FILTER': False}) as patched:
+        kept = apply_quality_filters(signals)
+        log = patched.log()
+
+    got = dict(zip(log['ticker'], log['reason']))
+    report("Same signals rejected with the same reasons", got == expected and len(expected) >= 3,
+           f"expected {expected}, got {got}")
+    report("Crash rejected for drawdown", log.set_index('ticker')['filter'].get('CRASH') == 'drawdown')
+    report("Thin, missing history and missing price allowed",
+           {'THIN', 'NOHIST', 'NOPRICE'} <= set(kept['ticker']))
+    report("All 34 signals checked (no 20-signal cap)", len(kept) + len(log) == len(signals) and len(signals) > 20)
+
+
+# ─── Test 2: One prefetch ────────────────────────────────────────────────────
+
+def test_single_prefetch():
+    """One batched read feeds the stale check and the price health check."""
+    histories, signals = make_universe(missing=False)
+    with Patched(histories) as patched:
+        apply_quality_filters(signals)
+
+    report("One prefetch for every candidate",
+           len(patched.prefetch_calls) == 1 and len(patched.prefetch_calls[0][0]) == len(signals)
+           and patched.prefetch_calls[0][1] == '35d', f"{[(len(t), p) for t, p in patched.prefetch_calls]}")
+    cutoff = pd.Timestamp(period_start('20d'))
+    report("Stale check sees the last 20 sessions",
+           patched.stale_windows and min(patched.stale_windows) >= cutoff
+           and all(len(histories[t][histories[t].index >= cutoff]) >= 20 for t in histories if t != 'THIN'),
+           f"{min(patched.stale_windows)}")
+
+    stats = price_health_stats(histories)
+    hist = histories['T05']
+    window = hist[hist.index >= pd.Timestamp(date.today() - timedelta(days=35))]
+    report("Panel stats match the ticker's own bars",
+           np.isclose(stats.loc['T05', 'high_30d'], window['High'].max())
+           and np.isclose(stats.loc['T05', 'sma_5'], window['Close'].tail(5).mean())
+           and stats.loc['T05', 'bars'] == len(window))
+
+
+# ─── Test 3: Cooldown and rejection log ──────────────────────────────────────
+
+def test_cooldown_and_log():
+    """Tickers sold inside the window are masked out and logged."""
+    histories, signals = make_universe(6, missing=False)
+    with Patched(histories) as patched:
+        now = datetime.now()
+        pd.DataFrame([
+            {'date': now - timedelta(days=2), 'action': 'SELL', 'ticker': 'T01'},
+            {'date': now - timedelta(days=4), 'action': 'SELL', 'ticker': 'T01'},
+            {'date': now - timedelta(days=10), 'action': 'SELL', 'ticker': 'T02'},
+            {'date': now - timedelta(days=1), 'action': 'BUY', 'ticker': 'T03'},
+            {'date': None, 'action': 'SELL', 'ticker': 'T04'},
+        ]).to_csv(process_signals.PAPER_TRADES_CSV, index=False)
+
+        shell = signals.copy()
+        shell.loc[shell['ticker'] == 'T05', 'sector'] = 'Shell Companies'
+        kept = apply_quality_filters(shell)
+        log = patched.log()
+
+    cooldown = log[log['filter'] == 'cooldown']
+    report("Only the recent sell is in cooldown", list(cooldown['ticker']) == ['T01'], f"{cooldown}")
+    report("Cooldown reason carries the latest close date",
+           cooldown['reason'].iloc[0] == f"Cooldown: T01 closed on {(now - timedelta(days=2)):%Y-%m-%d}, "
+                                         f"7-day cooldown required", f"{cooldown['reason'].tolist()}")
+    report("Log names the filter for every rejection",
+           list(log.columns) == ['date', 'ticker', 'filter', 'reason']
+           and log.set_index('ticker')['filter'].get('T05') == 'shell_company'
+           and not set(log['ticker']) & set(kept['ticker']), f"{log}")
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("QUALITY FILTER TESTS")
+    print("="*70 + "\n")
+
+    process_signals.logger.setLevel('ERROR')
+    test_price_health_parity()
+    test_single_prefetch()
+    test_cooldown_and_log()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
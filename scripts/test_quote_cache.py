@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared paper-trading quote cache.
+
+Covers:
+- get_portfolio_value prices all positions with one batched download and
+  reuses it across repeated calls (and _get_current_price) within the TTL
+- Values match cash + Σ shares × price, with entry-price fallback for
+  tickers no source can price
+- Expired entries are refetched
+
+These are unit-level tests that don't require external services (yfinance
+downloads are replaced by an in-memory fake).
+"""
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+import quote_cache
+import paper_trade
+
+PASS = 0
+FAIL = 0
+
+PRICES = {'AAA': 12.0, 'BBB': 55.5, 'CCC': 7.25}
+ORIGINAL_YF = quote_cache.yf
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+class FakeDownload:
+    """Stands in for yf.download: two daily bars per known ticker."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, tickers, **kwargs):
+        self.calls.append(list(tickers))
+        idx = pd.to_datetime(['2025-01-02', '2025-01-03'])
+        closes = pd.DataFrame({t: [PRICES[t] - 1, PRICES[t]] if t in PRICES else [np.nan, np.nan]
+                               for t in tickers}, index=idx)
+        closes.columns = pd.MultiIndex.from_product([['Close'], closes.columns])
+        return closes
+
+
+def make_portfolio():
+    fake = FakeDownload()
+    quote_cache.yf = SimpleNamespace(download=fake)
+    quote_cache._quote_cache = quote_cache.QuoteCache()
+
+    portfolio = paper_trade.PaperTradingPortfolio(starting_capital=10000)
+    portfolio.cash = 1000.0
+    for t, shares, entry in [('AAA', 10, 10.0), ('BBB', 4, 50.0), ('CCC', 100, 8.0), ('ZZZ', 3, 20.0)]:
+        portfolio.positions[t] = {'shares': shares, 'entry_price': entry}
+    portfolio._fetch_info_price = lambda t: None  # No network in tests
+    return portfolio, fake
+
+
+def restore():
+    quote_cache.yf = ORIGINAL_YF
+    quote_cache._quote_cache = None
+
+
+# ─── Test 1: One batched fetch per TTL ───────────────────────────────────────
+
+def test_one_fetch_per_run():
+    """Repeated valuations reuse one batched download."""
+    try:
+        portfolio, fake = make_portfolio()
+
+        value = portfolio.get_portfolio_value()
+        portfolio.get_portfolio_value(verbose=True)
+        portfolio.get_sector_concentration()
+        price = portfolio._get_current_price('BBB', 50.0)
+
+        report("One batched download", len(fake.calls) == 1, f"{fake.calls}")
+        report("All positions in the batch", sorted(fake.calls[0]) == ['AAA', 'BBB', 'CCC', 'ZZZ'])
+        expected = 1000.0 + 10 * 12.0 + 4 * 55.5 + 100 * 7.25 + 3 * 20.0
+        report("Value is cash + shares × price (entry fallback)", abs(value - expected) < 1e-9,
+               f"{value} vs {expected}")
+        report("_get_current_price served from the snapshot", price == 55.5)
+    finally:
+        restore()
+
+
+# ─── Test 2: TTL expiry ──────────────────────────────────────────────────────
+
+def test_ttl_expiry():
+    """Expired quotes are refetched; fresh ones are not."""
+    try:
+        portfolio, fake = make_portfolio()
+        quote_cache.get_quote_cache().ttl_seconds = 0.05
+
+        portfolio.get_portfolio_value()
+        time.sleep(0.1)
+        portfolio.get_portfolio_value()
+        report("Expired snapshot refetched", len(fake.calls) == 2, f"{fake.calls}")
+    finally:
+        restore()
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("QUOTE CACHE TESTS")
+    print("="*70 + "\n")
+
+    test_one_fetch_per_run()
+    test_ttl_expiry()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the batched sector analysis.
+
+Covers:
+- trailing_returns gives the same 30/60/90-day returns as the original
+  per-ETF loop, with NaN where an ETF's history is too short
+- enhance_signals_with_sector_analysis attaches the same sector, ETF,
+  relative performance and timing signal to every row as analysing each
+  signal on its own (mapped, learned, inferred and unmapped industries,
+  missing sectors, a non-sequential index)
+- All ETFs plus SPY are read in one batched call, each missing industry is
+  looked up once per ticker, and learned mappings are written once
+- 200 signals are analysed in milliseconds once prices are loaded
+
+These are unit-level tests that don't require external services (prices come
+from in-memory histories and the caches live in a temp dir).
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+import sector_analyzer
+from sector_analyzer import (INDUSTRY_SPECIFIC_ETFS, INDUSTRY_TO_SECTOR, PERFORMANCE_WINDOWS, SECTOR_ETFS,
+                             SectorAnalyzer, trailing_returns)
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+ETFS = sorted(set(SECTOR_ETFS.values()) | set(INDUSTRY_SPECIFIC_ETFS.values())) + ['SPY']
+INDUSTRIES = (list(SECTOR_ETFS)[:6] + list(INDUSTRY_SPECIFIC_ETFS)[:10] + list(INDUSTRY_TO_SECTOR)[:15]
+              + ['Regional Banking Services', 'Specialty Biotech Tools', 'Underwater Basket Weaving',
+                 'Zorbing Experiences', 'Unknown'])
+
+
+def random_history(etf, n=None):
+    """Random-walk closes over ~6 months of business days (n bars if given)."""
+    rng = np.random.default_rng(sum(map(ord, etf)))
+    n = n or 126
+    idx = pd.bdate_range(end='2025-06-30', periods=n)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 1e6}, index=idx)
+
+
+def make_histories():
+    histories = {etf: random_history(etf) for etf in ETFS}
+    histories['XLRE'] = random_history('XLRE', 45)  # too short for 60d/90d
+    del histories['XLU']                             # no data at all
+    return histories
+
+
+class Patched:
+    """Serves in-memory prices and industries; counts calls; restores the module afterwards."""
+
+    def __init__(self, histories, industries):
+        self.history_calls = []
+        self.industry_calls = []
+
+        def get_histories(tickers, start=None, end=None, adjusted=True):
+            self.history_calls.append(list(tickers))
+            return {t: histories[t] for t in tickers if t in histories}
+
+        def get_company_industry(ticker):
+            self.industry_calls.append(ticker)
+            return industries.get(ticker)
+
+        self.values = {'get_histories': get_histories, 'get_company_industry': get_company_industry}
+
+    def __enter__(self):
+        self.saved = {k: getattr(sector_analyzer, k) for k in self.values}
+        for k, v in self.values.items():
+            setattr(sector_analyzer, k, v)
+        return self
+
+    def __exit__(self, *exc):
+        for k, v in self.saved.items():
+            setattr(sector_analyzer, k, v)
+
+
+def make_signals(n=200, seed=4):
+    rng = random.Random(seed)
+    tickers = [f"S{i:03d}" for i in range(n // 2)]
+    rows = [{'ticker': rng.choice(tickers), 'sector': rng.choice(INDUSTRIES + [None, np.nan]), 'score': i}
+            for i in range(n)]
+    signals = pd.DataFrame(rows)
+    signals.index = rng.sample(range(10 * n), n)
+    industries = {t: rng.choice(INDUSTRIES + [None]) for t in tickers}
+    industries[signals['ticker'].iloc[0]] = None
+    signals.iloc[0, signals.columns.get_loc('sector')] = None
+    return signals, industries
+
+
+ANALYSIS_COLUMNS = ['sector', 'sector_etf', 'relative_performance_30d', 'relative_performance_60d',
+                    'relative_performance_90d', 'sector_signal', 'sector_context']
+
+
+def reference_etf_returns(hist):
+    """Original per-ETF return loop, for parity checks."""
+    current_price = hist['Close'].iloc[-1]
+    returns = {}
+    for days in PERFORMANCE_WINDOWS:
+        if len(hist) >= days:
+            past_price = hist['Close'].iloc[-days]
+            returns[f'{days}d'] = (current_price / past_price) - 1.0
+        else:
+            returns[f'{days}d'] = None
+    return current_price, returns
+
+
+def reference_analyze_signal_sector(analyzer, ticker, sector=None):
+    """Original per-signal analysis, for parity checks."""
+    if sector is None or sector == 'Unknown':
+        sector = analyzer.get_stock_sector(ticker)
+
+    sector_etf, mapped_sector, mapping_source = analyzer.get_etf_for_industry(sector)
+    unknown = {
+        'sector': sector,
+        'sector_etf': sector_etf,
+        'mapped_sector': mapped_sector,
+        'mapping_source': mapping_source,
+        'relative_performance_30d': None,
+        'relative_performance_60d': None,
+        'relative_performance_90d': None,
+        'sector_signal': 'UNKNOWN',
+    }
+    if not sector_etf:
+        return {**unknown, 'mapping_source': 'not_found', 'sector_context': 'No sector ETF mapping available'}
+
+    performance = analyzer.get_sector_performance()
+    if not performance or sector_etf not in performance or 'SPY' not in performance:
+        return {**unknown, 'sector_context': 'Performance data unavailable'}
+
+    sector_data = performance.get(sector_etf)
+    spy_data = performance.get('SPY')
+    if not sector_data or not spy_data:
+        return {**unknown, 'sector_context': 'Incomplete performance data'}
+
+    rel_perf = {}
+    for period in ['30d', '60d', '90d']:
+        sector_ret = sector_data['returns'].get(period)
+        spy_ret = spy_data['returns'].get(period)
+        rel_perf[period] = sector_ret - spy_ret if sector_ret is not None and spy_ret is not None else None
+
+    sector_signal, sector_context = analyzer._generate_timing_signal(
+        rel_perf['30d'], mapped_sector if mapped_sector else sector, sector_etf)
+    return {
+        **unknown,
+        'relative_performance_30d': rel_perf['30d'],
+        'relative_performance_60d': rel_perf['60d'],
+        'relative_performance_90d': rel_perf['90d'],
+        'sector_signal': sector_signal,
+        'sector_context': sector_context
+    }
+
+
+# ─── Test 1: Trailing returns matrix ─────────────────────────────────────────
+
+def test_trailing_returns():
+    """Same returns as the per-ETF iloc loop."""
+    histories = make_histories()
+    matrix = trailing_returns(histories)
+
+    mismatches = []
+    for etf, hist in histories.items():
+        price, returns = reference_etf_returns(hist)
+        row = matrix.loc[etf]
+        if row['current_price'] != price:
+            mismatches.append((etf, 'price'))
+        for period, value in returns.items():
+            if (value is None) != np.isnan(row[period]) or (value is not None and value != row[period]):
+                mismatches.append((etf, period))
+    report("Same returns as the per-ETF loop", not mismatches, f"{mismatches}")
+    report("Short history has NaN long windows",
+           not np.isnan(matrix.loc['XLRE', '30d']) and matrix.loc['XLRE', ['60d', '90d']].isna().all())
+    report("ETF without data left out", 'XLU' not in matrix.index and len(matrix) == len(histories))
+
+
+# ─── Test 2: Parity with per-signal analysis ─────────────────────────────────
+
+def test_parity():
+    """Every row gets the analysis a per-signal call gives it."""
+    histories = make_histories()
+    signals, industries = make_signals()
+
+    with Patched(histories, industries) as patched:
+        reference = SectorAnalyzer(cache_dir=tempfile.mkdtemp())
+        expected = []
+        for _, row in signals.iterrows():
+            sector = row['sector'] if isinstance(row['sector'], str) else None
+            expected.append(reference_analyze_signal_sector(reference, row['ticker'], sector))
+        expected = pd.DataFrame(expected)
+
+        cache_dir = tempfile.mkdtemp()
+        analyzer = SectorAnalyzer(cache_dir=cache_dir)
+        writes = []
+        write = analyzer._write_custom_mappings
+        analyzer._write_custom_mappings = lambda: (writes.append(1), write())
+        patched.history_calls.clear()
+        patched.industry_calls.clear()
+        got = analyzer.enhance_signals_with_sector_analysis(signals.copy())
+
+    same = all(expected[c].fillna('-').tolist() == got[c].fillna('-').tolist() for c in ANALYSIS_COLUMNS
+               if c in ('sector', 'sector_etf', 'sector_signal', 'sector_context'))
+    close = all(np.allclose(expected[c].astype(float), got[c].astype(float), equal_nan=True)
+                for c in ANALYSIS_COLUMNS if c.startswith('relative'))
+    report("Same sector, ETF, signal and context per row", same)
+    report("Same relative performance per row", close)
+    report("Index and other columns untouched",
+           list(got.index) == list(signals.index) and list(got['score']) == list(signals['score']))
+    report("All signal kinds exercised",
+           {'UNKNOWN', 'NEUTRAL'} <= set(got['sector_signal'])
+           and {'No sector ETF mapping available', 'Performance data unavailable'} <= set(got['sector_context']))
+
+    missing = signals.loc[signals['sector'].isna() | (signals['sector'] == 'Unknown'), 'ticker'].nunique()
+    report("One batched ETF read", len(patched.history_calls) == 1 and len(patched.history_calls[0]) == len(ETFS),
+           f"{patched.history_calls}")
+    report("Industry looked up once per ticker without one", len(patched.industry_calls) == missing,
+           f"{len(patched.industry_calls)} vs {missing}")
+    saved = json.loads((Path(cache_dir) / 'industry_mapping_cache.json').read_text())
+    report("Learned mappings written once", writes == [1] and saved.keys() == reference.custom_industry_mappings.keys(),
+           f"{len(writes)} writes")
+
+
+# ─── Test 3: Speed once prices are loaded ────────────────────────────────────
+
+def test_speed():
+    """200 signals in milliseconds with prices and industries in memory."""
+    signals, industries = make_signals()
+    with Patched(make_histories(), industries):
+        analyzer = SectorAnalyzer(cache_dir=tempfile.mkdtemp())
+        analyzer.update_sector_performance()
+        sector_analyzer.logger.disabled = True
+        try:
+            start = time.perf_counter()
+            analyzer.enhance_signals_with_sector_analysis(signals.copy())
+            elapsed = time.perf_counter() - start
+        finally:
+            sector_analyzer.logger.disabled = False
+    report("200 signals under 0.5s", elapsed < 0.5, f"{elapsed:.3f}s")
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("SECTOR ANALYSIS TESTS")
+    print("="*70 + "\n")
+
+    sector_analyzer.logger.setLevel('ERROR')
+    test_trailing_returns()
+    test_parity()
+    test_speed()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
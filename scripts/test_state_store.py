@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SQLite state store.
+
+Covers:
+- JSON state files are imported on first load and round-trip unchanged
+- Saves only write the records that changed
+- Modified stores are exported back to JSON; untouched ones are not
+- A JSON file changed behind the database's back is re-imported
+
+These are unit-level tests that don't require external services (the
+database and JSON files live in a temp dir).
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from automated_trading.state_store import StateStore
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+def make_files():
+    """Temp dir with a pending-orders file and an execution-metrics file."""
+    tmp = Path(tempfile.mkdtemp())
+    orders = {
+        'orders': {f'CID-{i}': {'ticker': f'T{i}', 'shares': i, 'status': 'pending'} for i in range(50)},
+        'last_updated': '2025-01-02T09:30:00',
+    }
+    metrics = {
+        'executions': [{'ticker': f'T{i}', 'slippage_pct': i / 10} for i in range(20)],
+        'daily_stats': {'2025-01-02': {'fills': 20}},
+        'last_updated': '2025-01-02T09:30:00',
+    }
+    (tmp / 'pending_orders.json').write_text(json.dumps(orders))
+    (tmp / 'execution_metrics.json').write_text(json.dumps(metrics))
+    return tmp, orders, metrics
+
+
+def version(tmp, name):
+    with sqlite3.connect(tmp / 'state.sqlite') as conn:
+        return conn.execute("SELECT version, exported_version FROM _stores WHERE name = ?", (name,)).fetchone()
+
+
+# ─── Test 1: Import and round trip ───────────────────────────────────────────
+
+def test_import_round_trip():
+    """Loading imports the JSON file; dict and list records round-trip."""
+    tmp, orders, metrics = make_files()
+    store = StateStore(str(tmp / 'state.sqlite'))
+
+    report("Dict records round-trip", store.load(str(tmp / 'pending_orders.json'), 'orders') == orders)
+    report("List records round-trip", store.load(str(tmp / 'execution_metrics.json'), 'executions') == metrics)
+    report("Missing file loads as None", store.load(str(tmp / 'queued_signals.json'), 'signals') is None)
+
+
+# ─── Test 2: Record-level writes ─────────────────────────────────────────────
+
+def test_saves_only_changed_records():
+    """Changing one order writes one row; an unchanged save writes nothing."""
+    tmp, orders, metrics = make_files()
+    path = str(tmp / 'pending_orders.json')
+    store = StateStore(str(tmp / 'state.sqlite'))
+    data = store.load(path, 'orders')
+
+    conn = store._connect()
+    before = conn.total_changes
+    store.save(path, data, 'orders')
+    report("Unchanged save writes no rows", conn.total_changes == before)
+
+    data['orders']['CID-3']['status'] = 'filled'
+    del data['orders']['CID-4']
+    before = conn.total_changes
+    store.save(path, data, 'orders')
+    # 1 upsert + 1 delete + the _stores version bump
+    report("Only changed records are written", conn.total_changes - before == 3,
+           f"{conn.total_changes - before} rows")
+
+    fresh = StateStore(str(tmp / 'state.sqlite'))
+    report("Changes are visible to another connection", fresh.load(path, 'orders') == data)
+    report("JSON file is untouched until export",
+           json.loads(Path(path).read_text()) == orders)
+
+
+# ─── Test 3: Export and re-import ────────────────────────────────────────────
+
+def test_export_and_reimport():
+    """Only modified stores are exported; external JSON edits are re-imported."""
+    tmp, orders, metrics = make_files()
+    orders_path = str(tmp / 'pending_orders.json')
+    metrics_path = str(tmp / 'execution_metrics.json')
+    store = StateStore(str(tmp / 'state.sqlite'))
+    store.load(metrics_path, 'executions')
+    data = store.load(orders_path, 'orders')
+    data['orders']['CID-99'] = {'ticker': 'NEW', 'shares': 1, 'status': 'pending'}
+    store.save(orders_path, data, 'orders')
+
+    metrics_mtime = os.stat(metrics_path).st_mtime_ns
+    report("One store exported", store.export() == 1)
+    report("Exported JSON matches the store", json.loads(Path(orders_path).read_text()) == data)
+    report("Untouched store not rewritten", os.stat(metrics_path).st_mtime_ns == metrics_mtime)
+    v, exported = version(tmp, 'pending_orders')
+    report("Export version recorded", v == exported, f"{v} vs {exported}")
+
+    edited = dict(orders, orders={'CID-1': {'ticker': 'PULLED', 'shares': 5, 'status': 'pending'}})
+    Path(orders_path).write_text(json.dumps(edited, indent=4))
+    report("Externally edited JSON is re-imported", store.load(orders_path, 'orders') == edited)
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("STATE STORE TESTS")
+    print("="*70 + "\n")
+
+    test_import_round_trip()
+    test_saves_only_changed_records()
+    test_export_and_reimport()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Unit tests for event-driven order tracking over the trade-updates stream.
+
+Covers:
+- Recorded fill / partial_fill / canceled / rejected updates replayed by the
+  local stand-in server drive the same OrderManager transitions (and fill
+  callbacks) as polling, without per-order get_order calls
+- await_fill returns as soon as the streamed fill arrives
+- With the stream down, order tracking falls back to REST polling
+
+These are unit-level tests that don't require external services (the
+websocket server runs on localhost and state files go to a temp dir).
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from automated_trading import config
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+PATCHED = ['PENDING_ORDERS_FILE', 'AUDIT_LOG_FILE', 'DATA_DIR', 'STATE_BACKEND']
+ORIGINAL = {name: getattr(config, name) for name in PATCHED}
+
+
+def restore_config():
+    for name, value in ORIGINAL.items():
+        setattr(config, name, value)
+
+
+def use_temp_state():
+    tmp = tempfile.mkdtemp()
+    for name in PATCHED[:2]:
+        setattr(config, name, os.path.join(tmp, os.path.basename(ORIGINAL[name])))
+    config.DATA_DIR = tmp
+    config.STATE_BACKEND = 'json'
+
+
+def update(event, order_id, client_order_id, symbol, status, qty, filled_qty=0, price=None):
+    """A trade_updates message as Alpaca sends it."""
+    return {
+        'stream': 'trade_updates',
+        'data': {
+            'event': event,
+            'order': {
+                'id': order_id, 'client_order_id': client_order_id, 'symbol': symbol,
+                'qty': str(qty), 'filled_qty': str(filled_qty), 'side': 'buy',
+                'type': 'limit', 'status': status, 'time_in_force': 'day',
+                'limit_price': '10.00',
+                'filled_avg_price': str(price) if price is not None else None,
+            },
+        },
+    }
+
+
+class ReplayServer:
+    """Runs serve_replay on a background event loop."""
+
+    def __init__(self, messages, delay=0.0):
+        from automated_trading.trade_stream import serve_replay
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server = asyncio.run_coroutine_threadsafe(
+            serve_replay(messages, delay=delay), self.loop).result(5)
+        self.url = f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    def close(self):
+        async def shutdown():
+            self.server.close()
+            await self.server.wait_closed()
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+
+class FakeBroker:
+    """get_order backed by a dict; counts calls."""
+
+    def __init__(self, orders=None):
+        self.orders = orders or {}
+        self.get_order_calls = 0
+
+    def get_order(self, order_id):
+        self.get_order_calls += 1
+        return self.orders.get(order_id)
+
+    def cancel_order(self, order_id):
+        return True
+
+
+def submitted(manager, ticker, order_id):
+    order, _ = manager.create_buy_order(ticker, 100, 10.0, {'signal_score': 5}, 'LIMIT')
+    manager.mark_order_submitted(order, order_id, 'new')
+    return order['client_order_id']
+
+
+# ─── Test 1: Streamed transitions ────────────────────────────────────────────
+
+def test_streamed_transitions():
+    """Recorded updates fill, partially fill, cancel and reject without polling."""
+    stream = server = None
+    try:
+        use_temp_state()
+        from automated_trading.order_manager import OrderManager
+        from automated_trading.trade_stream import TradeUpdateStream
+
+        manager = OrderManager()
+        server = ReplayServer([])
+        stream = TradeUpdateStream(url=server.url, api_key='k', secret_key='s')
+        report("Stream connects to stand-in server", stream.start(wait_seconds=5))
+
+        cids = {t: submitted(manager, t, f"id-{t}") for t in ['AAA', 'BBB', 'CCC', 'DDD']}
+        messages = [
+            update('fill', 'id-AAA', cids['AAA'], 'AAA', 'filled', 100, 100, 10.01),
+            update('partial_fill', 'id-BBB', cids['BBB'], 'BBB', 'partially_filled', 100, 40, 10.0),
+            update('canceled', 'id-CCC', cids['CCC'], 'CCC', 'canceled', 100),
+            update('rejected', 'id-DDD', cids['DDD'], 'DDD', 'rejected', 100),
+        ]
+        for msg in messages:
+            stream._on_message(json.loads(json.dumps(msg)))
+
+        filled = []
+        broker = FakeBroker({'id-BBB': {'status': 'partially_filled', 'filled_qty': 40,
+                                        'filled_avg_price': 10.0}})
+        results = manager.update_orders_from_broker(broker, on_fill_callback=filled.append,
+                                                    trade_stream=stream)
+
+        report("Fill applied with callback",
+               [o['ticker'] for o in results['filled']] == ['AAA'] and filled and filled[0]['filled_price'] == 10.01,
+               f"{results['filled']}")
+        report("Cancel and reject applied",
+               sorted(o['ticker'] for o in results['rejected']) == ['CCC', 'DDD'], f"{results['rejected']}")
+        report("Partial fill recorded",
+               manager.pending_orders[cids['BBB']]['filled_shares'] == 40
+               and manager.pending_orders[cids['BBB']]['state'] == 'partially_filled')
+        report("Only the partially filled order is polled", broker.get_order_calls == 1,
+               f"{broker.get_order_calls} get_order calls")
+    finally:
+        if stream:
+            stream.stop()
+        if server:
+            server.close()
+        restore_config()
+
+
+# ─── Test 2: Replayed over the socket ────────────────────────────────────────
+
+def test_await_fill_over_socket():
+    """A fill pushed by the server releases await_fill immediately."""
+    stream = server = None
+    try:
+        from automated_trading.alpaca_client import AlpacaTradingClient
+        from automated_trading.trade_stream import TradeUpdateStream
+
+        server = ReplayServer([update('fill', 'id-EEE', 'cid-EEE', 'EEE', 'filled', 50, 50, 20.5)],
+                              delay=0.2)
+        stream = TradeUpdateStream(url=server.url, api_key='k', secret_key='s')
+        stream.start(wait_seconds=5)
+
+        client = AlpacaTradingClient.__new__(AlpacaTradingClient)
+        client.trade_stream = stream
+        client.get_order = lambda order_id: (_ for _ in ()).throw(AssertionError("polled"))
+
+        started = time.monotonic()
+        order = client.await_fill('id-EEE', timeout_seconds=10)
+        elapsed = time.monotonic() - started
+
+        report("Streamed fill returned", order['status'] == 'filled' and order['filled_qty'] == 50, f"{order}")
+        report("await_fill is sub-second", elapsed < 1.0, f"{elapsed:.2f}s")
+        report("Update consumed from binary frame", stream.events_received == 1)
+    finally:
+        if stream:
+            stream.stop()
+        if server:
+            server.close()
+
+
+# ─── Test 3: Polling fallback ────────────────────────────────────────────────
+
+def test_polling_fallback():
+    """Without a live stream, orders are polled as before."""
+    try:
+        use_temp_state()
+        from automated_trading.alpaca_client import AlpacaTradingClient
+        from automated_trading.order_manager import OrderManager
+        from automated_trading.trade_stream import TradeUpdateStream
+
+        stream = TradeUpdateStream(url='ws://127.0.0.1:9', api_key='k', secret_key='s')  # Never started
+        manager = OrderManager()
+        cid = submitted(manager, 'FFF', 'id-FFF')
+        broker = FakeBroker({'id-FFF': {'status': 'filled', 'filled_qty': 100, 'filled_avg_price': 9.9}})
+
+        results = manager.update_orders_from_broker(broker, trade_stream=stream)
+        report("Disconnected stream falls back to get_order",
+               broker.get_order_calls == 1 and [o['client_order_id'] for o in results['filled']] == [cid])
+
+        client = AlpacaTradingClient.__new__(AlpacaTradingClient)
+        client.trade_stream = stream
+        client.get_order = lambda order_id: {'status': 'filled', 'filled_qty': 100}
+        report("await_fill polls when stream is down",
+               client.await_fill('id-FFF', timeout_seconds=1)['status'] == 'filled')
+
+        report("Stream only covers orders submitted while connected",
+               not stream.covers({'submitted_at': datetime.now().isoformat()}))
+    finally:
+        restore_config()
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("TRADE STREAM TESTS")
+    print("="*70 + "\n")
+
+    test_streamed_transitions()
+    test_await_fill_over_socket()
+    test_polling_fallback()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)
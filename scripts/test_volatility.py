@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the batched ATR% volatility service.
+
+Covers:
+- The NumPy panel ATR% matches the original per-ticker pandas computation
+  (short histories, exactly lookback bars, gaps and zero closes)
+- All tickers are read through one batched price store call, and results
+  are persisted per day so a second process recomputes nothing
+- Tickers without enough history are not persisted
+- TradingEngine and PaperTradingPortfolio prefetch every candidate in one
+  call, after which sizing lookups hit the session cache
+
+These are unit-level tests that don't require external services (bars come
+from an in-memory fetcher and the store lives in a temp dir).
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'jobs'))
+
+import paper_trade
+from price_store import PriceStore
+from volatility import DEFAULT_ATR_LOOKBACK_DAYS, VolatilityService, atr_pct_panel, _stack
+from automated_trading import execute_trades
+
+PASS = 0
+FAIL = 0
+
+
+def report(name, ok, detail=""):
+    global PASS, FAIL
+    if ok:
+        PASS += 1
+        print(f"  PASS  {name}")
+    else:
+        FAIL += 1
+        print(f"  FAIL  {name} — {detail}")
+
+
+def reference_atr_pct(hist, lookback=DEFAULT_ATR_LOOKBACK_DAYS):
+    """The original per-ticker ATR% computation, for parity checks."""
+    if hist.empty or len(hist) < lookback:
+        return None
+
+    high = hist['High']
+    low = hist['Low']
+    close = hist['Close']
+    prev_close = close.shift(1)
+
+    tr = high - low
+    tr = tr.combine(abs(high - prev_close), max)
+    tr = tr.combine(abs(low - prev_close), max)
+
+    atr = float(tr.tail(lookback).mean())
+    last_close = float(close.iloc[-1])
+    return (atr / last_close) * 100 if last_close > 0 else None
+
+
+def random_bars(n, seed, end=None):
+    """Random-walk OHLC over the n business days ending at end."""
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range(end=end or date.today() - timedelta(days=1), periods=n)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    open_ = close * np.exp(rng.normal(0, 0.01, n))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.03, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.03, n))
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close,
+                         'Volume': 1e6, 'Dividends': 0.0, 'Stock Splits': 0.0}, index=idx)
+
+
+class FakeFetcher:
+    """Serves random bars per ticker (none for 'NEW', 5 days for 'IPO') and records calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, tickers, start, end):
+        self.calls.append(tuple(tickers))
+        frames = {}
+        for t in tickers:
+            if t == 'NEW':
+                continue
+            bars = random_bars(5 if t == 'IPO' else 60, seed=sum(map(ord, t)), end=end)
+            frames[t] = bars[(bars.index >= pd.Timestamp(start)) & (bars.index <= pd.Timestamp(end))]
+        return frames
+
+
+def panel_atr(histories, lookback=20):
+    tickers, high, low, close = _stack(histories, lookback)
+    return dict(zip(tickers, atr_pct_panel(high, low, close)))
+
+
+# ─── Test 1: Parity with the per-ticker computation ──────────────────────────
+
+def test_parity():
+    """Same ATR% as the pandas combine(max) version."""
+    histories = {f"T{i}": random_bars(n, seed=i) for i, n in enumerate([21, 20, 40, 120, 19, 3])}
+    gappy = random_bars(40, seed=99)
+    gappy.iloc[[5, 30], gappy.columns.get_loc('High')] = np.nan
+    histories['GAP'] = gappy
+    zero = random_bars(30, seed=7)
+    zero.iloc[-1, zero.columns.get_loc('Close')] = 0.0
+    histories['ZERO'] = zero
+
+    fast = panel_atr(histories)
+    mismatches = []
+    for t, hist in histories.items():
+        expected = reference_atr_pct(hist)
+        got = fast.get(t)
+        got = None if got is None or not np.isfinite(got) else got
+        if (expected is None) != (got is None) or (expected is not None and not np.isclose(expected, got)):
+            mismatches.append((t, expected, got))
+    report("Panel ATR% matches reference for every ticker", not mismatches, f"{mismatches}")
+    report("Short histories excluded", 'T4' not in fast and 'T5' not in fast)
+
+
+# ─── Test 2: Batched, persisted per day ──────────────────────────────────────
+
+def test_service_batching_and_persistence():
+    """One batched download; a second service reuses today's values."""
+    fetcher = FakeFetcher()
+    store = PriceStore(os.path.join(tempfile.mkdtemp(), 'price_store.sqlite'), fetch_fn=fetcher)
+    tickers = ['AAA', 'bbb', 'CCC', 'NEW', 'IPO']
+
+    service = VolatilityService(store)
+    values = service.get_atr_pcts(tickers)
+    report("One batched download for all tickers", len(fetcher.calls) == 1 and len(fetcher.calls[0]) == 5,
+           f"{fetcher.calls}")
+    report("Normalized tickers, None without enough history",
+           set(values) == {'AAA', 'BBB', 'CCC', 'NEW', 'IPO'} and values['NEW'] is None and values['IPO'] is None)
+
+    start = date.today() - timedelta(days=int(25 * 1.8))
+    hist = store.get_history('AAA', start, date.today() - timedelta(days=1))
+    report("Values match the per-ticker computation", np.isclose(values['AAA'], reference_atr_pct(hist)))
+
+    service.get_atr_pcts(['AAA', 'CCC'])
+    report("Repeat lookup is served from memory", service.stats['computed'] == 3 and len(fetcher.calls) == 1)
+
+    other = VolatilityService(store)
+    again = other.get_atr_pcts(['AAA', 'BBB', 'CCC'])
+    report("Another run reuses persisted values",
+           again == {t: values[t] for t in ['AAA', 'BBB', 'CCC']} and other.stats['computed'] == 0
+           and other.stats['persisted_hits'] == 3)
+
+    other.get_atr_pcts(['NEW'])
+    report("Missing values are retried, not persisted", other.stats['persisted_hits'] == 3)
+
+    tomorrow = other.get_atr_pcts(['AAA'], as_of=date.today() + timedelta(days=1))
+    report("A new day recomputes", other.stats['computed'] == 1 and tomorrow['AAA'] is not None,
+           f"{other.stats}")
+    service.close()
+    other.close()
+    store.close()
+
+
+# ─── Test 3: Engine and paper portfolio prefetch ─────────────────────────────
+
+def test_prefetch():
+    """Sizing lookups after a prefetch don't call the service again."""
+    calls = []
+
+    def fake_get_atr_pcts(tickers, lookback):
+        calls.append(list(tickers))
+        return {t.upper(): (None if t == 'NONE' else 2.5) for t in tickers}
+
+    original_live = execute_trades.get_atr_pcts
+    original_paper = paper_trade.get_atr_pcts
+    try:
+        execute_trades.get_atr_pcts = fake_get_atr_pcts
+        paper_trade.get_atr_pcts = fake_get_atr_pcts
+
+        engine = execute_trades.TradingEngine.__new__(execute_trades.TradingEngine)
+        engine._atr_cache = {}
+        engine._prefetch_atr(['AAA', 'BBB', 'NONE', 'AAA', None])
+        sizes = [engine._calculate_atr_pct(t) for t in ['AAA', 'BBB', 'NONE']]
+        report("Engine: one batched call for all signals",
+               calls == [['AAA', 'BBB', 'NONE']] and sizes == [2.5, 2.5, None], f"{calls} {sizes}")
+        engine._calculate_atr_pct('CCC')
+        report("Engine: unprefetched ticker falls back to a single lookup", calls[-1] == ['CCC'])
+
+        calls.clear()
+        portfolio = paper_trade.PaperTradingPortfolio(starting_capital=10000)
+        portfolio.prefetch_atr(['XXX', 'YYY'])
+        portfolio.prefetch_atr(['XXX'])
+        report("Paper: one batched call, cached afterwards",
+               calls == [['XXX', 'YYY']] and portfolio._calculate_atr_pct('YYY') == 2.5 and len(calls) == 1,
+               f"{calls}")
+    finally:
+        execute_trades.get_atr_pcts = original_live
+        paper_trade.get_atr_pcts = original_paper
+
+
+# ─── Run all tests ───────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    print("\n" + "="*70)
+    print("VOLATILITY SERVICE TESTS")
+    print("="*70 + "\n")
+
+    test_parity()
+    test_service_batching_and_persistence()
+    test_prefetch()
+
+    print(f"\n{'='*70}")
+    print(f"Results: {PASS} passed, {FAIL} failed")
+    print(f"{'='*70}\n")
+
+    sys.exit(1 if FAIL > 0 else 0)